@@ -124,3 +124,17 @@ class ReservationMember(BaseModel):
     is_manager: bool
     status: enums.ReservationMemberStatus
     source: enums.ReservationMemberSource
+
+
+class Job(BaseModel):
+    id: int
+    job_type: str
+    payload: dict
+    status: enums.JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    locked_at: datetime | None
+    last_error: str | None
+    created_at: datetime
+    finished_at: datetime | None
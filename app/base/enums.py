@@ -102,3 +102,32 @@ class ReservationMemberStatus(StrEnum):
 class ReservationMemberSource(StrEnum):
     search = 'SEARCH'
     invitation_code = 'INVITATION_CODE'
+
+
+class RecurrenceFrequency(StrEnum):
+    daily = 'DAILY'
+    weekly = 'WEEKLY'
+
+
+class JobStatus(StrEnum):
+    pending = 'PENDING'
+    running = 'RUNNING'
+    done = 'DONE'
+    dead = 'DEAD'  # out of attempts, kept for the admin to retry
+
+
+class JobType(StrEnum):
+    verification_email = 'VERIFICATION_EMAIL'
+    forget_password_email = 'FORGET_PASSWORD_EMAIL'
+    invitation_email = 'INVITATION_EMAIL'
+    calendar_event_member = 'CALENDAR_EVENT_MEMBER'
+
+
+class CacheNamespace(StrEnum):
+    stadium = 'STADIUM'
+    venue = 'VENUE'
+    business_hour = 'BUSINESS_HOUR'
+    album = 'ALBUM'
+    city = 'CITY'
+    district = 'DISTRICT'
+    sport = 'SPORT'
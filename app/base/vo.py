@@ -2,10 +2,10 @@
 view objects
 """
 
-from datetime import time
+from datetime import date, time
 from typing import Sequence
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.base import do, enums
 from app.utils import ServerTZDatetime
@@ -19,7 +19,7 @@ class ViewStadium(do.Stadium):
 
 
 class WeekTimeRange(BaseModel):
-    weekday: int
+    weekday: int = Field(ge=1, le=7)  # 1 is monday
     start_time: time
     end_time: time
 
@@ -29,6 +29,51 @@ class DateTimeRange(BaseModel):
     end_time: ServerTZDatetime
 
 
+class Recurrence(BaseModel):
+    """
+    The RRULE subset of a reservation series, ending after `count` occurrences or on `until`.
+    """
+    frequency: enums.RecurrenceFrequency
+    interval: int = Field(default=1, ge=1)
+    count: int | None = Field(default=None, ge=1)
+    until: date | None = None
+
+
+class FreeSlot(BaseModel):
+    court_id: int
+    start_time: ServerTZDatetime
+    end_time: ServerTZDatetime
+
+
+class ViewFreeCourt(BaseModel):
+    court_id: int
+    court_number: int
+    venue_id: int
+    venue_name: str
+    stadium_id: int
+    stadium_name: str
+    start_time: ServerTZDatetime
+    end_time: ServerTZDatetime
+    distance: float | None = None
+
+
+class ViewCourtOccupancy(BaseModel):
+    court_id: int
+    stadium_name: str
+    venue_name: str
+    court_number: int
+    occupied: Sequence[tuple[int, int]]  # (first slot, slot count) of every occupied run
+
+
+class ViewCourtDailyStat(BaseModel):
+    court_id: int
+    day: date
+    reservation_count: int
+    reserved_minutes: int
+    member_count: int
+    cancelled_count: int
+
+
 class ViewMyReservation(BaseModel):
     reservation_id: int
     start_time: ServerTZDatetime
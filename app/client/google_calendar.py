@@ -1,4 +1,6 @@
+from datetime import datetime, timezone
 from typing import Sequence
+from zoneinfo import ZoneInfo
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -8,7 +10,9 @@ from pydantic import BaseModel
 import app.persistence.database as db
 from app import log
 from app.config import GoogleConfig, google_config
-from app.utils import ServerTZDatetime
+from app.utils import ServerTZDatetime, profiler
+
+TIME_ZONE = 'Asia/Taipei'  # of the naive times in events
 
 
 class Email(BaseModel):
@@ -22,6 +26,7 @@ class AddEventInput(BaseModel):
     event_id: str | None = None
     all_emails: Sequence[Email] | None = None
     summary: str | None = None
+    recurrence: Sequence[str] | None = None
 
 
 class AddEventMemberInput(BaseModel):
@@ -42,10 +47,11 @@ class GoogleCalendar:
             'client_id': self.config.CLIENT_ID, 'client_secret': self.config.CLIENT_SECRET,
         }
         scopes = ['https://www.googleapis.com/auth/calendar']
-        creds = Credentials.from_authorized_user_info(token_dict, scopes)
-        if not creds.valid:
-            creds.refresh(Request())
-        self.service = build('calendar', 'v3', credentials=creds)
+        with profiler.track_external('calendar'):
+            creds = Credentials.from_authorized_user_info(token_dict, scopes)
+            if not creds.valid:
+                creds.refresh(Request())
+            self.service = build('calendar', 'v3', credentials=creds)
 
     def add_event(self, data: AddEventInput) -> dict:
         event = {
@@ -53,11 +59,11 @@ class GoogleCalendar:
             'location': data.location,
             'start': {
                 'dateTime': data.start_time.isoformat(),
-                'timeZone': 'Asia/Taipei',
+                'timeZone': TIME_ZONE,
             },
             'end': {
                 'dateTime': data.end_time.isoformat(),
-                'timeZone': 'Asia/Taipei',
+                'timeZone': TIME_ZONE,
             },
             'attendees': [email.model_dump() for email in data.all_emails],
             'reminders': {
@@ -68,28 +74,33 @@ class GoogleCalendar:
                 ],
             },
         }
+        if data.recurrence:
+            event['recurrence'] = list(data.recurrence)
 
-        event = self.service.events().insert(calendarId='primary', body=event, sendUpdates='all').execute()
+        with profiler.track_external('calendar'):
+            event = self.service.events().insert(calendarId='primary', body=event, sendUpdates='all').execute()
 
         return event
 
     def add_event_member(self, data: AddEventMemberInput) -> None:
-        event = self.service.events().get(calendarId='primary', eventId=data.event_id).execute()
+        with profiler.track_external('calendar'):
+            event = self.service.events().get(calendarId='primary', eventId=data.event_id).execute()
 
-        attendees = event.get('attendees', [])
-        attendees.append(data.member_email.model_dump())
-        event['attendees'] = attendees
+            attendees = event.get('attendees', [])
+            attendees.append(data.member_email.model_dump())
+            event['attendees'] = attendees
 
-        self.service.events().update(calendarId='primary', eventId=data.event_id, body=event).execute()
+            self.service.events().update(calendarId='primary', eventId=data.event_id, body=event).execute()
 
     def update_event(self, data: AddEventInput) -> None:
-        event = self.service.events().get(calendarId='primary', eventId=data.event_id).execute()
+        with profiler.track_external('calendar'):
+            event = self.service.events().get(calendarId='primary', eventId=data.event_id).execute()
 
-        event['location'] = data.location
-        event['start']['dateTime'] = data.start_time.isoformat()
-        event['end']['dateTime'] = data.end_time.isoformat()
+            event['location'] = data.location
+            event['start']['dateTime'] = data.start_time.isoformat()
+            event['end']['dateTime'] = data.end_time.isoformat()
 
-        self.service.events().update(calendarId='primary', eventId=data.event_id, body=event).execute()
+            self.service.events().update(calendarId='primary', eventId=data.event_id, body=event).execute()
 
 
 async def add_google_calendar_event(
@@ -120,6 +131,42 @@ async def add_google_calendar_event(
     await db.reservation.add_event_id(reservation_id=reservation_id, event_id=result['id'])
 
 
+def instance_event_id(event_id: str, start_time: datetime) -> str:
+    """
+    Id of one occurrence of a recurring event, its original start in UTC appended.
+    A naive start is in `TIME_ZONE`, as the event declares, not in the zone this server runs in.
+    """
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=ZoneInfo(TIME_ZONE))
+    return f'{event_id}_{start_time.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}'
+
+
+async def add_google_calendar_series(
+    reservation_ids: Sequence[int], start_times: Sequence[datetime], end_time: ServerTZDatetime,
+    recurrence: str, account_id: int, location: str,
+):
+    """
+    One recurring event for a whole reservation series, each reservation keeps the id of its own occurrence,
+    so later member or time updates touch that occurrence only.
+    """
+    user = await db.account.read(account_id=account_id)
+    event = AddEventInput(
+        start_time=start_times[0], end_time=end_time,
+        all_emails=[Email(email=user.email)], location=location,
+        summary='[Jöinee 預約] 運動', recurrence=[recurrence],
+    )
+
+    calendar = GoogleCalendar(account_id=account_id, config=google_config)
+    await calendar.build_connection()
+    result = calendar.add_event(data=event)
+    log.logger.info(f'recurring event added for {len(reservation_ids)} reservations')
+
+    await db.reservation.batch_add_event_id(
+        reservation_ids=reservation_ids,
+        event_ids=[instance_event_id(result['id'], start_time) for start_time in start_times],
+    )
+
+
 async def add_google_calendar_event_member(
     reservation_id: int, member_id: int,
 ):
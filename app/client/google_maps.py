@@ -4,6 +4,7 @@ import googlemaps
 
 import app.exceptions as exc
 from app.config import GoogleConfig, google_config
+from app.utils import profiler
 
 
 class GoogleMaps:
@@ -18,7 +19,8 @@ class GoogleMaps:
         if self.service is None:
             self.build_connection()
 
-        geocode_result = self.service.geocode(address=address)
+        with profiler.track_external('maps'):
+            geocode_result = self.service.geocode(address=address)
 
         try:
             if geocode_result[0]['geometry']['location_type'] == 'ROOFTOP':
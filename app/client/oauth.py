@@ -1,7 +1,7 @@
 from authlib.integrations.starlette_client import OAuth
 
 from app.base import mcs
-from app.config import GoogleConfig
+from app.config import GoogleConfig, google_config
 
 
 class OAuthHandler(metaclass=mcs.Singleton):
@@ -22,15 +22,24 @@ class OAuthHandler(metaclass=mcs.Singleton):
         )
         self.login_redirect_url = google_config.LOGIN_REDIRECT_URI
 
+    @property
+    def google(self):
+        """
+        Initialized on first use, only the google login flow needs it.
+        """
+        if self.oauth is None:
+            self.initialize(google_config=google_config)
+        return self.oauth.google
+
     async def login(self, request, access_type: str = 'offline', prompt: str = 'consent', state: dict = None):
-        return await self.oauth.google.authorize_redirect(
+        return await self.google.authorize_redirect(
             request, self.login_redirect_url,
             access_type=access_type, prompt=prompt,
             state=state,
         )
 
     async def authorize_access_token(self, request):
-        return await self.oauth.google.authorize_access_token(request)
+        return await self.google.authorize_access_token(request)
 
 
 oauth_handler = OAuthHandler()
@@ -16,7 +16,17 @@ class PGConfig:
     username = env_values.get('PG_USERNAME')
     password = env_values.get('PG_PASSWORD')
     db_name = env_values.get('PG_DBNAME')
-    max_pool_size = int(env_values.get('PG_MAX_POOL_SIZE') or 1)
+    min_pool_size = int(env_values.get('PG_MIN_POOL_SIZE') or 1)  # opened at startup
+    max_pool_size = int(env_values.get('PG_MAX_POOL_SIZE') or 10)
+    acquire_timeout = float(env_values.get('PG_ACQUIRE_TIMEOUT') or 5)
+    max_waiting = int(env_values.get('PG_MAX_WAITING') or 100)  # more waiting callers are turned away
+    max_inactive_connection_lifetime = float(env_values.get('PG_MAX_INACTIVE_CONNECTION_LIFETIME') or 300)
+    statement_timeout_ms = int(env_values.get('PG_STATEMENT_TIMEOUT_MS') or 30000)
+    browse_statement_timeout_ms = int(env_values.get('PG_BROWSE_STATEMENT_TIMEOUT_MS') or 5000)
+    # space separated `host[:port]`, read-only queries are spread over them
+    replica_hosts = [host for host in env_values.get('PG_REPLICA_HOSTS', '').split(' ') if host]
+    replica_max_lag_seconds = float(env_values.get('PG_REPLICA_MAX_LAG_SECONDS') or 5)
+    replica_check_interval = float(env_values.get('PG_REPLICA_CHECK_INTERVAL') or 5)
 
 
 class AppConfig:
@@ -25,6 +35,25 @@ class AppConfig:
     redoc_url = env_values.get('APP_REDOC_URL', None)
     logger_name = env_values.get('APP_LOGGER_NAME', None)
     allow_origins = env_values.get('APP_ALLOW_ORIGINS', '').split(' ')
+    log_sql_max_length = int(env_values.get('APP_LOG_SQL_MAX_LENGTH') or 300)
+    n_plus_one_threshold = int(env_values.get('APP_N_PLUS_ONE_THRESHOLD') or 5)
+    admin_token = env_values.get('APP_ADMIN_TOKEN')  # admin endpoints are closed when not set
+
+
+class SlowQueryConfig:
+    threshold_ms = int(env_values.get('SLOW_QUERY_THRESHOLD_MS') or 200)
+    explain_rate = float(env_values.get('SLOW_QUERY_EXPLAIN_RATE') or 0.1)
+    explain_timeout_ms = int(env_values.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS') or 5000)
+    capacity = int(env_values.get('SLOW_QUERY_CAPACITY') or 50)
+    max_explains = int(env_values.get('SLOW_QUERY_MAX_EXPLAINS') or 2)  # running at once in a worker
+
+
+class JobConfig:
+    enabled = bool(strtobool(env_values.get('JOB_ENABLED', 'true')))  # workers of this pod take jobs
+    poll_interval = float(env_values.get('JOB_POLL_INTERVAL') or 1)  # seconds between claims when idle
+    stale_after = float(env_values.get('JOB_STALE_AFTER') or 600)  # a running job older than this is retried
+    retry_backoff = float(env_values.get('JOB_RETRY_BACKOFF') or 30)  # seconds, doubled per attempt
+    shutdown_grace = float(env_values.get('JOB_SHUTDOWN_GRACE') or 10)  # seconds running jobs get to finish
 
 
 class JWTConfig:
@@ -38,12 +67,21 @@ class RedisConfig:
     max_pool_size = int(env_values.get('REDIS_MAX_POOL_SIZE') or 1)
 
 
+class CacheConfig:
+    backend = env_values.get('CACHE_BACKEND', 'memory')
+    ttl = int(env_values.get('CACHE_TTL') or 60)
+    max_size = int(env_values.get('CACHE_MAX_SIZE') or 1024)
+
+
 class SMTPConfig:
     host = env_values.get('SMTP_HOST')
     port = env_values.get('SMTP_PORT')
     username = env_values.get('SMTP_USERNAME')
     password = env_values.get('SMTP_PASSWORD')
     use_tls = strtobool(env_values.get('SMTP_USE_TLS', 'false'))
+    pool_size = int(env_values.get('SMTP_POOL_SIZE') or 4)  # messages sent at once
+    check_after = float(env_values.get('SMTP_CHECK_AFTER') or 30)  # seconds idle before a reuse is checked by a NOOP
+    timeout = float(env_values.get('SMTP_TIMEOUT') or 60)
 
 
 class ServiceConfig:
@@ -70,8 +108,11 @@ class GoogleConfig:
 
 pg_config = PGConfig()
 app_config = AppConfig()
+slow_query_config = SlowQueryConfig()
+job_config = JobConfig()
 jwt_config = JWTConfig()
 redis_config = RedisConfig()
+cache_config = CacheConfig()
 smtp_config = SMTPConfig()
 service_config = ServiceConfig()
 google_config = GoogleConfig()
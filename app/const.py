@@ -1,11 +1,11 @@
 INVITE_CODE_LENGTH = 6
 AVAILABLE_CODE_CHAR = 'abcdefghijklmnopqrstuvwxyz'
 
+MAX_RECURRENCE_COUNT = 52
+
 ALLOWED_MEDIA_TYPE = ['image/jpeg', 'image/png']
 BUCKET_NAME = 'cloud-native-storage-db'
 
 COOKIE_ACCOUNT_KEY = 'account_id'
 COOKIE_TOKEN_KEY = 'token'
 COOKIE_ROLE_KEY = 'role'
-
-EXCEPTION_CLASS_DEFINITION_PATH = 'app/exceptions/ack_exception.py'
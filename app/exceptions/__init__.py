@@ -17,7 +17,10 @@ from .ack_exception import (
     LoginFailed,
     NoPermission,
     NotFound,
+    QueryTimeout,
     ReservationFull,
+    ServiceBusy,
+    ServiceUnavailable,
     UniqueViolationError,
     VenueUnreservable,
     WrongPassword,
@@ -87,3 +87,24 @@ class CourtUnreservable(AckException):
     Court can't be reserved yet.
     """
     status_code = 409
+
+
+class ServiceUnavailable(AckException):
+    """
+    Service is not ready yet
+    """
+    status_code = 503
+
+
+class ServiceBusy(AckException):
+    """
+    Too many requests are waiting for the database, retry later.
+    """
+    status_code = 503
+
+
+class QueryTimeout(AckException):
+    """
+    The query took longer than the route allows.
+    """
+    status_code = 504
@@ -1,14 +1,175 @@
+import atexit
+import copy
+import functools
 import logging
-
-import google.cloud.logging
-from google.cloud.logging.handlers import CloudLoggingHandler
+import logging.handlers
+import queue
+import random
+from typing import Any, Mapping, Sequence
 
 from app.config import app_config
+from app.utils import metrics
+
+
+class LoggingHandlerInherited(logging.Handler):
+    """
+    Creating the cloud logging client resolves credentials and detects the running resource remotely,
+    so it is deferred from `dictConfig` to the first emitted record.
+    Level, formatter and filters are configured on this handler as usual.
+    """
+
+    def __init__(self, batch_size: int | None = None, max_latency: float | None = None, **kwargs):
+        """
+        `batch_size` and `max_latency` tune how the background transport batches entries before shipping them.
+        """
+        super().__init__()
+        self._handler_kwargs = kwargs
+        self._transport_kwargs = {
+            key: value for key, value in (('batch_size', batch_size), ('max_latency', max_latency))
+            if value is not None
+        }
+        self._handler: logging.Handler | None = None
+        self._is_creating_handler = False
+
+    def _get_handler(self) -> logging.Handler | None:
+        """
+        `handle` holds `self.lock` around `emit`, so only records logged while creating the client re-enter here.
+        """
+        if self._handler is None and not self._is_creating_handler:
+            self._is_creating_handler = True
+            try:
+                import google.cloud.logging
+                from google.cloud.logging_v2.handlers import transports
+                if self._transport_kwargs:
+                    self._handler_kwargs['transport'] = functools.partial(
+                        transports.BackgroundThreadTransport, **self._transport_kwargs,
+                    )
+                handler = google.cloud.logging.handlers.CloudLoggingHandler(
+                    client=google.cloud.logging.Client(), **self._handler_kwargs,
+                )
+                handler.setFormatter(self.formatter)
+                self._handler = handler
+            finally:
+                self._is_creating_handler = False
+        return self._handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            handler = self._get_handler()
+        except Exception:
+            self.handleError(record)
+            return
+        if handler is not None:  # records from creating the client itself are dropped
+            handler.emit(record)
+
+    def flush(self) -> None:
+        if self._handler is not None:
+            self._handler.flush()
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    Only enqueues records on the calling thread, a background listener formats them and runs the slow handlers.
+    usage in logging-*.yaml, configure after the handlers it refers to (dictConfig goes by name order):
+        queue:
+          (): app.log.QueueListenerHandler
+          handlers: [cfg://handlers.console, cfg://handlers.cloud]
+    """
+
+    def __init__(self, handlers: Sequence[logging.Handler], respect_handler_level: bool = True):
+        super().__init__(queue.SimpleQueue())
+        handlers = [handlers[i] for i in range(len(handlers))]  # resolves the cfg:// references
+        if not all(isinstance(handler, logging.Handler) for handler in handlers):
+            raise ValueError('QueueListenerHandler must be configured after the handlers it refers to')
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *handlers, respect_handler_level=respect_handler_level,
+        )
+        self.listener.start()
+        atexit.register(self.stop)
+        metrics.register_queue('log', self.queue.qsize)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the arguments into the message so later mutations do not leak into the record,
+        but leaves formatting, including tracebacks, to the listener thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def stop(self) -> None:
+        """
+        Flushes what is queued, safe to call more than once.
+        """
+        if self.listener._thread is not None:  # noqa
+            self.listener.stop()
+
+    def close(self) -> None:
+        self.stop()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING, per logger and its children.
+    usage in logging-*.yaml:
+        sampling:
+          (): app.log.SamplingFilter
+          rates:
+            sql: 0.1
+    """
+
+    def __init__(self, rates: Mapping[str, float] | None = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._rate_cache: dict[str, float] = {}
+
+    def get_rate(self, name: str) -> float:
+        try:
+            return self._rate_cache[name]
+        except KeyError:
+            pass
+
+        rate, parent = 1.0, name
+        while parent:
+            if parent in self.rates:
+                rate = self.rates[parent]
+                break
+            parent, _, _ = parent.rpartition('.')
+        self._rate_cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.get_rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class Truncated:
+    """
+    Log argument shortened only when the record is actually emitted, e.g.
+        log.sql_logger.info('%s', Truncated(sql))
+    Strings get their whitespace collapsed, other values are repr-ed.
+    """
+    __slots__ = ('value', 'max_length')
 
+    def __init__(self, value: Any, max_length: int = app_config.log_sql_max_length):
+        self.value = value
+        self.max_length = max_length
 
-class LoggingHandlerInherited(CloudLoggingHandler):
-    def __init__(self, **kwargs):
-        super().__init__(client=google.cloud.logging.Client(), **kwargs)
+    def __str__(self) -> str:
+        text = ' '.join(self.value.split()) if isinstance(self.value, str) else repr(self.value)
+        if len(text) <= self.max_length:
+            return text
+        return f'{text[:self.max_length]}...({len(text)} chars)'
 
 
 logger = logging.getLogger(app_config.logger_name)
+sql_logger = logging.getLogger('sql')
@@ -34,43 +34,58 @@ app.add_middleware(
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
-@app.on_event('startup')
-async def app_startup():
-    log.logger.info('app start.')
-
-    log.logger.info('initializing database')
+async def initialize_database():
     from app.config import pg_config
     from app.persistence.database import pg_pool_handler
     await pg_pool_handler.initialize(db_config=pg_config)
-    log.logger.info('initialized database')
 
-    log.logger.info('initializing smtp')
-    from app.config import smtp_config
-    from app.persistence.email import smtp_handler
-    await smtp_handler.initialize(smtp_config=smtp_config)
-    log.logger.info('initialized smtp')
 
-    log.logger.info('initializing gcs')
+async def initialize_gcs():
+    import asyncio
+
     from app.persistence.file_storage.gcs import gcs_handler
-    gcs_handler.initialize()
-    log.logger.info('initialized gcs')
+    await asyncio.to_thread(gcs_handler.initialize)  # resolves credentials with blocking io
+
+
+async def initialize_cache():
+    from app.config import cache_config, redis_config
+    from app.persistence.cache import response_cache
+    from app.persistence.redis import redis_pool_handler
+    if redis_config.url:
+        await redis_pool_handler.initialize(db_config=redis_config)
+    await response_cache.initialize(cache_config=cache_config)
+
 
-    log.logger.info('initializing oauth')
-    from app.client.oauth import oauth_handler
-    from app.config import google_config
-    oauth_handler.initialize(google_config=google_config)
-    log.logger.info('initialized oauth')
+@app.on_event('startup')
+async def app_startup():
+    """
+    Smtp, oauth and google maps initialize themselves on first use.
+    """
+    log.logger.info('app start.')
 
-    # if redis needed
-    # from app.config import redis_config
-    # from app.persistence.redis import redis_pool_handler
-    # await redis_pool_handler.initialize(db_config=redis_config)
+    from app.startup import startup_orchestrator
+    await startup_orchestrator.start(
+        required={'database': initialize_database},
+        deferred={'gcs': initialize_gcs, 'cache': initialize_cache},
+    )
+
+    from app.config import job_config
+    from app.processor.job import job_runner
+    await job_runner.start(job_config=job_config)  # claims through the database, so after it
 
 
 @app.on_event('shutdown')
 async def app_shutdown():
     log.logger.info('app shutdown')
 
+    from app.startup import startup_orchestrator
+    await startup_orchestrator.cancel()
+
+    log.logger.info('closing job runner')
+    from app.processor.job import job_runner
+    await job_runner.close()
+    log.logger.info('closed job runner')
+
     log.logger.info('closing database')
     from app.persistence.database import pg_pool_handler
     await pg_pool_handler.close()
@@ -81,9 +96,15 @@ async def app_shutdown():
     await smtp_handler.close()
     log.logger.info('closed smtp')
 
-    # if redis needed
-    # from app.persistence.redis import redis_pool_handler
-    # await redis_pool_handler.close()
+    log.logger.info('closing response cache')
+    from app.persistence.cache import response_cache
+    await response_cache.close()
+    log.logger.info('closed response cache')
+
+    log.logger.info('closing redis')
+    from app.persistence.redis import redis_pool_handler
+    await redis_pool_handler.close()
+    log.logger.info('closed redis')
 
 from app.exceptions import register_exception_handlers
 
@@ -97,6 +118,10 @@ from app.middleware import auth
 
 app.middleware('http')(auth.middleware)
 
+from app.middleware import profiler
+
+app.middleware('http')(profiler.middleware)
+
 from app.processor import http
 
 http.register_routers(app)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from typing import Callable, Coroutine
+
+from fastapi import Request, Response
+
+import app.log as log
+from app.base import enums
+from app.middleware.response import PrevalidatedRoute
+from app.persistence.cache import CachedResponse, response_cache
+
+CACHE_NAMESPACE_ATTR = '__cache_namespace__'
+CACHE_TTL_ATTR = '__cache_ttl__'
+
+
+def cached(namespace: enums.CacheNamespace, ttl: int | None = None):
+    """
+    Marks an endpoint's response as cacheable, only takes effect on routers using `CachedRoute`.
+    usage:
+        @router.get('/city')
+        @cached(namespace=enums.CacheNamespace.city)
+        async def browse_city(): ...
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, CACHE_NAMESPACE_ATTR, namespace)
+        setattr(endpoint, CACHE_TTL_ATTR, ttl)
+        return endpoint
+
+    return decorator
+
+
+async def compute_cache_key(request: Request, path_format: str) -> str:
+    """
+    Normalizes the request so that param order and json formatting do not split entries.
+    """
+    body = await request.body()
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode()
+        except ValueError:
+            pass
+
+    digest = hashlib.sha1()
+    digest.update(repr(sorted(request.path_params.items())).encode())
+    digest.update(repr(sorted(request.query_params.multi_items())).encode())
+    digest.update(body)
+    return f'{request.method}:{path_format}:{digest.hexdigest()}'
+
+
+def compute_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def is_etag_matched(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison, as specified in RFC 9110 for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque_tag = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque_tag for tag in if_none_match.split(','))
+
+
+class CachedRoute(PrevalidatedRoute):
+    CACHE_HEADERS = {'Cache-Control': 'no-cache'}
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        route_handler = super().get_route_handler()
+        namespace = getattr(self.endpoint, CACHE_NAMESPACE_ATTR, None)
+        if namespace is None:
+            return route_handler
+        ttl = getattr(self.endpoint, CACHE_TTL_ATTR, None)
+
+        async def cached_route_handler(request: Request) -> Response:
+            key = await compute_cache_key(request, path_format=self.path_format)
+
+            try:
+                cached_response = await response_cache.get(namespace, key)
+            except Exception as e:  # the cache is an optimization, a backend outage must not fail the endpoint
+                log.logger.warning(f'response cache get failed, serving uncached: {e!r}')
+                return await route_handler(request)
+            if cached_response is not None:
+                if is_etag_matched(request.headers.get('if-none-match'), cached_response.etag):
+                    return Response(status_code=304, headers={'ETag': cached_response.etag, **self.CACHE_HEADERS})
+                return Response(
+                    content=cached_response.body,
+                    status_code=cached_response.status_code,
+                    media_type=cached_response.media_type,
+                    headers={'ETag': cached_response.etag, **self.CACHE_HEADERS},
+                )
+
+            response = await route_handler(request)
+            body = getattr(response, 'body', None)  # streaming responses are never cached
+            if response.status_code != 200 or body is None or 'set-cookie' in response.headers:
+                return response
+
+            etag = compute_etag(body)
+            try:
+                await response_cache.set(
+                    namespace, key,
+                    CachedResponse(
+                        body=body, status_code=response.status_code, media_type=response.media_type, etag=etag,
+                    ),
+                    ttl=ttl,
+                )
+            except Exception as e:
+                log.logger.warning(f'response cache set failed: {e!r}')
+
+            if is_etag_matched(request.headers.get('if-none-match'), etag):
+                return Response(status_code=304, headers={'ETag': etag, **self.CACHE_HEADERS})
+            response.headers.update({'ETag': etag, **self.CACHE_HEADERS})
+            return response
+
+        return cached_route_handler
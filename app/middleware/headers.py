@@ -1,8 +1,11 @@
+import hmac
 from typing import Annotated
 
 from fastapi import Cookie, Header
 
+import app.exceptions as exc
 import app.log as log
+from app.config import app_config
 from app.utils import security
 from app.utils.context import context
 
@@ -16,3 +19,15 @@ async def get_auth_token(
         account = security.decode_jwt(token or auth_token, context.request_time)
     log.logger.info(f'account: {account}')
     context.set_account(account)
+
+
+async def verify_admin_token(
+    admin_token: Annotated[str | None, Header(convert_underscores=True)] = None,
+):
+    """
+    Admin endpoints are for operators, not accounts, so they check a shared token instead of the login.
+    """
+    if not app_config.admin_token or not admin_token:
+        raise exc.NoPermission
+    if not hmac.compare_digest(admin_token.encode(), app_config.admin_token.encode()):
+        raise exc.NoPermission
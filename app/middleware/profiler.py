@@ -0,0 +1,42 @@
+from fastapi import Request
+
+import app.log as log
+from app.utils import metrics
+from app.utils.context import context
+from app.utils.profiler import RequestProfile
+
+
+def _route_template(request: Request) -> str:
+    """
+    Labels by the path the route was declared with, raw paths would make one series per id.
+    """
+    route = request.scope.get('route')
+    return getattr(route, 'path', 'unmatched')
+
+
+async def middleware(request: Request, call_next):
+    profile = RequestProfile()
+    context.set_request_profile(profile)
+    metrics.http_requests_in_progress.inc()
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.http_requests_in_progress.dec()
+    profile.finish()
+    metrics.http_request_duration.observe(
+        profile.total_time, request.method, _route_template(request), str(response.status_code),
+    )
+
+    response.headers['Server-Timing'] = profile.server_timing()
+    fields = profile.log_fields()
+    message = f'{request.method} {request.url.path} done in {fields["total_ms"]} ms, {fields["query_count"]} queries'
+    if profile.repeated_queries:
+        log.logger.warning(
+            msg=f'{message}, possible n+1 queries',
+            extra={'profile': fields, 'repeated_queries': [
+                {'sql': str(log.Truncated(sql)), 'count': count} for sql, count in profile.repeated_queries.items()
+            ]},
+        )
+    else:
+        log.logger.info(msg=message, extra={'profile': fields})
+    return response
@@ -0,0 +1,78 @@
+"""
+Lets endpoints returning trusted models skip FastAPI's response model round trip.
+------
+
+FastAPI dumps the returned model, validates the dump against the return annotation,
+encodes it again with `jsonable_encoder` and only then renders it.
+Models built by the persistence layer already are of the annotated types,
+so endpoints marked `prevalidated` have them rendered by orjson straight away.
+The return annotation still documents the response in the OpenAPI schema.
+"""
+import functools
+import inspect
+from typing import Callable
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+
+from app.utils import ORJSONResponse
+
+PREVALIDATED_ATTR = '__prevalidated__'
+SUB_RESPONSE_PARAM = 'prevalidated_sub_response'
+
+
+def prevalidated(endpoint: Callable) -> Callable:
+    """
+    Marks the returned data as already matching the return annotation, only takes effect on `PrevalidatedRoute`.
+    Do not mark endpoints returning a subclass of the annotated model, the extra fields would no longer be filtered.
+    usage:
+        @router.get('/city')
+        @prevalidated
+        async def browse_city() -> Response[Sequence[do.City]]: ...
+    """
+    setattr(endpoint, PREVALIDATED_ATTR, True)
+    return endpoint
+
+
+def _find_sub_response_param(signature: inspect.Signature) -> str | None:
+    for name, param in signature.parameters.items():
+        if inspect.isclass(param.annotation) and issubclass(param.annotation, Response):
+            return name
+    return None
+
+
+class PrevalidatedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if getattr(endpoint, PREVALIDATED_ATTR, False):
+            endpoint = self._render_directly(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def _render_directly(self, endpoint: Callable) -> Callable:
+        """
+        Returning a `Response` makes FastAPI skip serialization, but also drops what was set on the sub-response,
+        so the wrapper asks for the sub-response itself and merges it back like FastAPI does.
+        """
+        signature = inspect.signature(endpoint)
+        sub_response_param = _find_sub_response_param(signature)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            if sub_response_param:
+                sub_response = kwargs[sub_response_param]
+            else:
+                sub_response = kwargs.pop(SUB_RESPONSE_PARAM)
+
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            response = ORJSONResponse(content=result, status_code=sub_response.status_code or self.status_code or 200)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        if not sub_response_param:
+            wrapper.__signature__ = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            ])
+        return wrapper
@@ -0,0 +1,15 @@
+from typing import Awaitable, Callable
+
+from app.utils.context import context
+
+
+def statement_timeout(timeout_ms: int) -> Callable[[], Awaitable[None]]:
+    """
+    Caps every statement of the route tighter than `PG_STATEMENT_TIMEOUT_MS`, past it the route answers `QueryTimeout`.
+    usage:
+        @router.post('/stadium/browse', dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))])
+    """
+    async def set_statement_timeout():
+        context.set_statement_timeout(timeout_ms / 1000)
+
+    return set_statement_timeout
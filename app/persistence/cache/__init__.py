@@ -0,0 +1,167 @@
+"""
+Caches rendered responses of public read endpoints.
+------
+
+Entries are grouped by namespace (see `enums.CacheNamespace`),
+write paths invalidate whole namespaces instead of single keys.
+"""
+import collections
+import time
+from abc import abstractmethod
+from typing import NamedTuple, Sequence
+
+import app.log as log
+from app.base import enums, mcs
+from app.config import CacheConfig
+from app.persistence.redis import redis_pool_handler
+from app.utils import metrics
+
+cache_requests = metrics.registry.counter(
+    'response_cache_requests', 'Response cache lookups, the hit ratio is hit over all.',
+    labelnames=('namespace', 'result'),
+)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    status_code: int
+    media_type: str | None
+    etag: str
+
+
+class CacheBackendBase:
+    @abstractmethod
+    async def get(self, namespace: enums.CacheNamespace, key: str) -> CachedResponse | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, namespace: enums.CacheNamespace, key: str, value: CachedResponse, ttl: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate(self, namespaces: Sequence[enums.CacheNamespace]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackendBase):
+    """
+    Size-bounded LRU living in the worker process, entries expire lazily on read.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: collections.OrderedDict[tuple[str, str], tuple[float, CachedResponse]] \
+            = collections.OrderedDict()
+
+    async def get(self, namespace: enums.CacheNamespace, key: str) -> CachedResponse | None:
+        entry_key = (namespace, key)
+        try:
+            expire_at, value = self._entries[entry_key]
+        except KeyError:
+            return None
+
+        if expire_at <= time.monotonic():
+            del self._entries[entry_key]
+            return None
+
+        self._entries.move_to_end(entry_key)
+        return value
+
+    async def set(self, namespace: enums.CacheNamespace, key: str, value: CachedResponse, ttl: int) -> None:
+        entry_key = (namespace, key)
+        self._entries[entry_key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, namespaces: Sequence[enums.CacheNamespace]) -> None:
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] in namespaces]:
+            del self._entries[entry_key]
+
+
+class RedisCacheBackend(CacheBackendBase):
+    """
+    Shared across workers and pods through `redis_pool_handler`, which needs to be initialized beforehand.
+    """
+    KEY_PREFIX = 'response-cache'
+
+    def _key(self, namespace: enums.CacheNamespace, key: str) -> str:
+        return f'{self.KEY_PREFIX}:{namespace.value}:{key}'
+
+    def _tag(self, namespace: enums.CacheNamespace) -> str:
+        return f'{self.KEY_PREFIX}:{namespace.value}'
+
+    async def get(self, namespace: enums.CacheNamespace, key: str) -> CachedResponse | None:
+        value = await redis_pool_handler.get(self._key(namespace, key))
+        return CachedResponse(*value) if value is not None else None
+
+    async def set(self, namespace: enums.CacheNamespace, key: str, value: CachedResponse, ttl: int) -> None:
+        await redis_pool_handler.set(self._key(namespace, key), list(value), ttl=ttl, tags=[self._tag(namespace)])
+
+    async def invalidate(self, namespaces: Sequence[enums.CacheNamespace]) -> None:
+        await redis_pool_handler.invalidate_tags(*(self._tag(namespace) for namespace in namespaces))
+
+
+class ResponseCacheHandler(metaclass=mcs.Singleton):
+    def __init__(self):
+        self._backend: CacheBackendBase = None  # Need to be init/closed manually # noqa
+        self.default_ttl: int = None  # noqa
+        self.hit_count = 0
+        self.miss_count = 0
+
+    async def initialize(self, cache_config: CacheConfig):
+        if self._backend is None:
+            if cache_config.backend == 'redis':
+                if redis_pool_handler.pool is None:  # redis would connect to localhost instead
+                    raise ValueError('CACHE_BACKEND=redis needs REDIS_URL, redis is not initialized')
+                self._backend = RedisCacheBackend()
+            else:
+                self._backend = InMemoryCacheBackend(max_size=cache_config.max_size)
+            self.default_ttl = cache_config.ttl
+
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+    @property
+    def backend(self) -> CacheBackendBase | None:
+        return self._backend
+
+    async def get(self, namespace: enums.CacheNamespace, key: str) -> CachedResponse | None:
+        """
+        Always misses if the handler is not initialized, so callers need not care whether caching is enabled.
+        """
+        if self._backend is None:
+            return None
+
+        value = await self._backend.get(namespace, key)
+        if value is None:
+            self.miss_count += 1
+            cache_requests.inc(namespace.value, 'miss')
+        else:
+            self.hit_count += 1
+            cache_requests.inc(namespace.value, 'hit')
+        return value
+
+    async def set(self, namespace: enums.CacheNamespace, key: str, value: CachedResponse, ttl: int | None = None):
+        if self._backend is None:
+            return
+        await self._backend.set(namespace, key, value, ttl or self.default_ttl)
+
+    async def invalidate(self, *namespaces: enums.CacheNamespace):
+        """
+        Called after the write committed, so a backend error is only logged, the entries then expire by their ttl.
+        """
+        if self._backend is None:
+            return
+        try:
+            await self._backend.invalidate(namespaces)
+        except Exception as e:
+            log.logger.warning(f'response cache invalidate of {[namespace.value for namespace in namespaces]} failed: {e!r}')
+
+
+response_cache = ResponseCacheHandler()
@@ -4,19 +4,58 @@ Controls the connection / driver of database.
 
 分類的邏輯：拿出來的東西是什麼，就放在哪個檔案
 """
+import asyncio
+import dataclasses
+import itertools
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncContextManager
 
 import asyncpg
 
+import app.exceptions as exc
+import app.log as log
 from app.base import mcs
 from app.config import PGConfig
 from app.persistence import PoolHandlerBase
+from app.utils import metrics, profiler
+from app.utils.context import context
+
+# seconds the replica is behind, 0 when it replayed all it received, or is a primary itself
+REPLICA_LAG_SQL = (
+    r'SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0'
+    r'            ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)'
+    r'        END'
+)
+
+
+@dataclasses.dataclass
+class Replica:
+    name: str
+    pool: asyncpg.Pool
+    is_healthy: bool = False
 
 
 class PGPoolHandler(PoolHandlerBase, metaclass=mcs.Singleton):
+    """
+    A pool of the primary, and one of each replica in `PG_REPLICA_HOSTS`.
+    `cursor(read_only=True)` goes to a healthy replica in turn unless the request already wrote,
+    replicas are checked every `PG_REPLICA_CHECK_INTERVAL` seconds and skipped while down or lagging.
+
+    A caller waits at most `PG_ACQUIRE_TIMEOUT` seconds for a connection, and is turned away at once
+    with `ServiceBusy` when `PG_MAX_WAITING` callers already wait, so a slow query cannot stall the worker.
+    """
+    def __init__(self):
+        super().__init__()
+        self.waiting_count = 0  # callers blocked on acquiring a connection
+        self._db_config: PGConfig | None = None
+        self.replicas: list[Replica] = []
+        self._replica_turn = itertools.count()
+        self._check_task: asyncio.Task | None = None
+
     async def initialize(self, db_config: PGConfig):
         if self._pool is None:
+            self._db_config = db_config
             self._pool = await asyncpg.create_pool(
                 host=db_config.host,
                 port=db_config.port,
@@ -24,11 +63,66 @@ class PGPoolHandler(PoolHandlerBase, metaclass=mcs.Singleton):
                 password=db_config.password,
                 database=db_config.db_name,
                 max_size=db_config.max_pool_size,
-                min_size=1,
+                min_size=db_config.min_pool_size,  # connected before the first request
+                max_inactive_connection_lifetime=db_config.max_inactive_connection_lifetime,
+                server_settings={'statement_timeout': str(db_config.statement_timeout_ms)},
             )
+            await self._initialize_replicas(db_config)
+
+    async def _initialize_replicas(self, db_config: PGConfig):
+        for host in db_config.replica_hosts:
+            hostname, _, port = host.partition(':')
+            pool = await asyncpg.create_pool(
+                host=hostname,
+                port=port or db_config.port,
+                user=db_config.username,
+                password=db_config.password,
+                database=db_config.db_name,
+                max_size=db_config.max_pool_size,
+                min_size=0,  # connects on demand, a replica being down does not stop the start
+                max_inactive_connection_lifetime=db_config.max_inactive_connection_lifetime,
+                server_settings={'statement_timeout': str(db_config.statement_timeout_ms)},
+            )
+            self.replicas.append(Replica(name=host, pool=pool))
+        if self.replicas:
+            await self.check_replicas()
+            self._check_task = asyncio.create_task(self._keep_checking_replicas())
+
+    async def close(self):
+        if self._check_task is not None:
+            self._check_task.cancel()
+            self._check_task = None
+        for replica in self.replicas:
+            await replica.pool.close()
+        self.replicas = []
+        await super().close()
+
+    async def check_replicas(self):
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica):
+        try:
+            lag = await replica.pool.fetchval(REPLICA_LAG_SQL, timeout=self._db_config.replica_check_interval)
+            is_healthy = lag <= self._db_config.replica_max_lag_seconds
+        except (asyncpg.PostgresError, OSError, asyncio.TimeoutError) as e:
+            lag, is_healthy = e, False
+        if is_healthy != replica.is_healthy:
+            log.logger.warning(f'replica {replica.name} is {"healthy" if is_healthy else "unhealthy"}, lag: {lag}')
+        replica.is_healthy = is_healthy
+
+    async def _keep_checking_replicas(self):
+        while True:
+            await asyncio.sleep(self._db_config.replica_check_interval)
+            await self.check_replicas()
+
+    def _pick_replica(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.is_healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._replica_turn) % len(healthy)]
 
     @asynccontextmanager
-    async def cursor(self) -> AsyncContextManager[asyncpg.connection.Connection]:
+    async def cursor(self, read_only: bool = False) -> AsyncContextManager[asyncpg.connection.Connection]:
         """
         NOTE: params: dict
         usage:
@@ -36,15 +130,94 @@ class PGPoolHandler(PoolHandlerBase, metaclass=mcs.Singleton):
                 result = await cursor.fetch(sql, *params)
                 result = await cursor.fetchrow(sql, *params)
                 result = await cursor.execute(sql, *params)
+
+        `read_only` allows a replica, which may be up to `PG_REPLICA_MAX_LAG_SECONDS` behind.
         """
-        async with self._pool.acquire() as conn:
-            conn: asyncpg.connection.Connection
-            async with conn.transaction():
+        if self.waiting_count >= self._db_config.max_waiting:
+            db_pool_shed.inc()
+            raise exc.ServiceBusy
+
+        replica = self._pick_replica() if read_only and not context.is_primary_sticky() else None
+        if not read_only:
+            context.set_primary_sticky()
+
+        start = time.perf_counter()
+        self.waiting_count += 1
+        try:
+            conn, pool, replica = await self._acquire(replica)
+        except asyncio.TimeoutError:
+            db_pool_shed.inc()
+            raise exc.ServiceBusy
+        finally:
+            self.waiting_count -= 1
+        try:
+            wait_time = time.perf_counter() - start
+            profiler.add_pool_wait(wait_time)
+            metrics.db_pool_acquire_duration.observe(wait_time)
+            db_cursors.inc('replica' if replica else 'primary')
+            async with conn.transaction(readonly=replica is not None):
                 yield conn
+        finally:
+            await pool.release(conn)
+
+    async def _acquire(self, replica: Replica | None) \
+            -> tuple[asyncpg.connection.Connection, asyncpg.Pool, Replica | None]:
+        timeout = self._db_config.acquire_timeout
+        if replica is not None:
+            try:
+                return await replica.pool.acquire(timeout=timeout), replica.pool, replica
+            except (asyncpg.PostgresConnectionError, OSError) as e:
+                log.logger.warning(f'replica {replica.name} is unhealthy, {e!r}')
+                replica.is_healthy = False  # until the next check, the read falls back to the primary
+        return await self._pool.acquire(timeout=timeout), self._pool, None
+
+    @asynccontextmanager
+    async def side_connection(self) -> AsyncContextManager[asyncpg.connection.Connection]:
+        """
+        A connection outside the pool for diagnostics, so it never takes a connection from requests.
+        """
+        conn = await asyncpg.connect(
+            host=self._db_config.host,
+            port=self._db_config.port,
+            user=self._db_config.username,
+            password=self._db_config.password,
+            database=self._db_config.db_name,
+        )
+        try:
+            yield conn
+        finally:
+            await conn.close()
 
 
 pg_pool_handler = PGPoolHandler()
 
+metrics.registry.gauge(
+    'db_pool_size', 'Open database connections, idle or in use.',
+    function=lambda: pg_pool_handler.pool.get_size() if pg_pool_handler.pool else 0,
+)
+metrics.registry.gauge(
+    'db_pool_idle', 'Open database connections not in use.',
+    function=lambda: pg_pool_handler.pool.get_idle_size() if pg_pool_handler.pool else 0,
+)
+metrics.registry.gauge(
+    'db_pool_max_size', 'PG_MAX_POOL_SIZE of this worker.',
+    function=lambda: pg_pool_handler.pool.get_max_size() if pg_pool_handler.pool else 0,
+)
+metrics.registry.gauge(
+    'db_pool_waiting', 'Callers waiting for a database connection.',
+    function=lambda: pg_pool_handler.waiting_count,
+)
+metrics.registry.gauge(
+    'db_replica_healthy', 'Whether reads are sent to the replica.', ['replica'],
+    function=lambda: {(replica.name,): float(replica.is_healthy) for replica in pg_pool_handler.replicas},
+)
+db_pool_shed = metrics.registry.counter(
+    'db_pool_shed', 'Requests turned away with ServiceBusy, the pool being saturated.',
+)
+db_cursors = metrics.registry.counter(
+    'db_cursors', 'Database cursors opened, by the server they went to.', ['target'],
+)
+
 # For import usage
 from . import (
     account,
@@ -52,9 +225,11 @@ from . import (
     business_hour,
     city,
     court,
+    court_daily_stat,
     district,
     email_verification,
     gcs_file,
+    job,
     reservation,
     reservation_member,
     sport,
@@ -20,18 +20,31 @@ async def add(
     access_token: str | None = None,
     refresh_token: str | None = None,
     is_verified: bool = False,
+    cursor: asyncpg.Connection | None = None,
 ) -> int:
-    id_, = await PostgresQueryExecutor(
-        sql=r'INSERT INTO account'
-            r'            (email, pass_hash, nickname, gender, role, is_google_login, '
-            r'             access_token, refresh_token, is_verified)'
-            r'     VALUES (%(email)s, %(pass_hash)s, %(nickname)s, %(gender)s, %(role)s, %(is_google_login)s,'
-            r'             %(access_token)s, %(refresh_token)s, %(is_verified)s)'
-            r'  RETURNING id',
+    """
+    Pass the `cursor` of an open `pg_pool_handler.cursor()` to add the account in its transaction.
+    """
+    sql = (r'INSERT INTO account'
+           r'            (email, pass_hash, nickname, gender, role, is_google_login, '
+           r'             access_token, refresh_token, is_verified)'
+           r'     VALUES (%(email)s, %(pass_hash)s, %(nickname)s, %(gender)s, %(role)s, %(is_google_login)s,'
+           r'             %(access_token)s, %(refresh_token)s, %(is_verified)s)'
+           r'  RETURNING id')
+    params = dict(
         email=email, pass_hash=pass_hash, nickname=nickname, gender=gender, role=role,
         is_google_login=is_google_login, access_token=access_token, refresh_token=refresh_token,
         is_verified=is_verified,
-    ).fetch_one()
+    )
+
+    if cursor is not None:
+        sql, args = PostgresQueryExecutor.format(sql=sql, **params)
+        try:
+            return await cursor.fetchval(sql, *args)
+        except asyncpg.UniqueViolationError:
+            raise exc.UniqueViolationError
+
+    id_, = await PostgresQueryExecutor(sql=sql, **params).fetch_one()
     return id_
 
 
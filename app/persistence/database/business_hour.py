@@ -3,7 +3,9 @@ from typing import Sequence
 from app.base import do, enums, vo
 from app.persistence.database.util import (
     PostgresQueryExecutor,
+    business_hour_mask,
     generate_query_parameters,
+    generate_week_time_range_query,
 )
 
 
@@ -18,27 +20,15 @@ async def browse(
     }
     query, params = generate_query_parameters(criteria_dict=criteria_dict)
 
-    raw_or_query = []
     if time_ranges:
-        for i, time_range in enumerate(time_ranges):
-            time_range: vo.WeekTimeRange
-            raw_or_query.append(f"""({' AND '.join([
-                f'business_hour.weekday = %(weekday_{i})s',
-                f'business_hour.start_time < %(end_time_{i})s',
-                f'business_hour.end_time > %(start_time_{i})s'
-            ])})""")
-            params.update({
-                f'weekday_{i}': time_range.weekday,
-                f'end_time_{i}': time_range.end_time,
-                f'start_time_{i}': time_range.start_time,
-            })
-    or_query = ' OR '.join(raw_or_query)
+        time_range_query, time_range_params = generate_week_time_range_query(
+            time_ranges, weekday_column='business_hour.weekday',
+            start_column='business_hour.start_time', end_column='business_hour.end_time',
+        )
+        query.append(time_range_query)
+        params.update(time_range_params)
 
     where_sql = 'WHERE ' + ' AND '.join(query) if query else ''
-    if or_query and where_sql:
-        where_sql = where_sql + f' AND ({or_query})'
-    elif or_query:
-        where_sql = 'WHERE ' + or_query
 
     results = await PostgresQueryExecutor(
         sql=fr'SELECT id, place_id, type, weekday, start_time, end_time'
@@ -67,9 +57,16 @@ async def batch_add(place_type: enums.PlaceType, place_id: int, business_hours=S
     params.update({f'start_time_{i}': business_hour.start_time for i, business_hour in enumerate(business_hours)})
     params.update({f'end_time_{i}': business_hour.end_time for i, business_hour in enumerate(business_hours)})
 
+    place_table = 'stadium' if place_type is enums.PlaceType.stadium else 'venue'
+
     await PostgresQueryExecutor(
-        sql=fr'INSERT INTO business_hour'
-            fr'            (place_id, type, weekday, start_time, end_time)'
-            fr'     VALUES {value_sql}',
-        place_id=place_id, place_type=place_type, **params,
+        sql=fr'WITH inserted AS ('
+            fr'     INSERT INTO business_hour'
+            fr'                 (place_id, type, weekday, start_time, end_time)'
+            fr'          VALUES {value_sql}'
+            fr' )'
+            fr' UPDATE {place_table}'
+            fr'    SET business_hour_mask = business_hour_mask | %(business_hour_mask)s::BIT(672)'
+            fr'  WHERE id = %(place_id)s',
+        place_id=place_id, place_type=place_type, business_hour_mask=business_hour_mask(business_hours), **params,
     ).execute()
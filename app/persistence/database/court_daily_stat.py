@@ -0,0 +1,156 @@
+"""
+Per court and day reservation rollup, kept by the triggers of `migrations/0004_court_daily_stat.sql`.
+------
+
+usage:
+    ENV=ci poetry run python -m app.persistence.database.court_daily_stat [--start-date 2024-01-01] [--end-date ...] \
+        [--chunk-days 7]
+
+Rebuilds the rollup of the days given, all days by default, from reservation and reservation_member.
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Sequence
+
+import asyncpg
+
+from app.base import enums, vo
+from app.config import pg_config
+from app.persistence.database.util import (
+    PostgresQueryExecutor,
+    generate_query_parameters,
+    pg_pool_handler,
+)
+
+
+async def browse(
+        owner_id: int,
+        start_date: date,
+        end_date: date,
+        stadium_id: int | None = None,
+        venue_id: int | None = None,
+) -> Sequence[vo.ViewCourtDailyStat]:
+    """
+    Rollup rows of the owner's courts from `start_date` to `end_date` inclusive, days without reservations omitted.
+    """
+    criteria_dict = {
+        'stadium_id': (stadium_id, 'stadium.id = %(stadium_id)s'),
+        'venue_id': (venue_id, 'venue.id = %(venue_id)s'),
+    }
+    query, params = generate_query_parameters(criteria_dict=criteria_dict)
+    criteria_sql = ''.join(f' AND {q}' for q in query)
+
+    results = await PostgresQueryExecutor(
+        sql=fr'SELECT court_daily_stat.court_id, court_daily_stat.day, reservation_count, reserved_minutes,'
+            fr'       member_count, cancelled_count'
+            fr'  FROM court_daily_stat'
+            fr' INNER JOIN court ON court.id = court_daily_stat.court_id'
+            fr' INNER JOIN venue ON venue.id = court.venue_id'
+            fr' INNER JOIN stadium ON stadium.id = venue.stadium_id'
+            fr' WHERE stadium.owner_id = %(owner_id)s'
+            fr'{criteria_sql}'
+            fr'   AND court_daily_stat.day BETWEEN %(start_date)s AND %(end_date)s'
+            fr' ORDER BY court_daily_stat.day, court_daily_stat.court_id',
+        owner_id=owner_id, start_date=start_date, end_date=end_date, **params,
+    ).fetch_all()
+
+    return [
+        vo.ViewCourtDailyStat(
+            court_id=court_id,
+            day=day,
+            reservation_count=reservation_count,
+            reserved_minutes=reserved_minutes,
+            member_count=member_count,
+            cancelled_count=cancelled_count,
+        )
+        for court_id, day, reservation_count, reserved_minutes, member_count, cancelled_count in results
+    ]
+
+
+async def rebuild(start_date: date | None = None, end_date: date | None = None, chunk_days: int = 7) -> int:
+    """
+    Recomputes the days `chunk_days` at a time, each chunk in its own transaction holding off reservation writes
+    meanwhile so no trigger update is lost; a backfill blocks bookings one chunk at a time instead of all along.
+    Without bounds, the days of every reservation and rollup row are rebuilt.
+    Returns the number of rollup rows written.
+    """
+    if chunk_days < 1:
+        raise ValueError(f'chunk_days must be positive, got {chunk_days}')
+    if start_date is None or end_date is None:
+        first_day, last_day = await _day_range()
+        if first_day is None:  # nothing to rebuild
+            return 0
+        start_date, end_date = start_date or first_day, end_date or last_day
+
+    row_count = 0
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        row_count += await _rebuild_chunk(start_date=chunk_start, end_date=chunk_end)
+        chunk_start = chunk_end + timedelta(days=1)
+    return row_count
+
+
+async def _day_range() -> tuple[date | None, date | None]:
+    first_day, last_day = await PostgresQueryExecutor(
+        sql=r'SELECT MIN(day), MAX(day)'
+            r'  FROM (SELECT MIN(start_time)::DATE AS day FROM reservation'
+            r'         UNION ALL SELECT MAX(start_time)::DATE FROM reservation'
+            r'         UNION ALL SELECT MIN(day) FROM court_daily_stat'
+            r'         UNION ALL SELECT MAX(day) FROM court_daily_stat) AS bound',
+    ).fetch_one()
+    return first_day, last_day
+
+
+async def _rebuild_chunk(start_date: date, end_date: date) -> int:
+    delete_sql, delete_params = PostgresQueryExecutor.format(
+        sql=r'DELETE FROM court_daily_stat WHERE day BETWEEN %(start_date)s AND %(end_date)s',
+        start_date=start_date, end_date=end_date,
+    )
+    insert_sql, insert_params = PostgresQueryExecutor.format(
+        sql=r'INSERT INTO court_daily_stat'
+            r'            (court_id, day, reservation_count, reserved_minutes, member_count, cancelled_count)'
+            r' SELECT court_id, day,'
+            r'        COUNT(*) FILTER (WHERE NOT is_cancelled),'
+            r'        COALESCE(SUM(minutes) FILTER (WHERE NOT is_cancelled), 0),'
+            r'        COALESCE(SUM(members) FILTER (WHERE NOT is_cancelled), 0),'
+            r'        COUNT(*) FILTER (WHERE is_cancelled)'
+            r'   FROM (SELECT reservation.court_id, reservation.start_time::DATE AS day, reservation.is_cancelled,'
+            r'                (EXTRACT(EPOCH FROM reservation.end_time - reservation.start_time) / 60)::INTEGER AS minutes,'
+            r'                (SELECT COUNT(*)'
+            r'                   FROM reservation_member'
+            r'                  WHERE reservation_member.reservation_id = reservation.id'
+            r'                    AND reservation_member.status = %(joined)s) AS members'
+            r'           FROM reservation'
+            r'          WHERE reservation.start_time >= %(start_time)s'
+            r'            AND reservation.start_time < %(end_time)s) AS reservation'
+            r'  GROUP BY court_id, day',
+        joined=enums.ReservationMemberStatus.joined,
+        start_time=datetime.combine(start_date, time()), end_time=datetime.combine(end_date + timedelta(days=1), time()),
+    )
+
+    async with pg_pool_handler.cursor() as cursor:
+        cursor: asyncpg.Connection
+        await cursor.execute('SET LOCAL statement_timeout = 0')  # a chunk may outlast the pool's request timeout
+        await cursor.execute('LOCK TABLE reservation, reservation_member IN SHARE MODE')
+        await cursor.execute(delete_sql, *delete_params)
+        status = await cursor.execute(insert_sql, *insert_params)
+    return int(status.split()[-1])  # INSERT 0 <rows>
+
+
+async def main(start_date: date | None, end_date: date | None, chunk_days: int):
+    await pg_pool_handler.initialize(db_config=pg_config)
+    try:
+        print(f'{await rebuild(start_date=start_date, end_date=end_date, chunk_days=chunk_days)} rollup rows written')
+    finally:
+        await pg_pool_handler.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--start-date', type=date.fromisoformat)
+    parser.add_argument('--end-date', type=date.fromisoformat)
+    parser.add_argument('--chunk-days', type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(start_date=args.start_date, end_date=args.end_date, chunk_days=args.chunk_days))
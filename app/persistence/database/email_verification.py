@@ -1,16 +1,24 @@
 from uuid import UUID
 
+import asyncpg
+
 import app.exceptions as exc
 from app.persistence.database.util import PostgresQueryExecutor
 
 
-async def add(account_id: int, email: str) -> UUID:
-    code, = await PostgresQueryExecutor(
-        sql=r"INSERT INTO email_verification (account_id, email)"
-            r"     VALUES (%(account_id)s, %(email)s)"
-            r"  RETURNING code",
-        account_id=account_id, email=email,
-    ).fetch_one()
+async def add(account_id: int, email: str, cursor: asyncpg.Connection | None = None) -> UUID:
+    """
+    Pass the `cursor` of an open `pg_pool_handler.cursor()` to add the code in its transaction.
+    """
+    sql = (r"INSERT INTO email_verification (account_id, email)"
+           r"     VALUES (%(account_id)s, %(email)s)"
+           r"  RETURNING code")
+
+    if cursor is not None:
+        sql, args = PostgresQueryExecutor.format(sql=sql, account_id=account_id, email=email)
+        return await cursor.fetchval(sql, *args)
+
+    code, = await PostgresQueryExecutor(sql=sql, account_id=account_id, email=email).fetch_one()
     return code
 
 
@@ -34,12 +42,13 @@ async def verify_email(code: UUID):
     ).execute()
 
 
-async def read(account_id: int, email: str) -> UUID:
+async def read(account_id: int, email: str, include_consumed: bool = True) -> UUID:
     try:
         code, = await PostgresQueryExecutor(
-            sql=r'SELECT code'
-                r'  FROM email_verification'
-                r' WHERE account_id = %(account_id)s AND email = %(email)s',
+            sql=fr'SELECT code'
+                fr'  FROM email_verification'
+                fr' WHERE account_id = %(account_id)s AND email = %(email)s'
+                fr'{" AND NOT is_consumed" if not include_consumed else ""}',
             email=email, account_id=account_id,
         ).fetch_one()
     except TypeError:
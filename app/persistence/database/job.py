@@ -0,0 +1,201 @@
+"""
+Background jobs, run by the workers of `app.processor.job`.
+------
+
+A worker claims due jobs with `FOR UPDATE SKIP LOCKED`, so workers of every pod share the table without
+taking a job twice or waiting on each other. A failed job goes back to pending with an exponential delay,
+and to dead once it used `max_attempts`; a job left running by a worker that died is released after
+`JOB_STALE_AFTER` seconds the same way, so a job that kills its worker is not taken forever.
+"""
+import json
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+import asyncpg
+
+import app.exceptions as exc
+from app.base import do, enums
+from app.persistence.database.util import (
+    PostgresQueryExecutor,
+    generate_query_parameters,
+)
+
+_COLUMNS = (
+    r'id, job_type, payload, status, attempts, max_attempts, run_after, locked_at, last_error, created_at, finished_at'
+)
+
+
+def _to_job(row) -> do.Job:
+    (id_, job_type, payload, status, attempts, max_attempts, run_after, locked_at, last_error, created_at,
+     finished_at, *_) = row  # browse has the total count last
+    return do.Job(
+        id=id_,
+        job_type=job_type,
+        payload=json.loads(payload),
+        status=status,
+        attempts=attempts,
+        max_attempts=max_attempts,
+        run_after=run_after,
+        locked_at=locked_at,
+        last_error=last_error,
+        created_at=created_at,
+        finished_at=finished_at,
+    )
+
+
+async def add(
+        job_type: enums.JobType,
+        payload: Mapping[str, Any],
+        run_after: datetime | None = None,
+        max_attempts: int | None = None,
+        cursor: asyncpg.Connection | None = None,
+) -> int:
+    """
+    Pass the `cursor` of an open `pg_pool_handler.cursor()` to add the job in its transaction,
+    the job is then taken only if the transaction commits.
+    """
+    criteria_dict = {
+        'run_after': (run_after, 'run_after'),
+        'max_attempts': (max_attempts, 'max_attempts'),
+    }
+    query, params = generate_query_parameters(criteria_dict=criteria_dict)
+    columns_sql = ''.join(f', {column}' for column in query)
+    values_sql = ''.join(f', %({param})s' for param in params)
+    sql = (fr'INSERT INTO job (job_type, payload{columns_sql})'
+           fr'     VALUES (%(job_type)s, %(payload)s{values_sql})'
+           fr'  RETURNING id')
+
+    if cursor is not None:
+        sql, args = PostgresQueryExecutor.format(sql=sql, job_type=job_type, payload=json.dumps(payload), **params)
+        return await cursor.fetchval(sql, *args)
+
+    id_, = await PostgresQueryExecutor(
+        sql=sql, job_type=job_type, payload=json.dumps(payload), **params,
+    ).fetch_one()
+    return id_
+
+
+async def claim(job_type: enums.JobType, limit: int) -> Sequence[do.Job]:
+    """
+    Marks up to `limit` due jobs running and returns them, oldest first.
+    Rows another worker has locked are skipped instead of waited on.
+    """
+    results = await PostgresQueryExecutor(
+        sql=fr'UPDATE job'
+            fr'   SET status = %(running)s, attempts = attempts + 1, locked_at = NOW()'
+            fr' WHERE id IN (SELECT id'
+            fr'                FROM job'
+            fr'               WHERE job_type = %(job_type)s AND status = %(pending)s AND run_after <= NOW()'
+            fr'               ORDER BY run_after, id'
+            fr'               LIMIT %(limit)s'
+            fr'                 FOR UPDATE SKIP LOCKED)'
+            fr' RETURNING {_COLUMNS}',
+        running=enums.JobStatus.running, pending=enums.JobStatus.pending, job_type=job_type, limit=limit,
+    ).fetch_all()
+    return sorted((_to_job(result) for result in results), key=lambda job: (job.run_after, job.id))
+
+
+async def finish(job_id: int, attempts: int) -> bool:
+    """
+    `attempts` is that of the claimed job; returns False when the attempt no longer owns the job,
+    i.e. it went stale and was released, maybe claimed again.
+    """
+    result = await PostgresQueryExecutor(
+        sql=r'UPDATE job'
+            r'   SET status = %(done)s, locked_at = NULL, finished_at = NOW()'
+            r' WHERE id = %(job_id)s AND status = %(running)s AND attempts = %(attempts)s'
+            r' RETURNING id',
+        done=enums.JobStatus.done, running=enums.JobStatus.running, job_id=job_id, attempts=attempts,
+    ).fetch_one()
+    return result is not None
+
+
+async def fail(job_id: int, attempts: int, error: str, backoff_seconds: float) -> enums.JobStatus | None:
+    """
+    Retries after `backoff_seconds` doubled per attempt made, or kills the job when it has no attempt left.
+    Returns None when the attempt no longer owns the job, as `finish` does.
+    """
+    result = await PostgresQueryExecutor(
+        sql=r'UPDATE job'
+            r'   SET status = CASE WHEN attempts >= max_attempts THEN %(dead)s ELSE %(pending)s END::job_status,'
+            r'       run_after = NOW() + MAKE_INTERVAL(secs => %(backoff_seconds)s * POWER(2, attempts - 1)),'
+            r'       locked_at = NULL,'
+            r'       last_error = %(error)s,'
+            r'       finished_at = CASE WHEN attempts >= max_attempts THEN NOW() END'
+            r' WHERE id = %(job_id)s AND status = %(running)s AND attempts = %(attempts)s'
+            r' RETURNING status',
+        dead=enums.JobStatus.dead, pending=enums.JobStatus.pending, running=enums.JobStatus.running,
+        backoff_seconds=backoff_seconds, error=error, job_id=job_id, attempts=attempts,
+    ).fetch_one()
+    if not result:
+        return None
+    status, = result
+    return enums.JobStatus(status)
+
+
+async def release_stale(stale_seconds: float) -> int:
+    """
+    Puts jobs running longer than `stale_seconds` back to pending, their worker is taken to be gone.
+    The attempt they used still counts, a job out of attempts is dead, as when it fails.
+    """
+    results = await PostgresQueryExecutor(
+        sql=r'UPDATE job'
+            r'   SET status = CASE WHEN attempts >= max_attempts THEN %(dead)s ELSE %(pending)s END::job_status,'
+            r'       locked_at = NULL,'
+            r'       last_error = %(error)s,'
+            r'       finished_at = CASE WHEN attempts >= max_attempts THEN NOW() END'
+            r' WHERE status = %(running)s AND locked_at < NOW() - MAKE_INTERVAL(secs => %(stale_seconds)s)'
+            r' RETURNING id',
+        dead=enums.JobStatus.dead, pending=enums.JobStatus.pending, running=enums.JobStatus.running,
+        error='worker lost', stale_seconds=stale_seconds,
+    ).fetch_all()
+    return len(results)
+
+
+async def retry(job_id: int) -> None:
+    """
+    Gives a dead job its attempts back.
+    """
+    result = await PostgresQueryExecutor(
+        sql=r'UPDATE job'
+            r'   SET status = %(pending)s, attempts = 0, run_after = NOW(), finished_at = NULL'
+            r' WHERE id = %(job_id)s AND status = %(dead)s'
+            r' RETURNING id',
+        pending=enums.JobStatus.pending, dead=enums.JobStatus.dead, job_id=job_id,
+    ).fetch_one()
+    if not result:
+        raise exc.NotFound
+
+
+async def browse(
+        status: enums.JobStatus | None = None,
+        job_type: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+) -> tuple[Sequence[do.Job], int]:
+    criteria_dict = {
+        'status': (status, 'status = %(status)s'),
+        'job_type': (job_type, 'job_type = %(job_type)s'),
+    }
+    query, params = generate_query_parameters(criteria_dict=criteria_dict)
+    where_sql = 'WHERE ' + ' AND '.join(query) if query else ''
+
+    results = await PostgresQueryExecutor(
+        sql=fr'SELECT {_COLUMNS}, COUNT(*) OVER ()'
+            fr'  FROM job'
+            fr' {where_sql}'
+            fr' ORDER BY id DESC'
+            fr' LIMIT %(limit)s OFFSET %(offset)s',
+        limit=limit, offset=offset, **params,
+    ).fetch_all()
+    total_count = results[0][-1] if results else 0
+    return [_to_job(result) for result in results], total_count
+
+
+async def count_by_status() -> dict[tuple[str, enums.JobStatus], int]:
+    results = await PostgresQueryExecutor(
+        sql=r'SELECT job_type, status, COUNT(*)'
+            r'  FROM job'
+            r' GROUP BY job_type, status',
+    ).fetch_all()
+    return {(job_type, enums.JobStatus(status)): count for job_type, status, count in results}
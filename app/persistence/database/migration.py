@@ -0,0 +1,173 @@
+"""
+Versioned schema migrations.
+------
+
+usage:
+    ENV=ci poetry run python -m app.persistence.database.migration [upgrade|status]
+
+Files in `migrations/` are named `<version>_<name>.sql` and applied once each, in version order.
+A file starting with `-- migration: no-transaction` runs statement by statement outside a transaction,
+which `CREATE INDEX CONCURRENTLY` needs; otherwise a file is applied in one transaction with its record.
+A concurrent build that failed leaves an invalid index which `IF NOT EXISTS` would skip,
+so such an index is dropped before its statement runs again.
+Applied files are checksummed, edit nothing that already ran and add a new version instead.
+Runs are serialized by an advisory lock, so two deploys upgrading at once do not race.
+"""
+import argparse
+import asyncio
+import hashlib
+import re
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+import asyncpg
+
+import app.log as log
+from app.config import PGConfig, pg_config
+
+MIGRATION_DIR = Path(__file__).resolve().parents[3] / 'migrations'
+NO_TRANSACTION_MARK = '-- migration: no-transaction'
+ADVISORY_LOCK_KEY = 7_316_001  # any constant unique to this app
+_FILENAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+_CONCURRENT_INDEX = re.compile(
+    r'^CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)', re.IGNORECASE,
+)
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def in_transaction(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARK)
+
+    def statements(self) -> list[str]:
+        """
+        Splits on semicolons ending a line, enough for the index files run outside a transaction.
+        """
+        statements = []
+        for chunk in re.split(r';\s*$', self.sql, flags=re.MULTILINE):
+            lines = [line for line in chunk.splitlines() if line.strip() and not line.strip().startswith('--')]
+            if lines:
+                statements.append('\n'.join(lines))
+        return statements
+
+
+def load_migrations(directory: Path = MIGRATION_DIR) -> list[Migration]:
+    migrations = []
+    for path in directory.glob('*.sql'):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise MigrationError(f'unexpected migration file name {path.name}, expected <version>_<name>.sql')
+        migrations.append(Migration(version=int(match[1]), name=match[2], sql=path.read_text()))
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f'duplicated migration versions in {directory}')
+    return migrations
+
+
+async def ensure_history(conn: asyncpg.Connection) -> None:
+    await conn.execute(
+        r'CREATE TABLE IF NOT EXISTS schema_migration ('
+        r'    version    INTEGER PRIMARY KEY,'
+        r'    name       VARCHAR NOT NULL,'
+        r'    checksum   VARCHAR NOT NULL,'
+        r'    applied_at TIMESTAMP NOT NULL DEFAULT NOW()'
+        r')',
+    )
+
+
+async def read_applied(conn: asyncpg.Connection) -> dict[int, str]:
+    rows = await conn.fetch(r'SELECT version, checksum FROM schema_migration')
+    return {version: checksum for version, checksum in rows}
+
+
+def pending(migrations: Sequence[Migration], applied: dict[int, str]) -> list[Migration]:
+    for migration in migrations:
+        if migration.version in applied and applied[migration.version] != migration.checksum:
+            raise MigrationError(f'migration {migration.version}_{migration.name} changed after it was applied')
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+async def drop_invalid_index(conn: asyncpg.Connection, statement: str) -> None:
+    match = _CONCURRENT_INDEX.match(statement)
+    if not match:
+        return
+    is_invalid = await conn.fetchval(
+        r'SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)', match[1],
+    )
+    if is_invalid:
+        log.logger.warning(f'dropping invalid index {match[1]} left by a failed build')
+        await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {match[1]}')
+
+
+async def apply(conn: asyncpg.Connection, migration: Migration) -> None:
+    record_sql = r'INSERT INTO schema_migration (version, name, checksum) VALUES ($1, $2, $3)'
+    if migration.in_transaction:
+        async with conn.transaction():
+            await conn.execute(migration.sql)
+            await conn.execute(record_sql, migration.version, migration.name, migration.checksum)
+        return
+
+    for statement in migration.statements():
+        await drop_invalid_index(conn, statement)
+        await conn.execute(statement)
+    await conn.execute(record_sql, migration.version, migration.name, migration.checksum)
+
+
+async def upgrade(conn: asyncpg.Connection, migrations: Sequence[Migration]) -> list[Migration]:
+    await conn.execute(r'SELECT pg_advisory_lock($1)', ADVISORY_LOCK_KEY)
+    try:
+        await ensure_history(conn)
+        to_apply = pending(migrations, await read_applied(conn))
+        for migration in to_apply:
+            log.logger.info(f'applying migration {migration.version}_{migration.name}')
+            await apply(conn, migration)
+        return to_apply
+    finally:
+        await conn.execute(r'SELECT pg_advisory_unlock($1)', ADVISORY_LOCK_KEY)
+
+
+async def main(command: str, db_config: PGConfig = pg_config):
+    conn = await asyncpg.connect(
+        host=db_config.host,
+        port=db_config.port,
+        user=db_config.username,
+        password=db_config.password,
+        database=db_config.db_name,
+    )
+    try:
+        migrations = load_migrations()
+        if command == 'upgrade':
+            applied = await upgrade(conn, migrations)
+            print(f'applied {len(applied)} migrations')
+            return
+
+        await ensure_history(conn)
+        applied = await read_applied(conn)
+        for migration in migrations:
+            state = 'applied' if migration.version in applied else 'pending'
+            if migration.version in applied and applied[migration.version] != migration.checksum:
+                state = 'changed'
+            print(f'{migration.version:>6} {migration.name:<40} {state}')
+    finally:
+        await conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=('upgrade', 'status'), nargs='?', default='upgrade')
+    args = parser.parse_args()
+    asyncio.run(main(command=args.command))
@@ -8,6 +8,7 @@ from app.base import do, enums, vo
 from app.persistence.database.util import (
     PostgresQueryExecutor,
     generate_query_parameters,
+    generate_time_range_query,
     pg_pool_handler,
 )
 
@@ -51,26 +52,14 @@ async def browse(
 
     query, params = generate_query_parameters(criteria_dict=criteria_dict)
 
-    raw_or_query = []
     if time_ranges:
-        for i, time_range in enumerate(time_ranges):
-            time_range: vo.WeekTimeRange
-            raw_or_query.append(f"""({' AND '.join([
-                f'reservation.start_time < %(end_time_{i})s',
-                f'reservation.end_time > %(start_time_{i})s'
-            ])})""")
-            params.update({
-                f'end_time_{i}': time_range.end_time,
-                f'start_time_{i}': time_range.start_time,
-            })
-
-    or_query = ' OR '.join(raw_or_query)
+        time_range_query, time_range_params = generate_time_range_query(
+            time_ranges, start_column='reservation.start_time', end_column='reservation.end_time',
+        )
+        query.append(time_range_query)
+        params.update(time_range_params)
 
     where_sql = 'WHERE ' + ' AND '.join(query) if query else ''
-    if or_query and where_sql:
-        where_sql = where_sql + f' AND ({or_query})'
-    elif or_query:
-        where_sql = 'WHERE ' + or_query
 
     sql = (
         fr'SELECT reservation.id, reservation.stadium_id, venue_id, court_id, start_time, end_time, member_count,'
@@ -138,6 +127,107 @@ async def add(
     return id_
 
 
+async def browse_conflicts(court_id: int, time_ranges: Sequence[vo.DateTimeRange]) -> Sequence[vo.DateTimeRange]:
+    """
+    The given ranges overlapping a reservation of the court, checked together in one statement.
+    """
+    results = await PostgresQueryExecutor(
+        sql=r'SELECT time_range.start_time, time_range.end_time'
+            r'  FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+            r'    AS time_range(start_time, end_time)'
+            r' WHERE EXISTS (SELECT *'
+            r'                 FROM reservation'
+            r'                WHERE reservation.court_id = %(court_id)s'
+            r'                  AND reservation.start_time < time_range.end_time'
+            r'                  AND reservation.end_time > time_range.start_time)'
+            r' ORDER BY time_range.start_time',
+        court_id=court_id,
+        range_start_times=[time_range.start_time for time_range in time_ranges],
+        range_end_times=[time_range.end_time for time_range in time_ranges],
+    ).fetch_all()
+
+    return [vo.DateTimeRange(start_time=start_time, end_time=end_time) for start_time, end_time in results]
+
+
+async def batch_add(
+        stadium_id: int, venue_id: int, court_id: int, time_ranges: Sequence[vo.DateTimeRange],
+        technical_level: Sequence[enums.TechnicalType], invitation_codes: Sequence[str], manager_id: int,
+        member_ids: Sequence[int] = (), remark: str = None, member_count: int = 0, vacancy: int = -1,
+) -> Sequence[int]:
+    """
+    Adds one reservation per time range and their members in one statement,
+    the manager joined and `member_ids` invited to each of them.
+    """
+    results = await PostgresQueryExecutor(
+        sql=r'WITH added AS ('
+            r'     INSERT INTO reservation(stadium_id, venue_id, court_id, start_time, end_time, member_count,'
+            r'                             vacancy, technical_level, remark, invitation_code)'
+            r'     SELECT %(stadium_id)s, %(venue_id)s, %(court_id)s, occurrence.start_time, occurrence.end_time,'
+            r'            %(member_count)s, %(vacancy)s, %(technical_level)s, %(remark)s, occurrence.invitation_code'
+            r'       FROM UNNEST(%(start_times)s::TIMESTAMP[], %(end_times)s::TIMESTAMP[], %(invitation_codes)s::VARCHAR[])'
+            r'         AS occurrence(start_time, end_time, invitation_code)'
+            r'  RETURNING id, start_time'
+            r' ), added_member AS ('
+            r'     INSERT INTO reservation_member(reservation_id, account_id, is_manager, status, source)'
+            r'     SELECT added.id, member.account_id, member.account_id = %(manager_id)s,'
+            r'            CASE WHEN member.account_id = %(manager_id)s'
+            r'                 THEN %(joined)s::reservation_member_status'
+            r'                 ELSE %(invited)s::reservation_member_status END,'
+            r'            %(source)s'
+            r'       FROM added'
+            r'      CROSS JOIN UNNEST(%(account_ids)s::INTEGER[]) AS member(account_id)'
+            r' )'
+            r' SELECT id'
+            r'   FROM added'
+            r'  ORDER BY start_time',
+        stadium_id=stadium_id, venue_id=venue_id, court_id=court_id, member_count=member_count, vacancy=vacancy,
+        technical_level=technical_level, remark=remark,
+        start_times=[time_range.start_time for time_range in time_ranges],
+        end_times=[time_range.end_time for time_range in time_ranges],
+        invitation_codes=invitation_codes,
+        manager_id=manager_id, account_ids=list(dict.fromkeys([*member_ids, manager_id])),
+        joined=enums.ReservationMemberStatus.joined, invited=enums.ReservationMemberStatus.invited,
+        source=enums.ReservationMemberSource.invitation_code,
+    ).fetch_all()
+    return [id_ for id_, in results]
+
+
+async def browse_by_courts(court_ids: Sequence[int], start_time: datetime, end_time: datetime) \
+        -> Sequence[do.Reservation]:
+    """
+    Reservations of the courts overlapping [start_time, end_time), ordered by court then time.
+    """
+    results = await PostgresQueryExecutor(
+        sql=r'SELECT id, stadium_id, venue_id, court_id, start_time, end_time, member_count,'
+            r'       vacancy, technical_level, remark, invitation_code, is_cancelled'
+            r'  FROM reservation'
+            r' WHERE court_id = ANY(%(court_ids)s::INTEGER[])'
+            r'   AND start_time < %(end_time)s'
+            r'   AND end_time > %(start_time)s'
+            r' ORDER BY court_id, start_time',
+        court_ids=court_ids, start_time=start_time, end_time=end_time,
+    ).fetch_all()
+
+    return [
+        do.Reservation(
+            id=id_,
+            stadium_id=stadium_id,
+            venue_id=venue_id,
+            court_id=court_id,
+            start_time=start_time,
+            end_time=end_time,
+            member_count=member_count,
+            vacancy=vacancy,
+            technical_level=technical_level,
+            remark=remark,
+            invitation_code=invitation_code,
+            is_cancelled=is_cancelled,
+        )
+        for id_, stadium_id, venue_id, court_id, start_time, end_time, member_count, vacancy, technical_level,
+        remark, invitation_code, is_cancelled in results
+    ]
+
+
 async def read(reservation_id: int) -> do.Reservation:
     reservation = await PostgresQueryExecutor(
         sql=r'SELECT id, stadium_id, venue_id, court_id, start_time, end_time, member_count,'
@@ -210,6 +300,16 @@ async def add_event_id(reservation_id: int, event_id: str):
     ).execute()
 
 
+async def batch_add_event_id(reservation_ids: Sequence[int], event_ids: Sequence[str]):
+    await PostgresQueryExecutor(
+        sql=r"UPDATE reservation"
+            r"   SET google_event_id = event.event_id"
+            r"  FROM UNNEST(%(reservation_ids)s::INTEGER[], %(event_ids)s::VARCHAR[]) AS event(reservation_id, event_id)"
+            r" WHERE reservation.id = event.reservation_id",
+        reservation_ids=reservation_ids, event_ids=event_ids,
+    ).execute()
+
+
 async def get_manager_id(reservation_id: int):
     try:
         account_id, = await PostgresQueryExecutor(
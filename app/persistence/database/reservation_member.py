@@ -1,13 +1,10 @@
 from typing import Sequence
 
-import asyncpg
-
 import app.exceptions as exc
 from app.base import do, enums, vo
 from app.persistence.database.util import (
     PostgresQueryExecutor,
     generate_query_parameters,
-    pg_pool_handler,
 )
 
 
@@ -82,36 +79,87 @@ async def browse_with_names(
     ]
 
 
+async def join(invitation_code: str, account_id: int) -> tuple[int, bool]:
+    """
+    Takes a vacancy and adds the member in one statement.
+    `FOR UPDATE` queues concurrent joiners on the reservation row, each rechecks `vacancy > 0` once it gets the row.
+    An invited or rejected member joins like anyone else, `ON CONFLICT` only makes it set the status;
+    a repeated join updates nothing and takes nothing.
+
+    :return: reservation id, and whether the account joined just now, False if it already was a member;
+             an invited or rejected member finding no vacancy is refused as anyone else
+    """
+    result = await PostgresQueryExecutor(
+        sql=r'WITH joined AS ('
+            r'    INSERT INTO reservation_member'
+            r'                (reservation_id, account_id, is_manager, status, source)'
+            r'         SELECT id, %(account_id)s, %(is_manager)s, %(status)s, %(source)s'
+            r'           FROM reservation'
+            r'          WHERE invitation_code = %(invitation_code)s'
+            r'            AND vacancy > 0'
+            r'            FOR UPDATE'
+            r'    ON CONFLICT (reservation_id, account_id) DO UPDATE'
+            r'           SET status = %(status)s'
+            r'         WHERE reservation_member.status <> %(status)s'
+            r'      RETURNING reservation_id'
+            r'), taken AS ('
+            r'    UPDATE reservation'
+            r'       SET vacancy = vacancy - 1'
+            r'     WHERE id IN (SELECT reservation_id FROM joined)'
+            r')'
+            r'SELECT reservation.id,'
+            r'       EXISTS (SELECT * FROM joined),'
+            r'       EXISTS (SELECT *'
+            r'                 FROM reservation_member'
+            r'                WHERE reservation_id = reservation.id'
+            r'                  AND account_id = %(account_id)s'
+            r'                  AND status = %(status)s)'
+            r'  FROM reservation'
+            r' WHERE invitation_code = %(invitation_code)s',
+        invitation_code=invitation_code, account_id=account_id, is_manager=False,
+        status=enums.ReservationMemberStatus.joined, source=enums.ReservationMemberSource.invitation_code,
+    ).fetch_one()
+
+    try:
+        reservation_id, is_joined, was_member = result
+    except TypeError:
+        raise exc.NotFound
+
+    if not is_joined and not was_member:
+        raise exc.ReservationFull
+
+    return reservation_id, is_joined
+
+
 async def leave(reservation_id: int, account_id: int) -> None:
-    async with pg_pool_handler.cursor() as cursor:
-        cursor: asyncpg.Connection
-        is_manager, source = await cursor.fetchval(
-            r'DELETE FROM reservation_member'
-            r' WHERE reservation_id = $1'
-            r'   AND account_id = $2'
-            r' RETURNING (is_manager, source)',
-            reservation_id, account_id,
-        )
-        if is_manager:
-            await cursor.execute(
-                r'WITH tmp_tbl AS ('
-                r'  SELECT MIN(account_id) AS account_id'
-                r'  FROM reservation_member'
-                r'  WHERE reservation_id = $1'
-                r')'
-                r'UPDATE reservation_member'
-                r'   SET is_manager = $2'
-                r' WHERE reservation_id = $1'
-                r'  AND account_id = (SELECT account_id FROM tmp_tbl)',
-                reservation_id, True,
-            )
-        if source == enums.ReservationMemberSource.search:
-            await cursor.execute(
-                r'UPDATE reservation'
-                r'   SET vacancy = vacancy + 1'
-                r' WHERE id = $1',
-                reservation_id,
-            )
+    """
+    Removes the member, gives back the vacancy it took and hands the manager role on, in one statement.
+    Every member other than the manager took a vacancy when it became joined.
+    """
+    await PostgresQueryExecutor(
+        sql=r'WITH left_member AS ('
+            r'    DELETE FROM reservation_member'
+            r'     WHERE reservation_id = %(reservation_id)s'
+            r'       AND account_id = %(account_id)s'
+            r'    RETURNING is_manager, status'
+            r'), restored AS ('
+            r'    UPDATE reservation'
+            r'       SET vacancy = vacancy + 1'
+            r'     WHERE id = %(reservation_id)s'
+            r'       AND vacancy >= 0'
+            r'       AND EXISTS (SELECT * FROM left_member WHERE NOT is_manager AND status = %(joined)s)'
+            r')'
+            r'UPDATE reservation_member'
+            r'   SET is_manager = %(is_manager)s'
+            r' WHERE reservation_id = %(reservation_id)s'
+            r'   AND account_id = (SELECT MIN(account_id)'
+            r'                       FROM reservation_member'
+            r'                      WHERE reservation_id = %(reservation_id)s'
+            r'                        AND account_id <> %(account_id)s)'
+            r'   AND EXISTS (SELECT * FROM left_member WHERE is_manager)',
+        reservation_id=reservation_id, account_id=account_id, is_manager=True,
+        joined=enums.ReservationMemberStatus.joined,
+    ).execute()
 
 
 async def reject(reservation_id: int, account_id: int) -> None:
@@ -0,0 +1,153 @@
+"""
+Captures the slowest statements by fingerprint, with a sampled query plan.
+------
+
+The dynamic sql of browse queries varies with the filters, so statements are grouped by their fingerprint:
+the sql with parameters and literals replaced by `?`.
+A sampled fraction of slow reads is explained with `EXPLAIN (ANALYZE, BUFFERS)` in the background,
+on a side connection in a read-only transaction, so a plan is there before anyone complains.
+No more than `SLOW_QUERY_MAX_EXPLAINS` run at once, slow queries come in bursts when the database is busy.
+"""
+import asyncio
+import dataclasses
+import random
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Sequence
+
+import app.log as log
+from app.base import mcs
+from app.config import slow_query_config
+from app.utils import metrics
+
+from . import pg_pool_handler
+
+_COMMENT = re.compile(r'--[^\n]*')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAMETER = re.compile(r'\$\d+')
+_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_WHITESPACE = re.compile(r'\s+')
+
+slow_queries = metrics.registry.counter('db_slow_queries', 'Statements slower than SLOW_QUERY_THRESHOLD_MS.')
+
+
+def fingerprint(sql: str) -> str:
+    sql = _COMMENT.sub('', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _PARAMETER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _LIST.sub('?, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def is_read(sql: str) -> bool:
+    """
+    Only reads are explained, `EXPLAIN ANALYZE` runs the statement.
+    Writes in a `WITH` still fail on the read-only transaction.
+    """
+    return _COMMENT.sub('', sql).lstrip().upper().startswith(('SELECT', 'WITH'))
+
+
+@dataclasses.dataclass
+class SlowQuery:
+    fingerprint: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_seen: datetime | None = None
+    plan: str | None = None
+    explained_at: datetime | None = None
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.last_seen = datetime.now()
+
+
+class SlowQueryRecorder(metaclass=mcs.Singleton):
+    """
+    Keeps at most `capacity` fingerprints, a new one replaces the fastest when it is slower.
+    """
+
+    def __init__(
+            self,
+            threshold: float = slow_query_config.threshold_ms / 1000,
+            explain_rate: float = slow_query_config.explain_rate,
+            explain_timeout: float = slow_query_config.explain_timeout_ms / 1000,
+            capacity: int = slow_query_config.capacity,
+            max_explains: int = slow_query_config.max_explains,
+    ):
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.explain_timeout = explain_timeout
+        self.capacity = capacity
+        self.max_explains = max_explains
+        self._entries: dict[str, SlowQuery] = {}
+        self._explain_tasks: dict[str, asyncio.Task] = {}  # by fingerprint, one plan at a time per statement
+
+    def record(self, sql: str, params: Sequence, duration: float) -> None:
+        if duration < self.threshold:
+            return
+        slow_queries.inc()
+
+        key = fingerprint(sql)
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self.capacity:
+                fastest = min(self._entries.values(), key=lambda item: item.max_time)
+                if fastest.max_time >= duration:
+                    return
+                del self._entries[fastest.fingerprint]
+            entry = self._entries[key] = SlowQuery(fingerprint=key)
+        entry.add(duration)
+
+        if (key not in self._explain_tasks and len(self._explain_tasks) < self.max_explains
+                and is_read(sql) and random.random() < self.explain_rate):
+            task = asyncio.create_task(self._explain(entry, sql, params))
+            self._explain_tasks[key] = task
+            task.add_done_callback(lambda _: self._explain_tasks.pop(key, None))
+
+    async def _explain(self, entry: SlowQuery, sql: str, params: Sequence) -> None:
+        try:
+            async with pg_pool_handler.side_connection() as conn:
+                async with conn.transaction(readonly=True):
+                    await conn.execute(f'SET LOCAL statement_timeout = {int(self.explain_timeout * 1000)}')
+                    rows = await conn.fetch(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', *params)
+        except Exception as e:
+            log.logger.warning(f'failed to explain slow query: {e!r}')
+            return
+        entry.plan = '\n'.join(row[0] for row in rows)
+        entry.explained_at = datetime.now()
+
+    def top(self, limit: int | None = None) -> list[SlowQuery]:
+        return sorted(self._entries.values(), key=lambda item: item.max_time, reverse=True)[:limit]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def join(self) -> None:
+        """
+        Waits for the plans being explained, e.g. in tests.
+        """
+        await asyncio.gather(*self._explain_tasks.values(), return_exceptions=True)
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+@contextmanager
+def track(sql: str, params: Sequence) -> Iterator[None]:
+    """
+    usage:
+        with slow_query.track(self.sql, self.params):
+            await cursor.fetch(self.sql, *self.params)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        slow_query_recorder.record(sql, params, time.perf_counter() - start)
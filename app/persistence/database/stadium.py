@@ -6,6 +6,7 @@ import app.exceptions as exc
 from app.base import do, enums, vo
 from app.persistence.database.util import (
     PostgresQueryExecutor,
+    business_hour_mask,
     generate_query_parameters,
     pg_pool_handler,
 )
@@ -31,30 +32,12 @@ async def browse(
 
     query, params = generate_query_parameters(criteria_dict=criteria_dict)
 
-    raw_or_query = []
-    if time_ranges:
-        for i, time_range in enumerate(time_ranges):
-            time_range: vo.WeekTimeRange
-            raw_or_query.append(f"""({' AND '.join([
-                f'business_hour.weekday = %(weekday_{i})s',
-                f'business_hour.start_time < %(end_time_{i})s',
-                f'business_hour.end_time > %(start_time_{i})s'
-            ])})""")
-            params.update({
-                f'weekday_{i}': time_range.weekday,
-                f'end_time_{i}': time_range.end_time,
-                f'start_time_{i}': time_range.start_time,
-            })
-
-    or_query = ' OR '.join(raw_or_query)
+    if time_ranges:  # the mask shares a quarter hour with the stadium's when any of their ranges overlap
+        query.append(r"POSITION(B'1' IN stadium.business_hour_mask & %(business_hour_mask)s::BIT(672)) > 0")
+        params['business_hour_mask'] = business_hour_mask(time_ranges)
 
     where_sql = 'WHERE ' + ' AND '.join(query) if query else ''
 
-    if or_query and where_sql:
-        where_sql = where_sql + f' AND ({or_query})'
-    elif or_query:
-        where_sql = 'WHERE ' + or_query
-
     sql = (
         fr'SELECT stadium.id, stadium.name, district_id, contact_number, owner_id, address,'
         fr'       description, long, lat, stadium.is_published,'
@@ -70,8 +53,6 @@ async def browse(
         fr'      INNER JOIN city ON district.city_id = city.id'
         fr'       LEFT JOIN venue ON stadium.id = venue.stadium_id'
         fr'       LEFT JOIN sport ON venue.sport_id = sport.id'
-        fr'       LEFT JOIN business_hour ON business_hour.place_id = stadium.id'
-        fr'             AND business_hour.type = %(place_type)s'
         fr' {where_sql}'
         fr'        GROUP BY stadium.id, city.id, district.id'
         fr'   ) tbl ON tbl.stadium_id = stadium.id'
@@ -203,6 +184,10 @@ async def edit(
         'address': (address, 'address = %(address)s'),
         'contact_number': (contact_number, 'contact_number = %(contact_number)s'),
         'is_published': (is_published, 'is_published = %(is_published)s'),
+        'business_hour_mask': (
+            business_hour_mask(time_ranges) if time_ranges else None,
+            'business_hour_mask = %(business_hour_mask)s::BIT(672)',
+        ),
     }
 
     query, params = generate_query_parameters(criteria_dict=criteria_dict)
@@ -1,14 +1,30 @@
 import abc
+import asyncio
 import collections
+import datetime
 import itertools
+import re
 import typing
 
 import asyncpg
 
 import app.exceptions as exc
 import app.log as log
+from app.base import vo
+from app.utils import profiler
+from app.utils.context import context
 
-from . import pg_pool_handler
+from . import pg_pool_handler, slow_query
+
+_WRITE = re.compile(r'\b(INSERT|UPDATE|DELETE|FOR\s+(NO\s+KEY\s+)?UPDATE|FOR\s+(KEY\s+)?SHARE|NEXTVAL|SETVAL)\b', re.IGNORECASE)
+
+
+def is_read_only(sql: str) -> bool:
+    """
+    Whether a replica can run the statement: a `SELECT` or a `WITH` without writes or row locks.
+    A false negative only costs a trip to the primary.
+    """
+    return slow_query.is_read(sql) and not _WRITE.search(sql)
 
 
 class QueryExecutor:
@@ -57,34 +73,46 @@ class PostgresQueryExecutor(QueryExecutor):
             key=lambda item: int(item[1].replace('$', '')),
         )
         positional_args = [named_args[named_arg] for named_arg, _ in positional_items]
-        log.logger.info((formatted_query, positional_args))
+        log.sql_logger.info('%s, args: %s', log.Truncated(formatted_query), log.Truncated(positional_args))
         return formatted_query, positional_args
 
     async def fetch_all(self):
         try:
-            async with pg_pool_handler.cursor() as cursor:
-                cursor: asyncpg.connection.Connection
-                results = await cursor.fetch(self.sql, *self.params)
+            with profiler.track_query(self.sql):
+                async with pg_pool_handler.cursor(read_only=is_read_only(self.sql)) as cursor:
+                    cursor: asyncpg.connection.Connection
+                    with slow_query.track(self.sql, self.params):  # not the pool wait, a saturated pool is no slow query
+                        results = await cursor.fetch(self.sql, *self.params, timeout=context.get_statement_timeout())
             return results
         except exc.UniqueViolationError:
             raise exc.UniqueViolationError
+        except (asyncio.TimeoutError, asyncpg.QueryCanceledError):
+            raise exc.QueryTimeout
 
     async def fetch_one(self):
         try:
-            async with pg_pool_handler.cursor() as cursor:
-                cursor: asyncpg.connection.Connection
-                result = await cursor.fetchrow(self.sql, *self.params)
+            with profiler.track_query(self.sql):
+                async with pg_pool_handler.cursor(read_only=is_read_only(self.sql)) as cursor:
+                    cursor: asyncpg.connection.Connection
+                    with slow_query.track(self.sql, self.params):
+                        result = await cursor.fetchrow(self.sql, *self.params, timeout=context.get_statement_timeout())
             return result
         except self.UNIQUE_VIOLATION_ERROR:
             raise exc.UniqueViolationError
+        except (asyncio.TimeoutError, asyncpg.QueryCanceledError):
+            raise exc.QueryTimeout
 
     async def execute(self):
         try:
-            async with pg_pool_handler.cursor() as cursor:
-                cursor: asyncpg.connection.Connection
-                await cursor.execute(self.sql, *self.params)
+            with profiler.track_query(self.sql):
+                async with pg_pool_handler.cursor() as cursor:
+                    cursor: asyncpg.connection.Connection
+                    with slow_query.track(self.sql, self.params):
+                        await cursor.execute(self.sql, *self.params, timeout=context.get_statement_timeout())
         except exc.UniqueViolationError:
             raise exc.UniqueViolationError
+        except (asyncio.TimeoutError, asyncpg.QueryCanceledError):
+            raise exc.QueryTimeout
 
 
 def generate_query_parameters(criteria_dict: dict[str, tuple[typing.Any, str]]) -> tuple[list, dict[str: typing.Any]]:
@@ -94,3 +122,92 @@ def generate_query_parameters(criteria_dict: dict[str, tuple[typing.Any, str]])
         param_value is not None
     }
     return query, params
+
+
+def merge_time_ranges(time_ranges: typing.Sequence[vo.DateTimeRange]) -> list[vo.DateTimeRange]:
+    """
+    Overlapping or adjacent ranges become one, a row overlaps the result exactly when it overlaps the input.
+    """
+    merged: list[vo.DateTimeRange] = []
+    for time_range in sorted(time_ranges, key=lambda time_range: time_range.start_time):
+        if merged and time_range.start_time <= merged[-1].end_time:
+            if time_range.end_time > merged[-1].end_time:
+                merged[-1] = vo.DateTimeRange(start_time=merged[-1].start_time, end_time=time_range.end_time)
+            continue
+        merged.append(time_range)
+    return merged
+
+
+def merge_week_time_ranges(time_ranges: typing.Sequence[vo.WeekTimeRange]) -> list[vo.WeekTimeRange]:
+    merged: list[vo.WeekTimeRange] = []
+    for time_range in sorted(time_ranges, key=lambda time_range: (time_range.weekday, time_range.start_time)):
+        last = merged[-1] if merged else None
+        if last and last.weekday == time_range.weekday and time_range.start_time <= last.end_time:
+            if time_range.end_time > last.end_time:
+                merged[-1] = vo.WeekTimeRange(weekday=last.weekday, start_time=last.start_time, end_time=time_range.end_time)
+            continue
+        merged.append(time_range)
+    return merged
+
+
+def generate_time_range_query(
+        time_ranges: typing.Sequence[vo.DateTimeRange], start_column: str, end_column: str,
+) -> tuple[str, dict[str, typing.Any]]:
+    """
+    Rows overlapping any of the ranges. The ranges go as two array parameters,
+    so the statement text stays the same whatever the number of ranges.
+    """
+    time_ranges = merge_time_ranges(time_ranges)
+    query = (
+        fr'EXISTS (SELECT *'
+        fr'          FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+        fr'            AS time_range(start_time, end_time)'
+        fr'         WHERE {start_column} < time_range.end_time AND {end_column} > time_range.start_time)'
+    )
+    return query, {
+        'range_start_times': [time_range.start_time for time_range in time_ranges],
+        'range_end_times': [time_range.end_time for time_range in time_ranges],
+    }
+
+
+def generate_week_time_range_query(
+        time_ranges: typing.Sequence[vo.WeekTimeRange], weekday_column: str, start_column: str, end_column: str,
+) -> tuple[str, dict[str, typing.Any]]:
+    time_ranges = merge_week_time_ranges(time_ranges)
+    query = (
+        fr'EXISTS (SELECT *'
+        fr'          FROM UNNEST(%(range_weekdays)s::INTEGER[], %(range_start_times)s::TIME[], %(range_end_times)s::TIME[])'
+        fr'            AS time_range(weekday, start_time, end_time)'
+        fr'         WHERE {weekday_column} = time_range.weekday'
+        fr'           AND {start_column} < time_range.end_time AND {end_column} > time_range.start_time)'
+    )
+    return query, {
+        'range_weekdays': [time_range.weekday for time_range in time_ranges],
+        'range_start_times': [time_range.start_time for time_range in time_ranges],
+        'range_end_times': [time_range.end_time for time_range in time_ranges],
+    }
+
+
+QUARTER_SECONDS = 15 * 60
+QUARTERS_PER_DAY = 24 * 60 * 60 // QUARTER_SECONDS
+BUSINESS_HOUR_MASK_LENGTH = 7 * QUARTERS_PER_DAY  # BIT(672) of stadium / venue .business_hour_mask
+
+
+def _seconds(value: datetime.time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second + (1 if value.microsecond else 0)
+
+
+def business_hour_mask(time_ranges: typing.Iterable[vo.WeekTimeRange]) -> asyncpg.BitString:
+    """
+    One bit per quarter hour of the week, the leftmost being weekday 1 at 00:00.
+    A bit is set when the quarter overlaps a range, so two masks share a bit when their ranges overlap,
+    up to rounding to quarter hours.
+    """
+    mask = 0
+    for time_range in time_ranges:
+        first = _seconds(time_range.start_time) // QUARTER_SECONDS
+        stop = -(-_seconds(time_range.end_time) // QUARTER_SECONDS)  # ceil, the quarter the range ends in counts
+        offset = (time_range.weekday - 1) * QUARTERS_PER_DAY
+        for quarter in range(offset + first, offset + stop):
+            mask |= 1 << (BUSINESS_HOUR_MASK_LENGTH - 1 - quarter)
+    return asyncpg.BitString.from_int(mask, length=BUSINESS_HOUR_MASK_LENGTH)
@@ -5,6 +5,7 @@ from app.base import enums, vo
 from app.persistence.database.util import (
     PostgresQueryExecutor,
     generate_query_parameters,
+    generate_time_range_query,
 )
 
 
@@ -32,25 +33,14 @@ async def browse_my_reservation(
 
     query, params = generate_query_parameters(criteria_dict=criteria_dict)
 
-    raw_or_query = []
     if time_ranges:
-        for i, time_range in list(enumerate(time_ranges)):
-            raw_or_query.append(f"""({' AND '.join([
-                f'reservation.start_time < %(end_time_{i})s',
-                f'reservation.end_time > %(start_time_{i})s'
-            ])})""")
-            params.update({
-                f'end_time_{i}': time_range.end_time,
-                f'start_time_{i}': time_range.start_time,
-            })
-
-    or_query = ' OR '.join(raw_or_query)
+        time_range_query, time_range_params = generate_time_range_query(
+            time_ranges, start_column='reservation.start_time', end_column='reservation.end_time',
+        )
+        query.append(time_range_query)
+        params.update(time_range_params)
 
     where_sql = 'WHERE ' + ' AND '.join(query) if query else ''
-    if or_query and where_sql:
-        where_sql = where_sql + f' AND ({or_query})'
-    elif or_query:
-        where_sql = 'WHERE ' + or_query
 
     if sort_by is enums.ViewMyReservationSortBy.status:
         sort_by = '(start_time, is_cancelled)'
@@ -301,3 +291,83 @@ async def browse_provider_court(
         )
         for court_id, stadium_name, venue_name, court_number, is_published in results
     ], total_count
+
+
+async def browse_free_court(
+        time_ranges: Sequence[vo.DateTimeRange],
+        request_time: datetime,
+        city_id: int | None = None,
+        district_id: int | None = None,
+        sport_id: int | None = None,
+        long: float | None = None,
+        lat: float | None = None,
+        limit: int = 10,
+        offset: int = 0,
+) -> tuple[Sequence[vo.ViewFreeCourt], int]:
+    """
+    Published, reservable courts open and unreserved for a whole time range, one row per court and range,
+    nearest first when a location is given. The total count comes with the page, so this is one statement.
+    """
+    criteria_dict = {
+        'city_id': (city_id, 'district.city_id = %(city_id)s'),
+        'district_id': (district_id, 'stadium.district_id = %(district_id)s'),
+        'sport_id': (sport_id, 'venue.sport_id = %(sport_id)s'),
+    }
+    query, params = generate_query_parameters(criteria_dict=criteria_dict)
+    criteria_sql = ''.join(f' AND {q}' for q in query)
+
+    has_location = long is not None and lat is not None
+    distance_sql = 'POINT(stadium.long, stadium.lat) <-> POINT(%(long)s, %(lat)s)' if has_location else 'NULL'
+
+    results = await PostgresQueryExecutor(
+        sql=fr'SELECT court.id, court.number, venue.id, venue.name, stadium.id, stadium.name,'
+            fr'       time_range.start_time, time_range.end_time,'
+            fr'       {distance_sql} AS distance,'
+            fr'       COUNT(*) OVER () AS total_count'
+            fr'  FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+            fr'    AS time_range(start_time, end_time)'
+            fr' CROSS JOIN court'
+            fr' INNER JOIN venue ON venue.id = court.venue_id'
+            fr' INNER JOIN stadium ON stadium.id = venue.stadium_id'
+            fr' INNER JOIN district ON district.id = stadium.district_id'
+            fr' WHERE court.is_published AND venue.is_published AND stadium.is_published AND venue.is_reservable'
+            fr'{criteria_sql}'
+            fr'   AND time_range.start_time >= %(request_time)s'
+            fr'   AND time_range.start_time::DATE = time_range.end_time::DATE'
+            fr"   AND (venue.reservation_interval IS NULL"
+            fr"        OR time_range.start_time <= %(request_time)s + venue.reservation_interval * INTERVAL '1 day')"
+            fr'   AND EXISTS (SELECT *'
+            fr'                 FROM business_hour'
+            fr'                WHERE business_hour.type = %(place_type)s'
+            fr'                  AND business_hour.place_id = venue.id'
+            fr'                  AND business_hour.weekday = EXTRACT(ISODOW FROM time_range.start_time)'
+            fr'                  AND business_hour.start_time <= time_range.start_time::TIME'
+            fr'                  AND business_hour.end_time >= time_range.end_time::TIME)'
+            fr'   AND NOT EXISTS (SELECT *'
+            fr'                     FROM reservation'
+            fr'                    WHERE reservation.court_id = court.id'
+            fr'                      AND reservation.start_time < time_range.end_time'
+            fr'                      AND reservation.end_time > time_range.start_time)'
+            fr' ORDER BY {"distance, " if has_location else ""}time_range.start_time, court.id'
+            fr' LIMIT %(limit)s OFFSET %(offset)s',
+        **params, request_time=request_time, place_type=enums.PlaceType.venue,
+        range_start_times=[time_range.start_time for time_range in time_ranges],
+        range_end_times=[time_range.end_time for time_range in time_ranges],
+        limit=limit, offset=offset, **({'long': long, 'lat': lat} if has_location else {}),
+    ).fetch_all()
+
+    return [
+        vo.ViewFreeCourt(
+            court_id=court_id,
+            court_number=court_number,
+            venue_id=venue_id,
+            venue_name=venue_name,
+            stadium_id=stadium_id,
+            stadium_name=stadium_name,
+            start_time=start_time,
+            end_time=end_time,
+            distance=distance,
+        )
+        for court_id, court_number, venue_id, venue_name, stadium_id, stadium_name, start_time, end_time, distance, _
+        in results
+    ], results[0][-1] if results else 0
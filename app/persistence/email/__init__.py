@@ -1,68 +1,202 @@
+"""
+Sends mails over a pool of smtp connections.
+------
+
+Up to `SMTP_POOL_SIZE` messages are sent at once, each over its own connection, opened on first use.
+A connection idle longer than `SMTP_CHECK_AFTER` seconds is checked with a NOOP before it is reused,
+one used more recently is trusted, so a burst does not pay a round trip per message.
+A connection that raised is closed instead of reused, its session state being unknown.
+"""
+import asyncio
+import collections
+import dataclasses
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage, Message
+from typing import AsyncIterator, Iterable, Sequence
+
 import aiosmtplib
-import aiosmtplib.smtp
+import aiosmtplib.email
 
+import app.log as log
 from app.base import mcs
-from app.config import SMTPConfig
+from app.config import SMTPConfig, smtp_config
+from app.utils import metrics, profiler
+
+
+@dataclasses.dataclass
+class Delivery:
+    recipient: str
+    is_delivered: bool
+    code: int | None = None  # of a refused recipient
+    reason: str | None = None
+
+
+@dataclasses.dataclass
+class _Connection:
+    client: aiosmtplib.SMTP
+    last_used: float
 
 
 class SMTPHandler(metaclass=mcs.Singleton):
     def __init__(self):
-        self._client: aiosmtplib.SMTP = None  # Need to be init/closed manually # noqa
+        self._smtp_config: SMTPConfig | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._idle: list[_Connection] = []
+        self.in_use_count = 0
 
     async def initialize(self, smtp_config: SMTPConfig):
-        if self._client is None:
-            self._client = aiosmtplib.SMTP(
-                hostname=smtp_config.host,
-                port=smtp_config.port,
-                username=smtp_config.username,
-                password=smtp_config.password,
-                use_tls=smtp_config.use_tls,
-            )
+        if self._smtp_config is None:
+            self._smtp_config = smtp_config
+            self._slots = asyncio.Semaphore(smtp_config.pool_size)
 
     async def close(self):
-        if self._client is not None:
-            self._client.close()
+        for connection in self._idle:
+            connection.client.close()
+        self._idle = []
+
+    @property
+    def pool_size(self) -> int:
+        return self._smtp_config.pool_size if self._smtp_config else smtp_config.pool_size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        usage:
+            async with smtp_handler.connection() as client:
+                await client.send_message(message)
+        """
+        if self._smtp_config is None:  # initialized on first use, mails are rare compared to worker starts
+            await self.initialize(smtp_config=smtp_config)
+
+        async with self._slots:
+            connection = await self._take()
+            self.in_use_count += 1
+            try:
+                yield connection.client
+            except BaseException:
+                connection.client.close()
+                raise
+            else:
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+            finally:
+                self.in_use_count -= 1
+
+    async def _take(self) -> _Connection:
+        while self._idle:
+            connection = self._idle.pop()  # the most recently used is the likeliest to be alive
+            if not connection.client.is_connected:
+                continue
+            if time.monotonic() - connection.last_used < self._smtp_config.check_after:
+                return connection
+            try:
+                await connection.client.noop()
+                return connection
+            except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+                connection.client.close()
+
+        client = aiosmtplib.SMTP(
+            hostname=self._smtp_config.host,
+            port=self._smtp_config.port,
+            username=self._smtp_config.username,
+            password=self._smtp_config.password,
+            use_tls=self._smtp_config.use_tls,
+            timeout=self._smtp_config.timeout,
+        )
+        await client.connect()
+        return _Connection(client=client, last_used=time.monotonic())
 
     async def send_message(
             self,
-            message: aiosmtplib.smtp.Union[
-                aiosmtplib.smtp.email.message.EmailMessage,
-                aiosmtplib.smtp.email.message.Message,
-            ],
+            message: EmailMessage | Message,
             sender: str | None = None,
-            recipients: aiosmtplib.smtp.Union[str, aiosmtplib.smtp.Sequence[str]] | None = None,
-            mail_options: aiosmtplib.smtp.Iterable[str] | None = None,
-            rcpt_options: aiosmtplib.smtp.Iterable[str] | None = None,
-            timeout: aiosmtplib.smtp.Union[float, aiosmtplib.smtp.Default] | None = aiosmtplib.smtp._default,  # noqa
-    ):
-        client = await self.get_client()
-        responses, _ = await client.send_message(
-            message, sender=sender, recipients=recipients,
-            mail_options=mail_options, rcpt_options=rcpt_options,
-            timeout=timeout,
-        )
-        for address, (code, resp) in responses.items():
-            if code != 200:
-                print(f'{address=} failed with {code=} {resp=}')  # experimental, info level only
-
-    async def get_client(self):
-        try:
-            await self._client.noop()
-        except aiosmtplib.errors.SMTPServerDisconnected as e:
-            try:
-                await self._client.connect()
-            except Exception as e2:
-                raise e2 from e
+            recipients: str | Sequence[str] | None = None,
+            mail_options: Iterable[str] | None = None,
+            rcpt_options: Iterable[str] | None = None,
+    ) -> list[Delivery]:
+        async with self.connection() as client:
+            return await self._send(
+                client, message, sender=sender, recipients=recipients,
+                mail_options=mail_options, rcpt_options=rcpt_options,
+            )
+
+    async def send_messages(self, messages: Sequence[EmailMessage | Message]) -> list[list[Delivery] | Exception]:
+        """
+        Splits the messages over the pool, each connection sends its share back to back.
+        Results are in the order of `messages`, a message that could not be sent has its exception instead;
+        the rest of its share goes on over a new connection.
+        """
+        if self._smtp_config is None:
+            await self.initialize(smtp_config=smtp_config)
+
+        results: list[list[Delivery] | Exception | None] = [None] * len(messages)
+        width = min(self.pool_size, len(messages))
 
+        async def send_share(indices: collections.deque[int]):
+            while indices:
+                try:
+                    async with self.connection() as client:
+                        while indices:
+                            results[indices[0]] = await self._send(client, messages[indices[0]])
+                            indices.popleft()
+                except Exception as e:
+                    results[indices.popleft()] = e
+
+        await asyncio.gather(*(
+            send_share(collections.deque(range(start, len(messages), width))) for start in range(width)
+        ))
+        return results  # noqa, every index is filled
+
+    async def _send(
+            self,
+            client: aiosmtplib.SMTP,
+            message: EmailMessage | Message,
+            sender: str | None = None,
+            recipients: str | Sequence[str] | None = None,
+            mail_options: Iterable[str] | None = None,
+            rcpt_options: Iterable[str] | None = None,
+    ) -> list[Delivery]:
+        if recipients is None:
+            recipients = aiosmtplib.email.extract_recipients(message)
+        elif isinstance(recipients, str):
+            recipients = [recipients]
+
+        with profiler.track_external('smtp'):
             try:
-                await self._client.noop()  # verify
-            except Exception as e2:
-                raise e2 from e
+                refused, _ = await client.send_message(
+                    message, sender=sender, recipients=recipients,
+                    mail_options=mail_options, rcpt_options=rcpt_options,
+                )
+            except aiosmtplib.SMTPRecipientsRefused as e:  # every recipient, the connection is still fine
+                refused = {error.recipient: error for error in e.recipients}
 
-        return self._client
+        deliveries = []
+        for recipient in recipients:
+            error = refused.get(recipient)
+            if error is None:
+                deliveries.append(Delivery(recipient=recipient, is_delivered=True))
+                smtp_deliveries.inc('delivered')
+                continue
+            log.logger.warning(f'smtp refused {recipient} with {error.code} {error.message}')
+            deliveries.append(Delivery(recipient=recipient, is_delivered=False, code=error.code, reason=error.message))
+            smtp_deliveries.inc('refused')
+        return deliveries
 
 
 smtp_handler = SMTPHandler()
 
+metrics.registry.gauge(
+    'smtp_connections', 'Open smtp connections of this worker by state, they open on first use.', ['state'],
+    function=lambda: {('idle',): smtp_handler.idle_count, ('in_use',): smtp_handler.in_use_count},
+)
+smtp_deliveries = metrics.registry.counter(
+    'smtp_deliveries', 'Recipients of sent messages, by whether the server accepted them.', ['result'],
+)
+
 
 from . import forget_password, invitation, verification
@@ -1,27 +1,38 @@
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-
-from app.config import service_config, smtp_config
-from app.persistence.email import smtp_handler
-
-
-async def send(meet_code: str, to: str | None = None, subject='Invitation from Jöinee', bcc: str | None = None):
-    message = MIMEMultipart()
-    message['From'] = 'Jöinee'
-    message['Subject'] = subject
-    if to is not None:
-        message["To"] = to
-    if bcc is not None:
-        message["Bcc"] = bcc
-    body = f"""
-        <html>
-            <body>
-                <p style="color: black;">Hello,</p>
-                <p style="color: black;">You are invited to the reservation on Jöinee.</p>
-                <p style="color: black;">Click the link to join the reservation!</p>
-                <a href="{service_config.url}/reservation/{meet_code}">Click here to join the reservation!</a>
-            </body>
-        </html>
-        """
-    message.attach(MIMEText(body, 'html'))
-    await smtp_handler.send_message(message)
+from typing import Sequence
+
+from app.config import service_config
+from app.persistence.email import Delivery, smtp_handler
+from app.persistence.email.template import EmailTemplate
+
+TEMPLATE = EmailTemplate(
+    subject='Invitation from Jöinee',
+    text='Hello {nickname},\n'
+         'You are invited to the reservation on Jöinee.\n'
+         'Open the link to join the reservation: {url}\n',
+    html='<html>'
+         '<body>'
+         '<p style="color: black;">Hello {nickname},</p>'
+         '<p style="color: black;">You are invited to the reservation on Jöinee.</p>'
+         '<p style="color: black;">Click the link to join the reservation!</p>'
+         '<a href="{url}">Click here to join the reservation!</a>'
+         '</body>'
+         '</html>',
+)
+
+
+def _url(meet_code: str) -> str:
+    return f'{service_config.url}/reservation/{meet_code}'
+
+
+async def send(meet_code: str, to: str, nickname: str = '') -> list[Delivery]:
+    message = TEMPLATE.render(to=to, nickname=nickname, url=_url(meet_code))
+    return await smtp_handler.send_message(message)
+
+
+async def send_many(meet_code: str, invitees: Sequence[tuple[str, str]]) -> list[list[Delivery] | Exception]:
+    """
+    One message per `(email, nickname)` of `invitees`, rendered in one pass and sent over the whole smtp pool.
+    """
+    url = _url(meet_code)
+    messages = TEMPLATE.render_many({'to': to, 'nickname': nickname, 'url': url} for to, nickname in invitees)
+    return await smtp_handler.send_messages(messages)
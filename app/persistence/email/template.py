@@ -0,0 +1,109 @@
+"""
+Email templates compiled once, at import, into their literal parts and fields.
+------
+
+usage:
+    TEMPLATE = EmailTemplate(
+        subject='Invitation from Jöinee',
+        text='Hello {nickname}, join at {url}',
+        html='<p>Hello {nickname},</p><a href="{url}">join</a>',
+    )
+    message = TEMPLATE.render(to='a@example.com', nickname='a', url=url)
+    messages = TEMPLATE.render_many([{'to': 'a@example.com', 'nickname': 'a', 'url': url}, ...])
+
+Fields are `str.format` style names, without format specs; values are escaped in the html part only.
+Rendering joins the parts, a field missing from the values raises `KeyError`.
+"""
+import email.generator
+import html
+import string
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Iterable, Mapping
+
+SENDER = 'Jöinee'
+
+
+def _encode_header(value: str) -> str:
+    """
+    Encoded-words up front, folding a plain ascii header is cheaper on every flatten.
+    """
+    return value if value.isascii() else Header(value, 'utf-8').encode()
+
+
+_SENDER_HEADER = _encode_header(SENDER)
+
+
+class Template:
+    def __init__(self, source: str, escape: Callable[[str], str] = str):
+        self.escape = escape
+        self.parts: list[tuple[str, str | None]] = []  # (literal, field following it)
+        for literal, field, format_spec, conversion in string.Formatter().parse(source):
+            if format_spec or conversion:
+                raise ValueError(f'format specs are not supported, got {{{field}!{conversion}:{format_spec}}}')
+            if field is not None and not field.isidentifier():
+                raise ValueError(f'field {field!r} is not a name')
+            self.parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self.parts if field is not None)
+
+    def render(self, values: Mapping[str, str]) -> str:
+        escape = self.escape
+        return ''.join(
+            literal if field is None else literal + escape(str(values[field]))
+            for literal, field in self.parts
+        )
+
+
+class EmailTemplate:
+    def __init__(self, subject: str, text: str, html: str):
+        self.subject = Template(subject)
+        self.text = Template(text)
+        self.html = Template(html, escape=_escape_html)
+        # fixed, so flattening skips searching the body for a free one; the parts are base64, it cannot occur in them
+        self.boundary = email.generator._make_boundary()  # noqa
+
+    def render(self, to: str, **values: str) -> MIMEMultipart:
+        values = {'to': to, **values}  # the templates may greet the address
+        return self._build(
+            to, _encode_header(self.subject.render(values)),
+            MIMEText(self.text.render(values), 'plain', 'utf-8'), MIMEText(self.html.render(values), 'html', 'utf-8'),
+        )
+
+    def render_many(self, recipients: Iterable[Mapping[str, str]]) -> list[MIMEMultipart]:
+        """
+        One message per recipient, each mapping having `to` and the fields.
+        Recipients sharing the values of a part share the part, e.g. one encoded body for all when only `to` differs.
+        """
+        rendered: dict[tuple[int, tuple[str, ...]], str | MIMEText] = {}
+
+        def render(template: Template, values: Mapping[str, str], subtype: str | None = None) -> str | MIMEText:
+            key = id(template), tuple(str(values[field]) for field in sorted(template.fields))
+            if key not in rendered:
+                text = template.render(values)
+                rendered[key] = _encode_header(text) if subtype is None else MIMEText(text, subtype, 'utf-8')
+            return rendered[key]
+
+        return [
+            self._build(
+                values['to'], render(self.subject, values),
+                render(self.text, values, 'plain'), render(self.html, values, 'html'),
+            )
+            for values in recipients
+        ]
+
+    def _build(self, to: str, subject: str, text: MIMEText, html_part: MIMEText) -> MIMEMultipart:
+        """
+        Parts are only read when the message is flattened, so messages may share them.
+        """
+        message = MIMEMultipart('alternative', boundary=self.boundary)
+        message['From'] = _SENDER_HEADER
+        message['To'] = to
+        message['Subject'] = subject
+        message.attach(text)
+        message.attach(html_part)  # last is preferred
+        return message
+
+
+def _escape_html(value: str) -> str:
+    return html.escape(value, quote=True)
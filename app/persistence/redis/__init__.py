@@ -0,0 +1,139 @@
+"""
+Controls the connection of redis, shared by every worker and pod as the cross-process cache tier.
+------
+
+Values are serialized with msgpack, pydantic models are stored as their json-compatible dump.
+Tags group keys so that a write can invalidate everything derived from it at once.
+NOTE: tag expiry relies on `EXPIRE NX/GT`, which needs redis >= 7.0
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, Mapping, Sequence, Type, TypeVar
+
+import msgpack
+import pydantic
+import redis.asyncio as redis
+
+from app.base import mcs
+from app.config import RedisConfig
+from app.persistence import PoolHandlerBase
+
+T = TypeVar('T', bound=pydantic.BaseModel)
+
+
+class RedisPoolHandler(PoolHandlerBase, metaclass=mcs.Singleton):
+    TAG_PREFIX = 'tag'
+
+    async def initialize(self, db_config: RedisConfig):
+        if self._pool is None:
+            self._pool = redis.ConnectionPool.from_url(db_config.url, max_connections=db_config.max_pool_size)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.aclose()
+            self._pool = None
+
+    @asynccontextmanager
+    async def cursor(self) -> AsyncContextManager[redis.Redis]:
+        """
+        usage:
+            async with redis_pool_handler.cursor() as cursor:
+                await cursor.get(key)
+        """
+        if self._pool is None:  # a client without a pool connects to localhost
+            raise ValueError('redis is not initialized, check REDIS_URL')
+        client = redis.Redis(connection_pool=self._pool)
+        try:
+            yield client
+        finally:
+            await client.aclose()
+
+    @staticmethod
+    def _pack(value: Any) -> bytes:
+        if isinstance(value, pydantic.BaseModel):
+            value = value.model_dump(mode='json')
+        return msgpack.packb(value)
+
+    @staticmethod
+    def _unpack(raw: bytes | None, model: Type[T] | None = None) -> Any:
+        if raw is None:
+            return None
+        value = msgpack.unpackb(raw)
+        return model.model_validate(value) if model else value
+
+    def _tag_key(self, tag: str) -> str:
+        return f'{self.TAG_PREFIX}:{tag}'
+
+    async def get(self, key: str, model: Type[T] | None = None) -> T | Any | None:
+        async with self.cursor() as cursor:
+            raw = await cursor.get(key)
+        return self._unpack(raw, model=model)
+
+    async def get_many(self, keys: Sequence[str], model: Type[T] | None = None) -> list[T | Any | None]:
+        """
+        Pipelined so that it costs a single round trip, missing keys are returned as None.
+        """
+        if not keys:
+            return []
+
+        async with self.cursor() as cursor:
+            async with cursor.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key)
+                raws = await pipe.execute()
+        return [self._unpack(raw, model=model) for raw in raws]
+
+    async def set(self, key: str, value: Any, ttl: int | None = None, tags: Sequence[str] = ()) -> None:
+        await self.set_many({key: value}, ttl=ttl, tags=tags)
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: int | None = None, tags: Sequence[str] = ()) -> None:
+        if not mapping:
+            return
+
+        async with self.cursor() as cursor:
+            async with cursor.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, self._pack(value), ex=ttl)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, *mapping)
+                    if ttl:  # tag lives as long as its longest member
+                        pipe.expire(tag_key, ttl, nx=True)
+                        pipe.expire(tag_key, ttl, gt=True)
+                    else:
+                        pipe.persist(tag_key)
+                await pipe.execute()
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        async with self.cursor() as cursor:
+            await cursor.delete(*keys)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        if not tags:
+            return
+
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        async with self.cursor() as cursor:
+            async with cursor.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            keys = {key for tag_members in members for key in tag_members}
+            await cursor.delete(*keys, *tag_keys)
+
+    async def incr(self, key: str, ttl: int | None = None) -> int:
+        """
+        Counter shared across workers, e.g. fixed-window rate limit state.
+        The window starts at the first increment.
+        """
+        async with self.cursor() as cursor:
+            async with cursor.pipeline(transaction=True) as pipe:
+                pipe.incr(key)
+                if ttl:
+                    pipe.expire(key, ttl, nx=True)
+                count, *_ = await pipe.execute()
+        return count
+
+
+redis_pool_handler = RedisPoolHandler()
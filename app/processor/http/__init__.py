@@ -1,11 +1,14 @@
 import fastapi
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from app.utils import metrics
 
 
 def register_routers(app: fastapi.FastAPI):
     from . import (
         account,
+        admin,
         album,
         business_hour,
         city,
@@ -37,6 +40,13 @@ def register_routers(app: fastapi.FastAPI):
     def health_check():
         return '<a href="/api/docs">/api/docs</a>'
 
+    @app.get('/metrics', include_in_schema=False, response_class=PlainTextResponse)
+    async def access_metrics():
+        """
+        Prometheus scrape target, async so the gauges read the handlers from the event loop thread.
+        """
+        return PlainTextResponse(metrics.registry.expose(), media_type=metrics.CONTENT_TYPE)
+
     app.include_router(public.router, prefix='/api')
     app.include_router(account.router, prefix='/api')
     app.include_router(google.router)  # no api prefix since google login can't allow /api for some unknown reason
@@ -50,3 +60,4 @@ def register_routers(app: fastapi.FastAPI):
     app.include_router(court.router, prefix='/api')
     app.include_router(business_hour.router, prefix='/api')
     app.include_router(view.router, prefix='/api')
+    app.include_router(admin.router, prefix='/api')
@@ -12,11 +12,17 @@ from app.base import do, enums
 from app.const import ALLOWED_MEDIA_TYPE
 from app.middleware.headers import get_auth_token
 from app.persistence.file_storage.gcs import gcs_handler
-from app.utils import Response, context, security, update_cookie
+from app.utils import (
+    ORJSONResponse,
+    Response,
+    context,
+    security,
+    update_cookie,
+)
 
 router = APIRouter(
     tags=['Account'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
     dependencies=[Depends(get_auth_token)],
 )
 
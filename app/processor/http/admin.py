@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import Sequence
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+
+import app.persistence.database as db
+from app.base import do, enums
+from app.middleware.headers import verify_admin_token
+from app.persistence.database.slow_query import slow_query_recorder
+from app.utils import Limit, Offset, ORJSONResponse, Response
+
+router = APIRouter(
+    tags=['Admin'],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(verify_admin_token)],
+)
+
+
+class SlowQueryOutput(BaseModel):
+    fingerprint: str
+    count: int
+    mean_ms: float
+    max_ms: float
+    last_seen: datetime | None = None
+    plan: str | None = None
+    explained_at: datetime | None = None
+
+
+@router.get('/admin/slow-query')
+async def browse_slow_query(limit: int | None = Query(default=None, gt=0)) -> Response[Sequence[SlowQueryOutput]]:
+    """
+    Slowest statements of this worker since it started, slowest first.
+    """
+    return Response(data=[
+        SlowQueryOutput(
+            fingerprint=entry.fingerprint,
+            count=entry.count,
+            mean_ms=round(entry.total_time / entry.count * 1000, 1),
+            max_ms=round(entry.max_time * 1000, 1),
+            last_seen=entry.last_seen,
+            plan=entry.plan,
+            explained_at=entry.explained_at,
+        )
+        for entry in slow_query_recorder.top(limit)
+    ])
+
+
+@router.delete('/admin/slow-query')
+async def clear_slow_query() -> Response[bool]:
+    slow_query_recorder.clear()
+    return Response(data=True)
+
+
+class JobOutput(BaseModel):
+    """
+    A job without its payload, which may hold personal data.
+    """
+    id: int
+    job_type: str
+    status: enums.JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    locked_at: datetime | None
+    last_error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+
+class BrowseJobOutput(BaseModel):
+    data: Sequence[JobOutput]
+    total_count: int
+    limit: int | None = None
+    offset: int | None = None
+
+
+@router.get('/admin/job')
+async def browse_job(
+        status: enums.JobStatus | None = None,
+        job_type: enums.JobType | None = None,
+        limit: int | None = Limit,
+        offset: int | None = Offset,
+) -> Response[BrowseJobOutput]:
+    """
+    Newest first, e.g. `status=DEAD` lists the jobs out of attempts with their last error.
+    """
+    jobs, total_count = await db.job.browse(status=status, job_type=job_type, limit=limit or 20, offset=offset or 0)
+    return Response(data=BrowseJobOutput(
+        data=[JobOutput(**job.model_dump(exclude={'payload'})) for job in jobs],
+        total_count=total_count, limit=limit, offset=offset,
+    ))
+
+
+class JobSummaryOutput(BaseModel):
+    job_type: str
+    status: enums.JobStatus
+    count: int
+
+
+@router.get('/admin/job/summary')
+async def browse_job_summary() -> Response[Sequence[JobSummaryOutput]]:
+    counts = await db.job.count_by_status()
+    return Response(data=[
+        JobSummaryOutput(job_type=job_type, status=status, count=count)
+        for (job_type, status), count in sorted(counts.items())
+    ])
+
+
+@router.post('/admin/job/{job_id}/retry')
+async def retry_job(job_id: int) -> Response[bool]:
+    """
+    Runs a dead job again with all its attempts.
+    """
+    await db.job.retry(job_id=job_id)
+    return Response(data=True)
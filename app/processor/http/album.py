@@ -1,7 +1,7 @@
 from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile, responses
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 from pydantic import BaseModel
 
 import app.exceptions as exc
@@ -9,13 +9,17 @@ import app.log as log
 import app.persistence.database as db
 from app.base import do, enums
 from app.const import ALLOWED_MEDIA_TYPE, BUCKET_NAME
+from app.middleware.cache import CachedRoute, cached
 from app.middleware.headers import get_auth_token
+from app.middleware.response import prevalidated
+from app.persistence.cache import response_cache
 from app.persistence.file_storage.gcs import gcs_handler
-from app.utils import Response, context
+from app.utils import ORJSONResponse, Response, context
 
 router = APIRouter(
     tags=['Album'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
@@ -30,6 +34,8 @@ class BrowseAlbumOutput(BaseModel):
 
 
 @router.get('/album')
+@cached(namespace=enums.CacheNamespace.album, ttl=600)  # signed urls expire in an hour
+@prevalidated
 async def browse_album(params: BrowseAlbumInput = Depends()) -> Response[Sequence[BrowseAlbumOutput]]:
     albums = await db.album.browse(
         place_type=params.place_type,
@@ -81,6 +87,7 @@ async def batch_add_album(
         place_id=place_id,
         uuids=uuids,
     )
+    await response_cache.invalidate(enums.CacheNamespace.album)
 
     return Response(
         data=[
@@ -125,6 +132,7 @@ async def add_album(
         place_id=place_id,
         uuids=[uuid],
     )
+    await response_cache.invalidate(enums.CacheNamespace.album)
 
     return Response(
         data=BrowseAlbumOutput(
@@ -154,5 +162,6 @@ async def batch_delete_album(data: BatchDeleteAlbumInput, _=Depends(get_auth_tok
         place_id=data.place_id,
         uuids=data.uuids,
     )
+    await response_cache.invalidate(enums.CacheNamespace.album)
 
     return Response()
@@ -1,15 +1,18 @@
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, Query, responses
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 import app.persistence.database as db
 from app.base import do, enums
-from app.utils import Response
+from app.middleware.cache import CachedRoute, cached
+from app.middleware.response import prevalidated
+from app.utils import ORJSONResponse, Response
 
 router = APIRouter(
     tags=['Business Hour'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
@@ -19,6 +22,8 @@ class BrowseBusinessHourParams(BaseModel):
 
 
 @router.get('/business-hour')
+@cached(namespace=enums.CacheNamespace.business_hour)
+@prevalidated
 async def browse_business_hour(params: BrowseBusinessHourParams = Depends()) -> Response[Sequence[do.BusinessHour]]:
     business_hour = await db.business_hour.browse(
         place_type=params.place_type,
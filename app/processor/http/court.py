@@ -1,20 +1,31 @@
 from datetime import date, datetime, timedelta
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, responses
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
+import app.const as const
 import app.exceptions as exc
 import app.persistence.database as db
 import app.persistence.email as email
 from app.base import do, enums, vo
 from app.client import google_calendar
+from app.config import pg_config
 from app.middleware.headers import get_auth_token
-from app.utils import Response, ServerTZDatetime, context, invitation_code
+from app.middleware.timeout import statement_timeout
+from app.persistence.cache import response_cache
+from app.utils import (
+    ORJSONResponse,
+    Response,
+    ServerTZDatetime,
+    context,
+    invitation_code,
+    recurrence,
+)
 
 router = APIRouter(
     tags=['Court'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -42,6 +53,7 @@ async def batch_edit_court(data: BatchEditCourtInput, _=Depends(get_auth_token))
         is_published=data.is_published,
     )
 
+    await response_cache.invalidate(enums.CacheNamespace.venue)
     return Response()
 
 
@@ -55,7 +67,10 @@ class BrowseReservationOutput(BaseModel):
     reservations: Sequence[do.Reservation]
 
 
-@router.post('/court/{court_id}/reservation/browse')
+@router.post(
+    '/court/{court_id}/reservation/browse',
+    dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))],
+)
 async def browse_reservation_by_court_id(court_id: int, params: BrowseReservationParameters) \
         -> Response[BrowseReservationOutput]:
     """
@@ -185,12 +200,11 @@ async def add_reservation(court_id: int, data: AddReservationInput, _=Depends(ge
     account = await db.account.read(account_id=account_id)
     stadium = await db.stadium.read(stadium_id=venue.stadium_id)
     location = f'{stadium.name} {venue.name} 第 {court.number} {venue.court_type}'
-    # if data.member_ids:
-    #     invitees = await db.account.batch_read(account_ids=data.member_ids)
-    #     await email.invitation.send(
-    #         meet_code=invite_code,
-    #         bcc=', '.join(invitee.email for invitee in invitees),
-    #     )
+    if data.member_ids:
+        await db.job.add(
+            job_type=enums.JobType.invitation_email,
+            payload={'invitation_code': invite_code, 'account_ids': list(data.member_ids)},
+        )
     if account.is_google_login:
         await google_calendar.add_google_calendar_event(
             reservation_id=reservation_id,
@@ -202,6 +216,80 @@ async def add_reservation(court_id: int, data: AddReservationInput, _=Depends(ge
     return Response(data=AddReservationOutput(id=reservation_id))
 
 
+class AddReservationSeriesInput(AddReservationInput):
+    recurrence: vo.Recurrence
+
+
+class AddReservationSeriesOutput(BaseModel):
+    ids: Sequence[int]
+
+
+@router.post('/court/{court_id}/reservation/series')
+async def add_reservation_series(court_id: int, data: AddReservationSeriesInput, _=Depends(get_auth_token)) \
+        -> Response[AddReservationSeriesOutput]:
+    """
+    Books the court on every occurrence of `recurrence`, all or none, one conflict check and one insert for all.
+    """
+    account_id = context.account.id
+
+    if data.start_time < context.request_time or data.start_time >= data.end_time \
+            or not (data.recurrence.count or data.recurrence.until):
+        raise exc.IllegalInput
+
+    time_ranges = recurrence.expand(
+        start_time=data.start_time, end_time=data.end_time,
+        recurrence=data.recurrence, limit=const.MAX_RECURRENCE_COUNT,
+    )
+    if not time_ranges or len(time_ranges) > const.MAX_RECURRENCE_COUNT:  # none when `until` is before the start
+        raise exc.IllegalInput
+
+    court = await db.court.read(court_id=court_id)
+    venue = await db.venue.read(venue_id=court.venue_id)
+
+    if not venue.is_reservable:
+        raise exc.VenueUnreservable
+
+    if venue.reservation_interval is not None \
+            and time_ranges[-1].start_time > context.request_time + timedelta(days=venue.reservation_interval):
+        raise exc.CourtUnreservable
+
+    if await db.reservation.browse_conflicts(court_id=court_id, time_ranges=time_ranges):
+        raise exc.CourtReserved
+
+    invitation_codes = [invitation_code.generate() for _ in time_ranges]
+    reservation_ids = await db.reservation.batch_add(
+        court_id=court_id,
+        venue_id=venue.id,
+        stadium_id=venue.stadium_id,
+        time_ranges=time_ranges,
+        technical_level=data.technical_level,
+        invitation_codes=invitation_codes,
+        manager_id=account_id,
+        member_ids=data.member_ids,
+        remark=data.remark,
+        member_count=data.member_count,
+        vacancy=data.vacancy,
+    )
+
+    if data.member_ids:  # invited to every occurrence, the mail leads to the first
+        await db.job.add(
+            job_type=enums.JobType.invitation_email,
+            payload={'invitation_code': invitation_codes[0], 'account_ids': list(data.member_ids)},
+        )
+    account = await db.account.read(account_id=account_id)
+    if account.is_google_login:
+        stadium = await db.stadium.read(stadium_id=venue.stadium_id)
+        await google_calendar.add_google_calendar_series(
+            reservation_ids=reservation_ids,
+            start_times=[time_range.start_time for time_range in time_ranges],
+            end_time=data.end_time,
+            recurrence=recurrence.to_rrule(data.recurrence, count=len(time_ranges)),
+            account_id=account_id,
+            location=f'{stadium.name} {venue.name} 第 {court.number} {venue.court_type}',
+        )
+    return Response(data=AddReservationSeriesOutput(ids=reservation_ids))
+
+
 class EditCourtInput(BaseModel):
     is_published: bool | None = None
 
@@ -219,6 +307,7 @@ async def edit_court(court_id: int, data: EditCourtInput, _=Depends(get_auth_tok
         court_id=court_id,
         is_published=data.is_published,
     )
+    await response_cache.invalidate(enums.CacheNamespace.venue)
     return Response()
 
 
@@ -241,4 +330,5 @@ async def batch_add_court(data: AddCourtInput, _=Depends(get_auth_token)) -> Res
         is_published=venue.is_published,
     )
 
+    await response_cache.invalidate(enums.CacheNamespace.venue)
     return Response(data=True)
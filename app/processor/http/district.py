@@ -1,18 +1,23 @@
 from typing import Sequence
 
-from fastapi import APIRouter, responses
+from fastapi import APIRouter
 
 import app.persistence.database as db
-from app.base import do
-from app.utils import Response
+from app.base import do, enums
+from app.middleware.cache import CachedRoute, cached
+from app.middleware.response import prevalidated
+from app.utils import ORJSONResponse, Response
 
 router = APIRouter(
     tags=['District'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
 @router.get('/district')
+@cached(namespace=enums.CacheNamespace.district, ttl=3600)
+@prevalidated
 async def browse_district(city_id: int) -> Response[Sequence[do.District]]:
     districts = await db.district.browse(city_id=city_id)
     return Response(data=districts)
@@ -2,7 +2,7 @@ import json
 from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, responses
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 from starlette.responses import RedirectResponse
 
@@ -13,12 +13,12 @@ from app.client.oauth import oauth_handler
 from app.config import service_config
 from app.middleware.headers import get_auth_token
 from app.persistence.file_storage.gcs import gcs_handler
-from app.utils import Response, update_cookie
+from app.utils import ORJSONResponse, Response, update_cookie
 from app.utils.security import encode_jwt
 
 router = APIRouter(
     tags=['Google'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
 )
 
 
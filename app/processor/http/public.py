@@ -9,8 +9,8 @@ from pydantic import BaseModel, EmailStr
 import app.const as const
 import app.exceptions as exc
 import app.persistence.database as db
-import app.persistence.email as email
-from app.base.enums import GenderType, RoleType
+from app.base.enums import GenderType, JobType, RoleType
+from app.startup import startup_orchestrator
 from app.utils import Response, update_cookie
 from app.utils.security import encode_jwt, hash_password, verify_password
 
@@ -31,6 +31,23 @@ async def health_check() -> Response[HealthCheckOutput]:
     return Response(data=HealthCheckOutput(health='ok'))
 
 
+class ReadinessCheckOutput(BaseModel):
+    startup_timings: dict[str, float]  # milliseconds per component
+
+
+@router.get('/health/ready')
+async def readiness_check() -> Response[ReadinessCheckOutput]:
+    """
+    Only gates on the database, other components are optional or initialize on first use.
+    """
+    if db.pg_pool_handler.pool is None:
+        raise exc.ServiceUnavailable
+
+    return Response(data=ReadinessCheckOutput(
+        startup_timings={name: seconds * 1000 for name, seconds in startup_orchestrator.timings.items()},
+    ))
+
+
 class LoginInput(BaseModel):
     email: EmailStr
     password: str
@@ -102,19 +119,24 @@ class AddAccountInput(BaseModel):
 
 @router.post('/account', tags=['Account'])
 async def add_account(data: AddAccountInput) -> Response[AddAccountOutput]:
-    try:
-        account_id = await db.account.add(
-            email=data.email,
-            pass_hash=hash_password(data.password),
-            nickname=data.nickname,
-            gender=data.gender,
-            role=data.role,
-            is_google_login=False,
+    pass_hash = hash_password(data.password)
+    async with db.pg_pool_handler.cursor() as cursor:  # no account without its verification mail queued
+        try:
+            account_id = await db.account.add(
+                email=data.email,
+                pass_hash=pass_hash,
+                nickname=data.nickname,
+                gender=data.gender,
+                role=data.role,
+                is_google_login=False,
+                cursor=cursor,
+            )
+        except exc.UniqueViolationError:
+            raise exc.EmailExists
+        await db.email_verification.add(account_id=account_id, email=data.email, cursor=cursor)
+        await db.job.add(
+            job_type=JobType.verification_email, payload={'account_id': account_id, 'to': data.email}, cursor=cursor,
         )
-    except exc.UniqueViolationError:
-        raise exc.EmailExists
-    code = await db.email_verification.add(account_id=account_id, email=data.email)
-    await email.verification.send(to=data.email, code=str(code))
     return Response(data=AddAccountOutput(id=account_id))
 
 
@@ -125,8 +147,8 @@ class ResendEmailVerificationInput(BaseModel):
 @router.post('/email-verification/resend', tags=['Email Verification'])
 async def resend_email_verification(data: ResendEmailVerificationInput):
     account_id, *_ = await db.account.read_by_email(email=data.email, include_unverified=True)
-    code = await db.email_verification.read(account_id=account_id, email=data.email)
-    await email.verification.send(to=data.email, code=str(code))
+    await db.email_verification.read(account_id=account_id, email=data.email)  # not found without a code to resend
+    await db.job.add(job_type=JobType.verification_email, payload={'account_id': account_id, 'to': data.email})
     return Response(data=EmailVerificationOutput(success=True))
 
 
@@ -137,8 +159,12 @@ class ForgetPasswordInput(BaseModel):
 @router.post('/forget-password', tags=['Account'])
 async def forget_password(data: ForgetPasswordInput) -> Response:
     account_id, *_ = await db.account.read_by_email(email=data.email)
-    code = await db.email_verification.add(account_id=account_id, email=data.email)
-    await email.forget_password.send(to=data.email, code=str(code))
+    async with db.pg_pool_handler.cursor() as cursor:
+        await db.email_verification.add(account_id=account_id, email=data.email, cursor=cursor)
+        await db.job.add(
+            job_type=JobType.forget_password_email, payload={'account_id': account_id, 'to': data.email},
+            cursor=cursor,
+        )
     return Response()
 
 
@@ -1,19 +1,21 @@
 from datetime import datetime
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, responses
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 import app.exceptions as exc
 import app.persistence.database as db
 from app.base import do, enums, vo
 from app.client import google_calendar
+from app.config import pg_config
 from app.middleware.headers import get_auth_token
-from app.utils import Limit, Offset, Response, context
+from app.middleware.timeout import statement_timeout
+from app.utils import Limit, Offset, ORJSONResponse, Response, context
 
 router = APIRouter(
     tags=['Reservation'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -40,7 +42,10 @@ class BrowseReservationOutput(BaseModel):
 
 
 # use POST here since GET can't process request body
-@router.post('/view/reservation')
+@router.post(
+    '/view/reservation',
+    dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))],
+)
 async def browse_reservation(params: BrowseReservationParameters) -> Response[BrowseReservationOutput]:
     reservations, total_count = await db.reservation.browse(
         city_id=params.city_id,
@@ -92,27 +97,13 @@ async def read_reservation_by_invitation_code(invitation_code: str) -> Response[
 @router.post('/reservation/code/{invitation_code}')
 async def join_reservation(invitation_code: str, _=Depends(get_auth_token)) -> Response[bool]:
     account_id = context.account.id
-    reservation = await db.reservation.read_by_code(invitation_code=invitation_code)
-
-    if reservation.vacancy <= 0:
-        raise exc.ReservationFull
-
-    await db.reservation_member.batch_add_with_do(
-        members=[
-            do.ReservationMember(
-                reservation_id=reservation.id,
-                account_id=context.account.id,
-                is_manager=False,
-                status=enums.ReservationMemberStatus.joined,
-                source=enums.ReservationMemberSource.invitation_code,
-            ),
-        ],
-    )
+    reservation_id, is_joined = await db.reservation_member.join(invitation_code=invitation_code, account_id=account_id)
 
-    await google_calendar.add_google_calendar_event_member(
-        reservation_id=reservation.id,
-        member_id=account_id,
-    )
+    if is_joined:
+        await db.job.add(
+            job_type=enums.JobType.calendar_event_member,
+            payload={'reservation_id': reservation_id, 'member_id': account_id},
+        )
 
     return Response(data=True)
 
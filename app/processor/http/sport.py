@@ -1,18 +1,23 @@
 from typing import Sequence
 
-from fastapi import APIRouter, responses
+from fastapi import APIRouter
 
 import app.persistence.database as db
-from app.base import do
-from app.utils import Response
+from app.base import do, enums
+from app.middleware.cache import CachedRoute, cached
+from app.middleware.response import prevalidated
+from app.utils import ORJSONResponse, Response
 
 router = APIRouter(
     tags=['Sport'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
 @router.get('/sport')
+@cached(namespace=enums.CacheNamespace.sport, ttl=3600)
+@prevalidated
 async def browse_sport() -> Response[Sequence[do.Sport]]:
     sports = await db.sport.browse()
     return Response(data=sports)
@@ -1,18 +1,24 @@
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, responses
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 import app.exceptions as exc
 import app.persistence.database as db
 from app.base import enums, vo
 from app.client.google_maps import google_maps
+from app.config import pg_config
+from app.middleware.cache import CachedRoute, cached
 from app.middleware.headers import get_auth_token
-from app.utils import Limit, Offset, Response, context
+from app.middleware.response import prevalidated
+from app.middleware.timeout import statement_timeout
+from app.persistence.cache import response_cache
+from app.utils import Limit, Offset, ORJSONResponse, Response, context
 
 router = APIRouter(
     tags=['Stadium'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
@@ -34,7 +40,12 @@ class BrowseStadiumOutput(BaseModel):
 
 
 # use POST here since GET can't process request body
-@router.post('/stadium/browse')
+@router.post(
+    '/stadium/browse',
+    dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))],
+)
+@cached(namespace=enums.CacheNamespace.stadium)
+@prevalidated
 async def browse_stadium(params: StadiumSearchParameters) -> Response[BrowseStadiumOutput]:
     stadiums, row_count = await db.stadium.browse(
         name=params.name,
@@ -76,6 +87,7 @@ async def batch_edit_stadium(data: BatchEditStadiumInput, _=Depends(get_auth_tok
         await db.venue.batch_edit(venue_ids=[venue.id for venue in venues], is_published=False)
         await db.court.batch_edit(court_ids=[court.id for court in courts], is_published=False)
 
+    await response_cache.invalidate(enums.CacheNamespace.stadium, enums.CacheNamespace.venue)
     return Response()
 
 
@@ -109,6 +121,7 @@ async def edit_stadium(stadium_id: int, data: EditStadiumInput, _=Depends(get_au
         is_published=data.is_published,
     )
 
+    await response_cache.invalidate(enums.CacheNamespace.stadium, enums.CacheNamespace.business_hour)
     return Response()
 
 
@@ -149,6 +162,7 @@ async def add_stadium(data: AddStadiumInput, _=Depends(get_auth_token)) -> Respo
         business_hours=data.business_hours,
     )
 
+    await response_cache.invalidate(enums.CacheNamespace.stadium, enums.CacheNamespace.business_hour)
     return Response(data=AddStadiumOutput(id=id_))
 
 
@@ -1,18 +1,26 @@
+from datetime import timedelta
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, Query, responses
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 import app.exceptions as exc
 import app.persistence.database as db
 from app import log
 from app.base import do, enums, vo
+from app.config import pg_config
+from app.middleware.cache import CachedRoute, cached
 from app.middleware.headers import get_auth_token
-from app.utils import Limit, Offset, Response, context
+from app.middleware.response import prevalidated
+from app.middleware.timeout import statement_timeout
+from app.persistence.cache import response_cache
+from app.utils import (Limit, Offset, ORJSONResponse, Response, context,
+                       free_slot)
 
 router = APIRouter(
     tags=['Venue'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=CachedRoute,
 )
 
 
@@ -35,6 +43,8 @@ class BrowseVenueOutput(BaseModel):
 
 
 @router.get('/venue')
+@cached(namespace=enums.CacheNamespace.venue)
+@prevalidated
 async def browse_venue(params: VenueSearchParameters = Depends()) -> Response[BrowseVenueOutput]:
     venues, total_count = await db.venue.browse(
         name=params.name,
@@ -73,6 +83,7 @@ async def batch_edit_venue(data: BatchEditVenueInput, _=Depends(get_auth_token))
     if data.is_published is False:
         await db.court.batch_edit(court_ids=[court.id for court in courts], is_published=data.is_published)
 
+    await response_cache.invalidate(enums.CacheNamespace.venue, enums.CacheNamespace.stadium)
     return Response()
 
 
@@ -97,7 +108,10 @@ class BrowseCourtByVenueIdParams(BaseModel):
 
 
 # use post since get can't have body
-@router.post('/venue/{venue_id}/court')
+@router.post(
+    '/venue/{venue_id}/court',
+    dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))],
+)
 async def browse_court_by_venue_id(venue_id: int, params: BrowseCourtByVenueIdParams, _=Depends(get_auth_token))\
         -> Response[Sequence[do.Court]]:
     include_unpublished = context.account.role == enums.RoleType.provider if context.get_account() else False
@@ -116,14 +130,12 @@ async def browse_court_by_venue_id(venue_id: int, params: BrowseCourtByVenueIdPa
             court_id=court.id,
             time_ranges=params.time_ranges,
         )
-        log.logger.error(reservations)
+        log.logger.debug('court %s has %d reservations in time ranges', court.id, len(reservations))
         available_date = None
 
         for time_range in params.time_ranges:
             is_available = True
             for reservation in reservations:
-                log.logger.error(time_range)
-                log.logger.error((reservation.start_time, reservation.end_time))
                 if reservation.start_time <= time_range.start_time \
                         and reservation.end_time >= time_range.end_time \
                         and reservation.vacancy <= 0:
@@ -138,6 +150,43 @@ async def browse_court_by_venue_id(venue_id: int, params: BrowseCourtByVenueIdPa
     return Response(data=available_courts)
 
 
+class FreeSlotParameters(BaseModel):
+    court_id: int | None = Query(default=None)
+    duration: int = Query(default=60, gt=0, le=24 * 60, description='minutes')
+    horizon: int = Query(default=7, gt=0, le=60, description='days')
+    limit: int = Query(default=5, gt=0, le=50)
+
+
+@router.get('/venue/{venue_id}/free-slot')
+async def browse_free_slot(venue_id: int, params: FreeSlotParameters = Depends()) -> Response[Sequence[vo.FreeSlot]]:
+    """
+    Earliest free slots of the venue's courts, or of `court_id` only, within the next `horizon` days,
+    no later than the venue takes reservations.
+    """
+    venue = await db.venue.read(venue_id=venue_id)
+    courts = await db.court.browse(venue_ids=[venue_id])
+    court_ids = [court.id for court in courts if params.court_id in (None, court.id)]
+    if not court_ids:
+        raise exc.NotFound
+
+    horizon = params.horizon
+    if venue.reservation_interval is not None:
+        horizon = min(horizon, venue.reservation_interval)
+    start_time = context.request_time
+    end_time = start_time + timedelta(days=horizon)
+
+    business_hours = await db.business_hour.browse(place_type=enums.PlaceType.venue, place_id=venue_id)
+    reservations = await db.reservation.browse_by_courts(court_ids=court_ids, start_time=start_time, end_time=end_time)
+
+    return Response(data=free_slot.earliest(
+        windows=free_slot.open_windows(business_hours, start_time=start_time, end_time=end_time),
+        reservations=reservations,
+        court_ids=court_ids,
+        duration=timedelta(minutes=params.duration),
+        limit=params.limit,
+    ))
+
+
 class EditVenueInput(BaseModel):
     name: str | None = None
     floor: str | None = None
@@ -166,6 +215,7 @@ async def edit_venue(venue_id: int, data: EditVenueInput, _=Depends(get_auth_tok
         venue_id=venue.id,
         **data.model_dump(),
     )
+    await response_cache.invalidate(enums.CacheNamespace.venue, enums.CacheNamespace.stadium)
     return Response()
 
 
@@ -229,4 +279,7 @@ async def add_venue(data: AddVenueInput, _=Depends(get_auth_token)) -> Response[
         start_from=1,
     )
 
+    await response_cache.invalidate(
+        enums.CacheNamespace.venue, enums.CacheNamespace.stadium, enums.CacheNamespace.business_hour,
+    )
     return Response(data=AddVenueOutput(id=id_))
@@ -1,17 +1,23 @@
+from datetime import date, datetime, time, timedelta
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, Query, responses
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 import app.exceptions as exc
 import app.persistence.database as db
 from app.base import enums, vo
+from app.config import pg_config
 from app.middleware.headers import get_auth_token
-from app.utils import Limit, Offset, Response, context
+from app.middleware.response import PrevalidatedRoute, prevalidated
+from app.middleware.timeout import statement_timeout
+from app.utils import (Limit, Offset, ORJSONResponse, Response, context,
+                       occupancy)
 
 router = APIRouter(
     tags=['View'],
-    default_response_class=responses.JSONResponse,
+    default_response_class=ORJSONResponse,
+    route_class=PrevalidatedRoute,
 )
 
 
@@ -37,6 +43,7 @@ class ViewMyReservationOutput(BaseModel):
 
 
 @router.post('/view/my-reservation')
+@prevalidated
 async def view_my_reservation(data: ViewMyReservationParams, _=Depends(get_auth_token))\
         -> Response[ViewMyReservationOutput]:
     if context.account.id != data.account_id:
@@ -66,6 +73,55 @@ async def view_my_reservation(data: ViewMyReservationParams, _=Depends(get_auth_
     )
 
 
+class ViewFreeCourtParams(BaseModel):
+    time_ranges: Sequence[vo.DateTimeRange]
+    city_id: int | None = None
+    district_id: int | None = None
+    sport_id: int | None = None
+    long: float | None = None
+    lat: float | None = None
+    limit: int | None = Limit
+    offset: int | None = Offset
+
+
+class ViewFreeCourtOutput(BaseModel):
+    data: Sequence[vo.ViewFreeCourt]
+    total_count: int
+    limit: int | None = None
+    offset: int | None = None
+
+
+# use post since get can't have body
+@router.post(
+    '/view/free-court',
+    dependencies=[Depends(statement_timeout(pg_config.browse_statement_timeout_ms))],
+)
+@prevalidated
+async def view_free_court(data: ViewFreeCourtParams) -> Response[ViewFreeCourtOutput]:
+    if not data.time_ranges:
+        raise exc.IllegalInput
+
+    courts, total_count = await db.view.browse_free_court(
+        time_ranges=data.time_ranges,
+        request_time=context.request_time,
+        city_id=data.city_id,
+        district_id=data.district_id,
+        sport_id=data.sport_id,
+        long=data.long,
+        lat=data.lat,
+        limit=data.limit or 10,
+        offset=data.offset or 0,
+    )
+    return Response(
+        data=ViewFreeCourtOutput(
+            data=courts,
+            total_count=total_count,
+            limit=data.limit,
+            offset=data.offset,
+        ),
+    )
+
+
 class ViewProviderStadiumParams(BaseModel):
     city_id: int | None = Query(default=None)
     district_id: int | None = Query(default=None)
@@ -84,6 +140,7 @@ class ViewProviderStadiumOutput(BaseModel):
 
 
 @router.get('/view/stadium/provider')
+@prevalidated
 async def view_provider_stadium(
     params: ViewProviderStadiumParams = Depends(),
     _=Depends(get_auth_token),
@@ -131,6 +188,7 @@ class ViewProviderVenueOutput(BaseModel):
 
 
 @router.get('/view/venue/provider')
+@prevalidated
 async def view_provider_venue(
     params: ViewProviderVenueParams = Depends(),
     _=Depends(get_auth_token),
@@ -178,6 +236,7 @@ class ViewProviderCourtOutput(BaseModel):
 
 
 @router.get('/view/court/provider')
+@prevalidated
 async def view_provider_court(
     params: ViewProviderCourtParams = Depends(),
     _=Depends(get_auth_token),
@@ -205,3 +264,117 @@ async def view_provider_court(
             offset=params.offset,
         ),
     )
+
+
+class ViewProviderScheduleParams(BaseModel):
+    stadium_id: int | None = Query(default=None)
+    venue_id: int | None = Query(default=None)
+    start_date: date | None = Query(default=None)
+    days: int = Query(default=7, gt=0, le=31)
+    slot_minutes: int = Query(default=30, gt=0, le=24 * 60)
+
+
+class ViewProviderScheduleOutput(BaseModel):
+    start_time: datetime
+    slot_minutes: int
+    slot_count: int
+    courts: Sequence[vo.ViewCourtOccupancy]
+
+
+@router.get('/view/schedule/provider')
+@prevalidated
+async def view_provider_schedule(
+    params: ViewProviderScheduleParams = Depends(),
+    _=Depends(get_auth_token),
+) -> Response[ViewProviderScheduleOutput]:
+    """
+    Occupancy of every owned court, `days` from `start_date` in slots of `slot_minutes`,
+    as the occupied runs of each court. Cancelled reservations do not occupy.
+    """
+    if (24 * 60) % params.slot_minutes:
+        raise exc.IllegalInput
+
+    account = await db.account.read(account_id=context.account.id)
+
+    if account.role != enums.RoleType.provider:
+        raise exc.NoPermission
+
+    courts, _ = await db.view.browse_provider_court(
+        owner_id=account.id,
+        stadium_id=params.stadium_id,
+        venue_id=params.venue_id,
+    )
+
+    start_time = datetime.combine(params.start_date or context.request_time.date(), time())
+    slot = timedelta(minutes=params.slot_minutes)
+    slot_count = params.days * 24 * 60 // params.slot_minutes
+    court_ids = [court.court_id for court in courts]
+
+    reservations = await db.reservation.browse_by_courts(
+        court_ids=court_ids, start_time=start_time, end_time=start_time + slot * slot_count,
+    ) if court_ids else []
+
+    matrix = occupancy.rasterize(
+        court_ids=court_ids,
+        reservations=[reservation for reservation in reservations if not reservation.is_cancelled],
+        start_time=start_time, slot=slot, slot_count=slot_count,
+    )
+    return Response(
+        data=ViewProviderScheduleOutput(
+            start_time=start_time,
+            slot_minutes=params.slot_minutes,
+            slot_count=slot_count,
+            courts=[
+                vo.ViewCourtOccupancy(
+                    court_id=court.court_id,
+                    stadium_name=court.stadium_name,
+                    venue_name=court.venue_name,
+                    court_number=court.court_number,
+                    occupied=runs,
+                )
+                for court, runs in zip(courts, occupancy.run_lengths(matrix))
+            ],
+        ),
+    )
+
+
+class ViewProviderStatParams(BaseModel):
+    stadium_id: int | None = Query(default=None)
+    venue_id: int | None = Query(default=None)
+    start_date: date | None = Query(default=None)
+    end_date: date | None = Query(default=None)
+
+
+class ViewProviderStatOutput(BaseModel):
+    start_date: date
+    end_date: date
+    data: Sequence[vo.ViewCourtDailyStat]
+
+
+@router.get('/view/stat/provider')
+@prevalidated
+async def view_provider_stat(
+    params: ViewProviderStatParams = Depends(),
+    _=Depends(get_auth_token),
+) -> Response[ViewProviderStatOutput]:
+    """
+    Daily reservation numbers of the owned courts, the last 30 days by default. Reads the rollup only.
+    """
+    end_date = params.end_date or context.request_time.date()
+    start_date = params.start_date or end_date - timedelta(days=29)
+    if start_date > end_date or (end_date - start_date).days > 366:
+        raise exc.IllegalInput
+
+    account = await db.account.read(account_id=context.account.id)
+
+    if account.role != enums.RoleType.provider:
+        raise exc.NoPermission
+
+    stats = await db.court_daily_stat.browse(
+        owner_id=account.id,
+        start_date=start_date,
+        end_date=end_date,
+        stadium_id=params.stadium_id,
+        venue_id=params.venue_id,
+    )
+    return Response(data=ViewProviderStatOutput(start_date=start_date, end_date=end_date, data=stats))
@@ -0,0 +1,144 @@
+"""
+Runs the background jobs of `app.persistence.database.job` in the worker's event loop.
+------
+
+usage:
+    @job_runner.handler(enums.JobType.verification_email, concurrency=4)
+    async def send_verification_email(payload: Mapping[str, Any]):
+        ...
+
+    await db.job.add(job_type=enums.JobType.verification_email, payload={...})
+
+Every job type is polled by its own loop, which never has more than `concurrency` jobs of it running
+in this worker, so a slow smtp server cannot hold up calendar calls.
+A handler raising fails the attempt, and is retried until the job is dead.
+"""
+import asyncio
+import dataclasses
+from typing import Any, Awaitable, Callable, Mapping
+
+import app.log as log
+import app.persistence.database as db
+from app.base import do, enums, mcs
+from app.config import JobConfig
+from app.utils import metrics
+
+Handler = Callable[[Mapping[str, Any]], Awaitable[None]]
+
+
+@dataclasses.dataclass
+class JobKind:
+    job_type: enums.JobType
+    handler: Handler
+    concurrency: int
+    running: set[asyncio.Task] = dataclasses.field(default_factory=set)
+
+
+class JobRunner(metaclass=mcs.Singleton):
+    def __init__(self):
+        self.kinds: dict[enums.JobType, JobKind] = {}
+        self._job_config: JobConfig | None = None
+        self._loops: set[asyncio.Task] = set()
+
+    def handler(self, job_type: enums.JobType, concurrency: int = 1) -> Callable[[Handler], Handler]:
+        def register(handler: Handler) -> Handler:
+            if job_type in self.kinds:
+                raise ValueError(f'job type {job_type} already has a handler')
+            self.kinds[job_type] = JobKind(job_type=job_type, handler=handler, concurrency=concurrency)
+            return handler
+
+        return register
+
+    async def start(self, job_config: JobConfig):
+        if self._loops or not job_config.enabled:
+            return
+        self._job_config = job_config
+        for kind in self.kinds.values():
+            self._loops.add(asyncio.create_task(self._keep_polling(kind)))
+        self._loops.add(asyncio.create_task(self._keep_releasing_stale()))
+
+    async def close(self):
+        """
+        Stops claiming, and gives the running jobs `JOB_SHUTDOWN_GRACE` seconds;
+        a job cut off is taken again once it is stale.
+        """
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = set()
+
+        running = [task for kind in self.kinds.values() for task in kind.running]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=self._job_config.shutdown_grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def poll(self, kind: JobKind) -> int:
+        """
+        Claims as many jobs as `kind` has free slots and starts them, returns how many it started.
+        """
+        free = kind.concurrency - len(kind.running)
+        if free <= 0:
+            return 0
+        jobs = await db.job.claim(job_type=kind.job_type, limit=free)
+        for job in jobs:
+            task = asyncio.create_task(self.run(kind, job))
+            kind.running.add(task)
+            task.add_done_callback(kind.running.discard)
+        return len(jobs)
+
+    async def run(self, kind: JobKind, job: do.Job):
+        try:
+            await kind.handler(job.payload)
+        except Exception as e:
+            status = await db.job.fail(
+                job_id=job.id, attempts=job.attempts, error=repr(e), backoff_seconds=self._job_config.retry_backoff,
+            )
+            if status is None:
+                log.logger.warning(f'job {job.id} attempt {job.attempts} failed after it was released: {e!r}')
+                return
+            jobs_finished.inc(kind.job_type.value, status.value)
+            log.logger.warning(f'job {job.id} {kind.job_type} attempt {job.attempts} failed, now {status}: {e!r}')
+            return
+        if not await db.job.finish(job_id=job.id, attempts=job.attempts):
+            log.logger.warning(f'job {job.id} attempt {job.attempts} finished after it was released')
+            return
+        jobs_finished.inc(kind.job_type.value, enums.JobStatus.done.value)
+
+    async def _keep_polling(self, kind: JobKind):
+        while True:
+            try:
+                started = await self.poll(kind)
+            except Exception as e:
+                log.logger.error(f'failed to claim {kind.job_type} jobs: {e!r}')
+                started = 0
+            if not started:  # idle or full, a full kind frees slots as its jobs end
+                await asyncio.sleep(self._job_config.poll_interval)
+
+    async def _keep_releasing_stale(self):
+        while True:
+            await asyncio.sleep(self._job_config.stale_after / 2)
+            try:
+                released = await db.job.release_stale(stale_seconds=self._job_config.stale_after)
+            except Exception as e:
+                log.logger.error(f'failed to release stale jobs: {e!r}')
+                continue
+            if released:
+                log.logger.warning(f'released {released} stale jobs, pending again or dead')
+
+
+job_runner = JobRunner()
+
+jobs_finished = metrics.registry.counter(
+    'jobs_finished', 'Job attempts ended by this worker, by job type and the status they left the job in.',
+    ['job_type', 'status'],
+)
+metrics.registry.gauge(
+    'jobs_running', 'Jobs this worker is running, by job type; the backlog is in `GET /api/admin/job/summary`.',
+    ['job_type'],
+    function=lambda: {(kind.job_type.value,): len(kind.running) for kind in job_runner.kinds.values()},
+)
+
+# For import usage
+from . import email, google_calendar
@@ -0,0 +1,53 @@
+from typing import Any, Mapping
+
+import app.exceptions as exc
+import app.log as log
+import app.persistence.database as db
+from app.base import enums
+from app.config import smtp_config
+from app.persistence import email
+
+from . import job_runner
+
+
+async def _read_code(payload: Mapping[str, Any]) -> str | None:
+    """
+    Payloads only refer to the verification, jobs are kept and listed to admins, the code must not be in them.
+    """
+    try:
+        code = await db.email_verification.read(account_id=payload['account_id'], email=payload['to'],
+                                                include_consumed=False)
+    except exc.NotFound:
+        log.logger.info(f'no unconsumed code of account {payload["account_id"]} left to send')
+        return None
+    return str(code)
+
+
+@job_runner.handler(enums.JobType.verification_email, concurrency=smtp_config.pool_size)
+async def send_verification_email(payload: Mapping[str, Any]):
+    if code := await _read_code(payload):
+        await email.verification.send(to=payload['to'], code=code)
+
+
+@job_runner.handler(enums.JobType.forget_password_email, concurrency=smtp_config.pool_size)
+async def send_forget_password_email(payload: Mapping[str, Any]):
+    if code := await _read_code(payload):
+        await email.forget_password.send(to=payload['to'], code=code)
+
+
+@job_runner.handler(enums.JobType.invitation_email)
+async def send_invitation_emails(payload: Mapping[str, Any]):
+    """
+    One job for all invitees of a reservation, `send_many` spreads them over the smtp pool itself.
+    Retried only when no message went out, a retry would mail again those that did.
+    """
+    invitees = await db.account.batch_read(account_ids=payload['account_ids'])
+    results = await email.invitation.send_many(
+        meet_code=payload['invitation_code'],
+        invitees=[(invitee.email, invitee.nickname) for invitee in invitees],
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        log.logger.warning(f'failed to send an invitation of {payload["invitation_code"]}: {error!r}')
@@ -0,0 +1,14 @@
+from typing import Any, Mapping
+
+from app.base import enums
+from app.client import google_calendar
+
+from . import job_runner
+
+
+@job_runner.handler(enums.JobType.calendar_event_member, concurrency=2)
+async def add_event_member(payload: Mapping[str, Any]):
+    await google_calendar.add_google_calendar_event_member(
+        reservation_id=payload['reservation_id'],
+        member_id=payload['member_id'],
+    )
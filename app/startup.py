@@ -0,0 +1,59 @@
+"""
+Brings up the external clients of a worker.
+------
+
+Components in one call are initialized concurrently and timed one by one.
+Required components are awaited before the worker accepts requests,
+deferred ones keep initializing in the background and only log their failures,
+since their handlers either stay no-op until ready or initialize on first use.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Mapping
+
+from app import log
+from app.base import mcs
+
+Initializer = Callable[[], Awaitable[None]]
+
+
+class StartupOrchestrator(metaclass=mcs.Singleton):
+    def __init__(self):
+        self.timings: dict[str, float] = {}  # seconds per component
+        self._deferred_tasks: set[asyncio.Task] = set()
+
+    async def start(self, required: Mapping[str, Initializer], deferred: Mapping[str, Initializer] | None = None):
+        for name, initializer in (deferred or {}).items():
+            task = asyncio.create_task(self._initialize(name, initializer, raise_error=False))
+            self._deferred_tasks.add(task)
+            task.add_done_callback(self._deferred_tasks.discard)
+
+        await asyncio.gather(*(self._initialize(name, initializer) for name, initializer in required.items()))
+
+    async def join(self):
+        """
+        Waits for the deferred components, e.g. in tests or before closing them.
+        """
+        await asyncio.gather(*self._deferred_tasks)
+
+    async def cancel(self):
+        for task in self._deferred_tasks:
+            task.cancel()
+        await asyncio.gather(*self._deferred_tasks, return_exceptions=True)
+
+    async def _initialize(self, name: str, initializer: Initializer, raise_error: bool = True):
+        log.logger.info(f'initializing {name}')
+        start = time.perf_counter()
+        try:
+            await initializer()
+        except Exception as e:
+            if raise_error:
+                raise
+            log.logger.error(f'failed to initialize {name}: {e!r}')
+            return
+        finally:
+            self.timings[name] = time.perf_counter() - start
+        log.logger.info(f'initialized {name} in {self.timings[name] * 1000:.1f} ms')
+
+
+startup_orchestrator = StartupOrchestrator()
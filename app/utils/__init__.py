@@ -1,4 +1,4 @@
 from .context import context
 from .parameters import Limit, Offset, ServerTZDatetime
-from .response import Response, update_cookie
+from .response import ORJSONResponse, Response, update_cookie
 from .security import AuthedAccount
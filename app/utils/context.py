@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 from uuid import UUID
 
 import starlette_context
@@ -7,6 +8,9 @@ import app.exceptions as exc
 from app.base import mcs
 from app.utils.security import AuthedAccount
 
+if TYPE_CHECKING:
+    from app.utils.profiler import RequestProfile
+
 
 class Context(metaclass=mcs.Singleton):
     _context = starlette_context.context
@@ -14,6 +18,9 @@ class Context(metaclass=mcs.Singleton):
     CONTEXT_AUTHED_ACCOUNT_KEY = 'AUTHED_ACCOUNT'
     REQUEST_UUID_KEY = 'REQUEST_UUID'
     REQUEST_TIME_KEY = 'REQUEST_TIME'
+    REQUEST_PROFILE_KEY = 'REQUEST_PROFILE'
+    PRIMARY_STICKY_KEY = 'PRIMARY_STICKY'
+    STATEMENT_TIMEOUT_KEY = 'STATEMENT_TIMEOUT'
 
     @property
     def account(self) -> AuthedAccount:
@@ -48,5 +55,30 @@ class Context(metaclass=mcs.Singleton):
     def get_request_time(self) -> datetime | None:
         return self._context.get(self.REQUEST_TIME_KEY) if self._context.exists() else None
 
+    def set_request_profile(self, request_profile: 'RequestProfile') -> None:
+        self._context[self.REQUEST_PROFILE_KEY] = request_profile
+
+    def get_request_profile(self) -> 'RequestProfile | None':
+        return self._context.get(self.REQUEST_PROFILE_KEY) if self._context.exists() else None
+
+    def set_primary_sticky(self) -> None:
+        """
+        Marks that the request wrote, its later reads go to the primary to see the write.
+        """
+        if self._context.exists():
+            self._context[self.PRIMARY_STICKY_KEY] = True
+
+    def is_primary_sticky(self) -> bool:
+        return bool(self._context.get(self.PRIMARY_STICKY_KEY)) if self._context.exists() else False
+
+    def set_statement_timeout(self, timeout: float) -> None:
+        self._context[self.STATEMENT_TIMEOUT_KEY] = timeout
+
+    def get_statement_timeout(self) -> float | None:
+        """
+        Seconds a statement of this request may run, `None` leaves it to `PG_STATEMENT_TIMEOUT_MS`.
+        """
+        return self._context.get(self.STATEMENT_TIMEOUT_KEY) if self._context.exists() else None
+
 
 context = Context()
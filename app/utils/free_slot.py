@@ -0,0 +1,86 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Iterator, Mapping, Sequence
+
+from app.base import do, vo
+
+
+def open_windows(business_hours: Sequence[vo.WeekTimeRange], start_time: datetime, end_time: datetime) \
+        -> list[vo.DateTimeRange]:
+    """
+    Business hours laid out on the days of [start_time, end_time), clipped to it, sorted and merged.
+    Weekdays are ISO, 1 being Monday.
+    """
+    windows = []
+    day = start_time.date()
+    while day <= end_time.date():
+        for business_hour in business_hours:
+            if business_hour.weekday != day.isoweekday():
+                continue
+            window_start = max(datetime.combine(day, business_hour.start_time), start_time)
+            window_end = min(datetime.combine(day, business_hour.end_time), end_time)
+            if window_start < window_end:
+                windows.append((window_start, window_end))
+        day += timedelta(days=1)
+
+    merged: list[list[datetime]] = []
+    for window_start, window_end in sorted(windows):
+        if merged and window_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], window_end)
+        else:
+            merged.append([window_start, window_end])
+    return [vo.DateTimeRange(start_time=window_start, end_time=window_end) for window_start, window_end in merged]
+
+
+def free_ranges(windows: Sequence[vo.DateTimeRange], busy: Sequence[vo.DateTimeRange]) \
+        -> Iterator[vo.DateTimeRange]:
+    """
+    Gaps of the sorted, disjoint `windows` not covered by `busy`, which is sorted by start time, in order.
+    """
+    first = 0
+    for window in windows:
+        cursor = window.start_time
+        while first < len(busy) and busy[first].end_time <= cursor:
+            first += 1
+        i = first
+        while i < len(busy) and busy[i].start_time < window.end_time:
+            if busy[i].start_time > cursor:
+                yield vo.DateTimeRange(start_time=cursor, end_time=busy[i].start_time)
+            cursor = max(cursor, busy[i].end_time)
+            i += 1
+        if cursor < window.end_time:
+            yield vo.DateTimeRange(start_time=cursor, end_time=window.end_time)
+
+
+def earliest(
+        windows: Sequence[vo.DateTimeRange], reservations: Sequence[do.Reservation], court_ids: Sequence[int],
+        duration: timedelta, limit: int,
+) -> list[vo.FreeSlot]:
+    """
+    The `limit` earliest slots of `duration` over all courts, one per free gap.
+    Every court's gaps come lazily in order and a heap keeps the next one of each,
+    so the sweep stops as soon as enough slots are found.
+    """
+    busy: Mapping[int, list[vo.DateTimeRange]] = {court_id: [] for court_id in court_ids}
+    for reservation in sorted(reservations, key=lambda reservation: reservation.start_time):
+        if reservation.court_id in busy:
+            busy[reservation.court_id].append(
+                vo.DateTimeRange(start_time=reservation.start_time, end_time=reservation.end_time),
+            )
+
+    gaps = {
+        court_id: (gap for gap in free_ranges(windows, court_busy) if gap.end_time - gap.start_time >= duration)
+        for court_id, court_busy in busy.items()
+    }
+    heap = []
+    for court_id, court_gaps in gaps.items():
+        if gap := next(court_gaps, None):
+            heapq.heappush(heap, (gap.start_time, court_id))
+
+    slots = []
+    while heap and len(slots) < limit:
+        start_time, court_id = heapq.heappop(heap)
+        slots.append(vo.FreeSlot(court_id=court_id, start_time=start_time, end_time=start_time + duration))
+        if gap := next(gaps[court_id], None):
+            heapq.heappush(heap, (gap.start_time, court_id))
+    return slots
@@ -0,0 +1,202 @@
+"""
+In-process metrics in the Prometheus text format, served at `/metrics`.
+------
+
+Each worker keeps its own values, the image runs one uvicorn worker per pod so every scrape target is one process.
+Counters and histograms are plain dicts updated on the event loop, no locks are taken.
+Gauges of handler state are read by callbacks at scrape time, nothing is polled in between.
+"""
+import bisect
+import math
+from typing import Callable, Iterator, Mapping, Sequence
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, Mapping[str, str], float]  # (suffix, labels, value)
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1., 2.5, 5., 7.5, 10.)
+CONTENT_TYPE = 'text/plain; version=0.0.4'  # starlette appends the charset
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+class MetricBase:
+    type_: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, values: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_}']
+        lines += [
+            f'{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}'
+            for suffix, labels, value in self.samples()
+        ]
+        return '\n'.join(lines)
+
+
+class Counter(MetricBase):
+    type_ = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        for label_values, value in self._values.items():
+            yield '_total', self._labels(label_values), value
+
+
+class Gauge(MetricBase):
+    """
+    Either set directly, or read from `function` at scrape time, e.g.
+        Gauge('db_pool_size', '...', function=lambda: pool.get_size())
+    A function returning a mapping gives one sample per label values tuple.
+    """
+    type_ = 'gauge'
+
+    def __init__(
+            self, name: str, documentation: str, labelnames: Sequence[str] = (),
+            function: Callable[[], float | Mapping[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def samples(self) -> Iterator[Sample]:
+        values = self._values
+        if self.function is not None:
+            result = self.function()
+            values = result if isinstance(result, Mapping) else {(): result}
+        for label_values, value in values.items():
+            yield '', self._labels(label_values), value
+
+
+class Histogram(MetricBase):
+    type_ = 'histogram'
+
+    def __init__(
+            self, name: str, documentation: str, labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}  # per bucket, not cumulative, the last one is +Inf
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        try:
+            counts = self._counts[label_values]
+        except KeyError:
+            counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+            self._sums[label_values] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[label_values] += value
+
+    def samples(self) -> Iterator[Sample]:
+        for label_values, counts in self._counts.items():
+            labels = self._labels(label_values)
+            cumulative = 0
+            for upper_bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield '_bucket', {**labels, 'le': _format_value(upper_bound)}, cumulative
+            yield '_count', labels, cumulative
+            yield '_sum', labels, self._sums[label_values]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, MetricBase] = {}
+
+    def register(self, metric: MetricBase) -> MetricBase:
+        if metric.name in self._metrics:
+            raise ValueError(f'metric {metric.name} already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # noqa
+
+    def gauge(
+            self, name: str, documentation: str, labelnames: Sequence[str] = (),
+            function: Callable[[], float | Mapping[LabelValues, float]] | None = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, function=function))  # noqa
+
+    def histogram(
+            self, name: str, documentation: str, labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))  # noqa
+
+    def expose(self) -> str:
+        return '\n'.join(metric.expose() for metric in self._metrics.values()) + '\n'
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Request latency by route template.',
+    labelnames=('method', 'route', 'status'),
+)
+http_requests_in_progress = registry.gauge(
+    'http_requests_in_progress', 'Requests being served by this worker.',
+)
+db_pool_acquire_duration = registry.histogram(
+    'db_pool_acquire_duration_seconds', 'Time spent waiting for a database connection.',
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5.),
+)
+
+_queue_depths: dict[str, Callable[[], int]] = {}
+
+
+def register_queue(name: str, depth: Callable[[], int]) -> None:
+    """
+    Reports a background queue in `background_queue_depth`, e.g.
+        metrics.register_queue('log', self.queue.qsize)
+    """
+    _queue_depths[name] = depth
+
+
+registry.gauge(
+    'background_queue_depth', 'Items waiting in in-process background queues.',
+    labelnames=('queue',),
+    function=lambda: {(name,): depth() for name, depth in _queue_depths.items()},
+)
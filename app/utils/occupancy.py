@@ -0,0 +1,62 @@
+"""
+Occupancy of many courts as a courts × time-slot boolean matrix, built and encoded with numpy.
+"""
+from datetime import datetime, timedelta
+from typing import Sequence
+
+import numpy as np
+
+from app.base import do
+
+
+def rasterize(
+        court_ids: Sequence[int], reservations: Sequence[do.Reservation],
+        start_time: datetime, slot: timedelta, slot_count: int,
+) -> np.ndarray:
+    """
+    Row i is `court_ids[i]`, column j the slot starting at `start_time + j * slot`.
+    A slot is occupied when any reservation overlaps it. Every reservation adds +1 at its first slot
+    and -1 past its last one of a difference matrix, whose running sum along the slots is then the overlap count.
+    """
+    order = np.argsort(court_ids)
+    sorted_ids = np.asarray(court_ids, dtype=np.int64)[order]
+    diff = np.zeros((len(court_ids), slot_count + 1), dtype=np.int32)
+    if not reservations or not len(court_ids):
+        return diff[:, :-1] > 0
+
+    count = len(reservations)
+    reserved_court_ids = np.fromiter((reservation.court_id for reservation in reservations), np.int64, count)
+    positions = np.minimum(np.searchsorted(sorted_ids, reserved_court_ids), len(sorted_ids) - 1)
+    known = sorted_ids[positions] == reserved_court_ids  # reservations of other courts are dropped
+
+    starts = np.fromiter(
+        ((reservation.start_time - start_time).total_seconds() for reservation in reservations), np.float64, count,
+    )
+    ends = np.fromiter(
+        ((reservation.end_time - start_time).total_seconds() for reservation in reservations), np.float64, count,
+    )
+    step = slot.total_seconds()
+    first = np.clip(np.floor(starts / step), 0, slot_count).astype(np.int64)
+    stop = np.clip(np.ceil(ends / step), 0, slot_count).astype(np.int64)  # a partly covered slot is occupied
+
+    keep = known & (first < stop)
+    rows = order[positions[keep]]
+    np.add.at(diff, (rows, first[keep]), 1)
+    np.add.at(diff, (rows, stop[keep]), -1)
+    return np.cumsum(diff[:, :-1], axis=1) > 0
+
+
+def run_lengths(matrix: np.ndarray) -> list[list[tuple[int, int]]]:
+    """
+    Per row, the (first slot, length) of every occupied run.
+    """
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    start_rows, start_columns = np.nonzero(edges == 1)
+    _, stop_columns = np.nonzero(edges == -1)  # row major, so the n-th stop closes the n-th start
+
+    runs: list[list[tuple[int, int]]] = [[] for _ in range(matrix.shape[0])]
+    for row, start, stop in zip(start_rows.tolist(), start_columns.tolist(), stop_columns.tolist()):
+        runs[row].append((start, stop - start))
+    return runs
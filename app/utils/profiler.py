@@ -0,0 +1,114 @@
+"""
+Accumulates where the time of a request goes.
+------
+
+The profile is kept in the request context by `middleware.profiler`,
+instrumented code does nothing when there is no profile, e.g. at startup or in tests.
+"""
+import collections
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.config import app_config
+from app.utils.context import context
+
+
+class RequestProfile:
+    def __init__(self, n_plus_one_threshold: int = app_config.n_plus_one_threshold):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.db_time = 0.0
+        self.pool_wait_time = 0.0
+        self.external_times: collections.defaultdict[str, float] = collections.defaultdict(float)
+        self.query_counts: collections.Counter[str] = collections.Counter()  # by sql text
+
+    def add_query(self, sql: str, duration: float) -> None:
+        self.query_counts[sql] += 1
+        self.db_time += duration
+
+    def add_pool_wait(self, duration: float) -> None:
+        self.pool_wait_time += duration
+
+    def add_external(self, name: str, duration: float) -> None:
+        self.external_times[name] += duration
+
+    def finish(self) -> None:
+        self.end = time.perf_counter()
+
+    @property
+    def total_time(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def query_count(self) -> int:
+        return sum(self.query_counts.values())
+
+    @property
+    def repeated_queries(self) -> dict[str, int]:
+        """
+        The same statement run this many times in one request usually is a query in a loop, i.e. N+1.
+        """
+        return {sql: count for sql, count in self.query_counts.items() if count >= self.n_plus_one_threshold}
+
+    def server_timing(self) -> str:
+        """
+        Durations in milliseconds, db includes the pool wait.
+        """
+        metrics = [
+            f'total;dur={self.total_time * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'pool;dur={self.pool_wait_time * 1000:.1f}',
+        ]
+        metrics += [f'{name};dur={duration * 1000:.1f}' for name, duration in self.external_times.items()]
+        return ', '.join(metrics)
+
+    def log_fields(self) -> dict:
+        return {
+            'total_ms': round(self.total_time * 1000, 1),
+            'db_ms': round(self.db_time * 1000, 1),
+            'query_count': self.query_count,
+            'pool_wait_ms': round(self.pool_wait_time * 1000, 1),
+            'external_ms': {name: round(duration * 1000, 1) for name, duration in self.external_times.items()},
+            'n_plus_one': bool(self.repeated_queries),
+        }
+
+
+@contextmanager
+def track_query(sql: str) -> Iterator[None]:
+    profile = context.get_request_profile()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_query(sql, time.perf_counter() - start)
+
+
+@contextmanager
+def track_external(name: str) -> Iterator[None]:
+    """
+    usage:
+        with profiler.track_external('gcs'):
+            blob.upload_from_file(file)
+    """
+    profile = context.get_request_profile()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_external(name, time.perf_counter() - start)
+
+
+def add_pool_wait(duration: float) -> None:
+    profile = context.get_request_profile()
+    if profile is not None:
+        profile.add_pool_wait(duration)
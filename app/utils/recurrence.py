@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from app.base import enums, vo
+
+FREQUENCY_DAYS = {
+    enums.RecurrenceFrequency.daily: 1,
+    enums.RecurrenceFrequency.weekly: 7,
+}
+
+
+def expand(start_time: datetime, end_time: datetime, recurrence: vo.Recurrence, limit: int) \
+        -> list[vo.DateTimeRange]:
+    """
+    Occurrences of the first range, in order, at most `limit + 1` of them so an unbounded rule is caught by the caller.
+    """
+    step = timedelta(days=FREQUENCY_DAYS[recurrence.frequency] * recurrence.interval)
+    count = min(recurrence.count, limit + 1) if recurrence.count else limit + 1
+
+    time_ranges = []
+    for i in range(count):
+        occurrence_start = start_time + step * i
+        if recurrence.until and occurrence_start.date() > recurrence.until:
+            break
+        time_ranges.append(vo.DateTimeRange(start_time=occurrence_start, end_time=end_time + step * i))
+    return time_ranges
+
+
+def to_rrule(recurrence: vo.Recurrence, count: int) -> str:
+    """
+    The expanded count is written instead of UNTIL, so the calendar repeats exactly the booked occurrences.
+    """
+    return f'RRULE:FREQ={recurrence.frequency.value};INTERVAL={recurrence.interval};COUNT={count}'
@@ -1,36 +1,28 @@
-import ast
 import enum
 import typing
 
+import orjson
 import pydantic
 from fastapi import responses
 
 from app.base import enums
-from app.const import (
-    COOKIE_ACCOUNT_KEY,
-    COOKIE_ROLE_KEY,
-    COOKIE_TOKEN_KEY,
-    EXCEPTION_CLASS_DEFINITION_PATH,
-)
+from app.const import COOKIE_ACCOUNT_KEY, COOKIE_ROLE_KEY, COOKIE_TOKEN_KEY
+from app.exceptions.ack_exception import AckException
 
 T = typing.TypeVar('T')
 
 
-class ClassNameExtractor(ast.NodeVisitor):
-    def __init__(self, file_path: str):
-        self.class_names = []
-        with open(file_path, 'r') as file:
-            content = file.read()
-            tree = ast.parse(content)
-        self.visit(tree)
+def walk_exception_classes(cls: type[AckException] = AckException) -> typing.Iterator[type[AckException]]:
+    """
+    Definition order, only classes declared alongside `AckException` are part of the api.
+    """
+    yield cls
+    for subclass in cls.__subclasses__():
+        if subclass.__module__ == AckException.__module__:
+            yield from walk_exception_classes(subclass)
 
-    def visit_ClassDef(self, node):
-        self.class_names.append(node.name)
-        self.generic_visit(node)
 
-
-class_names: typing.List[str] = ClassNameExtractor(EXCEPTION_CLASS_DEFINITION_PATH).class_names
-class_enum = enum.Enum('ErrorMessage', {class_name: class_name for class_name in class_names})
+class_enum = enum.Enum('ErrorMessage', {cls.__name__: cls.__name__ for cls in walk_exception_classes()})
 
 
 class Response(pydantic.BaseModel, typing.Generic[T]):
@@ -38,6 +30,23 @@ class Response(pydantic.BaseModel, typing.Generic[T]):
     error: class_enum | None = None
 
 
+def _orjson_default(obj: typing.Any) -> typing.Any:
+    if isinstance(obj, pydantic.BaseModel):
+        return obj.model_dump()
+    raise TypeError
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """
+    Also renders pydantic models as is, datetimes, enums and uuids are serialized natively.
+    """
+
+    def render(self, content: typing.Any) -> bytes:
+        if isinstance(content, pydantic.BaseModel):  # serialized in pydantic-core without intermediate dicts
+            return content.model_dump_json().encode()
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
 def update_cookie(
         response: responses.Response,
         account_id: int = '',
@@ -0,0 +1,145 @@
+"""
+Checks that the `app.persistence.database` reads use an index on the seeded local postgres.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.index_usage [--min-rows 10000] [--unused]
+
+Needs the rows of `python -m benchmarks.load.seed` and the indexes of `migrations/`.
+Runs every read once in a rolled back transaction, explains each statement it sent and lists
+the sequential scans on tables larger than `--min-rows`, exiting 1 if there is any.
+`--unused` also lists the indexes `pg_stat_user_indexes` has not seen a scan on since the last stats reset.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Iterator, NamedTuple, Sequence
+
+import asyncpg
+
+import app.persistence.database as db
+from app.base import enums
+from app.config import pg_config
+
+from .load.seed import connect
+from .persistence import (CASES, Dataset, date_time_ranges, load_dataset,
+                          recording, rolled_back, week_time_ranges)
+
+
+class Read(NamedTuple):
+    name: str
+    run: Callable[[Dataset], Awaitable[Any]]
+
+
+class SeqScan(NamedTuple):
+    read: str
+    relation: str
+    row_estimate: int
+
+
+READS = [
+    *(Read(f'{case.name}({case.parameter}={case.values[-1]})', lambda data, case=case: case.run(data, case.values[-1]))
+      for case in CASES if not case.name.endswith('batch_add')),
+    Read('account.read_by_email', lambda data: db.account.read_by_email(email='bench1@example.com')),
+    Read('account.batch_read', lambda data: db.account.batch_read(account_ids=[data.account_id])),
+    Read('district.browse', lambda data: db.district.browse(city_id=data.city_id)),
+    Read('venue.browse', lambda data: db.venue.browse(stadium_id=data.stadium_ids[0])),
+    Read('court.read', lambda data: db.court.read(court_id=data.court_ids[0])),
+    Read('album.browse', lambda data: db.album.browse(place_type=enums.PlaceType.stadium, place_id=data.stadium_ids[0])),
+    Read('business_hour.browse', lambda data: db.business_hour.browse(
+        place_type=enums.PlaceType.stadium, place_id=data.stadium_ids[0], time_ranges=week_time_ranges(4),
+    )),
+    Read('reservation.browse(court_id)', lambda data: db.reservation.browse(
+        court_id=data.court_ids[0], start_date=date.today(),
+    )),
+    Read('reservation_member.browse_with_names', lambda data: db.reservation_member.browse_with_names(
+        account_id=data.account_id,
+    )),
+    Read('view.browse_provider_stadium', lambda data: db.view.browse_provider_stadium(
+        owner_id=data.account_id, limit=20, offset=0,
+    )),
+    Read('view.browse_provider_venue', lambda data: db.view.browse_provider_venue(
+        owner_id=data.account_id, limit=20, offset=0,
+    )),
+    Read('view.browse_provider_court', lambda data: db.view.browse_provider_court(
+        owner_id=data.account_id, limit=20, offset=0,
+    )),
+    Read('view.browse_free_court', lambda data: db.view.browse_free_court(
+        time_ranges=date_time_ranges(4), request_time=datetime.now(), city_id=data.city_id, limit=20,
+    )),
+]
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    if plan['Node Type'] == 'Seq Scan':
+        yield plan['Relation Name']
+    for child in plan.get('Plans', ()):
+        yield from seq_scans(child)
+
+
+async def check(conn: asyncpg.Connection, read: Read, dataset: Dataset, row_estimates: dict[str, int]) \
+        -> list[SeqScan]:
+    statements: list[tuple[str, Sequence]] = []
+    savepoint = conn.transaction()
+    await savepoint.start()
+    try:
+        with recording(statements):
+            await read.run(dataset)
+    finally:
+        await savepoint.rollback()
+
+    found = []
+    for sql, params in dict(statements).items():
+        plan = await conn.fetchval(f'EXPLAIN (FORMAT JSON) {sql}', *params)
+        for relation in set(seq_scans(json.loads(plan)[0]['Plan'])):
+            found.append(SeqScan(read=read.name, relation=relation, row_estimate=row_estimates.get(relation, 0)))
+    return found
+
+
+async def unused_indexes(conn: asyncpg.Connection) -> list[tuple[str, str]]:
+    rows = await conn.fetch(
+        r'SELECT relname, indexrelname'
+        r'  FROM pg_stat_user_indexes'
+        r' WHERE idx_scan = 0'
+        r' ORDER BY relname, indexrelname',
+    )
+    return [(row['relname'], row['indexrelname']) for row in rows]
+
+
+async def main(min_rows: int, show_unused: bool) -> int:
+    conn = await connect(pg_config)
+    try:
+        dataset = await load_dataset(conn)
+        row_estimates = {
+            row['relname']: int(row['reltuples'])
+            for row in await conn.fetch(r"SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+        }
+        scans = []
+        async with rolled_back(conn):
+            for read in READS:
+                scans.extend(await check(conn, read, dataset, row_estimates))
+
+        large_scans = [scan for scan in scans if scan.row_estimate >= min_rows]
+        for scan in sorted(set(scans)):
+            flag = 'FAIL' if scan in large_scans else 'ok  '
+            print(f'{flag} {scan.read:<60} seq scan on {scan.relation} (~{scan.row_estimate} rows)')
+        print(f'{len(READS)} reads checked, {len(set(large_scans))} sequential scans on tables over {min_rows} rows')
+
+        if show_unused:
+            print()
+            for relation, index in await unused_indexes(conn):
+                print(f'unused {relation}.{index}')
+    finally:
+        await conn.close()
+
+    return 1 if large_scans else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--min-rows', type=int, default=10_000)
+    parser.add_argument('--unused', action='store_true')
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(min_rows=args.min_rows, show_unused=args.unused)))
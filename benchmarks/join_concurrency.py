@@ -0,0 +1,117 @@
+"""
+Joins one reservation from many accounts at once and checks it is not oversubscribed.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.join_concurrency [--joiners 500] [--vacancy 20] [--pool-size 50]
+
+Needs the rows of `python -m benchmarks.load.seed`.
+Adds a reservation with `--vacancy` open spots, then every joiner calls `reservation_member.join` twice, concurrently.
+Exactly `--vacancy` accounts must end up members, the vacancy must reach 0 and no account may be added twice.
+Exits with 1 otherwise. The reservation is deleted afterwards.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+import app.exceptions as exc
+import app.persistence.database as db
+from app.base import enums
+from app.config import PGConfig, pg_config
+from app.utils import invitation_code
+
+from .load.seed import connect
+
+
+async def add_reservation(vacancy: int) -> tuple[int, str]:
+    conn = await connect(pg_config)
+    try:
+        stadium_id, venue_id, court_id = await conn.fetchrow(
+            r"SELECT venue.stadium_id, venue.id, court.id"
+            r"  FROM venue"
+            r" INNER JOIN court ON court.venue_id = venue.id"
+            r" WHERE venue.name LIKE 'bench %'"
+            r" ORDER BY court.id"
+            r" LIMIT 1",
+        )
+    finally:
+        await conn.close()
+
+    while True:
+        code = invitation_code.generate()
+        try:
+            await db.reservation.read_by_code(invitation_code=code)
+        except exc.NotFound:
+            break
+
+    start_time = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    reservation_id = await db.reservation.add(
+        stadium_id=stadium_id, venue_id=venue_id, court_id=court_id,
+        start_time=start_time, end_time=start_time + timedelta(hours=2),
+        technical_level=[enums.TechnicalType.entry], invitation_code=code, remark='bench join', vacancy=vacancy,
+    )
+    return reservation_id, code
+
+
+async def main(joiners: int, vacancy: int, pool_size: int) -> int:
+    db_config = PGConfig()
+    db_config.max_pool_size = pool_size
+    db_config.max_waiting = joiners * 2  # every joiner queues, nothing is shed
+    await db.pg_pool_handler.initialize(db_config=db_config)
+    try:
+        conn = await connect(pg_config)
+        try:
+            rows = await conn.fetch(
+                r"SELECT id FROM account WHERE email LIKE 'bench%@example.com' ORDER BY id LIMIT $1", joiners,
+            )
+        finally:
+            await conn.close()
+        account_ids = [row['id'] for row in rows]
+        if len(account_ids) < joiners:
+            raise SystemExit('not enough seeded accounts, run `python -m benchmarks.load.seed` first')
+
+        reservation_id, code = await add_reservation(vacancy)
+        try:
+            async def join(account_id: int) -> bool:
+                try:
+                    _, is_joined = await db.reservation_member.join(invitation_code=code, account_id=account_id)
+                except exc.ReservationFull:
+                    return False
+                return is_joined
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(join(account_id) for account_id in account_ids * 2))
+            elapsed = time.perf_counter() - start
+
+            reservation = await db.reservation.read(reservation_id=reservation_id)
+            members = await db.reservation_member.browse_with_names(reservation_id=reservation_id)
+        finally:
+            await db.reservation.delete(reservation_id=reservation_id)
+    finally:
+        await db.pg_pool_handler.close()
+
+    member_ids = [member.account_id for member in members]
+    print(f'{len(results)} joins of {joiners} accounts in {elapsed:.2f} s')
+    print(f'joined: {sum(results)}, members: {len(member_ids)}, vacancy left: {reservation.vacancy}')
+
+    errors = []
+    if sum(results) != vacancy:
+        errors.append(f'{sum(results)} joins succeeded, expected {vacancy}')
+    if len(member_ids) != vacancy or len(set(member_ids)) != len(member_ids):
+        errors.append(f'{len(member_ids)} members, expected {vacancy} distinct')
+    if reservation.vacancy != 0:
+        errors.append(f'vacancy ended at {reservation.vacancy}, expected 0')
+    for error in errors:
+        print(f'FAIL {error}')
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--joiners', type=int, default=500)
+    parser.add_argument('--vacancy', type=int, default=20)
+    parser.add_argument('--pool-size', type=int, default=50)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(joiners=args.joiners, vacancy=args.vacancy, pool_size=args.pool_size)))
@@ -0,0 +1,12 @@
+"""
+Load test of the hot api paths against a seeded local postgres.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.load.seed [--scale 1.0]
+    ENV=ci poetry run python -m benchmarks.load.run [--target asgi|uvicorn] [--workers 4] [--save-baseline]
+
+`seed` bulk loads 10k stadiums, 100k courts and 1M reservations (times `--scale`) next to the existing rows.
+`run` drives each scenario with a fixed number of concurrent clients, reports p50/p95/p99 and RPS,
+and compares them to `baseline.json`, exiting with 1 on a regression.
+"""
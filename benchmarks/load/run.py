@@ -0,0 +1,217 @@
+"""
+Drives the scenarios and compares the result with the stored baseline.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.load.run
+        [--target asgi|uvicorn] [--workers 4] [--concurrency 16] [--duration 20]
+        [--scenario browse_stadium ...] [--baseline benchmarks/load/baseline.json] [--save-baseline]
+
+`asgi` calls the app in this process through `httpx.ASGITransport`, i.e. no network and one event loop.
+`uvicorn` starts `uvicorn app.main:app --workers N` and calls it over localhost, like the deployment does.
+Each scenario runs `--concurrency` clients back to back for `--duration` seconds after a short warm-up.
+A scenario regresses when p95 grows or RPS drops by more than `--tolerance` compared to the baseline,
+baselines are only comparable on the same machine, target and options.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Sequence
+
+import httpx
+
+from app.config import pg_config
+
+from .scenarios import SCENARIOS, Dataset, load_dataset
+from .seed import connect
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+WARM_UP_SECONDS = 2
+
+
+class Result:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.error_count = 0
+        self.elapsed = 0.0
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[percent - 1]
+
+    def summary(self) -> dict[str, float]:
+        return {
+            'count': len(self.latencies),
+            'errors': self.error_count,
+            'rps': round(len(self.latencies) / self.elapsed, 1) if self.elapsed else 0.0,
+            'p50_ms': round(self.percentile(50) * 1000, 2),
+            'p95_ms': round(self.percentile(95) * 1000, 2),
+            'p99_ms': round(self.percentile(99) * 1000, 2),
+        }
+
+
+async def drive(
+        client: httpx.AsyncClient, name: str, dataset: Dataset, concurrency: int, duration: float, seed: int,
+) -> Result:
+    scenario = SCENARIOS[name]
+    result = Result(name)
+    recording = False
+
+    async def worker(index: int, deadline: float):
+        rng = random.Random(f'{seed}-{name}-{index}')
+        while time.perf_counter() < deadline:
+            request = scenario(rng, dataset)
+            start = time.perf_counter()
+            try:
+                response = await client.request(request.method, request.path, json=request.json)
+                is_error = response.status_code >= 500
+            except httpx.HTTPError:
+                is_error = True
+            if not recording:
+                continue
+            if is_error:
+                result.error_count += 1
+            else:
+                result.latencies.append(time.perf_counter() - start)
+
+    warm_up_deadline = time.perf_counter() + WARM_UP_SECONDS
+    await asyncio.gather(*(worker(i, warm_up_deadline) for i in range(concurrency)))
+
+    recording = True
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i, start + duration) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+@asynccontextmanager
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+@asynccontextmanager
+async def uvicorn_client(workers: int, port: int) -> AsyncIterator[httpx.AsyncClient]:
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--workers', str(workers),
+         '--port', str(port), '--no-access-log'],
+        env=os.environ,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            await wait_until_ready(client, process)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'uvicorn exited with {process.returncode}')
+        try:
+            if (await client.get('/api/health/ready')).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit('uvicorn did not become ready')
+
+
+def compare(summaries: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    regressions = []
+    for name, summary in summaries.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if summary['p95_ms'] > expected['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {expected["p95_ms"]} -> {summary["p95_ms"]} ms')
+        if summary['rps'] < expected['rps'] * (1 - tolerance):
+            regressions.append(f'{name}: rps {expected["rps"]} -> {summary["rps"]}')
+    return regressions
+
+
+def print_table(summaries: dict[str, dict], baseline: dict[str, dict]):
+    print(f'{"scenario":>28} {"rps":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"errors":>7} {"baseline p95":>13}')
+    for name, summary in summaries.items():
+        expected = baseline.get(name, {}).get('p95_ms', '-')
+        print(f'{name:>28} {summary["rps"]:>9} {summary["p50_ms"]:>9} {summary["p95_ms"]:>9}'
+              f' {summary["p99_ms"]:>9} {summary["errors"]:>7} {expected:>13}')
+
+
+async def main(
+        target: str, workers: int, port: int, concurrency: int, duration: float, scenarios: Sequence[str],
+        baseline_path: Path, save_baseline: bool, tolerance: float, seed: int,
+) -> int:
+    conn = await connect(pg_config)
+    try:
+        dataset = await load_dataset(conn)
+    finally:
+        await conn.close()
+
+    client_context = asgi_client() if target == 'asgi' else uvicorn_client(workers=workers, port=port)
+    summaries = {}
+    async with client_context as client:
+        for name in scenarios:
+            result = await drive(client, name, dataset, concurrency=concurrency, duration=duration, seed=seed)
+            summaries[name] = result.summary()
+
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    print(f'target={target} workers={workers if target == "uvicorn" else 1}'
+          f' concurrency={concurrency} duration={duration}s')
+    print_table(summaries, baseline)
+
+    if save_baseline:
+        baseline_path.write_text(json.dumps({**baseline, **summaries}, indent=2) + '\n')
+        print(f'saved baseline to {baseline_path}')
+        return 0
+
+    if not baseline:
+        print(f'no baseline at {baseline_path}, run with --save-baseline first')
+        return 0
+
+    regressions = compare(summaries, baseline, tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--target', choices=('asgi', 'uvicorn'), default='asgi')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--scenario', nargs='*', choices=tuple(SCENARIOS), default=tuple(SCENARIOS))
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(
+        target=args.target, workers=args.workers, port=args.port, concurrency=args.concurrency,
+        duration=args.duration, scenarios=args.scenario, baseline_path=args.baseline,
+        save_baseline=args.save_baseline, tolerance=args.tolerance, seed=args.seed,
+    )))
@@ -0,0 +1,120 @@
+"""
+Requests of the hot api paths, with parameters drawn from the seeded rows.
+------
+
+Every scenario builds one request from a seeded `random.Random`, so two runs send the same sequence.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Callable, NamedTuple
+
+import asyncpg
+
+from .seed import BENCH_EMAIL, BENCH_PASSWORD
+
+SAMPLE_SIZE = 1000
+
+
+class Dataset(NamedTuple):
+    city_ids: list[int]
+    sport_ids: list[int]
+    venue_ids: list[int]
+    court_ids: list[int]
+    account_count: int
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    json: dict | None = None
+
+
+Scenario = Callable[[random.Random, Dataset], Request]
+
+
+async def load_dataset(conn: asyncpg.Connection) -> Dataset:
+    async def sample(table: str) -> list[int]:
+        rows = await conn.fetch(
+            fr"SELECT id FROM {table} WHERE name LIKE 'bench %' ORDER BY id LIMIT {SAMPLE_SIZE}",
+        )
+        return [row['id'] for row in rows]
+
+    venue_ids = await sample('venue')
+    court_rows = await conn.fetch(
+        r'SELECT id FROM court WHERE venue_id = ANY($1) ORDER BY id', venue_ids,
+    )
+    account_count = await conn.fetchval(r"SELECT COUNT(*) FROM account WHERE email LIKE 'bench%@example.com'")
+    if not venue_ids or not account_count:
+        raise SystemExit('no seeded rows found, run `python -m benchmarks.load.seed` first')
+
+    return Dataset(
+        city_ids=await sample('city'),
+        sport_ids=await sample('sport'),
+        venue_ids=venue_ids,
+        court_ids=[row['id'] for row in court_rows],
+        account_count=account_count,
+    )
+
+
+def _date_time_ranges(rng: random.Random, count: int) -> list[dict]:
+    ranges = []
+    for _ in range(count):
+        start_time = datetime.combine(date.today(), time()) + timedelta(
+            days=rng.randrange(-7, 7), hours=rng.randrange(8, 21),
+        )
+        ranges.append({
+            'start_time': start_time.isoformat(),
+            'end_time': (start_time + timedelta(hours=rng.choice((1, 2, 3)))).isoformat(),
+        })
+    return ranges
+
+
+def browse_stadium(rng: random.Random, dataset: Dataset) -> Request:
+    weekday = rng.randint(1, 7)
+    return Request('POST', '/api/stadium/browse', {
+        'city_id': rng.choice(dataset.city_ids),
+        'sport_id': rng.choice((None, rng.choice(dataset.sport_ids))),
+        'time_ranges': [{'weekday': weekday, 'start_time': '18:00:00', 'end_time': '20:00:00'}],
+        'limit': 20,
+        'offset': rng.choice((0, 0, 20, 40)),
+    })
+
+
+def browse_reservation(rng: random.Random, dataset: Dataset) -> Request:
+    return Request('POST', '/api/view/reservation', {
+        'city_id': rng.choice(dataset.city_ids),
+        'sport_id': rng.choice((None, rng.choice(dataset.sport_ids))),
+        'time_ranges': _date_time_ranges(rng, rng.randint(1, 3)),
+        'has_vacancy': True,
+        'limit': 20,
+        'offset': 0,
+    })
+
+
+def browse_court_by_venue(rng: random.Random, dataset: Dataset) -> Request:
+    return Request('POST', f'/api/venue/{rng.choice(dataset.venue_ids)}/court', {
+        'time_ranges': _date_time_ranges(rng, rng.randint(1, 3)),
+    })
+
+
+def browse_reservation_by_court(rng: random.Random, dataset: Dataset) -> Request:
+    start_date = date.today() + timedelta(days=rng.randrange(-7, 7))
+    return Request('POST', f'/api/court/{rng.choice(dataset.court_ids)}/reservation/browse', {
+        'start_date': start_date.isoformat(),
+    })
+
+
+def login(rng: random.Random, dataset: Dataset) -> Request:
+    return Request('POST', '/api/login', {
+        'email': BENCH_EMAIL.format(rng.randrange(dataset.account_count)),
+        'password': BENCH_PASSWORD,
+    })
+
+
+SCENARIOS: dict[str, Scenario] = {
+    'browse_stadium': browse_stadium,
+    'browse_reservation': browse_reservation,
+    'browse_court_by_venue': browse_court_by_venue,
+    'browse_reservation_by_court': browse_reservation_by_court,
+    'login': login,
+}
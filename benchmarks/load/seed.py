@@ -0,0 +1,219 @@
+"""
+Seeds the database of `.env` with benchmark volume.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.load.seed [--scale 1.0] [--seed 0] [--force]
+
+Rows are appended with `COPY`, named `bench ...`, so an existing schema and data stay untouched.
+Only a local host is seeded unless `--force` is given.
+All accounts are verified and log in with `BENCH_PASSWORD`, every tenth one is a provider.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from typing import Iterable, Sequence
+
+import asyncpg
+
+import app.const as const
+from app.base import enums, vo
+from app.config import PGConfig, pg_config
+from app.persistence.database.util import business_hour_mask
+from app.utils.security import hash_password
+
+BENCH_PASSWORD = 'benchmark'
+BENCH_EMAIL = 'bench{}@example.com'
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1', None, '')
+
+CITY_COUNT = 20
+DISTRICTS_PER_CITY = 10
+SPORT_COUNT = 10
+ACCOUNT_COUNT = 10_000
+STADIUM_COUNT = 10_000
+VENUES_PER_STADIUM = 2
+COURTS_PER_VENUE = 5
+RESERVATION_COUNT = 1_000_000
+RESERVATION_DAYS = 120  # spread around today, half in the past
+CHUNK_SIZE = 50_000
+
+
+def invitation_code(number: int) -> str:
+    """
+    Distinct codes of the usual length and alphabet.
+    """
+    chars = []
+    for _ in range(const.INVITE_CODE_LENGTH):
+        number, index = divmod(number, len(const.AVAILABLE_CODE_CHAR))
+        chars.append(const.AVAILABLE_CODE_CHAR[index])
+    return ''.join(reversed(chars))
+
+
+async def connect(db_config: PGConfig) -> asyncpg.Connection:
+    return await asyncpg.connect(
+        host=db_config.host,
+        port=db_config.port,
+        user=db_config.username,
+        password=db_config.password,
+        database=db_config.db_name,
+    )
+
+
+async def copy(conn: asyncpg.Connection, table: str, columns: Sequence[str], records: Iterable[tuple]) -> list[int]:
+    """
+    Copies in chunks and returns the ids of the new rows, in insertion order.
+    """
+    last_id = await conn.fetchval(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= CHUNK_SIZE:
+            await conn.copy_records_to_table(table, records=chunk, columns=columns)
+            chunk = []
+    if chunk:
+        await conn.copy_records_to_table(table, records=chunk, columns=columns)
+    return [row['id'] for row in await conn.fetch(f'SELECT id FROM {table} WHERE id > $1 ORDER BY id', last_id)]
+
+
+async def seed(conn: asyncpg.Connection, scale: float, rng: random.Random) -> dict[str, int]:
+    def scaled(count: int) -> int:
+        return max(1, int(count * scale))
+
+    city_ids = await copy(conn, 'city', ['name'], ((f'bench city {i}',) for i in range(CITY_COUNT)))
+    district_ids = await copy(conn, 'district', ['name', 'city_id'], (
+        (f'bench district {i}', city_id)
+        for city_id in city_ids for i in range(DISTRICTS_PER_CITY)
+    ))
+    sport_ids = await copy(conn, 'sport', ['name'], ((f'bench sport {i}',) for i in range(SPORT_COUNT)))
+
+    pass_hash = hash_password(BENCH_PASSWORD)
+    account_count = scaled(ACCOUNT_COUNT)
+    account_ids = await copy(
+        conn, 'account',
+        ['email', 'pass_hash', 'nickname', 'gender', 'role', 'is_google_login', 'is_verified'],
+        (
+            (BENCH_EMAIL.format(i), pass_hash, f'bench {i}', enums.GenderType.unrevealed,
+             enums.RoleType.provider if i % 10 == 0 else enums.RoleType.normal, False, True)
+            for i in range(account_count)
+        ),
+    )
+    provider_ids = account_ids[::10]
+
+    stadium_count = scaled(STADIUM_COUNT)
+    opening_hours = [
+        [vo.WeekTimeRange(weekday=weekday, start_time=dt_time(rng.choice((6, 8, 10))), end_time=dt_time(22))
+         for weekday in range(1, 8)]
+        for _ in range(stadium_count)
+    ]
+    stadium_ids = await copy(
+        conn, 'stadium',
+        ['name', 'district_id', 'owner_id', 'address', 'contact_number', 'description', 'long', 'lat', 'is_published',
+         'business_hour_mask'],
+        (
+            (f'bench stadium {i}', rng.choice(district_ids), rng.choice(provider_ids), f'bench address {i}',
+             '0912345678', 'bench description', 121 + rng.random(), 24 + rng.random(), rng.random() < 0.9,
+             business_hour_mask(opening_hours[i]))
+            for i in range(stadium_count)
+        ),
+    )
+    await copy(
+        conn, 'business_hour', ['place_id', 'type', 'weekday', 'start_time', 'end_time'],
+        (
+            (stadium_id, enums.PlaceType.stadium, time_range.weekday, time_range.start_time, time_range.end_time)
+            for stadium_id, time_ranges in zip(stadium_ids, opening_hours) for time_range in time_ranges
+        ),
+    )
+
+    venue_stadium_ids = [stadium_id for stadium_id in stadium_ids for _ in range(VENUES_PER_STADIUM)]
+    venue_ids = await copy(
+        conn, 'venue',
+        ['stadium_id', 'name', 'floor', 'reservation_interval', 'is_reservable', 'is_chargeable', 'fee_rate',
+         'fee_type', 'area', 'capacity', 'sport_equipments', 'facilities', 'court_type', 'sport_id', 'is_published'],
+        (
+            (stadium_id, f'bench venue {i}', '1', None, True, True, 100.0, enums.FeeType.per_hour,
+             300, 20, None, None, 'bench', rng.choice(sport_ids), True)
+            for i, stadium_id in enumerate(venue_stadium_ids)
+        ),
+    )
+
+    court_venues = [
+        (venue_id, stadium_id)
+        for venue_id, stadium_id in zip(venue_ids, venue_stadium_ids) for _ in range(COURTS_PER_VENUE)
+    ]
+    court_ids = await copy(conn, 'court', ['venue_id', 'number', 'is_published'], (
+        (venue_id, i % COURTS_PER_VENUE + 1, True) for i, (venue_id, _) in enumerate(court_venues)
+    ))
+
+    last_reservation_id = await conn.fetchval('SELECT COALESCE(MAX(id), 0) FROM reservation')
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    first_day = today - timedelta(days=RESERVATION_DAYS // 2)
+
+    def reservations():
+        levels = list(enums.TechnicalType)
+        for i in range(scaled(RESERVATION_COUNT)):
+            court_index = rng.randrange(len(court_ids))
+            venue_id, stadium_id = court_venues[court_index]
+            start_time = first_day + timedelta(days=rng.randrange(RESERVATION_DAYS), hours=rng.randrange(8, 21))
+            member_count = rng.randint(1, 8)
+            yield (
+                stadium_id, venue_id, court_ids[court_index], start_time,
+                start_time + timedelta(hours=rng.choice((1, 2))), member_count, rng.randint(0, 10 - member_count),
+                rng.sample(levels, rng.randint(1, len(levels))), None, invitation_code(last_reservation_id + i), rng.random() < 0.05,
+            )
+
+    reservation_ids = await copy(
+        conn, 'reservation',
+        ['stadium_id', 'venue_id', 'court_id', 'start_time', 'end_time', 'member_count', 'vacancy',
+         'technical_level', 'remark', 'invitation_code', 'is_cancelled'],
+        reservations(),
+    )
+    await conn.execute(
+        r'INSERT INTO reservation_member (reservation_id, account_id, is_manager, status, source)'
+        r'     SELECT reservation.id, ($2::int[])[1 + reservation.id % array_length($2::int[], 1)],'
+        r"            true, 'JOINED', 'SEARCH'"
+        r'       FROM reservation'
+        r'      WHERE reservation.id > $1',
+        last_reservation_id, account_ids,
+    )
+    await conn.execute('ANALYZE')
+
+    return {
+        'city': len(city_ids),
+        'district': len(district_ids),
+        'sport': len(sport_ids),
+        'account': len(account_ids),
+        'stadium': len(stadium_ids),
+        'venue': len(venue_ids),
+        'court': len(court_ids),
+        'reservation': len(reservation_ids),
+    }
+
+
+async def main(scale: float, seed_: int, force: bool):
+    if pg_config.host not in LOCAL_HOSTS and not force:
+        raise SystemExit(f'refusing to seed {pg_config.host}, pass --force for a non-local database')
+
+    conn = await connect(pg_config)
+    start = time.perf_counter()
+    try:
+        async with conn.transaction():
+            counts = await seed(conn, scale=scale, rng=random.Random(seed_))
+    finally:
+        await conn.close()
+
+    print(f'seeded in {time.perf_counter() - start:.1f} s')
+    for table, count in counts.items():
+        print(f'{table:>12}: {count}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=float, default=1.0, help='e.g. 0.01 for a quick run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(main(scale=args.scale, seed_=args.seed, force=args.force))
@@ -0,0 +1,110 @@
+"""
+Measures the logging time spent on the request path for one simulated request.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.logging_overhead [--number 2000] [--queries 8]
+
+A request logs its access line and one line per query, as `logging.middleware` and `PostgresQueryExecutor` do.
+`sync` is the former setup: console and json "cloud" handlers on the root logger, full sql tuples at INFO.
+`queued` is logging-prd.yaml: `QueueListenerHandler` in front of both handlers, sampled and truncated sql.
+Output goes to os.devnull and the cloud handler only formats, so real numbers are higher for `sync`.
+"""
+import argparse
+import logging
+import logging.config
+import os
+import time
+
+from pythonjsonlogger import jsonlogger
+
+from app import log
+
+HUMAN_FORMAT = '[%(asctime)s][%(levelname)s] %(name)s %(filename)s:%(funcName)s:%(lineno)d | %(message)s'
+SQL = (
+    'SELECT stadium.id, stadium.name, district_id, contact_number, owner_id, address, description, long, lat,'
+    '       is_published, city.name, district.name, ARRAY_AGG(DISTINCT sport.name),'
+    '       ARRAY_AGG(DISTINCT (business_hour.id, business_hour.place_id, business_hour.type,'
+    '                           business_hour.weekday, business_hour.start_time, business_hour.end_time))'
+    '  FROM stadium'
+    '  LEFT JOIN district ON stadium.district_id = district.id'
+    '  LEFT JOIN city ON district.city_id = city.id'
+    '  LEFT JOIN venue ON venue.stadium_id = stadium.id'
+    '  LEFT JOIN sport ON venue.sport_id = sport.id'
+    '  LEFT JOIN business_hour ON business_hour.place_id = stadium.id AND business_hour.type = $1'
+    ' WHERE stadium.name LIKE $2 AND district.city_id = $3'
+    ' GROUP BY stadium.id, city.name, district.name'
+    ' ORDER BY stadium.id LIMIT $4 OFFSET $5'
+)
+ARGS = ['STADIUM', '%stadium%', 1, 50, 0]
+
+
+class FormatOnlyHandler(logging.Handler):
+    """
+    Stands in for the cloud handler, which formats on the calling thread and ships in the background.
+    """
+
+    def emit(self, record):
+        self.format(record)
+
+
+def build_handlers(stream) -> tuple[logging.Handler, logging.Handler]:
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter(HUMAN_FORMAT))
+    cloud = FormatOnlyHandler()
+    cloud.setFormatter(jsonlogger.JsonFormatter(HUMAN_FORMAT))
+    return console, cloud
+
+
+def simulate_sync_request(logger: logging.Logger, queries: int):
+    logger.info('POST /api/stadium/browse, params: ,', extra={'request': {'method': 'POST'}})
+    for _ in range(queries):
+        logger.info((SQL, ARGS))
+
+
+def simulate_queued_request(logger: logging.Logger, queries: int):
+    logger.info('POST /api/stadium/browse, params: ,', extra={'request': {'method': 'POST'}})
+    for _ in range(queries):
+        log.sql_logger.info('%s, args: %s', log.Truncated(SQL), log.Truncated(ARGS))
+
+
+def measure(simulate, logger: logging.Logger, number: int, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        simulate(logger, queries)
+    return (time.perf_counter() - start) / number
+
+
+def main(number: int, queries: int):
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    logger = logging.getLogger('benchmark')
+
+    with open(os.devnull, 'w') as stream:
+        root.handlers = list(build_handlers(stream))
+        sync_time = measure(simulate_sync_request, logger, number, queries)
+        for handler in root.handlers:
+            handler.flush()
+
+        queue_handler = log.QueueListenerHandler(handlers=build_handlers(stream))
+        queue_handler.addFilter(log.SamplingFilter(rates={'sql': 0.1}))
+        root.handlers = [queue_handler]
+        logging.getLogger('sql').setLevel(logging.INFO)
+        queued_time = measure(simulate_queued_request, logger, number, queries)
+
+        start = time.perf_counter()
+        queue_handler.stop()
+        drain_time = time.perf_counter() - start
+
+    print(f'{number} requests with {queries} queries each, request path time per request')
+    print(f'{"sync":>8}: {sync_time * 1e6:8.1f} us')
+    print(f'{"queued":>8}: {queued_time * 1e6:8.1f} us')
+    print(f'listener drained the rest in {drain_time * 1000:.1f} ms after the last request')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=8)
+    args = parser.parse_args()
+    main(number=args.number, queries=args.queries)
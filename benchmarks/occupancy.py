@@ -0,0 +1,69 @@
+"""
+Times the provider schedule rasterization, `utils.occupancy`, on generated reservations.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.occupancy [--courts 50] [--days 14] [--slot-minutes 30] [--number 20]
+
+Each court gets `--per-day` reservations of one to three hours a day. The reservations are built once.
+Reported is the median time to paint them into the matrix and to encode it as run lengths,
+the part of `/view/schedule/provider` after its two queries.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.base import do
+from app.utils import occupancy
+
+
+def generate(court_count: int, days: int, per_day: int, start_time: datetime) -> list[do.Reservation]:
+    rng = random.Random(0)
+    reservations = []
+    for court_id in range(1, court_count + 1):
+        for day in range(days):
+            for _ in range(per_day):
+                reservation_start = start_time + timedelta(days=day, hours=rng.randint(6, 20))
+                reservations.append(do.Reservation(
+                    id=len(reservations) + 1, stadium_id=1, venue_id=1, court_id=court_id,
+                    start_time=reservation_start, end_time=reservation_start + timedelta(hours=rng.randint(1, 3)),
+                    member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='bench',
+                    is_cancelled=False,
+                ))
+    return reservations
+
+
+def main(court_count: int, days: int, slot_minutes: int, per_day: int, number: int):
+    start_time = datetime(2024, 1, 1)
+    slot = timedelta(minutes=slot_minutes)
+    slot_count = days * 24 * 60 // slot_minutes
+    court_ids = list(range(1, court_count + 1))
+    reservations = generate(court_count, days, per_day, start_time)
+
+    paint_times, encode_times = [], []
+    for _ in range(number):
+        start = time.perf_counter()
+        matrix = occupancy.rasterize(court_ids, reservations, start_time, slot, slot_count)
+        paint_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        runs = occupancy.run_lengths(matrix)
+        encode_times.append(time.perf_counter() - start)
+
+    print(f'{court_count} courts x {slot_count} slots, {len(reservations)} reservations,'
+          f' {sum(len(court_runs) for court_runs in runs)} occupied runs')
+    print(f'rasterize   {statistics.median(paint_times) * 1000:8.2f} ms')
+    print(f'run lengths {statistics.median(encode_times) * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--courts', type=int, default=50)
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--slot-minutes', type=int, default=30)
+    parser.add_argument('--per-day', type=int, default=4)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+    main(court_count=args.courts, days=args.days, slot_minutes=args.slot_minutes, per_day=args.per_day,
+         number=args.number)
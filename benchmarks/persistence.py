@@ -0,0 +1,236 @@
+"""
+Times `app.persistence.database` functions one by one against the seeded local postgres.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.persistence [--number 5] [--case stadium.browse ...]
+
+Needs the rows of `python -m benchmarks.load.seed`.
+Each case sweeps one parameter, i.e. number of time ranges, batch size or page depth,
+and reports per value: statements run, rows returned, median wall time and the plan node types.
+Everything runs in one transaction that is rolled back, so the write cases leave no rows behind.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Iterator, NamedTuple, Sequence
+from unittest.mock import patch
+
+import asyncpg
+
+import app.persistence.database as db
+from app.base import enums, vo
+from app.config import pg_config
+from app.persistence.database import slow_query
+
+from .load.seed import connect
+
+SAMPLE_SIZE = 1000
+
+
+class Dataset(NamedTuple):
+    account_id: int
+    city_id: int
+    stadium_ids: list[int]
+    venue_ids: list[int]
+    court_ids: list[int]
+
+
+class Case(NamedTuple):
+    name: str
+    parameter: str
+    values: Sequence[int]
+    run: Callable[[Dataset, int], Awaitable[Any]]
+
+
+class Measurement(NamedTuple):
+    statement_count: int
+    row_count: int
+    wall_time: float
+    node_types: list[str]
+
+
+def week_time_ranges(count: int) -> list[vo.WeekTimeRange]:
+    return [
+        vo.WeekTimeRange(weekday=i % 7 + 1, start_time=dt_time(8 + i % 12), end_time=dt_time(9 + i % 12))
+        for i in range(count)
+    ]
+
+
+def date_time_ranges(count: int) -> list[vo.DateTimeRange]:
+    first_day = datetime.combine(date.today(), dt_time())
+    return [
+        vo.DateTimeRange(
+            start_time=first_day + timedelta(days=i % 14, hours=8 + i % 12),
+            end_time=first_day + timedelta(days=i % 14, hours=10 + i % 12),
+        )
+        for i in range(count)
+    ]
+
+
+CASES = [
+    Case('stadium.browse', 'time_ranges', (0, 1, 4, 16, 64), lambda data, n: db.stadium.browse(
+        city_id=data.city_id, time_ranges=week_time_ranges(n) or None, limit=20,
+    )),
+    Case('stadium.browse', 'offset', (0, 100, 1000, 5000), lambda data, n: db.stadium.browse(
+        limit=20, offset=n,
+    )),
+    Case('reservation.browse', 'time_ranges', (0, 1, 4, 16, 64), lambda data, n: db.reservation.browse(
+        city_id=data.city_id, time_ranges=date_time_ranges(n) or None, limit=20, offset=0,
+        sort_by=enums.BrowseReservationSortBy.time, order=enums.Sorter.desc,
+    )),
+    Case('reservation.browse', 'offset', (0, 1000, 10000, 100000), lambda data, n: db.reservation.browse(
+        limit=20, offset=n, sort_by=enums.BrowseReservationSortBy.time, order=enums.Sorter.desc,
+    )),
+    Case('view.browse_my_reservation', 'time_ranges', (0, 1, 4, 16), lambda data, n: db.view.browse_my_reservation(
+        account_id=data.account_id, request_time=datetime.now(), time_ranges=date_time_ranges(n) or None,
+    )),
+    Case('stadium.batch_read', 'batch_size', (1, 10, 100, 1000), lambda data, n: db.stadium.batch_read(
+        stadium_ids=data.stadium_ids[:n],
+    )),
+    Case('venue.batch_read', 'batch_size', (1, 10, 100, 1000), lambda data, n: db.venue.batch_read(
+        venue_ids=data.venue_ids[:n],
+    )),
+    Case('court.batch_read', 'batch_size', (1, 10, 100, 1000), lambda data, n: db.court.batch_read(
+        court_ids=data.court_ids[:n],
+    )),
+    Case('court.browse', 'batch_size', (1, 10, 100, 1000), lambda data, n: db.court.browse(
+        venue_ids=data.venue_ids[:n],
+    )),
+    Case('court.batch_add', 'batch_size', (1, 10, 100, 1000), lambda data, n: db.court.batch_add(
+        venue_id=data.venue_ids[0], add=n, start_from=1000,
+    )),
+    Case('business_hour.batch_add', 'batch_size', (1, 10, 100), lambda data, n: db.business_hour.batch_add(
+        place_type=enums.PlaceType.stadium, place_id=data.stadium_ids[0], business_hours=week_time_ranges(n),
+    )),
+]
+
+
+async def load_dataset(conn: asyncpg.Connection) -> Dataset:
+    async def sample(table: str) -> list[int]:
+        rows = await conn.fetch(
+            fr"SELECT id FROM {table} WHERE name LIKE 'bench %' ORDER BY id LIMIT {SAMPLE_SIZE}",
+        )
+        return [row['id'] for row in rows]
+
+    venue_ids = await sample('venue')
+    if not venue_ids:
+        raise SystemExit('no seeded rows found, run `python -m benchmarks.load.seed` first')
+    court_rows = await conn.fetch(r'SELECT id FROM court WHERE venue_id = ANY($1) ORDER BY id', venue_ids)
+    return Dataset(
+        account_id=await conn.fetchval(r"SELECT id FROM account WHERE email LIKE 'bench%@example.com' LIMIT 1"),
+        city_id=(await sample('city'))[0],
+        stadium_ids=await sample('stadium'),
+        venue_ids=venue_ids,
+        court_ids=[row['id'] for row in court_rows][:SAMPLE_SIZE],
+    )
+
+
+@asynccontextmanager
+async def rolled_back(conn: asyncpg.Connection):
+    """
+    Routes `pg_pool_handler.cursor` to one connection inside a transaction,
+    the cursor's own transactions become savepoints of it.
+    """
+    @asynccontextmanager
+    async def cursor(read_only: bool = False):  # reads stay on this connection too
+        async with conn.transaction():
+            yield conn
+
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        with patch.object(db.pg_pool_handler, 'cursor', cursor):
+            yield
+    finally:
+        await transaction.rollback()
+
+
+@contextmanager
+def recording(statements: list[tuple[str, Sequence]]) -> Iterator[None]:
+    @contextmanager
+    def track(sql: str, params: Sequence):
+        statements.append((sql, params))
+        yield
+
+    with patch.object(slow_query, 'track', track):
+        yield
+
+
+def count_rows(result: Any) -> int:
+    if isinstance(result, tuple):  # browse functions return (rows, total count)
+        result = result[0]
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 0 if result is None else 1
+
+
+async def node_types(conn: asyncpg.Connection, statements: list[tuple[str, Sequence]]) -> list[str]:
+    def walk(plan: dict) -> Iterator[str]:
+        yield plan['Node Type']
+        for child in plan.get('Plans', ()):
+            yield from walk(child)
+
+    types = set()
+    for sql, params in dict(statements).items():  # one plan per distinct statement
+        plan = await conn.fetchval(f'EXPLAIN (FORMAT JSON) {sql}', *params)
+        types.update(walk(json.loads(plan)[0]['Plan']))
+    return sorted(types)
+
+
+async def measure(conn: asyncpg.Connection, case: Case, dataset: Dataset, value: int, number: int) -> Measurement:
+    wall_times = []
+    statements: list[tuple[str, Sequence]] = []
+    row_count = 0
+    for _ in range(number):
+        statements = []
+        savepoint = conn.transaction()  # every round starts from the same rows
+        await savepoint.start()
+        try:
+            with recording(statements):
+                start = time.perf_counter()
+                result = await case.run(dataset, value)
+                wall_times.append(time.perf_counter() - start)
+        finally:
+            await savepoint.rollback()
+        row_count = count_rows(result)
+
+    return Measurement(
+        statement_count=len(statements),
+        row_count=row_count,
+        wall_time=statistics.median(wall_times),
+        node_types=await node_types(conn, statements),
+    )
+
+
+async def main(number: int, case_names: Sequence[str] | None):
+    conn = await connect(pg_config)
+    try:
+        dataset = await load_dataset(conn)
+        async with rolled_back(conn):
+            for case in CASES:
+                if case_names and case.name not in case_names:
+                    continue
+                print(f'{case.name} by {case.parameter}, median of {number}')
+                print(f'{case.parameter:>12} {"statements":>10} {"rows":>6} {"ms":>9}  plan nodes')
+                for value in case.values:
+                    result = await measure(conn, case, dataset, value, number)
+                    print(f'{value:>12} {result.statement_count:>10} {result.row_count:>6}'
+                          f' {result.wall_time * 1000:>9.2f}  {", ".join(result.node_types)}')
+                print()
+    finally:
+        await conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=5)
+    parser.add_argument('--case', nargs='*', choices=sorted({case.name for case in CASES}))
+    args = parser.parse_args()
+    asyncio.run(main(number=args.number, case_names=args.case))
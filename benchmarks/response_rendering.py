@@ -0,0 +1,84 @@
+"""
+Compares the cpu time to render one 50-item `/stadium/browse` page.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.response_rendering [--number 200]
+
+`fastapi` is the default path: dump, validate against the return annotation, `jsonable_encoder`, stdlib json.
+`prevalidated` is what `PrevalidatedRoute` does: orjson straight from the models built by the persistence layer.
+"""
+import argparse
+import asyncio
+import time
+from datetime import time as dt_time
+
+from fastapi import responses
+from fastapi.routing import serialize_response
+
+from app.base import do, enums, vo
+from app.processor.http import stadium
+from app.utils import ORJSONResponse, Response
+
+PAGE_SIZE = 50
+
+
+def build_page() -> Response:
+    stadiums = [
+        vo.ViewStadium(
+            id=i, name=f'stadium {i}', district_id=1, owner_id=1, address='address', contact_number='0912345678',
+            description='description ' * 10, long=121.5, lat=25.0, is_published=True,
+            city='city', district='district', sports=['badminton', 'basketball'],
+            business_hours=[
+                do.BusinessHour(
+                    id=i * 7 + weekday, place_id=i, type=enums.PlaceType.stadium, weekday=weekday,
+                    start_time=dt_time(8), end_time=dt_time(22),
+                ) for weekday in range(1, 8)
+            ],
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    return Response(data=stadium.BrowseStadiumOutput(data=stadiums, total_count=1000, limit=PAGE_SIZE, offset=0))
+
+
+def get_response_field():
+    route, = [route for route in stadium.router.routes if route.name == 'browse_stadium']
+    return route.response_field
+
+
+async def render_fastapi(response_field, page: Response) -> bytes:
+    content = await serialize_response(field=response_field, response_content=page, is_coroutine=True)
+    return responses.JSONResponse(content).body
+
+
+async def render_prevalidated(_, page: Response) -> bytes:
+    return ORJSONResponse(page).body
+
+
+async def measure(render, response_field, page: Response, number: int) -> float:
+    await render(response_field, page)  # warm up
+    start = time.process_time()
+    for _ in range(number):
+        await render(response_field, page)
+    return (time.process_time() - start) / number
+
+
+async def main(number: int):
+    page = build_page()
+    response_field = get_response_field()
+
+    fastapi_time = await measure(render_fastapi, response_field, page, number)
+    prevalidated_time = await measure(render_prevalidated, response_field, page, number)
+
+    print(f'page of {PAGE_SIZE} stadiums, {number} rounds, cpu time per page')
+    print(f'{"fastapi":>14}: {fastapi_time * 1000:8.3f} ms')
+    print(f'{"prevalidated":>14}: {prevalidated_time * 1000:8.3f} ms')
+    print(f'{"saved":>14}: {(fastapi_time - prevalidated_time) * 1000:8.3f} ms'
+          f' ({fastapi_time / prevalidated_time:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(number=args.number))
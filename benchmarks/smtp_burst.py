@@ -0,0 +1,104 @@
+"""
+Sends a burst of verification-sized mails to a local aiosmtpd server, per smtp pool size.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.smtp_burst [--messages 200] [--latency-ms 20] [--pool-size 1 4 8]
+
+The server waits `--latency-ms` on every message, as a remote relay would.
+Reports wall time and messages per second of `smtp_handler.send_messages` and of one `send_message` per mail,
+which is what the email jobs do, and exits with 1 if a recipient was not delivered.
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from email.message import EmailMessage
+from typing import Sequence
+
+from aiosmtpd.controller import Controller
+
+from app.config import SMTPConfig
+from app.persistence.email import SMTPHandler
+
+
+class SlowHandler:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def handle_DATA(self, server, session, envelope):  # noqa
+        await asyncio.sleep(self.latency)
+        return '250 Message accepted for delivery'
+
+
+def make_messages(count: int) -> list[EmailMessage]:
+    messages = []
+    for i in range(count):
+        message = EmailMessage()
+        message['From'] = 'joinee@example.com'
+        message['To'] = f'bench{i}@example.com'
+        message['Subject'] = 'Jöinee 帳號驗證'
+        message.set_content(f'<a href="http://localhost/auth/signup/verified?code={i}">verify</a>', subtype='html')
+        messages.append(message)
+    return messages
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def measure(port: int, pool_size: int, messages: Sequence[EmailMessage], batched: bool) -> tuple[float, int]:
+    smtp_config = SMTPConfig()
+    smtp_config.host, smtp_config.port, smtp_config.use_tls = '127.0.0.1', port, False
+    smtp_config.username = smtp_config.password = None
+    smtp_config.pool_size = pool_size
+
+    handler = SMTPHandler.__new__(SMTPHandler)  # one pool per run, not the worker's singleton
+    handler.__init__()
+    await handler.initialize(smtp_config=smtp_config)
+    try:
+        start = time.perf_counter()
+        if batched:
+            results = await handler.send_messages(messages)
+        else:
+            results = await asyncio.gather(*(handler.send_message(message) for message in messages))
+        elapsed = time.perf_counter() - start
+    finally:
+        await handler.close()
+
+    undelivered = sum(
+        1 if isinstance(deliveries, Exception) else sum(not delivery.is_delivered for delivery in deliveries)
+        for deliveries in results
+    )
+    return elapsed, undelivered
+
+
+async def main(message_count: int, latency_ms: float, pool_sizes: Sequence[int]) -> int:
+    controller = Controller(SlowHandler(latency_ms / 1000), hostname='127.0.0.1', port=free_port())
+    controller.start()
+    try:
+        messages = make_messages(message_count)
+        print(f'{message_count} messages, {latency_ms} ms server latency')
+        print(f'{"pool size":>9} {"mode":>13} {"s":>7} {"msg/s":>8} {"undelivered":>11}')
+        failed = 0
+        for pool_size in pool_sizes:
+            for batched in (True, False):
+                elapsed, undelivered = await measure(controller.port, pool_size, messages, batched)
+                failed += undelivered
+                mode = 'send_messages' if batched else 'send_message'
+                print(f'{pool_size:>9} {mode:>13} {elapsed:>7.2f} {message_count / elapsed:>8.1f} {undelivered:>11}')
+    finally:
+        controller.stop()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--pool-size', type=int, nargs='*', default=[1, 4, 8])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(message_count=args.messages, latency_ms=args.latency_ms, pool_sizes=args.pool_size)))
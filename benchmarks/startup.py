@@ -0,0 +1,69 @@
+"""
+Measures the cold start of a worker, i.e. `import app.main` in a fresh interpreter.
+------
+
+usage:
+    ENV=ci poetry run python -m benchmarks.startup [--number 10] [--top 15]
+
+Each round spawns a new process so nothing is reused from `sys.modules`.
+`--top` additionally lists the slowest modules reported by `python -X importtime`.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_SNIPPET = (
+    'import time\n'
+    'start = time.perf_counter()\n'
+    'import app.main\n'
+    'print(time.perf_counter() - start)\n'
+)
+
+
+def run_once() -> float:
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET],
+        capture_output=True, text=True, check=True, env=os.environ,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_modules(top: int) -> list[tuple[int, str]]:
+    """
+    Cumulative microseconds per module, parsed from the `-X importtime` report on stderr.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.main'],
+        capture_output=True, text=True, check=True, env=os.environ,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main(number: int, top: int):
+    run_once()  # warm up the filesystem cache and bytecode
+    timings = [run_once() for _ in range(number)]
+    print(f'import app.main, {number} rounds')
+    print(f'{"min":>8}: {min(timings) * 1000:8.1f} ms')
+    print(f'{"median":>8}: {statistics.median(timings) * 1000:8.1f} ms')
+    print(f'{"max":>8}: {max(timings) * 1000:8.1f} ms')
+
+    if top:
+        print(f'\nslowest {top} modules (cumulative)')
+        for cumulative, name in slowest_modules(top):
+            print(f'{cumulative / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--top', type=int, default=0)
+    args = parser.parse_args()
+    main(number=args.number, top=args.top)
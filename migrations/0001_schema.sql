@@ -0,0 +1,168 @@
+-- Baseline of the tables the persistence layer reads and writes.
+-- Everything is created only if missing, so running it on an existing database changes nothing.
+
+DO $$ BEGIN
+    CREATE TYPE gender_type AS ENUM ('MALE', 'FEMALE', 'UNREVEALED');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE role_type AS ENUM ('PROVIDER', 'NORMAL');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE fee_type AS ENUM ('PER_RESERVATION', 'PER_PERSON', 'PER_HOUR', 'PER_PERSON_PER_HOUR');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE place_type AS ENUM ('STADIUM', 'VENUE');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE technical_type AS ENUM ('ENTRY', 'INTERMEDIATE', 'ADVANCED');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE reservation_member_status AS ENUM ('JOINED', 'INVITED', 'REJECTED');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE reservation_member_source AS ENUM ('SEARCH', 'INVITATION_CODE');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS gcs_file (
+    file_uuid UUID PRIMARY KEY,
+    key       VARCHAR NOT NULL,
+    bucket    VARCHAR NOT NULL,
+    filename  VARCHAR NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS account (
+    id              SERIAL PRIMARY KEY,
+    email           VARCHAR NOT NULL,
+    pass_hash       VARCHAR,
+    nickname        VARCHAR NOT NULL,
+    gender          gender_type,
+    image_uuid      UUID REFERENCES gcs_file (file_uuid),
+    role            role_type NOT NULL,
+    is_verified     BOOLEAN NOT NULL DEFAULT FALSE,
+    is_google_login BOOLEAN NOT NULL DEFAULT FALSE,
+    access_token    VARCHAR,
+    refresh_token   VARCHAR
+);
+
+-- in the transaction of this file, a failed build rolls back instead of leaving an invalid index behind
+DO $$ BEGIN
+    ALTER TABLE account ADD CONSTRAINT account_email_key UNIQUE (email);
+EXCEPTION WHEN duplicate_table OR duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS email_verification (
+    code        UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    account_id  INTEGER NOT NULL REFERENCES account (id),
+    email       VARCHAR NOT NULL,
+    is_consumed BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS city (
+    id   SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS district (
+    id      SERIAL PRIMARY KEY,
+    name    VARCHAR NOT NULL,
+    city_id INTEGER NOT NULL REFERENCES city (id)
+);
+
+CREATE TABLE IF NOT EXISTS sport (
+    id   SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stadium (
+    id             SERIAL PRIMARY KEY,
+    name           VARCHAR NOT NULL,
+    district_id    INTEGER NOT NULL REFERENCES district (id),
+    owner_id       INTEGER NOT NULL REFERENCES account (id),
+    address        VARCHAR NOT NULL,
+    contact_number VARCHAR,
+    description    VARCHAR,
+    long           DOUBLE PRECISION NOT NULL,
+    lat            DOUBLE PRECISION NOT NULL,
+    is_published   BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS venue (
+    id                   SERIAL PRIMARY KEY,
+    stadium_id           INTEGER NOT NULL REFERENCES stadium (id),
+    name                 VARCHAR NOT NULL,
+    floor                VARCHAR NOT NULL,
+    reservation_interval INTEGER,
+    is_reservable        BOOLEAN NOT NULL,
+    is_chargeable        BOOLEAN NOT NULL,
+    fee_rate             DOUBLE PRECISION,
+    fee_type             fee_type,
+    area                 INTEGER NOT NULL,
+    current_user_count   INTEGER NOT NULL DEFAULT 0,
+    capacity             INTEGER NOT NULL,
+    sport_equipments     VARCHAR,
+    facilities           VARCHAR,
+    court_type           VARCHAR NOT NULL,
+    sport_id             INTEGER NOT NULL REFERENCES sport (id),
+    is_published         BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS court (
+    id           SERIAL PRIMARY KEY,
+    venue_id     INTEGER NOT NULL REFERENCES venue (id),
+    number       INTEGER NOT NULL,
+    is_published BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS album (
+    id        SERIAL PRIMARY KEY,
+    place_id  INTEGER NOT NULL,
+    type      place_type NOT NULL,
+    file_uuid UUID NOT NULL REFERENCES gcs_file (file_uuid)
+);
+
+CREATE TABLE IF NOT EXISTS business_hour (
+    id         SERIAL PRIMARY KEY,
+    place_id   INTEGER NOT NULL,
+    type       place_type NOT NULL,
+    weekday    INTEGER NOT NULL,
+    start_time TIME NOT NULL,
+    end_time   TIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reservation (
+    id              SERIAL PRIMARY KEY,
+    stadium_id      INTEGER NOT NULL REFERENCES stadium (id),
+    venue_id        INTEGER NOT NULL REFERENCES venue (id),
+    court_id        INTEGER NOT NULL REFERENCES court (id),
+    start_time      TIMESTAMP NOT NULL,
+    end_time        TIMESTAMP NOT NULL,
+    member_count    INTEGER NOT NULL DEFAULT 0,
+    vacancy         INTEGER NOT NULL DEFAULT -1,
+    technical_level technical_type[] NOT NULL DEFAULT '{}',
+    remark          VARCHAR,
+    invitation_code VARCHAR NOT NULL,
+    is_cancelled    BOOLEAN NOT NULL DEFAULT FALSE,
+    google_event_id VARCHAR
+);
+
+CREATE TABLE IF NOT EXISTS reservation_member (
+    reservation_id INTEGER NOT NULL REFERENCES reservation (id),
+    account_id     INTEGER NOT NULL REFERENCES account (id),
+    is_manager     BOOLEAN NOT NULL DEFAULT FALSE,
+    status         reservation_member_status NOT NULL,
+    source         reservation_member_source NOT NULL,
+    PRIMARY KEY (reservation_id, account_id)
+);
@@ -0,0 +1,51 @@
+-- migration: no-transaction
+-- Indexes for the lookups and browse predicates of app/persistence/database.
+-- Built concurrently so existing tables stay writable, `benchmarks.index_usage` checks they are picked.
+
+-- account.read_by_email and login go by the account_email_key constraint of the schema
+
+-- email_verification.read
+CREATE INDEX CONCURRENTLY IF NOT EXISTS email_verification_account_id_email_idx
+    ON email_verification (account_id, email);
+
+-- district.browse, stadium.browse by city
+CREATE INDEX CONCURRENTLY IF NOT EXISTS district_city_id_idx ON district (city_id);
+
+-- stadium.browse by district on published stadiums, view.browse_provider_stadium
+CREATE INDEX CONCURRENTLY IF NOT EXISTS stadium_district_id_published_idx
+    ON stadium (district_id) WHERE is_published;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS stadium_owner_id_idx ON stadium (owner_id);
+
+-- venue.batch_read by stadium, stadium.browse joins, published venues by sport
+CREATE INDEX CONCURRENTLY IF NOT EXISTS venue_stadium_id_idx ON venue (stadium_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS venue_sport_id_stadium_id_published_idx
+    ON venue (sport_id, stadium_id) WHERE is_published;
+
+-- court.browse by venue, and only the published ones for the public pages
+CREATE INDEX CONCURRENTLY IF NOT EXISTS court_venue_id_number_idx ON court (venue_id, number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS court_venue_id_published_idx
+    ON court (venue_id) WHERE is_published;
+
+-- album.browse, business_hour.browse by place
+CREATE INDEX CONCURRENTLY IF NOT EXISTS album_type_place_id_idx ON album (type, place_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS business_hour_type_place_id_weekday_idx
+    ON business_hour (type, place_id, weekday);
+
+-- reservations of a court in a time window: court page and the availability check
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_court_id_start_time_end_time_idx
+    ON reservation (court_id, start_time, end_time);
+-- reservation.browse within a stadium and overall, sorted by time
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_stadium_id_start_time_idx
+    ON reservation (stadium_id, start_time);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_start_time_end_time_idx
+    ON reservation (start_time, end_time);
+-- the public search only lists open reservations with vacancy
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_start_time_open_idx
+    ON reservation (start_time) WHERE NOT is_cancelled AND vacancy > 0;
+-- reservation.read_by_code, join by invitation code
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_invitation_code_idx ON reservation (invitation_code);
+
+-- view.browse_my_reservation goes from the account to its reservations,
+-- (reservation_id, account_id) is the primary key
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reservation_member_account_id_reservation_id_idx
+    ON reservation_member (account_id, reservation_id);
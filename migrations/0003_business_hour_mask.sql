@@ -0,0 +1,36 @@
+-- Weekly opening hours as one bit per quarter hour, 7 x 96 bits, the first bit being weekday 1 at 00:00.
+-- Kept by the persistence layer whenever business hours are written, see util.business_hour_mask.
+ALTER TABLE stadium ADD COLUMN IF NOT EXISTS business_hour_mask BIT(672) NOT NULL DEFAULT REPEAT('0', 672)::BIT(672);
+ALTER TABLE venue ADD COLUMN IF NOT EXISTS business_hour_mask BIT(672) NOT NULL DEFAULT REPEAT('0', 672)::BIT(672);
+
+CREATE TEMPORARY TABLE business_hour_quarter ON COMMIT DROP AS
+SELECT DISTINCT type, place_id, (weekday - 1) * 96 + quarter AS quarter
+  FROM business_hour,
+       GENERATE_SERIES(
+           FLOOR(EXTRACT(EPOCH FROM start_time) / 900)::INTEGER,
+           CEIL(EXTRACT(EPOCH FROM end_time) / 900)::INTEGER - 1
+       ) AS quarter;
+
+UPDATE stadium
+   SET business_hour_mask = mask.value
+  FROM (SELECT place_id,
+               STRING_AGG(CASE WHEN quarters @> ARRAY[i] THEN '1' ELSE '0' END, '' ORDER BY i)::BIT(672) AS value
+          FROM (SELECT place_id, ARRAY_AGG(quarter) AS quarters
+                  FROM business_hour_quarter
+                 WHERE type = 'STADIUM'
+                 GROUP BY place_id) AS place,
+               GENERATE_SERIES(0, 671) AS i
+         GROUP BY place_id) AS mask
+ WHERE stadium.id = mask.place_id;
+
+UPDATE venue
+   SET business_hour_mask = mask.value
+  FROM (SELECT place_id,
+               STRING_AGG(CASE WHEN quarters @> ARRAY[i] THEN '1' ELSE '0' END, '' ORDER BY i)::BIT(672) AS value
+          FROM (SELECT place_id, ARRAY_AGG(quarter) AS quarters
+                  FROM business_hour_quarter
+                 WHERE type = 'VENUE'
+                 GROUP BY place_id) AS place,
+               GENERATE_SERIES(0, 671) AS i
+         GROUP BY place_id) AS mask
+ WHERE venue.id = mask.place_id;
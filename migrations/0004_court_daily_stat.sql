@@ -0,0 +1,118 @@
+-- Per court and day rollup of reservations for provider analytics, the day being the reservation's start date.
+-- Kept by triggers on every write to reservation and reservation_member, so no write path can miss it;
+-- `python -m app.persistence.database.court_daily_stat` rebuilds it from scratch.
+CREATE TABLE IF NOT EXISTS court_daily_stat (
+    court_id          INTEGER NOT NULL REFERENCES court (id),
+    day               DATE NOT NULL,
+    reservation_count INTEGER NOT NULL DEFAULT 0,  -- not cancelled
+    reserved_minutes  INTEGER NOT NULL DEFAULT 0,  -- not cancelled
+    member_count      INTEGER NOT NULL DEFAULT 0,  -- joined members of reservations not cancelled
+    cancelled_count   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (court_id, day)
+);
+
+CREATE OR REPLACE FUNCTION court_daily_stat_add(
+    p_court_id INTEGER, p_day DATE,
+    p_reservations INTEGER, p_minutes INTEGER, p_members INTEGER, p_cancellations INTEGER
+) RETURNS VOID AS $$
+BEGIN
+    IF p_reservations = 0 AND p_minutes = 0 AND p_members = 0 AND p_cancellations = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO court_daily_stat AS stat
+                (court_id, day, reservation_count, reserved_minutes, member_count, cancelled_count)
+         VALUES (p_court_id, p_day, p_reservations, p_minutes, p_members, p_cancellations)
+    ON CONFLICT (court_id, day) DO UPDATE
+            SET reservation_count = stat.reservation_count + EXCLUDED.reservation_count,
+                reserved_minutes = stat.reserved_minutes + EXCLUDED.reserved_minutes,
+                member_count = stat.member_count + EXCLUDED.member_count,
+                cancelled_count = stat.cancelled_count + EXCLUDED.cancelled_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A reservation row counts its joined members only when updated or deleted, moving them between days
+-- or out on cancel; members added or removed are counted by the reservation_member trigger.
+CREATE OR REPLACE FUNCTION court_daily_stat_reservation() RETURNS TRIGGER AS $$
+DECLARE
+    members INTEGER := 0;  -- 0 on insert, the members are inserted afterwards
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        SELECT COUNT(*) INTO members
+          FROM reservation_member
+         WHERE reservation_id = OLD.id
+           AND status = 'JOINED';
+        PERFORM court_daily_stat_add(
+            OLD.court_id, OLD.start_time::DATE,
+            -(NOT OLD.is_cancelled)::INTEGER,
+            -CASE WHEN OLD.is_cancelled THEN 0 ELSE (EXTRACT(EPOCH FROM OLD.end_time - OLD.start_time) / 60)::INTEGER END,
+            -CASE WHEN OLD.is_cancelled THEN 0 ELSE members END,
+            -OLD.is_cancelled::INTEGER
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM court_daily_stat_add(
+            NEW.court_id, NEW.start_time::DATE,
+            (NOT NEW.is_cancelled)::INTEGER,
+            CASE WHEN NEW.is_cancelled THEN 0 ELSE (EXTRACT(EPOCH FROM NEW.end_time - NEW.start_time) / 60)::INTEGER END,
+            CASE WHEN NEW.is_cancelled THEN 0 ELSE members END,
+            NEW.is_cancelled::INTEGER
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION court_daily_stat_member() RETURNS TRIGGER AS $$
+DECLARE
+    delta INTEGER := 0;
+    reservation_id_ INTEGER;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        reservation_id_ := OLD.reservation_id;
+    ELSE
+        reservation_id_ := NEW.reservation_id;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        IF OLD.status = 'JOINED' THEN
+            delta := delta - 1;
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NEW.status = 'JOINED' THEN
+            delta := delta + 1;
+        END IF;
+    END IF;
+    IF delta <> 0 THEN
+        PERFORM court_daily_stat_add(court_id, start_time::DATE, 0, 0, delta, 0)
+           FROM reservation
+          WHERE id = reservation_id_
+            AND NOT is_cancelled;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS court_daily_stat_reservation ON reservation;
+CREATE TRIGGER court_daily_stat_reservation
+    AFTER INSERT OR DELETE OR UPDATE OF court_id, start_time, end_time, is_cancelled ON reservation
+    FOR EACH ROW EXECUTE FUNCTION court_daily_stat_reservation();
+
+DROP TRIGGER IF EXISTS court_daily_stat_member ON reservation_member;
+CREATE TRIGGER court_daily_stat_member
+    AFTER INSERT OR DELETE OR UPDATE OF status ON reservation_member
+    FOR EACH ROW EXECUTE FUNCTION court_daily_stat_member();
+
+INSERT INTO court_daily_stat (court_id, day, reservation_count, reserved_minutes, member_count, cancelled_count)
+SELECT reservation.court_id, reservation.start_time::DATE,
+       COUNT(*) FILTER (WHERE NOT reservation.is_cancelled),
+       COALESCE(SUM((EXTRACT(EPOCH FROM reservation.end_time - reservation.start_time) / 60)::INTEGER)
+                FILTER (WHERE NOT reservation.is_cancelled), 0),
+       COALESCE(SUM(member.count) FILTER (WHERE NOT reservation.is_cancelled), 0),
+       COUNT(*) FILTER (WHERE reservation.is_cancelled)
+  FROM reservation
+  LEFT JOIN LATERAL (SELECT COUNT(*) AS count
+                       FROM reservation_member
+                      WHERE reservation_member.reservation_id = reservation.id
+                        AND reservation_member.status = 'JOINED') AS member ON TRUE
+ GROUP BY reservation.court_id, reservation.start_time::DATE
+    ON CONFLICT (court_id, day) DO NOTHING;
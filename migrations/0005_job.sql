@@ -0,0 +1,25 @@
+-- Background jobs, taken by the workers of `app.processor.job` with `FOR UPDATE SKIP LOCKED`.
+-- A job is added in the same transaction as the rows it is about, so it runs exactly when they commit.
+
+DO $$ BEGIN
+    CREATE TYPE job_status AS ENUM ('PENDING', 'RUNNING', 'DONE', 'DEAD');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS job (
+    id           BIGSERIAL PRIMARY KEY,
+    job_type     VARCHAR NOT NULL,  -- not an enum, a new handler needs no migration
+    payload      JSONB NOT NULL DEFAULT '{}',
+    status       job_status NOT NULL DEFAULT 'PENDING',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after    TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at    TIMESTAMP,
+    last_error   VARCHAR,
+    created_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at  TIMESTAMP
+);
+
+-- the claim scans only what is due, done and dead jobs stay out of the index
+CREATE INDEX IF NOT EXISTS job_pending_idx ON job (job_type, run_after, id) WHERE status = 'PENDING';
+CREATE INDEX IF NOT EXISTS job_running_idx ON job (locked_at) WHERE status = 'RUNNING';
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from app.client import google_calendar
+from tests import TestCase
+
+
+class TestInstanceEventId(TestCase):
+    def test_naive_start_in_event_time_zone(self):
+        self.assertEqual(
+            google_calendar.instance_event_id('event', datetime(2023, 11, 17, 11)),
+            'event_20231117T030000Z',
+        )
+
+    def test_aware_start(self):
+        self.assertEqual(
+            google_calendar.instance_event_id('event', datetime(2023, 11, 17, 11, tzinfo=timezone.utc)),
+            'event_20231117T110000Z',
+        )
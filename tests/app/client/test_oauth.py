@@ -54,3 +54,15 @@ class TestOAuthHandler(AsyncTestCase):
         oauth_handler = OAuthHandler()
         oauth_handler.initialize(self.google_config)
         await oauth_handler.authorize_access_token(self.request)
+
+    @patch('app.client.oauth.OAuth', new_callable=Mock)
+    async def test_initialize_on_first_use(self, mock_oauth: Mock):
+        mock_oauth_return = AsyncMock()
+        mock_oauth.return_value = mock_oauth_return
+        mock_oauth_return.register = Mock()
+
+        oauth_handler = OAuthHandler()
+        oauth_handler.oauth = None
+        await oauth_handler.login(self.request)
+
+        mock_oauth_return.register.assert_called_once()
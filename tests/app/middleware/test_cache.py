@@ -0,0 +1,102 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.base import enums
+from app.config import CacheConfig
+from app.middleware import cache
+from app.persistence.cache import response_cache
+from tests import AsyncMock, AsyncTestCase, TestCase, patch
+
+
+class TestIsEtagMatched(TestCase):
+    def test_weak_comparison(self):
+        self.assertTrue(cache.is_etag_matched('"abc"', 'W/"abc"'))
+        self.assertTrue(cache.is_etag_matched('W/"xyz", W/"abc"', 'W/"abc"'))
+        self.assertTrue(cache.is_etag_matched('*', 'W/"abc"'))
+
+    def test_not_matched(self):
+        self.assertFalse(cache.is_etag_matched(None, 'W/"abc"'))
+        self.assertFalse(cache.is_etag_matched('W/"xyz"', 'W/"abc"'))
+
+
+class MockCacheConfig(CacheConfig):
+    backend = 'memory'
+    ttl = 60
+    max_size = 16
+
+
+class TestCachedRoute(AsyncTestCase):
+    async def asyncSetUp(self) -> None:
+        await response_cache.initialize(cache_config=MockCacheConfig())
+        self.call_count = 0
+        router = APIRouter(route_class=cache.CachedRoute)
+
+        @router.get('/city')
+        @cache.cached(namespace=enums.CacheNamespace.city)
+        async def browse_city(name: str | None = None):
+            self.call_count += 1
+            return {'name': name}
+
+        @router.get('/sport')
+        async def browse_sport():
+            self.call_count += 1
+            return {}
+
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    async def asyncTearDown(self) -> None:
+        await response_cache.close()
+
+    async def test_cache_hit(self):
+        first = self.client.get('/city', params={'name': 'a'})
+        second = self.client.get('/city', params={'name': 'a'})
+
+        self.assertEqual(self.call_count, 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first.headers['etag'], second.headers['etag'])
+        self.assertTrue(first.headers['etag'].startswith('W/'))
+
+    async def test_not_modified(self):
+        etag = self.client.get('/city').headers['etag']
+        response = self.client.get('/city', headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    async def test_different_params(self):
+        self.client.get('/city', params={'name': 'a'})
+        self.client.get('/city', params={'name': 'b'})
+
+        self.assertEqual(self.call_count, 2)
+
+    async def test_invalidate(self):
+        self.client.get('/city')
+        await response_cache.invalidate(enums.CacheNamespace.city)
+        self.client.get('/city')
+
+        self.assertEqual(self.call_count, 2)
+
+    async def test_not_cached_endpoint(self):
+        response = self.client.get('/sport')
+        self.client.get('/sport')
+
+        self.assertEqual(self.call_count, 2)
+        self.assertNotIn('etag', response.headers)
+
+    async def test_backend_down(self):
+        with patch.object(response_cache.backend, 'get', AsyncMock(side_effect=ConnectionError)), \
+                patch.object(response_cache.backend, 'set', AsyncMock(side_effect=ConnectionError)):
+            first = self.client.get('/city')
+            second = self.client.get('/city')
+
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertEqual(self.call_count, 2)
+
+    async def test_backend_set_failed(self):
+        with patch.object(response_cache.backend, 'set', AsyncMock(side_effect=TimeoutError)):
+            response = self.client.get('/city')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('etag', response.headers)
@@ -1,8 +1,9 @@
 from datetime import datetime
 from unittest.mock import patch
 
+import app.exceptions as exc
 from app.base.enums import RoleType
-from app.middleware.headers import get_auth_token
+from app.middleware.headers import get_auth_token, verify_admin_token
 from app.utils.security import AuthedAccount
 from tests import AsyncTestCase, Mock, MockContext
 
@@ -54,3 +55,21 @@ class TestGetAuthToken(AsyncTestCase):
             self.context['REQUEST_TIME'],
         )
         self.assertEqual(mock_context.account, self.auth_account)
+
+
+class TestVerifyAdminToken(AsyncTestCase):
+    @patch('app.config.app_config.admin_token', 'secret')
+    async def test_happy_path(self):
+        await verify_admin_token(admin_token='secret')
+
+    @patch('app.config.app_config.admin_token', 'secret')
+    async def test_wrong_token(self):
+        with self.assertRaises(exc.NoPermission):
+            await verify_admin_token(admin_token='guess')
+        with self.assertRaises(exc.NoPermission):
+            await verify_admin_token()
+
+    @patch('app.config.app_config.admin_token', None)
+    async def test_not_configured(self):
+        with self.assertRaises(exc.NoPermission):
+            await verify_admin_token(admin_token='')
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from fastapi import Request, Response
+
+from app.middleware import profiler
+from app.utils import metrics
+from app.utils.profiler import RequestProfile
+from tests import AsyncMock, AsyncTestCase, Mock
+
+
+class TestMiddleware(AsyncTestCase):
+    def setUp(self) -> None:
+        self.request = Request({
+            'type': 'http',
+            'method': 'GET',
+            'headers': [],
+            'path': '/test',
+            'query_string': b'',
+        })
+        self.profiles = []
+
+    def set_request_profile(self, profile: RequestProfile):
+        self.profiles.append(profile)
+
+    @patch('app.log.logger.warning', new_callable=Mock)
+    @patch('app.log.logger.info', new_callable=Mock)
+    async def test_happy_path(self, mock_info: Mock, mock_warning: Mock):
+        with patch.object(profiler.context, 'set_request_profile', self.set_request_profile):
+            response = await profiler.middleware(self.request, AsyncMock(return_value=Response()))
+
+        profile, = self.profiles
+        self.assertEqual(response.headers['Server-Timing'], profile.server_timing())
+        self.assertEqual(mock_info.call_args.kwargs['extra'], {'profile': profile.log_fields()})
+        mock_warning.assert_not_called()
+
+    @patch('app.log.logger.warning', new_callable=Mock)
+    @patch('app.log.logger.info', new_callable=Mock)
+    async def test_n_plus_one(self, mock_info: Mock, mock_warning: Mock):
+        async def call_next(_):
+            for _ in range(self.profiles[0].n_plus_one_threshold):
+                self.profiles[0].add_query('SELECT 1', 0.001)
+            return Response()
+
+        with patch.object(profiler.context, 'set_request_profile', self.set_request_profile):
+            await profiler.middleware(self.request, call_next)
+
+        mock_info.assert_not_called()
+        self.assertEqual(mock_warning.call_args.kwargs['extra']['repeated_queries'], [
+            {'sql': 'SELECT 1', 'count': self.profiles[0].n_plus_one_threshold},
+        ])
+
+    @patch('app.log.logger.info', new_callable=Mock)
+    async def test_route_histogram(self, _):
+        self.request.scope['route'] = Mock(path='/api/city/{city_id}')
+        in_progress = []
+
+        async def call_next(_):
+            in_progress.append(metrics.http_requests_in_progress._values[()])
+            return Response(status_code=201)
+
+        with patch.object(profiler.context, 'set_request_profile', self.set_request_profile), \
+                patch.object(profiler.metrics, 'http_request_duration', new_callable=Mock) as mock_histogram:
+            await profiler.middleware(self.request, call_next)
+
+        self.assertEqual(in_progress, [1])
+        self.assertEqual(metrics.http_requests_in_progress._values[()], 0)
+        self.assertEqual(mock_histogram.observe.call_args.args[1:], ('GET', '/api/city/{city_id}', '201'))
+
+    @patch('app.log.logger.info', new_callable=Mock)
+    async def test_unmatched_route(self, _):
+        with patch.object(profiler.context, 'set_request_profile', self.set_request_profile), \
+                patch.object(profiler.metrics, 'http_request_duration', new_callable=Mock) as mock_histogram:
+            await profiler.middleware(self.request, AsyncMock(return_value=Response(status_code=404)))
+
+        self.assertEqual(mock_histogram.observe.call_args.args[1:], ('GET', 'unmatched', '404'))
@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, time
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import APIRouter, FastAPI, responses
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.base import enums
+from app.middleware import response
+from app.utils import ORJSONResponse, Response
+from tests import TestCase
+
+
+class Model(BaseModel):
+    id: int
+    file_uuid: UUID
+    type: enums.PlaceType
+    start_time: time
+    created_at: datetime
+    tags: Sequence[str]
+
+
+MODEL = Model(
+    id=1,
+    file_uuid=UUID('2b1f8e4a-2c1d-4a6e-8f3b-0c9d5e7a1b2c'),
+    type=enums.PlaceType.stadium,
+    start_time=time(8, 30),
+    created_at=datetime(2023, 10, 1, 12, 0, 0, 123456),
+    tags=['a', 'b'],
+)
+
+
+class TestPrevalidatedRoute(TestCase):
+    def setUp(self) -> None:
+        router = APIRouter(route_class=response.PrevalidatedRoute, default_response_class=ORJSONResponse)
+
+        @router.get('/prevalidated')
+        @response.prevalidated
+        async def prevalidated_endpoint(id_: int = 1) -> Response[Sequence[Model]]:
+            return Response(data=[MODEL.model_copy(update={'id': id_})])
+
+        @router.get('/validated')
+        async def validated_endpoint(id_: int = 1) -> Response[Sequence[Model]]:
+            return Response(data=[MODEL.model_copy(update={'id': id_})])
+
+        @router.post('/cookie', status_code=201)
+        @response.prevalidated
+        async def cookie_endpoint(sub_response: responses.Response) -> Response[bool]:
+            sub_response.set_cookie(key='token', value='abc')
+            return Response(data=True)
+
+        @router.get('/status')
+        @response.prevalidated
+        async def status_endpoint() -> Response[bool]:
+            return Response(data=True)
+
+        app = FastAPI()
+        app.include_router(router)
+        self.app = app
+        self.client = TestClient(app)
+
+    def test_same_body_as_validated(self):
+        prevalidated = self.client.get('/prevalidated', params={'id_': 2})
+        validated = self.client.get('/validated', params={'id_': 2})
+
+        self.assertEqual(prevalidated.status_code, 200)
+        self.assertEqual(prevalidated.headers['content-type'], 'application/json')
+        self.assertEqual(prevalidated.json(), validated.json())
+        self.assertEqual(prevalidated.json()['data'][0]['id'], 2)
+
+    def test_sub_response_merged(self):
+        result = self.client.post('/cookie')
+
+        self.assertEqual(result.status_code, 201)
+        self.assertEqual(result.json(), {'data': True, 'error': None})
+        self.assertIn('token=abc', result.headers['set-cookie'])
+
+    def test_hidden_sub_response_param(self):
+        result = self.client.get('/status')
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.json(), {'data': True, 'error': None})
+        parameters = self.app.openapi()['paths']['/status']['get'].get('parameters', [])
+        self.assertEqual(parameters, [])
+
+    def test_schema_kept(self):
+        schema = self.app.openapi()['paths']['/prevalidated']['get']['responses']['200']
+        self.assertIn('$ref', schema['content']['application/json']['schema'])
+
+
+class TestORJSONResponse(TestCase):
+    def test_render_model(self):
+        result = ORJSONResponse(content=Response(data=MODEL))
+        self.assertEqual(
+            result.body,
+            b'{"data":{"id":1,"file_uuid":"2b1f8e4a-2c1d-4a6e-8f3b-0c9d5e7a1b2c","type":"STADIUM",'
+            b'"start_time":"08:30:00","created_at":"2023-10-01T12:00:00.123456","tags":["a","b"]},"error":null}',
+        )
+
+    def test_render_nested_model(self):
+        result = ORJSONResponse(content={'data': [MODEL]})
+        self.assertEqual(json.loads(result.body), {'data': [MODEL.model_dump(mode='json')]})
+
+    def test_render_unsupported(self):
+        with self.assertRaises(TypeError):
+            ORJSONResponse(content={'data': object()})
@@ -0,0 +1,11 @@
+from unittest.mock import patch
+
+from app.middleware.timeout import statement_timeout
+from tests import AsyncTestCase, Mock
+
+
+class TestStatementTimeout(AsyncTestCase):
+    @patch('app.middleware.timeout.context')
+    async def test_happy_path(self, mock_context: Mock):
+        await statement_timeout(1500)()
+        mock_context.set_statement_timeout.assert_called_once_with(1.5)
@@ -0,0 +1,136 @@
+from unittest.mock import patch
+
+import fakeredis
+import fakeredis.aioredis
+import redis.asyncio as redis
+
+from app.base import enums
+from app.config import CacheConfig
+from app.persistence import cache
+from app.persistence.redis import redis_pool_handler
+from tests import AsyncTestCase
+
+
+class MockCacheConfig(CacheConfig):
+    def __init__(self, backend: str = 'memory'):
+        self.backend = backend
+        self.ttl = 60
+        self.max_size = 2
+
+
+class TestInMemoryCacheBackend(AsyncTestCase):
+    def setUp(self) -> None:
+        self.backend = cache.InMemoryCacheBackend(max_size=2)
+        self.value = cache.CachedResponse(body=b'{}', status_code=200, media_type='application/json', etag='W/"1"')
+
+    async def test_get_set(self):
+        await self.backend.set(enums.CacheNamespace.city, 'key', self.value, ttl=60)
+        result = await self.backend.get(enums.CacheNamespace.city, 'key')
+        self.assertEqual(result, self.value)
+
+    async def test_miss(self):
+        result = await self.backend.get(enums.CacheNamespace.city, 'key')
+        self.assertIsNone(result)
+
+    @patch('time.monotonic')
+    async def test_expired(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        await self.backend.set(enums.CacheNamespace.city, 'key', self.value, ttl=60)
+        mock_monotonic.return_value = 160
+        result = await self.backend.get(enums.CacheNamespace.city, 'key')
+        self.assertIsNone(result)
+
+    async def test_evict_least_recently_used(self):
+        await self.backend.set(enums.CacheNamespace.city, 'a', self.value, ttl=60)
+        await self.backend.set(enums.CacheNamespace.city, 'b', self.value, ttl=60)
+        await self.backend.get(enums.CacheNamespace.city, 'a')
+        await self.backend.set(enums.CacheNamespace.city, 'c', self.value, ttl=60)
+
+        self.assertEqual(await self.backend.get(enums.CacheNamespace.city, 'a'), self.value)
+        self.assertIsNone(await self.backend.get(enums.CacheNamespace.city, 'b'))
+        self.assertEqual(await self.backend.get(enums.CacheNamespace.city, 'c'), self.value)
+
+    async def test_invalidate(self):
+        await self.backend.set(enums.CacheNamespace.city, 'a', self.value, ttl=60)
+        await self.backend.set(enums.CacheNamespace.sport, 'a', self.value, ttl=60)
+        await self.backend.invalidate([enums.CacheNamespace.city])
+
+        self.assertIsNone(await self.backend.get(enums.CacheNamespace.city, 'a'))
+        self.assertEqual(await self.backend.get(enums.CacheNamespace.sport, 'a'), self.value)
+
+
+class TestRedisCacheBackend(AsyncTestCase):
+    def setUp(self) -> None:
+        self.value = cache.CachedResponse(body=b'{}', status_code=200, media_type='application/json', etag='W/"1"')
+        redis_pool_handler._pool = redis.ConnectionPool(
+            connection_class=fakeredis.aioredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+        )
+
+    async def asyncTearDown(self) -> None:
+        await redis_pool_handler.close()
+
+    async def test_get_set_invalidate(self):
+        backend = cache.RedisCacheBackend()
+
+        await backend.set(enums.CacheNamespace.stadium, 'a', self.value, ttl=60)
+        await backend.set(enums.CacheNamespace.venue, 'a', self.value, ttl=60)
+        self.assertEqual(await backend.get(enums.CacheNamespace.stadium, 'a'), self.value)
+
+        await backend.invalidate([enums.CacheNamespace.stadium])
+        self.assertIsNone(await backend.get(enums.CacheNamespace.stadium, 'a'))
+        self.assertEqual(await backend.get(enums.CacheNamespace.venue, 'a'), self.value)
+        await backend.close()
+
+
+class TestResponseCacheHandler(AsyncTestCase):
+    def setUp(self) -> None:
+        self.handler = cache.ResponseCacheHandler()
+        self.value = cache.CachedResponse(body=b'{}', status_code=200, media_type='application/json', etag='W/"1"')
+
+    async def asyncTearDown(self) -> None:
+        await self.handler.close()
+
+    async def test_not_initialized(self):
+        await self.handler.set(enums.CacheNamespace.city, 'key', self.value)
+        self.assertIsNone(await self.handler.get(enums.CacheNamespace.city, 'key'))
+        await self.handler.invalidate(enums.CacheNamespace.city)
+
+    @patch('app.log.logger.warning')
+    async def test_invalidate_failed(self, mock_warning):
+        await self.handler.initialize(cache_config=MockCacheConfig())
+        with patch.object(self.handler.backend, 'invalidate', side_effect=ConnectionError):
+            await self.handler.invalidate(enums.CacheNamespace.city)
+        mock_warning.assert_called_once()
+
+    async def test_initialize_memory(self):
+        await self.handler.initialize(cache_config=MockCacheConfig())
+        self.assertIsInstance(self.handler.backend, cache.InMemoryCacheBackend)
+
+    async def test_initialize_redis(self):
+        redis_pool_handler._pool = redis.ConnectionPool(
+            connection_class=fakeredis.aioredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+        )
+        try:
+            await self.handler.initialize(cache_config=MockCacheConfig(backend='redis'))
+        finally:
+            await redis_pool_handler.close()
+        self.assertIsInstance(self.handler.backend, cache.RedisCacheBackend)
+
+    async def test_initialize_redis_without_url(self):
+        with self.assertRaises(ValueError):
+            await self.handler.initialize(cache_config=MockCacheConfig(backend='redis'))
+        self.assertIsNone(self.handler.backend)
+
+    async def test_hit_ratio(self):
+        await self.handler.initialize(cache_config=MockCacheConfig())
+        hit_count, miss_count = self.handler.hit_count, self.handler.miss_count
+
+        await self.handler.get(enums.CacheNamespace.city, 'key')
+        await self.handler.set(enums.CacheNamespace.city, 'key', self.value)
+        result = await self.handler.get(enums.CacheNamespace.city, 'key')
+
+        self.assertEqual(result, self.value)
+        self.assertEqual(self.handler.hit_count, hit_count + 1)
+        self.assertEqual(self.handler.miss_count, miss_count + 1)
@@ -1,9 +1,11 @@
+import asyncio
 from contextlib import asynccontextmanager
 from unittest.mock import patch
 
+import app.exceptions as exc
 from app.config import PGConfig
-from app.persistence.database import PGPoolHandler, PoolHandlerBase
-from tests import AsyncMock, AsyncTestCase
+from app.persistence.database import PGPoolHandler, PoolHandlerBase, Replica
+from tests import AsyncMock, AsyncTestCase, Mock
 
 
 class MockPoolHandler(PoolHandlerBase):
@@ -35,6 +37,7 @@ class TestPGPoolHandler(AsyncTestCase):
         self.mock_pool = 'mock_pool'
         self.config = PGConfig()
         self.handler = PGPoolHandler()
+        self.handler._db_config = self.config
 
     def tearDown(self) -> None:
         self.handler._pool = None
@@ -51,5 +54,179 @@ class TestPGPoolHandler(AsyncTestCase):
             password=self.config.password,
             database=self.config.db_name,
             max_size=self.config.max_pool_size,
-            min_size=1,
+            min_size=self.config.min_pool_size,
+            max_inactive_connection_lifetime=self.config.max_inactive_connection_lifetime,
+            server_settings={'statement_timeout': str(self.config.statement_timeout_ms)},
         )
+
+    async def test_cursor(self):
+        mock_conn = Mock()
+        mock_conn.transaction = Mock(return_value=AsyncMock())
+        mock_pool = Mock()
+        waiting = []
+
+        async def acquire(timeout):
+            waiting.append(self.handler.waiting_count)
+            return mock_conn
+
+        mock_pool.acquire = acquire
+        mock_pool.release = AsyncMock()
+        self.handler._pool = mock_pool
+
+        async with self.handler.cursor() as conn:
+            self.assertIs(conn, mock_conn)
+
+        self.assertEqual(waiting, [1])
+        self.assertEqual(self.handler.waiting_count, 0)
+        mock_pool.release.assert_awaited_once_with(mock_conn)
+
+    async def test_cursor_released_on_error(self):
+        mock_conn = Mock()
+        mock_conn.transaction = Mock(return_value=AsyncMock())
+        mock_pool = Mock()
+        mock_pool.acquire = AsyncMock(return_value=mock_conn)
+        mock_pool.release = AsyncMock()
+        self.handler._pool = mock_pool
+
+        with self.assertRaises(ValueError):
+            async with self.handler.cursor():
+                raise ValueError
+
+        mock_pool.release.assert_awaited_once_with(mock_conn)
+
+    async def test_cursor_shed_when_saturated(self):
+        mock_pool = Mock()
+        mock_pool.acquire = AsyncMock()
+        self.handler._pool = mock_pool
+        self.handler.waiting_count = self.config.max_waiting
+
+        try:
+            with self.assertRaises(exc.ServiceBusy):
+                async with self.handler.cursor():
+                    pass
+        finally:
+            self.handler.waiting_count = 0
+        mock_pool.acquire.assert_not_called()
+
+    async def test_cursor_acquire_timeout(self):
+        mock_pool = Mock()
+        mock_pool.acquire = AsyncMock(side_effect=asyncio.TimeoutError)
+        self.handler._pool = mock_pool
+
+        with self.assertRaises(exc.ServiceBusy):
+            async with self.handler.cursor():
+                pass
+        mock_pool.acquire.assert_awaited_once_with(timeout=self.config.acquire_timeout)
+        self.assertEqual(self.handler.waiting_count, 0)
+
+    @patch('asyncpg.connect', new_callable=AsyncMock)
+    async def test_side_connection(self, mock_connect: AsyncMock):
+        mock_conn = AsyncMock()
+        mock_connect.return_value = mock_conn
+        self.handler._db_config = self.config
+
+        async with self.handler.side_connection() as conn:
+            self.assertIs(conn, mock_conn)
+
+        mock_connect.assert_awaited_once()
+        mock_conn.close.assert_awaited_once()
+
+
+class TestReplicaRouting(AsyncTestCase):
+    def setUp(self) -> None:
+        self.handler = PGPoolHandler()
+        self.handler._db_config = PGConfig()
+        self.primary_conn, self.replica_conn = Mock(), Mock()
+        for conn in (self.primary_conn, self.replica_conn):
+            conn.transaction = Mock(return_value=AsyncMock())
+        self.handler._pool = self.make_pool(self.primary_conn)
+        self.replica = Replica(name='replica:5433', pool=self.make_pool(self.replica_conn), is_healthy=True)
+        self.handler.replicas = [self.replica]
+        self.context = Mock()
+        self.context.is_primary_sticky = Mock(return_value=False)
+        self.context.set_primary_sticky = Mock(return_value=None)
+        self.context_patcher = patch('app.persistence.database.context', self.context)
+        self.context_patcher.start()
+
+    def tearDown(self) -> None:
+        self.context_patcher.stop()
+        self.handler._pool = None
+        self.handler.replicas = []
+
+    @staticmethod
+    def make_pool(conn):
+        pool = Mock()
+        pool.acquire = AsyncMock(return_value=conn)
+        pool.release = AsyncMock()
+        return pool
+
+    async def test_read_goes_to_replica(self):
+        async with self.handler.cursor(read_only=True) as conn:
+            self.assertIs(conn, self.replica_conn)
+        self.replica_conn.transaction.assert_called_once_with(readonly=True)
+        self.replica.pool.release.assert_awaited_once_with(self.replica_conn)
+        self.context.set_primary_sticky.assert_not_called()
+
+    async def test_write_goes_to_primary_and_sticks(self):
+        async with self.handler.cursor() as conn:
+            self.assertIs(conn, self.primary_conn)
+        self.context.set_primary_sticky.assert_called_once()
+
+    async def test_read_after_write_goes_to_primary(self):
+        self.context.is_primary_sticky = Mock(return_value=True)
+        async with self.handler.cursor(read_only=True) as conn:
+            self.assertIs(conn, self.primary_conn)
+
+    async def test_unhealthy_replica_skipped(self):
+        self.replica.is_healthy = False
+        async with self.handler.cursor(read_only=True) as conn:
+            self.assertIs(conn, self.primary_conn)
+
+    async def test_unreachable_replica_falls_back(self):
+        self.replica.pool.acquire = AsyncMock(side_effect=OSError('connection refused'))
+        async with self.handler.cursor(read_only=True) as conn:
+            self.assertIs(conn, self.primary_conn)
+        self.assertFalse(self.replica.is_healthy)
+
+    async def test_round_robin(self):
+        other = Replica(name='replica:5434', pool=self.make_pool(Mock()), is_healthy=True)
+        self.handler.replicas.append(other)
+        picked = {self.handler._pick_replica().name for _ in range(4)}
+        self.assertEqual(picked, {'replica:5433', 'replica:5434'})
+
+    async def test_check_replica(self):
+        self.handler._db_config.replica_max_lag_seconds = 5
+        self.replica.pool.fetchval = AsyncMock(return_value=30)
+        await self.handler.check_replicas()
+        self.assertFalse(self.replica.is_healthy)
+
+        self.replica.pool.fetchval = AsyncMock(return_value=0)
+        await self.handler.check_replicas()
+        self.assertTrue(self.replica.is_healthy)
+
+        self.replica.pool.fetchval = AsyncMock(side_effect=OSError)
+        await self.handler.check_replicas()
+        self.assertFalse(self.replica.is_healthy)
+
+    @patch('asyncpg.create_pool', new_callable=AsyncMock)
+    async def test_initialize_replicas(self, mock_create_pool: AsyncMock):
+        self.handler.replicas = []
+        self.handler._pool = None
+        config = PGConfig()
+        config.replica_hosts = ['replica', 'replica:5433']
+        replica_pool = Mock()
+        replica_pool.fetchval = AsyncMock(return_value=0)
+        replica_pool.close = AsyncMock()
+        mock_create_pool.return_value = replica_pool
+
+        await self.handler.initialize(config)
+        try:
+            self.assertEqual([replica.name for replica in self.handler.replicas], ['replica', 'replica:5433'])
+            self.assertTrue(all(replica.is_healthy for replica in self.handler.replicas))
+            self.assertEqual(mock_create_pool.call_args_list[1].kwargs['port'], config.port)
+            self.assertEqual(mock_create_pool.call_args_list[2].kwargs['port'], '5433')
+        finally:
+            self.handler._pool = Mock(close=AsyncMock())
+            await self.handler.close()
+        replica_pool.close.assert_awaited()
+        self.assertIsNone(self.handler._check_task)
@@ -1,6 +1,8 @@
 from unittest.mock import patch
 from uuid import UUID
 
+import asyncpg
+
 import app.exceptions as exc
 from app.base import do
 from app.base.enums import GenderType, RoleType
@@ -31,6 +33,17 @@ class TestAddAccount(AsyncTestCase):
                 gender=GenderType.unrevealed, role=RoleType.normal, is_google_login=False,
             )
 
+    async def test_add_account_in_transaction(self):
+        cursor = Mock(fetchval=AsyncMock(return_value=1))
+        result = await account.add(email='email@email.com', cursor=cursor)
+        self.assertEqual(result, self.happy_path_result)
+        self.assertTrue(cursor.fetchval.await_args.args[0].startswith('INSERT INTO account'))
+
+    async def test_add_account_in_transaction_unique_error(self):
+        cursor = Mock(fetchval=AsyncMock(side_effect=asyncpg.UniqueViolationError))
+        with self.assertRaises(exc.UniqueViolationError):
+            await account.add(email='email@email.com', cursor=cursor)
+
 
 class TestReadByEmail(AsyncTestCase):
     def setUp(self) -> None:
@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 from app.base import do, enums, vo
 from app.persistence.database import business_hour
+from app.persistence.database.util import business_hour_mask
 from tests import AsyncMock, AsyncTestCase, Mock
 
 
@@ -21,9 +22,9 @@ class TestBrowse(AsyncTestCase):
         self.params = {
             'place_id': self.place_id,
             'place_type': self.place_type,
-            'weekday_0': 1,
-            'start_time_0': time(10, 27),
-            'end_time_0': time(17, 27),
+            'range_weekdays': [1],
+            'range_start_times': [time(10, 27)],
+            'range_end_times': [time(17, 27)],
         }
         self.params_no_time_range = {
             'place_id': self.place_id,
@@ -62,8 +63,11 @@ class TestBrowse(AsyncTestCase):
                 '  FROM business_hour'
                 ' WHERE type = %(place_type)s'
                 ' AND place_id = %(place_id)s'
-                ' AND ((business_hour.weekday = %(weekday_0)s AND business_hour.start_time < %(end_time_0)s AND business_hour.end_time > %(start_time_0)s))'  # noqa
-                ''
+                ' AND EXISTS (SELECT *'
+                '          FROM UNNEST(%(range_weekdays)s::INTEGER[], %(range_start_times)s::TIME[], %(range_end_times)s::TIME[])'
+                '            AS time_range(weekday, start_time, end_time)'
+                '         WHERE business_hour.weekday = time_range.weekday'
+                '           AND business_hour.start_time < time_range.end_time AND business_hour.end_time > time_range.start_time)'  # noqa
                 ' ORDER BY id',
             **self.params,
         )
@@ -128,9 +132,15 @@ class TestBatchAdd(AsyncTestCase):
         self.assertIsNone(result)
 
         mock_init.assert_called_with(
-            sql=r'INSERT INTO business_hour'
-                r'            (place_id, type, weekday, start_time, end_time)'
-                r'     VALUES (%(place_id)s, %(place_type)s, %(weekday_0)s, %(start_time_0)s, %(end_time_0)s),'
-                r' (%(place_id)s, %(place_type)s, %(weekday_1)s, %(start_time_1)s, %(end_time_1)s)',
-            place_id=self.place_id, place_type=self.place_type, **self.params,
+            sql=r'WITH inserted AS ('
+                r'     INSERT INTO business_hour'
+                r'                 (place_id, type, weekday, start_time, end_time)'
+                r'          VALUES (%(place_id)s, %(place_type)s, %(weekday_0)s, %(start_time_0)s, %(end_time_0)s),'
+                r' (%(place_id)s, %(place_type)s, %(weekday_1)s, %(start_time_1)s, %(end_time_1)s)'
+                r' )'
+                r' UPDATE stadium'
+                r'    SET business_hour_mask = business_hour_mask | %(business_hour_mask)s::BIT(672)'
+                r'  WHERE id = %(place_id)s',
+            place_id=self.place_id, place_type=self.place_type,
+            business_hour_mask=business_hour_mask(self.business_hours), **self.params,
         )
@@ -0,0 +1,77 @@
+from datetime import date, datetime
+
+from app.base import vo
+from app.persistence.database import court_daily_stat
+from tests import AsyncMock, AsyncTestCase, Mock, patch
+
+
+class TestBrowse(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [(1, date(2023, 11, 17), 2, 180, 5, 1)]
+
+        result = await court_daily_stat.browse(
+            owner_id=1, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30), stadium_id=2,
+        )
+
+        self.assertEqual(result, [
+            vo.ViewCourtDailyStat(
+                court_id=1, day=date(2023, 11, 17), reservation_count=2, reserved_minutes=180,
+                member_count=5, cancelled_count=1,
+            ),
+        ])
+        mock_init.assert_called_with(
+            sql=r'SELECT court_daily_stat.court_id, court_daily_stat.day, reservation_count, reserved_minutes,'
+                r'       member_count, cancelled_count'
+                r'  FROM court_daily_stat'
+                r' INNER JOIN court ON court.id = court_daily_stat.court_id'
+                r' INNER JOIN venue ON venue.id = court.venue_id'
+                r' INNER JOIN stadium ON stadium.id = venue.stadium_id'
+                r' WHERE stadium.owner_id = %(owner_id)s'
+                r' AND stadium.id = %(stadium_id)s'
+                r'   AND court_daily_stat.day BETWEEN %(start_date)s AND %(end_date)s'
+                r' ORDER BY court_daily_stat.day, court_daily_stat.court_id',
+            owner_id=1, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30), stadium_id=2,
+        )
+
+
+class TestRebuild(AsyncTestCase):
+    def setUp(self) -> None:
+        self.mock_cursor = Mock()
+        self.mock_cursor.execute = AsyncMock(return_value='INSERT 0 4')
+
+    @patch('app.persistence.database.court_daily_stat.pg_pool_handler')
+    async def test_chunks(self, mock_handler):
+        mock_handler.cursor = Mock(return_value=AsyncMock(__aenter__=AsyncMock(return_value=self.mock_cursor)))
+
+        result = await court_daily_stat.rebuild(start_date=date(2023, 11, 1), end_date=date(2023, 11, 10), chunk_days=7)
+
+        self.assertEqual(result, 8)
+        self.assertEqual(mock_handler.cursor.call_count, 2)  # a transaction per chunk
+        timeout, lock, delete, insert, *second_chunk = self.mock_cursor.execute.await_args_list
+        self.assertEqual(timeout.args, ('SET LOCAL statement_timeout = 0',))
+        self.assertEqual(lock.args, ('LOCK TABLE reservation, reservation_member IN SHARE MODE',))
+        self.assertEqual(
+            delete.args,
+            ('DELETE FROM court_daily_stat WHERE day BETWEEN $1 AND $2', date(2023, 11, 1), date(2023, 11, 7)),
+        )
+        self.assertEqual(insert.args[1:], ('JOINED', datetime(2023, 11, 1), datetime(2023, 11, 8)))
+        self.assertEqual(second_chunk[2].args[1:], (date(2023, 11, 8), date(2023, 11, 10)))
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    @patch('app.persistence.database.court_daily_stat.pg_pool_handler')
+    async def test_all_days(self, mock_handler, mock_fetch: AsyncMock):
+        mock_handler.cursor = Mock(return_value=AsyncMock(__aenter__=AsyncMock(return_value=self.mock_cursor)))
+        mock_fetch.return_value = date(2023, 11, 1), date(2023, 11, 3)
+
+        result = await court_daily_stat.rebuild(start_date=date(2023, 11, 2))
+
+        self.assertEqual(result, 4)
+        delete = self.mock_cursor.execute.await_args_list[2]
+        self.assertEqual(delete.args[1:], (date(2023, 11, 2), date(2023, 11, 3)))
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_nothing_to_rebuild(self, mock_fetch: AsyncMock):
+        mock_fetch.return_value = None, None
+        self.assertEqual(await court_daily_stat.rebuild(), 0)
@@ -3,7 +3,7 @@ from uuid import UUID
 
 import app.exceptions as exc
 from app.persistence.database import email_verification
-from tests import AsyncMock, AsyncTestCase
+from tests import AsyncMock, AsyncTestCase, Mock
 
 
 class TestAdd(AsyncTestCase):
@@ -19,6 +19,13 @@ class TestAdd(AsyncTestCase):
 
         self.assertEqual(result, self.uuid)
 
+    async def test_in_transaction(self):
+        cursor = Mock(fetchval=AsyncMock(return_value=self.uuid))
+        result = await email_verification.add(account_id=self.account_id, email=self.email, cursor=cursor)
+
+        self.assertEqual(result, self.uuid)
+        cursor.fetchval.assert_awaited_once()
+
 
 class TestVerifyEmail(AsyncTestCase):
     def setUp(self) -> None:
@@ -61,3 +68,12 @@ class TestRead(AsyncTestCase):
         mock_executor.return_value = None
         with self.assertRaises(exc.NotFound):
             await email_verification.read(account_id=self.account_id, email=self.email)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', return_value=None)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_exclude_consumed(self, mock_fetch: AsyncMock, mock_init):
+        mock_fetch.return_value = self.code,
+        result = await email_verification.read(account_id=self.account_id, email=self.email, include_consumed=False)
+
+        self.assertEqual(result, self.code)
+        self.assertIn('AND NOT is_consumed', mock_init.call_args.kwargs['sql'])
@@ -0,0 +1,151 @@
+import json
+from datetime import datetime
+
+import app.exceptions as exc
+from app.base import do, enums
+from app.persistence.database import job
+from tests import AsyncMock, AsyncTestCase, Mock, patch
+
+
+class TestAdd(AsyncTestCase):
+    def setUp(self) -> None:
+        self.payload = {'to': 'email@email.com', 'code': 'code'}
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = (1,)
+
+        result = await job.add(job_type=enums.JobType.verification_email, payload=self.payload, max_attempts=3)
+
+        self.assertEqual(result, 1)
+        mock_init.assert_called_with(
+            sql=r'INSERT INTO job (job_type, payload, max_attempts)'
+                r'     VALUES (%(job_type)s, %(payload)s, %(max_attempts)s)'
+                r'  RETURNING id',
+            job_type=enums.JobType.verification_email, payload=json.dumps(self.payload), max_attempts=3,
+        )
+
+    async def test_in_transaction(self):
+        cursor = Mock(fetchval=AsyncMock(return_value=2))
+
+        result = await job.add(job_type=enums.JobType.verification_email, payload=self.payload, cursor=cursor)
+
+        self.assertEqual(result, 2)
+        cursor.fetchval.assert_awaited_once_with(
+            r'INSERT INTO job (job_type, payload)'
+            r'     VALUES ($1, $2)'
+            r'  RETURNING id',
+            enums.JobType.verification_email, json.dumps(self.payload),
+        )
+
+
+class TestClaim(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [
+            (2, 'VERIFICATION_EMAIL', '{"to": "b"}', 'RUNNING', 1, 5, datetime(2023, 11, 4, 10, 1),
+             datetime(2023, 11, 4, 10, 2), None, datetime(2023, 11, 4, 10, 1), None),
+            (1, 'VERIFICATION_EMAIL', '{"to": "a"}', 'RUNNING', 2, 5, datetime(2023, 11, 4, 10),
+             datetime(2023, 11, 4, 10, 2), 'error', datetime(2023, 11, 4, 9), None),
+        ]
+
+        result = await job.claim(job_type=enums.JobType.verification_email, limit=2)
+
+        self.assertEqual([claimed.id for claimed in result], [1, 2])
+        self.assertEqual(result[0], do.Job(
+            id=1, job_type='VERIFICATION_EMAIL', payload={'to': 'a'}, status=enums.JobStatus.running,
+            attempts=2, max_attempts=5, run_after=datetime(2023, 11, 4, 10), locked_at=datetime(2023, 11, 4, 10, 2),
+            last_error='error', created_at=datetime(2023, 11, 4, 9), finished_at=None,
+        ))
+        self.assertIn('FOR UPDATE SKIP LOCKED', mock_init.call_args.kwargs['sql'])
+        self.assertEqual(mock_init.call_args.kwargs['limit'], 2)
+
+
+class TestFail(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_dead(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = ('DEAD',)
+
+        result = await job.fail(job_id=1, attempts=5, error='error', backoff_seconds=30)
+
+        self.assertEqual(result, enums.JobStatus.dead)
+        self.assertEqual(mock_init.call_args.kwargs['backoff_seconds'], 30)
+        self.assertEqual(mock_init.call_args.kwargs['attempts'], 5)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_released(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = None
+
+        result = await job.fail(job_id=1, attempts=2, error='error', backoff_seconds=30)
+
+        self.assertIsNone(result)
+
+
+class TestFinish(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = (1,)
+
+        self.assertTrue(await job.finish(job_id=1, attempts=2))
+        self.assertIn('attempts = %(attempts)s', mock_init.call_args.kwargs['sql'])
+        self.assertEqual(mock_init.call_args.kwargs['attempts'], 2)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_released(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = None
+
+        self.assertFalse(await job.finish(job_id=1, attempts=2))
+
+
+class TestReleaseStale(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_init.return_value = None
+        mock_fetch.return_value = [(1,), (2,)]
+
+        result = await job.release_stale(stale_seconds=600)
+
+        self.assertEqual(result, 2)
+        self.assertIn('CASE WHEN attempts >= max_attempts THEN %(dead)s', mock_init.call_args.kwargs['sql'])
+        self.assertEqual(mock_init.call_args.kwargs['dead'], enums.JobStatus.dead)
+
+
+class TestRetry(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_not_dead(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = None
+
+        with self.assertRaises(exc.NotFound):
+            await job.retry(job_id=1)
+
+
+class TestBrowse(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [
+            (1, 'VERIFICATION_EMAIL', '{}', 'DEAD', 5, 5, datetime(2023, 11, 4), None, 'error',
+             datetime(2023, 11, 4), datetime(2023, 11, 4), 7),
+        ]
+
+        jobs, total_count = await job.browse(status=enums.JobStatus.dead, limit=1, offset=0)
+
+        self.assertEqual(total_count, 7)
+        self.assertEqual(jobs[0].status, enums.JobStatus.dead)
+        mock_init.assert_called_with(
+            sql=r'SELECT id, job_type, payload, status, attempts, max_attempts, run_after, locked_at, last_error,'
+                r' created_at, finished_at, COUNT(*) OVER ()'
+                r'  FROM job'
+                r' WHERE status = %(status)s'
+                r' ORDER BY id DESC'
+                r' LIMIT %(limit)s OFFSET %(offset)s',
+            limit=1, offset=0, status=enums.JobStatus.dead,
+        )
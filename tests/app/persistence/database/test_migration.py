@@ -0,0 +1,115 @@
+import tempfile
+from pathlib import Path
+
+from app.persistence.database import migration
+from tests import AsyncMock, AsyncTestCase, Mock, TestCase
+
+INDEX_SQL = (
+    '-- migration: no-transaction\n'
+    '-- by venue\n'
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS court_venue_id_idx\n'
+    '    ON court (venue_id);\n'
+    '\n'
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS album_type_place_id_idx ON album (type, place_id);\n'
+)
+
+
+class TestLoadMigrations(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_sorted_by_version(self):
+        (self.path / '0010_index.sql').write_text(INDEX_SQL)
+        (self.path / '0002_schema.sql').write_text('CREATE TABLE a (id INT);')
+
+        result = migration.load_migrations(self.path)
+
+        self.assertEqual([(item.version, item.name) for item in result], [(2, 'schema'), (10, 'index')])
+        self.assertTrue(result[0].in_transaction)
+        self.assertFalse(result[1].in_transaction)
+
+    def test_bad_name(self):
+        (self.path / 'schema.sql').write_text('')
+        with self.assertRaises(migration.MigrationError):
+            migration.load_migrations(self.path)
+
+    def test_duplicated_version(self):
+        (self.path / '0001_a.sql').write_text('')
+        (self.path / '1_b.sql').write_text('')
+        with self.assertRaises(migration.MigrationError):
+            migration.load_migrations(self.path)
+
+    def test_shipped_migrations(self):
+        result = migration.load_migrations()
+        self.assertEqual([item.version for item in result][:2], [1, 2])
+        self.assertFalse(result[1].in_transaction)
+        self.assertTrue(all('CONCURRENTLY' in statement for statement in result[1].statements()))
+        self.assertTrue(all('UNIQUE' not in statement for statement in result[1].statements()))
+
+
+class TestMigration(TestCase):
+    def test_statements(self):
+        self.assertEqual(migration.Migration(1, 'index', INDEX_SQL).statements(), [
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS court_venue_id_idx\n    ON court (venue_id)',
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS album_type_place_id_idx ON album (type, place_id)',
+        ])
+
+    def test_pending(self):
+        first, second = migration.Migration(1, 'a', 'SELECT 1'), migration.Migration(2, 'b', 'SELECT 2')
+        self.assertEqual(migration.pending([first, second], {1: first.checksum}), [second])
+
+    def test_changed_after_applied(self):
+        first = migration.Migration(1, 'a', 'SELECT 1')
+        with self.assertRaises(migration.MigrationError):
+            migration.pending([first], {1: 'other'})
+
+
+class TestUpgrade(AsyncTestCase):
+    def setUp(self) -> None:
+        self.conn = Mock()
+        self.conn.execute = AsyncMock()
+        self.conn.fetch = AsyncMock(return_value=[])
+        self.conn.fetchval = AsyncMock(return_value=None)
+        self.conn.transaction = Mock(return_value=AsyncMock())
+
+    async def test_happy_path(self):
+        schema = migration.Migration(1, 'schema', 'CREATE TABLE a (id INT);')
+        index = migration.Migration(2, 'index', INDEX_SQL)
+
+        result = await migration.upgrade(self.conn, [schema, index])
+
+        self.assertEqual(result, [schema, index])
+        executed = [call.args[0] for call in self.conn.execute.call_args_list]
+        self.assertEqual(executed[0], r'SELECT pg_advisory_lock($1)')
+        self.assertIn(schema.sql, executed)
+        self.assertIn(index.statements()[0], executed)
+        self.assertNotIn(index.sql, executed)
+        self.assertEqual(executed[-1], r'SELECT pg_advisory_unlock($1)')
+        self.conn.transaction.assert_called_once()
+
+    async def test_drop_invalid_index(self):
+        self.conn.fetchval = AsyncMock(side_effect=[True, False])
+        index = migration.Migration(2, 'index', INDEX_SQL)
+
+        await migration.upgrade(self.conn, [index])
+
+        executed = [call.args[0] for call in self.conn.execute.call_args_list]
+        drop = 'DROP INDEX CONCURRENTLY IF EXISTS court_venue_id_idx'
+        self.assertEqual(executed.count(drop), 1)
+        self.assertLess(executed.index(drop), executed.index(index.statements()[0]))
+        self.assertEqual(
+            [call.args[1] for call in self.conn.fetchval.call_args_list],
+            ['court_venue_id_idx', 'album_type_place_id_idx'],
+        )
+
+    async def test_unlock_on_error(self):
+        self.conn.fetch = AsyncMock(return_value=[(1, 'other')])
+
+        with self.assertRaises(migration.MigrationError):
+            await migration.upgrade(self.conn, [migration.Migration(1, 'a', 'SELECT 1')])
+
+        self.assertEqual(self.conn.execute.call_args.args[0], r'SELECT pg_advisory_unlock($1)')
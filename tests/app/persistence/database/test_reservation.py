@@ -24,8 +24,8 @@ class TestBrowse(AsyncTestCase):
             'start_date': self.start_date,
             'end_date': self.end_date,
             'is_cancelled': self.is_cancelled,
-            'start_time_0': self.time_ranges[0].start_time,
-            'end_time_0': self.time_ranges[0].end_time,
+            'range_start_times': [self.time_ranges[0].start_time],
+            'range_end_times': [self.time_ranges[0].end_time],
         }
 
         self.raw_reservations = [
@@ -82,7 +82,10 @@ class TestBrowse(AsyncTestCase):
                     '         ON venue.id = reservation.venue_id'
                     ' WHERE court_id = %(court_id)s AND start_time >= %(start_date)s AND end_time <= %(end_date)s'
                     ' AND is_cancelled = %(is_cancelled)s'
-                    ' AND ((reservation.start_time < %(end_time_0)s AND reservation.end_time > %(start_time_0)s))'
+                    ' AND EXISTS (SELECT *'
+                    '          FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+                    '            AS time_range(start_time, end_time)'
+                    '         WHERE reservation.start_time < time_range.end_time AND reservation.end_time > time_range.start_time)'  # noqa
                     ' ORDER BY start_time',
                 **self.params, limit=None, offset=None,
             ),
@@ -100,7 +103,10 @@ class TestBrowse(AsyncTestCase):
                     '         ON venue.id = reservation.venue_id'
                     ' WHERE court_id = %(court_id)s AND start_time >= %(start_date)s AND end_time <= %(end_date)s'
                     ' AND is_cancelled = %(is_cancelled)s'
-                    ' AND ((reservation.start_time < %(end_time_0)s AND reservation.end_time > %(start_time_0)s))'
+                    ' AND EXISTS (SELECT *'
+                    '          FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+                    '            AS time_range(start_time, end_time)'
+                    '         WHERE reservation.start_time < time_range.end_time AND reservation.end_time > time_range.start_time)'  # noqa
                     ' ORDER BY start_time) AS tbl',
                 **self.params,
             ),
@@ -134,7 +140,10 @@ class TestBrowse(AsyncTestCase):
                     '         ON venue.id = reservation.venue_id'
                     ' WHERE court_id = %(court_id)s AND start_time >= %(start_date)s AND end_time <= %(end_date)s'
                     ' AND is_cancelled = %(is_cancelled)s'
-                    ' AND ((reservation.start_time < %(end_time_0)s AND reservation.end_time > %(start_time_0)s))'
+                    ' AND EXISTS (SELECT *'
+                    '          FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+                    '            AS time_range(start_time, end_time)'
+                    '         WHERE reservation.start_time < time_range.end_time AND reservation.end_time > time_range.start_time)'  # noqa
                     ' ORDER BY start_time',
                 **self.params, limit=None, offset=None,
             ),
@@ -152,7 +161,10 @@ class TestBrowse(AsyncTestCase):
                     '         ON venue.id = reservation.venue_id'
                     ' WHERE court_id = %(court_id)s AND start_time >= %(start_date)s AND end_time <= %(end_date)s'
                     ' AND is_cancelled = %(is_cancelled)s'
-                    ' AND ((reservation.start_time < %(end_time_0)s AND reservation.end_time > %(start_time_0)s))'
+                    ' AND EXISTS (SELECT *'
+                    '          FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+                    '            AS time_range(start_time, end_time)'
+                    '         WHERE reservation.start_time < time_range.end_time AND reservation.end_time > time_range.start_time)'  # noqa
                     ' ORDER BY start_time) AS tbl',
                 **self.params,
             ),
@@ -201,6 +213,97 @@ class TestAdd(AsyncTestCase):
         )
 
 
+class TestBrowseConflicts(AsyncTestCase):
+    def setUp(self) -> None:
+        self.court_id = 1
+        self.time_ranges = [
+            vo.DateTimeRange(start_time=datetime(2023, 11, day, 11), end_time=datetime(2023, 11, day, 13))
+            for day in (17, 24)
+        ]
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [(datetime(2023, 11, 24, 11), datetime(2023, 11, 24, 13))]
+
+        result = await reservation.browse_conflicts(court_id=self.court_id, time_ranges=self.time_ranges)
+
+        self.assertEqual(result, self.time_ranges[1:])
+        mock_init.assert_called_with(
+            sql=r'SELECT time_range.start_time, time_range.end_time'
+                r'  FROM UNNEST(%(range_start_times)s::TIMESTAMP[], %(range_end_times)s::TIMESTAMP[])'
+                r'    AS time_range(start_time, end_time)'
+                r' WHERE EXISTS (SELECT *'
+                r'                 FROM reservation'
+                r'                WHERE reservation.court_id = %(court_id)s'
+                r'                  AND reservation.start_time < time_range.end_time'
+                r'                  AND reservation.end_time > time_range.start_time)'
+                r' ORDER BY time_range.start_time',
+            court_id=self.court_id,
+            range_start_times=[datetime(2023, 11, 17, 11), datetime(2023, 11, 24, 11)],
+            range_end_times=[datetime(2023, 11, 17, 13), datetime(2023, 11, 24, 13)],
+        )
+
+
+class TestBatchAdd(AsyncTestCase):
+    def setUp(self) -> None:
+        self.time_ranges = [
+            vo.DateTimeRange(start_time=datetime(2023, 11, day, 11), end_time=datetime(2023, 11, day, 13))
+            for day in (17, 24)
+        ]
+        self.technical_level = [enums.TechnicalType.advanced]
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [(1,), (2,)]
+
+        result = await reservation.batch_add(
+            stadium_id=1, venue_id=2, court_id=3, time_ranges=self.time_ranges,
+            technical_level=self.technical_level, invitation_codes=['abc', 'def'], manager_id=5, member_ids=[6, 5],
+        )
+
+        self.assertEqual(result, [1, 2])
+        _, kwargs = mock_init.call_args
+        self.assertEqual(kwargs['start_times'], [datetime(2023, 11, 17, 11), datetime(2023, 11, 24, 11)])
+        self.assertEqual(kwargs['end_times'], [datetime(2023, 11, 17, 13), datetime(2023, 11, 24, 13)])
+        self.assertEqual(kwargs['invitation_codes'], ['abc', 'def'])
+        self.assertEqual(kwargs['account_ids'], [6, 5])
+        self.assertEqual(kwargs['manager_id'], 5)
+        self.assertIn('CROSS JOIN UNNEST(%(account_ids)s::INTEGER[]) AS member(account_id)', kwargs['sql'])
+
+
+class TestBrowseByCourts(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = [
+            (1, 1, 1, 2, datetime(2023, 11, 17, 8), datetime(2023, 11, 17, 10), 1, 0, [], None, 'code', False),
+        ]
+
+        result = await reservation.browse_by_courts(
+            court_ids=[1, 2], start_time=datetime(2023, 11, 17), end_time=datetime(2023, 11, 24),
+        )
+
+        self.assertEqual(result, [
+            do.Reservation(
+                id=1, stadium_id=1, venue_id=1, court_id=2,
+                start_time=datetime(2023, 11, 17, 8), end_time=datetime(2023, 11, 17, 10),
+                member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=False,
+            ),
+        ])
+        mock_init.assert_called_with(
+            sql=r'SELECT id, stadium_id, venue_id, court_id, start_time, end_time, member_count,'
+                r'       vacancy, technical_level, remark, invitation_code, is_cancelled'
+                r'  FROM reservation'
+                r' WHERE court_id = ANY(%(court_ids)s::INTEGER[])'
+                r'   AND start_time < %(end_time)s'
+                r'   AND end_time > %(start_time)s'
+                r' ORDER BY court_id, start_time',
+            court_ids=[1, 2], start_time=datetime(2023, 11, 17), end_time=datetime(2023, 11, 24),
+        )
+
+
 class TestRead(AsyncTestCase):
     def setUp(self) -> None:
         self.reservation_id = 1
@@ -319,6 +422,23 @@ class TestAddEventId(AsyncTestCase):
         self.assertIsNone(result)
 
 
+class TestBatchAddEventId(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.execute', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_execute: AsyncMock, mock_init: Mock):
+        mock_execute.return_value = None
+
+        await reservation.batch_add_event_id(reservation_ids=[1, 2], event_ids=['a_1', 'a_2'])
+
+        mock_init.assert_called_with(
+            sql=r"UPDATE reservation"
+                r"   SET google_event_id = event.event_id"
+                r"  FROM UNNEST(%(reservation_ids)s::INTEGER[], %(event_ids)s::VARCHAR[]) AS event(reservation_id, event_id)"
+                r" WHERE reservation.id = event.reservation_id",
+            reservation_ids=[1, 2], event_ids=['a_1', 'a_2'],
+        )
+
+
 class TestGetManagerId(AsyncTestCase):
     def setUp(self) -> None:
         self.reservation_id = 1
@@ -1,3 +1,4 @@
+import app.exceptions as exc
 from app.base import do, enums, vo
 from app.persistence.database import reservation_member
 from tests import AsyncMock, AsyncTestCase, Mock, patch
@@ -154,3 +155,66 @@ class TestRead(AsyncTestCase):
                 r' WHERE reservation_id = %(reservation_id)s and account_id = %(account_id)s',
             reservation_id=self.reservation_id, account_id=self.account_id,
         )
+
+
+class TestJoin(AsyncTestCase):
+    def setUp(self) -> None:
+        self.invitation_code = 'code'
+        self.account_id = 1
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock):
+        mock_fetch.return_value = 1, True, False
+        result = await reservation_member.join(invitation_code=self.invitation_code, account_id=self.account_id)
+        self.assertEqual(result, (1, True))
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_already_member(self, mock_fetch: AsyncMock):
+        mock_fetch.return_value = 1, False, True
+        result = await reservation_member.join(invitation_code=self.invitation_code, account_id=self.account_id)
+        self.assertEqual(result, (1, False))
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_full(self, mock_fetch: AsyncMock):
+        mock_fetch.return_value = 1, False, False
+        with self.assertRaises(exc.ReservationFull):
+            await reservation_member.join(invitation_code=self.invitation_code, account_id=self.account_id)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_not_found(self, mock_fetch: AsyncMock):
+        mock_fetch.return_value = None
+        with self.assertRaises(exc.NotFound):
+            await reservation_member.join(invitation_code=self.invitation_code, account_id=self.account_id)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_one', new_callable=AsyncMock)
+    async def test_takes_vacancy_in_one_statement(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_init.return_value = None
+        mock_fetch.return_value = 1, True, False
+        await reservation_member.join(invitation_code=self.invitation_code, account_id=self.account_id)
+
+        sql = mock_init.call_args.kwargs['sql']
+        self.assertIn('FOR UPDATE', sql)
+        self.assertIn('ON CONFLICT (reservation_id, account_id) DO UPDATE', sql)
+        self.assertIn('WHERE reservation_member.status <> %(status)s', sql)  # invited and rejected rejoin
+        self.assertIn('AND status = %(status)s)', sql)  # only a joined member was one already
+        self.assertEqual(mock_init.call_args.kwargs['status'], enums.ReservationMemberStatus.joined)
+        self.assertIn('SET vacancy = vacancy - 1', sql)
+        self.assertEqual(mock_init.call_args.kwargs['source'], enums.ReservationMemberSource.invitation_code)
+
+
+class TestLeave(AsyncTestCase):
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.execute', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_execute: AsyncMock, mock_init: Mock):
+        mock_init.return_value = None
+        mock_execute.return_value = None
+
+        result = await reservation_member.leave(reservation_id=1, account_id=2)
+
+        self.assertIsNone(result)
+        mock_execute.assert_awaited_once()
+        self.assertEqual(mock_init.call_args.kwargs['reservation_id'], 1)
+        self.assertEqual(mock_init.call_args.kwargs['account_id'], 2)
+        self.assertIn('WHERE NOT is_manager AND status = %(joined)s', mock_init.call_args.kwargs['sql'])
+        self.assertEqual(mock_init.call_args.kwargs['joined'], enums.ReservationMemberStatus.joined)
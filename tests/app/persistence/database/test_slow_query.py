@@ -0,0 +1,123 @@
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from app.persistence.database import slow_query
+from tests import AsyncMock, AsyncTestCase, Mock, TestCase
+
+
+class TestFingerprint(TestCase):
+    def test_parameters_and_literals(self):
+        self.assertEqual(
+            slow_query.fingerprint('''
+                SELECT *  -- browse
+                  FROM stadium
+                 WHERE city_id = $1 AND name LIKE 'it''s%' AND id IN ($2, $3, $4)
+                 LIMIT 10
+            '''),
+            'SELECT * FROM stadium WHERE city_id = ? AND name LIKE ? AND id IN (?, ...) LIMIT ?',
+        )
+
+    def test_identifiers_kept(self):
+        self.assertEqual(slow_query.fingerprint('SELECT t1.col_2 FROM t1'), 'SELECT t1.col_2 FROM t1')
+
+    def test_is_read(self):
+        self.assertTrue(slow_query.is_read('  -- comment\n select 1'))
+        self.assertTrue(slow_query.is_read('WITH a AS (SELECT 1) SELECT * FROM a'))
+        self.assertFalse(slow_query.is_read('UPDATE account SET name = $1'))
+
+
+class TestSlowQueryRecorder(AsyncTestCase):
+    def setUp(self) -> None:
+        self.recorder = slow_query.slow_query_recorder
+        self.origin = (self.recorder.threshold, self.recorder.explain_rate, self.recorder.capacity)
+        self.recorder.threshold, self.recorder.explain_rate, self.recorder.capacity = 0.1, 0, 2
+
+    def tearDown(self) -> None:
+        self.recorder.threshold, self.recorder.explain_rate, self.recorder.capacity = self.origin
+        self.recorder.clear()
+
+    def test_below_threshold(self):
+        self.recorder.record('SELECT 1', [], 0.05)
+        self.assertEqual(self.recorder.top(), [])
+
+    def test_grouped_by_fingerprint(self):
+        self.recorder.record('SELECT * FROM stadium WHERE id = $1', [1], 0.2)
+        self.recorder.record('SELECT * FROM stadium WHERE id = $1', [2], 0.4)
+
+        entry, = self.recorder.top()
+        self.assertEqual(entry.fingerprint, 'SELECT * FROM stadium WHERE id = ?')
+        self.assertEqual(entry.count, 2)
+        self.assertAlmostEqual(entry.total_time, 0.6)
+        self.assertEqual(entry.max_time, 0.4)
+
+    def test_keeps_slowest(self):
+        self.recorder.record('SELECT 1 FROM a', [], 0.3)
+        self.recorder.record('SELECT 1 FROM b', [], 0.2)
+        self.recorder.record('SELECT 1 FROM c', [], 0.15)  # faster than all kept
+        self.recorder.record('SELECT 1 FROM d', [], 0.5)
+
+        self.assertEqual(
+            [entry.fingerprint for entry in self.recorder.top()],
+            ['SELECT ? FROM d', 'SELECT ? FROM a'],
+        )
+        self.assertEqual(len(self.recorder.top(1)), 1)
+
+    async def test_explain(self):
+        self.recorder.explain_rate = 1
+        mock_conn = Mock()
+        mock_conn.transaction = Mock(return_value=AsyncMock())
+        mock_conn.execute = AsyncMock()
+        mock_conn.fetch = AsyncMock(return_value=[('Index Scan using stadium_pkey',), ('Buffers: shared hit=4',)])
+
+        @asynccontextmanager
+        async def side_connection():
+            yield mock_conn
+
+        with patch.object(slow_query.pg_pool_handler, 'side_connection', side_connection):
+            self.recorder.record('SELECT * FROM stadium WHERE id = $1', [1], 0.2)
+            self.recorder.record('UPDATE stadium SET name = $1', ['a'], 0.2)
+            await self.recorder.join()
+
+        mock_conn.transaction.assert_called_with(readonly=True)
+        mock_conn.fetch.assert_awaited_once_with('EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM stadium WHERE id = $1', 1)
+        select, update = sorted(self.recorder.top(), key=lambda entry: entry.fingerprint)
+        self.assertEqual(select.plan, 'Index Scan using stadium_pkey\nBuffers: shared hit=4')
+        self.assertIsNone(update.plan)
+
+    async def test_explain_capped(self):
+        self.recorder.explain_rate = 1
+        origin_max_explains, self.recorder.max_explains = self.recorder.max_explains, 1
+        mock_explain = AsyncMock()
+
+        try:
+            with patch.object(self.recorder, '_explain', mock_explain):
+                self.recorder.record('SELECT 1 FROM a', [], 0.2)
+                self.recorder.record('SELECT 1 FROM b', [], 0.2)  # another fingerprint, still over the cap
+                await self.recorder.join()
+        finally:
+            self.recorder.max_explains = origin_max_explains
+
+        mock_explain.assert_awaited_once()
+
+    @patch('app.log.logger.warning', new_callable=Mock)
+    async def test_explain_failed(self, mock_warning: Mock):
+        self.recorder.explain_rate = 1
+
+        with patch.object(slow_query.pg_pool_handler, 'side_connection', Mock(side_effect=OSError)):
+            self.recorder.record('SELECT 1', [], 0.2)
+            await self.recorder.join()
+
+        entry, = self.recorder.top()
+        self.assertIsNone(entry.plan)
+        mock_warning.assert_called_once()
+
+
+class TestTrack(TestCase):
+    @patch('app.persistence.database.slow_query.slow_query_recorder.record', new_callable=Mock)
+    def test_happy_path(self, mock_record: Mock):
+        with slow_query.track('SELECT 1', [1]):
+            pass
+
+        sql, params, duration = mock_record.call_args.args
+        self.assertEqual((sql, params), ('SELECT 1', [1]))
+        self.assertGreaterEqual(duration, 0)
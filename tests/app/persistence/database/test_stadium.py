@@ -4,6 +4,7 @@ from unittest.mock import call, patch
 import app.exceptions as exc
 from app.base import do, enums, vo
 from app.persistence.database import stadium
+from app.persistence.database.util import business_hour_mask
 from tests import AsyncMock, AsyncTestCase, Mock
 
 
@@ -15,16 +16,6 @@ class TestBrowse(AsyncTestCase):
         self.sport_id = 1
         self.limit = 5
         self.offset = 10
-        self.params = {
-            'name': self.name,
-            'city_id': self.city_id,
-            'district_id': self.district_id,
-            'sport_id': self.sport_id,
-            'weekday_0': 1,
-            'start_time_0': time(10, 27),
-            'end_time_0': time(17, 27),
-            'is_published': True,
-        }
         self.time_ranges = [
             vo.WeekTimeRange(
                 weekday=1,
@@ -32,6 +23,14 @@ class TestBrowse(AsyncTestCase):
                 end_time=time(17, 27),
             ),
         ]
+        self.params = {
+            'name': self.name,
+            'city_id': self.city_id,
+            'district_id': self.district_id,
+            'sport_id': self.sport_id,
+            'is_published': True,
+            'business_hour_mask': business_hour_mask(self.time_ranges),
+        }
         self.query_params = self.params.copy()
         self.query_params['name'] = f'%{self.params["name"]}%'
         self.no_filter_params = {'is_published': True}
@@ -127,17 +126,13 @@ class TestBrowse(AsyncTestCase):
                     r'      INNER JOIN city ON district.city_id = city.id'
                     r'       LEFT JOIN venue ON stadium.id = venue.stadium_id'
                     r'       LEFT JOIN sport ON venue.sport_id = sport.id'
-                    r'       LEFT JOIN business_hour ON business_hour.place_id = stadium.id'
-                    r'             AND business_hour.type = %(place_type)s'
                     r' WHERE stadium.name LIKE %(name)s'
                     r' AND district.city_id = %(city_id)s'
                     r' AND district.id = %(district_id)s'
                     r' AND venue.sport_id = %(sport_id)s'
                     r' AND stadium.is_published = %(is_published)s'
                     r' AND venue.is_published = %(is_published)s'
-                    r' AND ((business_hour.weekday = %(weekday_0)s'
-                    r' AND business_hour.start_time < %(end_time_0)s'
-                    r' AND business_hour.end_time > %(start_time_0)s))'
+                    r" AND POSITION(B'1' IN stadium.business_hour_mask & %(business_hour_mask)s::BIT(672)) > 0"
                     r'        GROUP BY stadium.id, city.id, district.id'
                     r'   ) tbl ON tbl.stadium_id = stadium.id'
                     r' INNER JOIN district ON stadium.district_id = district.id'
@@ -171,17 +166,13 @@ class TestBrowse(AsyncTestCase):
                     r'      INNER JOIN city ON district.city_id = city.id'
                     r'       LEFT JOIN venue ON stadium.id = venue.stadium_id'
                     r'       LEFT JOIN sport ON venue.sport_id = sport.id'
-                    r'       LEFT JOIN business_hour ON business_hour.place_id = stadium.id'
-                    r'             AND business_hour.type = %(place_type)s'
                     r' WHERE stadium.name LIKE %(name)s'
                     r' AND district.city_id = %(city_id)s'
                     r' AND district.id = %(district_id)s'
                     r' AND venue.sport_id = %(sport_id)s'
                     r' AND stadium.is_published = %(is_published)s'
                     r' AND venue.is_published = %(is_published)s'
-                    r' AND ((business_hour.weekday = %(weekday_0)s'
-                    r' AND business_hour.start_time < %(end_time_0)s'
-                    r' AND business_hour.end_time > %(start_time_0)s))'
+                    r" AND POSITION(B'1' IN stadium.business_hour_mask & %(business_hour_mask)s::BIT(672)) > 0"
                     r'        GROUP BY stadium.id, city.id, district.id'
                     r'   ) tbl ON tbl.stadium_id = stadium.id'
                     r' INNER JOIN district ON stadium.district_id = district.id'
@@ -223,8 +214,6 @@ class TestBrowse(AsyncTestCase):
                     r'      INNER JOIN city ON district.city_id = city.id'
                     r'       LEFT JOIN venue ON stadium.id = venue.stadium_id'
                     r'       LEFT JOIN sport ON venue.sport_id = sport.id'
-                    r'       LEFT JOIN business_hour ON business_hour.place_id = stadium.id'
-                    r'             AND business_hour.type = %(place_type)s'
                     r' WHERE stadium.is_published = %(is_published)s'
                     r' AND venue.is_published = %(is_published)s'
                     r'        GROUP BY stadium.id, city.id, district.id'
@@ -259,8 +248,6 @@ class TestBrowse(AsyncTestCase):
                     r'      INNER JOIN city ON district.city_id = city.id'
                     r'       LEFT JOIN venue ON stadium.id = venue.stadium_id'
                     r'       LEFT JOIN sport ON venue.sport_id = sport.id'
-                    r'       LEFT JOIN business_hour ON business_hour.place_id = stadium.id'
-                    r'             AND business_hour.type = %(place_type)s'
                     r' WHERE stadium.is_published = %(is_published)s'
                     r' AND venue.is_published = %(is_published)s'
                     r'        GROUP BY stadium.id, city.id, district.id'
@@ -1,7 +1,22 @@
+from datetime import datetime, time
 from unittest.mock import patch
 
-from app.persistence.database.util import PostgresQueryExecutor, QueryExecutor
-from tests import AsyncMock, AsyncTestCase
+import asyncpg
+import pydantic
+
+import app.exceptions as exc
+from app.base import vo
+from app.persistence.database.util import (
+    PostgresQueryExecutor,
+    QueryExecutor,
+    business_hour_mask,
+    generate_time_range_query,
+    generate_week_time_range_query,
+    is_read_only,
+    merge_time_ranges,
+    merge_week_time_ranges,
+)
+from tests import AsyncMock, AsyncTestCase, Mock, TestCase
 
 
 class MockQueryExecutor(QueryExecutor):
@@ -90,3 +105,103 @@ class TestPostgresQueryExecutor(AsyncTestCase):
         ).execute()
         mock_fetch_none.assert_called_once()
         self.assertIsNone(result)
+
+    @patch('app.persistence.database.util.context')
+    @patch('app.persistence.database.util.pg_pool_handler')
+    async def test_statement_timeout(self, mock_handler, mock_context):
+        mock_context.get_statement_timeout = Mock(return_value=2.0)
+        mock_cursor = Mock()
+        mock_cursor.fetch = AsyncMock(side_effect=asyncpg.QueryCanceledError(''))
+        mock_handler.cursor = Mock(return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_cursor)))
+
+        with self.assertRaises(exc.QueryTimeout):
+            await PostgresQueryExecutor(sql=self.sql, **self.params).fetch_all()
+
+        mock_cursor.fetch.assert_awaited_once_with(
+            'SELECT * FROM account WHERE id = $1 AND name = $2', 1, 'name', timeout=2.0,  # noqa
+        )
+        mock_handler.cursor.assert_called_once_with(read_only=True)
+
+
+class TestIsReadOnly(TestCase):
+    def test_reads(self):
+        self.assertTrue(is_read_only('SELECT id, updated_at FROM account WHERE id = $1'))
+        self.assertTrue(is_read_only('WITH tmp AS (SELECT 1) SELECT * FROM tmp'))
+
+    def test_writes(self):
+        self.assertFalse(is_read_only('INSERT INTO account (email) VALUES ($1) RETURNING id'))
+        self.assertFalse(is_read_only('WITH tmp AS (DELETE FROM court RETURNING id) SELECT * FROM tmp'))
+        self.assertFalse(is_read_only('SELECT vacancy FROM reservation WHERE id = $1 FOR UPDATE'))
+
+
+class TestTimeRangeQuery(TestCase):
+    def setUp(self) -> None:
+        self.day = datetime(2023, 11, 17)
+
+    def date_time_range(self, start_hour: int, end_hour: int) -> vo.DateTimeRange:
+        return vo.DateTimeRange(start_time=self.day.replace(hour=start_hour), end_time=self.day.replace(hour=end_hour))
+
+    def test_merge_time_ranges(self):
+        result = merge_time_ranges([
+            self.date_time_range(14, 16),
+            self.date_time_range(8, 10),
+            self.date_time_range(9, 12),
+            self.date_time_range(12, 13),  # adjacent
+            self.date_time_range(15, 15),  # inside
+        ])
+        self.assertEqual(result, [self.date_time_range(8, 13), self.date_time_range(14, 16)])
+
+    def test_merge_week_time_ranges(self):
+        result = merge_week_time_ranges([
+            vo.WeekTimeRange(weekday=2, start_time=time(8), end_time=time(10)),
+            vo.WeekTimeRange(weekday=1, start_time=time(9), end_time=time(11)),
+            vo.WeekTimeRange(weekday=1, start_time=time(8), end_time=time(10)),
+        ])
+        self.assertEqual(result, [
+            vo.WeekTimeRange(weekday=1, start_time=time(8), end_time=time(11)),
+            vo.WeekTimeRange(weekday=2, start_time=time(8), end_time=time(10)),
+        ])
+
+    def test_same_statement_for_any_count(self):
+        one, one_params = generate_time_range_query([self.date_time_range(8, 9)], 'start_time', 'end_time')
+        many, many_params = generate_time_range_query(
+            [self.date_time_range(hour, hour + 1) for hour in range(0, 23, 2)], 'start_time', 'end_time',
+        )
+        self.assertEqual(one, many)
+        self.assertEqual(one_params, {
+            'range_start_times': [self.day.replace(hour=8)], 'range_end_times': [self.day.replace(hour=9)],
+        })
+        self.assertEqual(len(many_params['range_start_times']), 12)
+
+    def test_week_time_range_query(self):
+        query, params = generate_week_time_range_query(
+            [vo.WeekTimeRange(weekday=1, start_time=time(8), end_time=time(10))],
+            weekday_column='weekday', start_column='start_time', end_column='end_time',
+        )
+        self.assertIn('UNNEST(%(range_weekdays)s::INTEGER[]', query)
+        self.assertEqual(params, {
+            'range_weekdays': [1], 'range_start_times': [time(8)], 'range_end_times': [time(10)],
+        })
+
+
+class TestBusinessHourMask(TestCase):
+    def test_quarter_bits(self):
+        mask = business_hour_mask([
+            vo.WeekTimeRange(weekday=1, start_time=time(0), end_time=time(0, 30)),
+            vo.WeekTimeRange(weekday=7, start_time=time(23, 50), end_time=time(23, 59, 59)),
+        ])
+        bits = mask.as_string().replace(' ', '')
+        self.assertEqual(len(bits), 672)
+        self.assertEqual(bits[:3], '110')
+        self.assertEqual(bits[-2:], '01')
+        self.assertEqual(bits.count('1'), 3)
+
+    def test_partial_quarter_counts(self):
+        mask = business_hour_mask([vo.WeekTimeRange(weekday=2, start_time=time(8, 10), end_time=time(8, 20))])
+        bits = mask.as_string().replace(' ', '')
+        self.assertEqual([i for i, bit in enumerate(bits) if bit == '1'], [96 + 32, 96 + 33])
+
+    def test_weekday_out_of_range(self):
+        for weekday in (0, 8):
+            with self.assertRaises(pydantic.ValidationError):
+                vo.WeekTimeRange(weekday=weekday, start_time=time(8), end_time=time(10))
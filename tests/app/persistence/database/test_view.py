@@ -484,3 +484,52 @@ class TestBrowseProviderCourt(AsyncTestCase):
 
         self.assertEqual(result, self.expect_result)
         self.assertEqual(mock_init.call_count, 2)
+
+
+class TestBrowseFreeCourt(AsyncTestCase):
+    def setUp(self) -> None:
+        self.time_ranges = [
+            vo.DateTimeRange(start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12)),
+        ]
+        self.request_time = datetime(2023, 11, 17, 8)
+        self.raw = [
+            (3, 1, 2, 'venue', 1, 'stadium', datetime(2023, 11, 17, 10), datetime(2023, 11, 17, 12), 0.5, 7),
+        ]
+        self.expect = [
+            vo.ViewFreeCourt(
+                court_id=3, court_number=1, venue_id=2, venue_name='venue', stadium_id=1, stadium_name='stadium',
+                start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12), distance=0.5,
+            ),
+        ], 7
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = self.raw
+
+        result = await view.browse_free_court(
+            time_ranges=self.time_ranges, request_time=self.request_time,
+            city_id=1, sport_id=2, long=121.5, lat=25.0, limit=5, offset=10,
+        )
+
+        self.assertEqual(result, self.expect)
+        _, kwargs = mock_init.call_args
+        self.assertIn(' AND district.city_id = %(city_id)s AND venue.sport_id = %(sport_id)s', kwargs['sql'])
+        self.assertIn(' ORDER BY distance, time_range.start_time, court.id', kwargs['sql'])
+        self.assertEqual(kwargs['range_start_times'], [datetime(2023, 11, 17, 10)])
+        self.assertEqual(kwargs['range_end_times'], [datetime(2023, 11, 17, 12)])
+        self.assertEqual((kwargs['long'], kwargs['lat'], kwargs['limit'], kwargs['offset']), (121.5, 25.0, 5, 10))
+        self.assertEqual(kwargs['place_type'], enums.PlaceType.venue)
+
+    @patch('app.persistence.database.util.PostgresQueryExecutor.__init__', new_callable=Mock)
+    @patch('app.persistence.database.util.PostgresQueryExecutor.fetch_all', new_callable=AsyncMock)
+    async def test_no_location(self, mock_fetch: AsyncMock, mock_init: Mock):
+        mock_fetch.return_value = []
+
+        result = await view.browse_free_court(time_ranges=self.time_ranges, request_time=self.request_time)
+
+        self.assertEqual(result, ([], 0))
+        _, kwargs = mock_init.call_args
+        self.assertIn('NULL AS distance', kwargs['sql'])
+        self.assertIn(' ORDER BY time_range.start_time, court.id', kwargs['sql'])
+        self.assertNotIn('long', kwargs)
@@ -1,40 +1,160 @@
+import asyncio
+import socket
+from email.message import EmailMessage
 from unittest.mock import patch
 
+from aiosmtpd.controller import Controller
+
 from app.config import SMTPConfig
 from app.persistence import email
-from tests import AsyncMock, AsyncTestCase
+from tests import AsyncMock, AsyncTestCase, Mock
 
 
 class MockSMTPConfig(SMTPConfig):
-    def __init__(self):
-        self.host = 'host'
-        self.port = 'port'
-        self.username = 'username'
-        self.password = 'password'
-        self.use_tls = True
+    def __init__(self, port='port', pool_size=2):
+        self.host = '127.0.0.1'
+        self.port = port
+        self.username = None
+        self.password = None
+        self.use_tls = False
+        self.pool_size = pool_size
+        self.check_after = 30
+        self.timeout = 5
+
+
+def make_handler(smtp_config: SMTPConfig) -> email.SMTPHandler:
+    handler = email.SMTPHandler.__new__(email.SMTPHandler)  # not the shared singleton
+    handler.__init__()
+    handler._smtp_config = smtp_config
+    handler._slots = asyncio.Semaphore(smtp_config.pool_size)
+    return handler
+
+
+def make_message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message['From'] = 'joinee@example.com'
+    message['To'] = to
+    message['Subject'] = 'subject'
+    message.set_content('body')
+    return message
+
+
+class RecordingHandler:
+    """
+    Accepts every recipient but `refused@example.com`, and tracks how many messages are in flight at once.
+    """
+    def __init__(self, delay: float = 0.):
+        self.delay = delay
+        self.received: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):  # noqa
+        if address == 'refused@example.com':
+            return '550 no such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):  # noqa
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.received.append(list(envelope.rcpt_tos))
+        return '250 Message accepted for delivery'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
 
 
 class TestSMTPHandler(AsyncTestCase):
-    @patch('aiosmtplib.SMTP', new_callable=AsyncMock)
-    async def test_initialize(self, mock_smtp: AsyncMock):
-        smtp_handler = email.SMTPHandler()
-        smtp_handler._client = None
-        smtp_config = MockSMTPConfig()
-        await smtp_handler.initialize(smtp_config=smtp_config)
-
-        mock_smtp.assert_called_with(
-            hostname='host',
-            port='port',
-            username='username',
-            password='password',
-            use_tls=True,
-        )
+    def setUp(self) -> None:
+        self.server = RecordingHandler(delay=0.05)
+        self.controller = Controller(self.server, hostname='127.0.0.1', port=free_port())
+        self.controller.start()
+        self.handler = make_handler(MockSMTPConfig(port=self.controller.port, pool_size=2))
+
+    async def asyncTearDown(self) -> None:
+        await self.handler.close()
+
+    def tearDown(self) -> None:
+        self.controller.stop()
+
+    async def test_send_message(self):
+        result = await self.handler.send_message(make_message('a@example.com, refused@example.com'))
+
+        self.assertEqual(result, [
+            email.Delivery(recipient='a@example.com', is_delivered=True),
+            email.Delivery(recipient='refused@example.com', is_delivered=False, code=550, reason='no such user'),
+        ])
+        self.assertEqual(self.server.received, [['a@example.com']])
+        self.assertEqual(self.handler.idle_count, 1)
+
+    async def test_reuse_connection(self):
+        await self.handler.send_message(make_message('a@example.com'))
+        client = self.handler._idle[0].client  # noqa
 
-    @patch('aiosmtplib.SMTP', new_callable=AsyncMock)
-    async def test_already_have_client(self, mock_smtp: AsyncMock):
-        smtp_handler = email.SMTPHandler()
-        smtp_config = MockSMTPConfig()
-        smtp_handler._client = 1
-        await smtp_handler.initialize(smtp_config=smtp_config)
+        await self.handler.send_message(make_message('b@example.com'))
 
-        mock_smtp.assert_not_called()
+        self.assertIs(self.handler._idle[0].client, client)  # noqa
+
+    async def test_check_idle_connection(self):
+        await self.handler.send_message(make_message('a@example.com'))
+        connection = self.handler._idle[0]  # noqa
+        connection.last_used -= 60
+        connection.client.noop = AsyncMock(side_effect=email.aiosmtplib.SMTPServerDisconnected('gone'))
+
+        result = await self.handler.send_message(make_message('b@example.com'))
+
+        connection.client.noop.assert_awaited_once()
+        self.assertTrue(result[0].is_delivered)
+        self.assertIsNot(self.handler._idle[0], connection)  # noqa
+
+    async def test_send_messages_at_pool_width(self):
+        messages = [make_message(f'{i}@example.com') for i in range(6)]
+
+        result = await self.handler.send_messages(messages)
+
+        self.assertEqual([deliveries[0].recipient for deliveries in result], [f'{i}@example.com' for i in range(6)])
+        self.assertEqual(self.server.max_in_flight, 2)
+        self.assertEqual(len(self.server.received), 6)
+        self.assertEqual(self.handler.idle_count, 2)
+
+    async def test_all_refused(self):
+        result = await self.handler.send_message(make_message('refused@example.com'))
+
+        self.assertEqual(result, [
+            email.Delivery(recipient='refused@example.com', is_delivered=False, code=550, reason='no such user'),
+        ])
+        self.assertEqual(self.handler.idle_count, 1)
+
+
+class TestSendMessagesFailure(AsyncTestCase):
+    async def test_connect_failed(self):
+        handler = make_handler(MockSMTPConfig(port=free_port(), pool_size=2))  # nothing listens
+
+        result = await handler.send_messages([make_message('a@example.com'), make_message('b@example.com')])
+
+        self.assertTrue(all(isinstance(error, email.aiosmtplib.SMTPConnectError) for error in result))
+        self.assertEqual(handler.idle_count, 0)
+        self.assertEqual(handler.in_use_count, 0)
+
+
+class TestInitialize(AsyncTestCase):
+    @patch('aiosmtplib.SMTP', new_callable=Mock)
+    async def test_initialize_on_first_use(self, mock_smtp: Mock):
+        mock_smtp.return_value = AsyncMock(is_connected=True)
+        handler = email.SMTPHandler.__new__(email.SMTPHandler)
+        handler.__init__()
+
+        with patch('app.persistence.email.smtp_config', MockSMTPConfig()):
+            async with handler.connection() as client:
+                self.assertIs(client, mock_smtp.return_value)
+
+        mock_smtp.assert_called_once_with(
+            hostname='127.0.0.1', port='port', username=None, password=None, use_tls=False, timeout=5,
+        )
+        client.connect.assert_awaited_once()
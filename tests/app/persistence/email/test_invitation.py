@@ -36,3 +36,14 @@ class TestSend(AsyncTestCase):
     async def test_happy_path(self, mock_send: AsyncMock):
         await email.invitation.send(to=self.to, meet_code=self.code)
         mock_send.assert_called_once()
+
+    @patch('app.persistence.email.SMTPHandler.send_messages', new_callable=AsyncMock)
+    @patch('app.persistence.email.invitation.service_config', MockServiceConfig())
+    async def test_send_many(self, mock_send: AsyncMock):
+        await email.invitation.send_many(meet_code=self.code, invitees=[(self.to, 'to'), ('b@b.com', 'b')])
+
+        messages, = mock_send.call_args.args
+        self.assertEqual([message['To'] for message in messages], [self.to, 'b@b.com'])
+        self.assertIn(
+            'https://domain:port/reservation/code', messages[0].get_payload()[1].get_payload(decode=True).decode(),
+        )
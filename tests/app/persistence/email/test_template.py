@@ -0,0 +1,58 @@
+from app.persistence.email.template import EmailTemplate, Template
+from tests import TestCase
+
+
+class TestTemplate(TestCase):
+    def test_render(self):
+        template = Template('Hello {name}, see {url}!')
+
+        self.assertEqual(template.fields, {'name', 'url'})
+        self.assertEqual(template.render({'name': 'a', 'url': 'b'}), 'Hello a, see b!')
+
+    def test_escape(self):
+        template = Template('<p>{name}</p>', escape=lambda value: value.upper())
+        self.assertEqual(template.render({'name': 'a'}), '<p>A</p>')
+
+    def test_missing_field(self):
+        with self.assertRaises(KeyError):
+            Template('{name}').render({})
+
+    def test_format_spec(self):
+        with self.assertRaises(ValueError):
+            Template('{count:>3}')
+
+
+class TestEmailTemplate(TestCase):
+    def setUp(self) -> None:
+        self.template = EmailTemplate(
+            subject='Hi {nickname}',
+            text='Hello {nickname} <{to}>, {url}',
+            html='<p>Hello {nickname}</p><a href="{url}">link</a>',
+        )
+
+    def test_render(self):
+        message = self.template.render(to='a@example.com', nickname='<b>a</b>', url='https://x?a=1&b=2')
+
+        self.assertEqual(message['To'], 'a@example.com')
+        self.assertEqual(message['Subject'], 'Hi <b>a</b>')
+        text, html = message.get_payload()
+        self.assertEqual(text.get_content_type(), 'text/plain')
+        self.assertEqual(text.get_payload(decode=True).decode(), 'Hello <b>a</b> <a@example.com>, https://x?a=1&b=2')
+        self.assertEqual(html.get_content_type(), 'text/html')
+        self.assertEqual(
+            html.get_payload(decode=True).decode(),
+            '<p>Hello &lt;b&gt;a&lt;/b&gt;</p><a href="https://x?a=1&amp;b=2">link</a>',
+        )
+
+    def test_render_many(self):
+        messages = self.template.render_many([
+            {'to': 'a@example.com', 'nickname': 'a', 'url': 'u'},
+            {'to': 'b@example.com', 'nickname': 'b', 'url': 'u'},
+        ])
+
+        self.assertEqual([message['To'] for message in messages], ['a@example.com', 'b@example.com'])
+        self.assertEqual([message['Subject'] for message in messages], ['Hi a', 'Hi b'])
+        self.assertEqual(
+            messages[1].get_payload()[1].get_payload(decode=True).decode(),
+            '<p>Hello b</p><a href="u">link</a>',
+        )
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+import fakeredis
+import fakeredis.aioredis
+import pydantic
+import redis.asyncio as redis
+
+from app.config import RedisConfig
+from app.persistence.redis import RedisPoolHandler
+from tests import AsyncTestCase
+
+
+class MockRedisConfig(RedisConfig):
+    def __init__(self):
+        self.url = 'redis://localhost:6379'
+        self.max_pool_size = 2
+
+
+class Model(pydantic.BaseModel):
+    id: int
+    name: str
+
+
+class TestRedisPoolHandler(AsyncTestCase):
+    def setUp(self) -> None:
+        self.handler = RedisPoolHandler()
+        self.handler._pool = redis.ConnectionPool(
+            connection_class=fakeredis.aioredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.handler.close()
+
+    @patch('redis.asyncio.ConnectionPool.from_url')
+    async def test_initialize(self, mock_from_url):
+        await self.handler.close()
+        config = MockRedisConfig()
+        await self.handler.initialize(db_config=config)
+        mock_from_url.assert_called_with(config.url, max_connections=config.max_pool_size)
+        self.handler._pool = None
+
+    async def test_not_initialized(self):
+        await self.handler.close()
+        with self.assertRaises(ValueError):
+            await self.handler.get('key')
+
+    async def test_get_set(self):
+        await self.handler.set('key', {'a': [1, 2], 'b': b'bytes'}, ttl=60)
+        result = await self.handler.get('key')
+        self.assertEqual(result, {'a': [1, 2], 'b': b'bytes'})
+
+    async def test_get_set_model(self):
+        await self.handler.set('key', Model(id=1, name='name'))
+        result = await self.handler.get('key', model=Model)
+        self.assertEqual(result, Model(id=1, name='name'))
+
+    async def test_ttl(self):
+        await self.handler.set('key', 1, ttl=60)
+        async with self.handler.cursor() as cursor:
+            self.assertEqual(await cursor.ttl('key'), 60)
+
+    async def test_get_many(self):
+        await self.handler.set_many({'a': 1, 'b': 2})
+        result = await self.handler.get_many(['a', 'missing', 'b'])
+        self.assertEqual(result, [1, None, 2])
+
+    async def test_get_many_empty(self):
+        result = await self.handler.get_many([])
+        self.assertEqual(result, [])
+
+    async def test_invalidate_tags(self):
+        await self.handler.set('a', 1, ttl=60, tags=['stadium'])
+        await self.handler.set('b', 2, ttl=60, tags=['stadium', 'venue'])
+        await self.handler.set('c', 3, ttl=60, tags=['venue'])
+
+        await self.handler.invalidate_tags('stadium')
+
+        result = await self.handler.get_many(['a', 'b', 'c'])
+        self.assertEqual(result, [None, None, 3])
+
+    async def test_tag_expires_with_longest_member(self):
+        await self.handler.set('a', 1, ttl=60, tags=['stadium'])
+        await self.handler.set('b', 1, ttl=120, tags=['stadium'])
+        await self.handler.set('c', 1, ttl=30, tags=['stadium'])
+        async with self.handler.cursor() as cursor:
+            self.assertEqual(await cursor.ttl('tag:stadium'), 120)
+
+    async def test_delete(self):
+        await self.handler.set('a', 1)
+        await self.handler.delete('a')
+        self.assertIsNone(await self.handler.get('a'))
+
+    async def test_incr(self):
+        self.assertEqual(await self.handler.incr('counter', ttl=60), 1)
+        self.assertEqual(await self.handler.incr('counter', ttl=60), 2)
+        async with self.handler.cursor() as cursor:
+            self.assertEqual(await cursor.ttl('counter'), 60)
@@ -1,4 +1,8 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
 from app.processor.http import register_routers
+from app.utils import metrics
 from tests import Mock, TestCase, patch
 
 
@@ -9,5 +13,18 @@ class TestRegisterRouters(TestCase):
         app.include_router = Mock()
         app.get = Mock(return_value=Mock())
         register_routers(app=app)
-        self.assertEqual(app.include_router.call_count, 13)
-        self.assertEqual(app.get.call_count, 2)
+        self.assertEqual(app.include_router.call_count, 14)
+        self.assertEqual(app.get.call_count, 3)
+
+
+class TestMetrics(TestCase):
+    def test_happy_path(self):
+        app = FastAPI()
+        register_routers(app=app)
+
+        result = TestClient(app).get('/metrics')
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.headers['content-type'], f'{metrics.CONTENT_TYPE}; charset=utf-8')
+        self.assertIn('# TYPE http_request_duration_seconds histogram\n', result.text)
+        self.assertIn('db_pool_waiting 0\n', result.text)
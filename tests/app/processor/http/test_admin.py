@@ -0,0 +1,89 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from app.base import do, enums
+from app.persistence.database.slow_query import SlowQuery
+from app.processor.http import admin
+from tests import AsyncMock, AsyncTestCase, Mock
+
+
+class TestBrowseSlowQuery(AsyncTestCase):
+    def setUp(self) -> None:
+        self.entry = SlowQuery(
+            fingerprint='SELECT * FROM stadium WHERE id = ?',
+            count=2,
+            total_time=0.5,
+            max_time=0.3,
+            last_seen=datetime(2023, 11, 4),
+            plan='Seq Scan on stadium',
+            explained_at=datetime(2023, 11, 4),
+        )
+
+    @patch('app.processor.http.admin.slow_query_recorder.top', new_callable=Mock)
+    async def test_happy_path(self, mock_top: Mock):
+        mock_top.return_value = [self.entry]
+
+        result = await admin.browse_slow_query(limit=10)
+
+        mock_top.assert_called_with(10)
+        self.assertEqual(result.data, [admin.SlowQueryOutput(
+            fingerprint='SELECT * FROM stadium WHERE id = ?',
+            count=2,
+            mean_ms=250.0,
+            max_ms=300.0,
+            last_seen=datetime(2023, 11, 4),
+            plan='Seq Scan on stadium',
+            explained_at=datetime(2023, 11, 4),
+        )])
+
+
+class TestClearSlowQuery(AsyncTestCase):
+    @patch('app.processor.http.admin.slow_query_recorder.clear', new_callable=Mock)
+    async def test_happy_path(self, mock_clear: Mock):
+        result = await admin.clear_slow_query()
+        mock_clear.assert_called_once()
+        self.assertTrue(result.data)
+
+
+class TestBrowseJob(AsyncTestCase):
+    @patch('app.persistence.database.job.browse', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_browse: AsyncMock):
+        job = do.Job(
+            id=1, job_type='VERIFICATION_EMAIL', payload={'account_id': 1, 'to': 'email@email.com'},
+            status=enums.JobStatus.dead, attempts=5, max_attempts=5,
+            run_after=datetime(2023, 11, 4), locked_at=None, last_error='error', created_at=datetime(2023, 11, 4),
+            finished_at=datetime(2023, 11, 4),
+        )
+        mock_browse.return_value = [job], 1
+
+        result = await admin.browse_job(status=enums.JobStatus.dead, job_type=None, limit=None, offset=None)
+
+        mock_browse.assert_called_with(status=enums.JobStatus.dead, job_type=None, limit=20, offset=0)
+        self.assertEqual(result.data, admin.BrowseJobOutput(data=[
+            admin.JobOutput(
+                id=1, job_type='VERIFICATION_EMAIL', status=enums.JobStatus.dead, attempts=5, max_attempts=5,
+                run_after=datetime(2023, 11, 4), locked_at=None, last_error='error', created_at=datetime(2023, 11, 4),
+                finished_at=datetime(2023, 11, 4),
+            ),
+        ], total_count=1))
+        self.assertNotIn('payload', result.data.data[0].model_dump())
+
+
+class TestBrowseJobSummary(AsyncTestCase):
+    @patch('app.persistence.database.job.count_by_status', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_count: AsyncMock):
+        mock_count.return_value = {('VERIFICATION_EMAIL', enums.JobStatus.pending): 3}
+
+        result = await admin.browse_job_summary()
+
+        self.assertEqual(result.data, [
+            admin.JobSummaryOutput(job_type='VERIFICATION_EMAIL', status=enums.JobStatus.pending, count=3),
+        ])
+
+
+class TestRetryJob(AsyncTestCase):
+    @patch('app.persistence.database.job.retry', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_retry: AsyncMock):
+        result = await admin.retry_job(job_id=1)
+        mock_retry.assert_called_with(job_id=1)
+        self.assertTrue(result.data)
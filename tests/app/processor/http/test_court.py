@@ -1,6 +1,7 @@
 from datetime import date, datetime, time
 from uuid import UUID
 
+import pydantic
 from freezegun import freeze_time
 
 import app.exceptions as exc
@@ -485,8 +486,7 @@ class TestAddReservation(AsyncTestCase):
         ]
 
     @freeze_time('2023-10-10')
-    @patch('app.persistence.email.invitation.send', new_callable=AsyncMock)
-    @patch('app.persistence.database.account.batch_read', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
     @patch('app.persistence.database.stadium.read', new_callable=AsyncMock)
     @patch('app.persistence.database.account.read', new_callable=AsyncMock)
     @patch('app.client.google_calendar.add_google_calendar_event', new_callable=AsyncMock)
@@ -501,7 +501,7 @@ class TestAddReservation(AsyncTestCase):
         self, mock_batch_add: AsyncMock, mock_add: AsyncMock, mock_read_venue: AsyncMock,
         mock_read_court: AsyncMock, mock_generate: Mock, mock_browse_reservation: AsyncMock,
         mock_context: MockContext, mock_add_event: AsyncMock, mock_read_account: AsyncMock,
-        mock_read_stadium: AsyncMock, mock_batch_read: AsyncMock, mock_send_email: AsyncMock,
+        mock_read_stadium: AsyncMock, mock_add_job: AsyncMock,
     ):
         mock_context._context = self.context
         mock_browse_reservation.return_value = None, 0
@@ -511,7 +511,6 @@ class TestAddReservation(AsyncTestCase):
         mock_add.return_value = self.reservation_id
         mock_read_account.return_value = self.account
         mock_read_stadium.return_value = self.stadium
-        mock_batch_read.return_value = self.member_accounts
 
         result = await court.add_reservation(court_id=self.court_id, data=self.data)
 
@@ -550,10 +549,10 @@ class TestAddReservation(AsyncTestCase):
             account_id=self.account_id,
             location=self.location,
         )
-        # mock_send_email.assert_called_with(
-        #     meet_code=self.invitation_code,
-        #     bcc=', '.join(member.email for member in self.member_accounts),
-        # )
+        mock_add_job.assert_called_with(
+            job_type=enums.JobType.invitation_email,
+            payload={'invitation_code': self.invitation_code, 'account_ids': list(self.data.member_ids)},
+        )
 
         mock_context.reset_context()
 
@@ -652,6 +651,176 @@ class TestAddReservation(AsyncTestCase):
         mock_context.reset_context()
 
 
+class TestAddReservationSeries(AsyncTestCase):
+    def setUp(self) -> None:
+        self.court_id = 1
+        self.account_id = 1
+        self.data = court.AddReservationSeriesInput(
+            start_time=datetime(2023, 11, 17, 11),
+            end_time=datetime(2023, 11, 17, 13),
+            technical_level=[enums.TechnicalType.advanced],
+            remark='',
+            member_count=1,
+            vacancy=1,
+            member_ids=[2],
+            recurrence=vo.Recurrence(frequency=enums.RecurrenceFrequency.weekly, count=3),
+        )
+        self.time_ranges = [
+            vo.DateTimeRange(start_time=datetime(2023, 11, day, 11), end_time=datetime(2023, 11, day, 13))
+            for day in (17, 24)
+        ] + [vo.DateTimeRange(start_time=datetime(2023, 12, 1, 11), end_time=datetime(2023, 12, 1, 13))]
+        self.court = do.Court(id=1, venue_id=1, is_published=True, number=1)
+        self.venue = do.Venue(
+            id=1, stadium_id=1, name='name', floor='floor', reservation_interval=30, is_reservable=True,
+            is_chargeable=True, area=1, capacity=1, current_user_count=1, court_count=1, court_type='場',
+            sport_id=1, fee_rate=1, fee_type=enums.FeeType.per_hour, sport_equipments='equipment',
+            facilities='facility', is_published=True,
+        )
+        self.stadium = vo.ViewStadium(
+            id=1, name='name', district_id=1, contact_number='0800092000', description='desc', owner_id=1,
+            address='address1', long=3.14, lat=1.59, is_published=True, city='city1', district='district1',
+            sports=['sport1'], business_hours=[],
+        )
+        self.account = do.Account(
+            id=self.account_id, email='email@gmail.com', nickname='1',
+            gender=enums.GenderType.female, image_uuid=UUID('fad08f83-6ad7-429f-baa6-b1c3abf4991c'),
+            role=enums.RoleType.normal, is_verified=True, is_google_login=True,
+        )
+        self.reservation_ids = [1, 2, 3]
+        self.context = {
+            'AUTHED_ACCOUNT': AuthedAccount(id=1, time=datetime(2023, 11, 4), role=enums.RoleType.normal),
+            'REQUEST_TIME': datetime(2023, 11, 17),
+        }
+
+    @patch('app.persistence.database.stadium.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.account.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
+    @patch('app.client.google_calendar.add_google_calendar_series', new_callable=AsyncMock)
+    @patch('app.processor.http.court.context', new_callable=MockContext)
+    @patch('app.processor.http.court.invitation_code.generate', new_callable=Mock)
+    @patch('app.persistence.database.reservation.browse_conflicts', new_callable=AsyncMock)
+    @patch('app.persistence.database.court.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.venue.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.reservation.batch_add', new_callable=AsyncMock)
+    async def test_happy_path(
+        self, mock_batch_add: AsyncMock, mock_read_venue: AsyncMock, mock_read_court: AsyncMock,
+        mock_browse_conflicts: AsyncMock, mock_generate: Mock, mock_context: MockContext,
+        mock_add_series: AsyncMock, mock_add_job: AsyncMock, mock_read_account: AsyncMock,
+        mock_read_stadium: AsyncMock,
+    ):
+        mock_context._context = self.context
+        mock_read_court.return_value = self.court
+        mock_read_venue.return_value = self.venue
+        mock_browse_conflicts.return_value = []
+        mock_generate.side_effect = ['code1', 'code2', 'code3']
+        mock_batch_add.return_value = self.reservation_ids
+        mock_read_account.return_value = self.account
+        mock_read_stadium.return_value = self.stadium
+
+        result = await court.add_reservation_series(court_id=self.court_id, data=self.data)
+
+        self.assertEqual(result, Response(data=court.AddReservationSeriesOutput(ids=self.reservation_ids)))
+        mock_browse_conflicts.assert_called_once_with(court_id=self.court_id, time_ranges=self.time_ranges)
+        mock_batch_add.assert_called_once_with(
+            court_id=self.court_id,
+            venue_id=self.venue.id,
+            stadium_id=self.venue.stadium_id,
+            time_ranges=self.time_ranges,
+            technical_level=self.data.technical_level,
+            invitation_codes=['code1', 'code2', 'code3'],
+            manager_id=self.account_id,
+            member_ids=self.data.member_ids,
+            remark=self.data.remark,
+            member_count=self.data.member_count,
+            vacancy=self.data.vacancy,
+        )
+        mock_add_series.assert_called_once_with(
+            reservation_ids=self.reservation_ids,
+            start_times=[time_range.start_time for time_range in self.time_ranges],
+            end_time=self.data.end_time,
+            recurrence='RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=3',
+            account_id=self.account_id,
+            location=f'{self.stadium.name} {self.venue.name} 第 {self.court.number} {self.venue.court_type}',
+        )
+        mock_add_job.assert_called_once_with(
+            job_type=enums.JobType.invitation_email, payload={'invitation_code': 'code1', 'account_ids': [2]},
+        )
+
+        mock_context.reset_context()
+
+    @patch('app.persistence.database.account.read', new_callable=AsyncMock)
+    @patch('app.processor.http.court.context', new_callable=MockContext)
+    @patch('app.persistence.database.reservation.browse_conflicts', new_callable=AsyncMock)
+    @patch('app.persistence.database.court.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.venue.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.reservation.batch_add', new_callable=AsyncMock)
+    async def test_no_reservation_interval(
+        self, mock_batch_add: AsyncMock, mock_read_venue: AsyncMock, mock_read_court: AsyncMock,
+        mock_browse_conflicts: AsyncMock, mock_context: MockContext, mock_read_account: AsyncMock,
+    ):
+        mock_context._context = self.context
+        mock_read_court.return_value = self.court
+        mock_read_venue.return_value = self.venue.model_copy(update={'reservation_interval': None})
+        mock_browse_conflicts.return_value = []
+        mock_batch_add.return_value = self.reservation_ids
+        mock_read_account.return_value = self.account.model_copy(update={'is_google_login': False})
+
+        result = await court.add_reservation_series(
+            court_id=self.court_id, data=self.data.model_copy(update={'member_ids': []}),
+        )
+
+        self.assertEqual(result, Response(data=court.AddReservationSeriesOutput(ids=self.reservation_ids)))
+        mock_context.reset_context()
+
+    @patch('app.processor.http.court.context', new_callable=MockContext)
+    @patch('app.persistence.database.reservation.browse_conflicts', new_callable=AsyncMock)
+    @patch('app.persistence.database.court.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.venue.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.reservation.batch_add', new_callable=AsyncMock)
+    async def test_conflict(
+        self, mock_batch_add: AsyncMock, mock_read_venue: AsyncMock, mock_read_court: AsyncMock,
+        mock_browse_conflicts: AsyncMock, mock_context: MockContext,
+    ):
+        mock_context._context = self.context
+        mock_read_court.return_value = self.court
+        mock_read_venue.return_value = self.venue
+        mock_browse_conflicts.return_value = self.time_ranges[1:2]
+
+        with self.assertRaises(exc.CourtReserved):
+            await court.add_reservation_series(court_id=self.court_id, data=self.data)
+
+        mock_batch_add.assert_not_called()
+        mock_context.reset_context()
+
+    @patch('app.processor.http.court.context', new_callable=MockContext)
+    async def test_unbounded(self, mock_context: MockContext):
+        mock_context._context = self.context
+        data = self.data.model_copy(
+            update={'recurrence': vo.Recurrence(frequency=enums.RecurrenceFrequency.daily)},
+        )
+
+        with self.assertRaises(exc.IllegalInput):
+            await court.add_reservation_series(court_id=self.court_id, data=data)
+
+        mock_context.reset_context()
+
+    @patch('app.processor.http.court.context', new_callable=MockContext)
+    async def test_until_before_start(self, mock_context: MockContext):
+        mock_context._context = self.context
+        data = self.data.model_copy(
+            update={'recurrence': vo.Recurrence(frequency=enums.RecurrenceFrequency.weekly, until=date(2023, 11, 16))},
+        )
+
+        with self.assertRaises(exc.IllegalInput):
+            await court.add_reservation_series(court_id=self.court_id, data=data)
+
+        mock_context.reset_context()
+
+    def test_count_not_positive(self):
+        with self.assertRaises(pydantic.ValidationError):
+            vo.Recurrence(frequency=enums.RecurrenceFrequency.weekly, count=-1)
+
+
 class TestEditCourt(AsyncTestCase):
     def setUp(self) -> None:
         self.court_id =1
@@ -5,7 +5,7 @@ from fastapi import Response as FastAPIResponse
 
 import app.processor
 from app import exceptions as exc
-from app.base.enums import GenderType, RoleType
+from app.base.enums import GenderType, JobType, RoleType
 from app.processor.http import public
 from app.utils import Response
 from tests import AsyncMock, AsyncTestCase, Mock
@@ -29,6 +29,19 @@ class TestHealthCheck(AsyncTestCase):
         self.assertEqual(result.data.health, self.expect_result.data.health)
 
 
+class TestReadinessCheck(AsyncTestCase):
+    @patch('app.persistence.database.pg_pool_handler._pool', Mock())
+    @patch('app.startup.startup_orchestrator.timings', {'database': 0.5})
+    async def test_happy_path(self):
+        result = await public.readiness_check()
+        self.assertEqual(result.data.startup_timings, {'database': 500})
+
+    @patch('app.persistence.database.pg_pool_handler._pool', None)
+    async def test_database_not_ready(self):
+        with self.assertRaises(exc.ServiceUnavailable):
+            await public.readiness_check()
+
+
 class TestLogin(AsyncTestCase):
     def setUp(self) -> None:
         self.login_input = public.LoginInput(
@@ -134,13 +147,20 @@ class TestAddAccount(AsyncTestCase):
         self.hashed_password = 'hash'
         self.code = UUID('fad08f83-6ad7-429f-baa6-b1c3abf4991c')
         self.expect_output = Response(data=app.processor.http.public.AddAccountOutput(id=self.account_id))
+        self.cursor = Mock()
+        patcher = patch(
+            'app.persistence.database.pg_pool_handler.cursor',
+            Mock(return_value=AsyncMock(__aenter__=AsyncMock(return_value=self.cursor))),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('app.persistence.database.account.add', new_callable=AsyncMock)
     @patch('app.processor.http.public.hash_password', new_callable=Mock)
     @patch('app.persistence.database.email_verification.add', new_callable=AsyncMock)
-    @patch('app.persistence.email.verification.send', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
     async def test_happy_path(
-        self, mock_send: AsyncMock,
+        self, mock_add_job: AsyncMock,
         mock_add_verification: AsyncMock,
         mock_hash: Mock,
         mock_add_account: AsyncMock,
@@ -160,9 +180,13 @@ class TestAddAccount(AsyncTestCase):
             gender=self.data.gender,
             role=self.data.role,
             is_google_login=False,
+            cursor=self.cursor,
+        )
+        mock_add_verification.assert_called_with(account_id=self.account_id, email=self.data.email, cursor=self.cursor)
+        mock_add_job.assert_called_with(
+            job_type=JobType.verification_email, payload={'account_id': self.account_id, 'to': self.data.email},
+            cursor=self.cursor,
         )
-        mock_add_verification.assert_called_with(account_id=self.account_id, email=self.data.email)
-        mock_send.assert_called_with(to=self.data.email, code=str(self.code))
 
     @patch('app.persistence.database.account.add', new_callable=AsyncMock)
     @patch('app.processor.http.public.hash_password', new_callable=Mock)
@@ -181,6 +205,7 @@ class TestAddAccount(AsyncTestCase):
             gender=self.data.gender,
             role=self.data.role,
             is_google_login=False,
+            cursor=self.cursor,
         )
 
 
@@ -194,9 +219,9 @@ class TestResendEmailVerification(AsyncTestCase):
 
     @patch('app.persistence.database.account.read_by_email', new_callable=AsyncMock)
     @patch('app.persistence.database.email_verification.read', new_callable=AsyncMock)
-    @patch('app.persistence.email.verification.send', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
     async def test_happy_path(
-        self, mock_send: AsyncMock,
+        self, mock_add_job: AsyncMock,
         mock_read_verification: AsyncMock,
         mock_read_by_email: AsyncMock,
     ):
@@ -208,7 +233,9 @@ class TestResendEmailVerification(AsyncTestCase):
         self.assertEqual(result, self.expect_output)
         mock_read_by_email.assert_called_with(email=self.email, include_unverified=True)
         mock_read_verification.assert_called_with(account_id=self.account_id, email=self.email)
-        mock_send.assert_called_with(to=self.email, code=str(self.code))
+        mock_add_job.assert_called_with(
+            job_type=JobType.verification_email, payload={'account_id': self.account_id, 'to': self.email},
+        )
 
 
 class TestForgetPassword(AsyncTestCase):
@@ -219,11 +246,18 @@ class TestForgetPassword(AsyncTestCase):
 
         self.data = public.ForgetPasswordInput(email=self.email)
         self.expect_result = Response()
+        self.cursor = Mock()
+        patcher = patch(
+            'app.persistence.database.pg_pool_handler.cursor',
+            Mock(return_value=AsyncMock(__aenter__=AsyncMock(return_value=self.cursor))),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('app.persistence.database.account.read_by_email', new_callable=AsyncMock)
     @patch('app.persistence.database.email_verification.add', new_callable=AsyncMock)
-    @patch('app.persistence.email.forget_password.send', new_callable=AsyncMock)
-    async def test_happy_path(self, mock_send: AsyncMock, mock_add: AsyncMock, mock_read: AsyncMock):
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_add_job: AsyncMock, mock_add: AsyncMock, mock_read: AsyncMock):
         mock_read.return_value = self.account_id,
         mock_add.return_value = self.code
 
@@ -231,8 +265,11 @@ class TestForgetPassword(AsyncTestCase):
 
         self.assertEqual(result, self.expect_result)
         mock_read.assert_called_with(email=self.data.email)
-        mock_add.assert_called_with(account_id=self.account_id, email=self.data.email)
-        mock_send.assert_called_with(to=self.data.email, code=str(self.code))
+        mock_add.assert_called_with(account_id=self.account_id, email=self.data.email, cursor=self.cursor)
+        mock_add_job.assert_called_with(
+            job_type=JobType.forget_password_email, payload={'account_id': self.account_id, 'to': self.data.email},
+            cursor=self.cursor,
+        )
 
 
 class TestResetPassword(AsyncTestCase):
@@ -141,80 +141,52 @@ class TestJoinReservation(AsyncTestCase):
         self.context = {'AUTHED_ACCOUNT': AuthedAccount(id=1, time=datetime(2023, 11, 4), role=enums.RoleType.normal)}
         self.invitation_code = 'code'
         self.account_id = 1
-        self.member = do.ReservationMember(
-            reservation_id=1,
-            account_id=self.account_id,
-            is_manager=False,
-            status=enums.ReservationMemberStatus.joined,
-            source=enums.ReservationMemberSource.invitation_code,
-        )
-        self.reservation = do.Reservation(
-            id=1,
-            stadium_id=1,
-            venue_id=1,
-            court_id=1,
-            start_time=datetime(2023, 11, 17, 11, 11, 11),
-            end_time=datetime(2023, 11, 17, 13, 11, 11),
-            member_count=1,
-            vacancy=1,
-            technical_level=[enums.TechnicalType.advanced],
-            remark='remark',
-            invitation_code='invitation_code',
-            is_cancelled=False,
-        )
-        self.full_reservation = do.Reservation(
-            id=1,
-            stadium_id=1,
-            venue_id=1,
-            court_id=1,
-            start_time=datetime(2023, 11, 17, 11, 11, 11),
-            end_time=datetime(2023, 11, 17, 13, 11, 11),
-            member_count=1,
-            vacancy=-1,
-            technical_level=[enums.TechnicalType.advanced],
-            remark='remark',
-            invitation_code='invitation_code',
-            is_cancelled=False,
-        )
+        self.reservation_id = 1
         self.expect_result = Response(data=True)
 
-    @patch('app.client.google_calendar.add_google_calendar_event_member', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
     @patch('app.processor.http.reservation.context', new_callable=MockContext)
-    @patch('app.persistence.database.reservation.read_by_code', new_callable=AsyncMock)
-    @patch('app.persistence.database.reservation_member.batch_add_with_do', new_callable=AsyncMock)
-    async def test_happy_path(
-        self, mock_add: AsyncMock, mock_read: AsyncMock, mock_context: MockContext,
-        mock_update_event: AsyncMock,
-    ):
+    @patch('app.persistence.database.reservation_member.join', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_join: AsyncMock, mock_context: MockContext, mock_add_job: AsyncMock):
         mock_context._context = self.context
-        mock_read.return_value = self.reservation
+        mock_join.return_value = self.reservation_id, True
 
         result = await reservation.join_reservation(invitation_code=self.invitation_code)
 
         self.assertEqual(result, self.expect_result)
-        mock_read.assert_called_with(invitation_code=self.invitation_code)
-        mock_add.assert_called_with(
-            members=[self.member],
-        )
-        mock_update_event.assert_called_with(
-            reservation_id=self.reservation.id,
-            member_id=self.account_id,
+        mock_join.assert_called_with(invitation_code=self.invitation_code, account_id=self.account_id)
+        mock_add_job.assert_called_with(
+            job_type=enums.JobType.calendar_event_member,
+            payload={'reservation_id': self.reservation_id, 'member_id': self.account_id},
         )
 
         mock_context.reset_context()
 
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
+    @patch('app.processor.http.reservation.context', new_callable=MockContext)
+    @patch('app.persistence.database.reservation_member.join', new_callable=AsyncMock)
+    async def test_already_member(self, mock_join: AsyncMock, mock_context: MockContext, mock_add_job: AsyncMock):
+        mock_context._context = self.context
+        mock_join.return_value = self.reservation_id, False
+
+        result = await reservation.join_reservation(invitation_code=self.invitation_code)
+
+        self.assertEqual(result, self.expect_result)
+        mock_add_job.assert_not_called()
+
+        mock_context.reset_context()
+
+    @patch('app.persistence.database.job.add', new_callable=AsyncMock)
     @patch('app.processor.http.reservation.context', new_callable=MockContext)
-    @patch('app.persistence.database.reservation.read_by_code', new_callable=AsyncMock)
-    @patch('app.persistence.database.reservation_member.batch_add', new_callable=AsyncMock)
-    async def test_reservation_full(self, mock_add: AsyncMock, mock_read: AsyncMock, mock_context: MockContext):
+    @patch('app.persistence.database.reservation_member.join', new_callable=AsyncMock)
+    async def test_reservation_full(self, mock_join: AsyncMock, mock_context: MockContext, mock_add_job: AsyncMock):
         mock_context._context = self.context
-        mock_read.return_value = self.full_reservation
+        mock_join.side_effect = exc.ReservationFull
 
         with self.assertRaises(exc.ReservationFull):
             await reservation.join_reservation(invitation_code=self.invitation_code)
 
-        mock_read.assert_called_with(invitation_code=self.invitation_code)
-        mock_add.assert_not_called()
+        mock_add_job.assert_not_called()
         mock_context.reset_context()
 
 
@@ -336,6 +336,74 @@ class TestBrowseCourt(AsyncTestCase):
         mock_context.reset_context()
 
 
+class TestBrowseFreeSlot(AsyncTestCase):
+    def setUp(self) -> None:
+        self.venue_id = 1
+        self.params = venue.FreeSlotParameters(court_id=None, duration=60, horizon=7, limit=2)
+        self.venue = do.Venue(
+            id=1, stadium_id=1, name='name', floor='floor', reservation_interval=1, is_reservable=True,
+            is_chargeable=True, area=1, capacity=1, current_user_count=1, court_count=2, court_type='場',
+            sport_id=1, fee_rate=1, fee_type=enums.FeeType.per_hour, sport_equipments='equipment',
+            facilities='facility', is_published=True,
+        )
+        self.courts = [
+            do.Court(id=1, venue_id=1, number=1, is_published=True),
+            do.Court(id=2, venue_id=1, number=2, is_published=True),
+        ]
+        self.business_hours = [  # 2023-11-17 is a friday
+            do.BusinessHour(id=1, place_id=1, type=enums.PlaceType.venue, weekday=5, start_time=time(8), end_time=time(12)),
+        ]
+        self.reservations = [
+            do.Reservation(
+                id=1, stadium_id=1, venue_id=1, court_id=1,
+                start_time=datetime(2023, 11, 17, 8), end_time=datetime(2023, 11, 17, 10),
+                member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=False,
+            ),
+        ]
+        self.context = {'REQUEST_TIME': datetime(2023, 11, 17, 7)}
+
+    @patch('app.processor.http.venue.context', new_callable=MockContext)
+    @patch('app.persistence.database.reservation.browse_by_courts', new_callable=AsyncMock)
+    @patch('app.persistence.database.business_hour.browse', new_callable=AsyncMock)
+    @patch('app.persistence.database.court.browse', new_callable=AsyncMock)
+    @patch('app.persistence.database.venue.read', new_callable=AsyncMock)
+    async def test_happy_path(
+        self, mock_read_venue: AsyncMock, mock_browse_court: AsyncMock, mock_browse_business_hour: AsyncMock,
+        mock_browse_reservation: AsyncMock, mock_context: MockContext,
+    ):
+        mock_context._context = self.context
+        mock_read_venue.return_value = self.venue
+        mock_browse_court.return_value = self.courts
+        mock_browse_business_hour.return_value = self.business_hours
+        mock_browse_reservation.return_value = self.reservations
+
+        result = await venue.browse_free_slot(venue_id=self.venue_id, params=self.params)
+
+        self.assertEqual(result, Response(data=[
+            vo.FreeSlot(court_id=2, start_time=datetime(2023, 11, 17, 8), end_time=datetime(2023, 11, 17, 9)),
+            vo.FreeSlot(court_id=1, start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 11)),
+        ]))
+        mock_browse_reservation.assert_called_once_with(
+            court_ids=[1, 2], start_time=datetime(2023, 11, 17, 7), end_time=datetime(2023, 11, 18, 7),
+        )
+        mock_context.reset_context()
+
+    @patch('app.processor.http.venue.context', new_callable=MockContext)
+    @patch('app.persistence.database.court.browse', new_callable=AsyncMock)
+    @patch('app.persistence.database.venue.read', new_callable=AsyncMock)
+    async def test_court_not_in_venue(
+        self, mock_read_venue: AsyncMock, mock_browse_court: AsyncMock, mock_context: MockContext,
+    ):
+        mock_context._context = self.context
+        mock_read_venue.return_value = self.venue
+        mock_browse_court.return_value = self.courts
+
+        with self.assertRaises(exc.NotFound):
+            await venue.browse_free_slot(venue_id=self.venue_id, params=self.params.model_copy(update={'court_id': 3}))
+
+        mock_context.reset_context()
+
+
 class TestEditVenue(AsyncTestCase):
     def setUp(self) -> None:
         self.context = {'AUTHED_ACCOUNT': AuthedAccount(id=1, time=datetime(2023, 11, 4), role=enums.RoleType.provider)}
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 import app.exceptions as exc
 from app.base import do, enums, vo
@@ -337,3 +337,154 @@ class TestViewProviderCourt(AsyncTestCase):
             )
         mock_browse.assert_not_called()
         mock_context.reset_context()
+
+
+class TestViewFreeCourt(AsyncTestCase):
+    def setUp(self) -> None:
+        self.data = view.ViewFreeCourtParams(
+            time_ranges=[vo.DateTimeRange(start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12))],
+            city_id=1,
+            limit=5,
+        )
+        self.courts = [
+            vo.ViewFreeCourt(
+                court_id=3, court_number=1, venue_id=2, venue_name='venue', stadium_id=1, stadium_name='stadium',
+                start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12),
+            ),
+        ]
+        self.context = {'REQUEST_TIME': datetime(2023, 11, 17, 8)}
+
+    @patch('app.processor.http.view.context', new_callable=MockContext)
+    @patch('app.persistence.database.view.browse_free_court', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_browse: AsyncMock, mock_context: MockContext):
+        mock_context._context = self.context
+        mock_browse.return_value = self.courts, 1
+
+        result = await view.view_free_court(data=self.data)
+
+        self.assertEqual(result, Response(data=view.ViewFreeCourtOutput(data=self.courts, total_count=1, limit=5)))
+        mock_browse.assert_called_once_with(
+            time_ranges=self.data.time_ranges,
+            request_time=datetime(2023, 11, 17, 8),
+            city_id=1,
+            district_id=None,
+            sport_id=None,
+            long=None,
+            lat=None,
+            limit=5,
+            offset=0,
+        )
+        mock_context.reset_context()
+
+    async def test_no_time_range(self):
+        with self.assertRaises(exc.IllegalInput):
+            await view.view_free_court(data=view.ViewFreeCourtParams(time_ranges=[]))
+
+
+class TestViewProviderSchedule(AsyncTestCase):
+    def setUp(self) -> None:
+        self.context = {
+            'AUTHED_ACCOUNT': AuthedAccount(id=1, time=datetime(2023, 11, 4), role=enums.RoleType.provider),
+            'REQUEST_TIME': datetime(2023, 11, 17, 15),
+        }
+        self.provider_account = do.Account(
+            id=1, email='email@email.com', nickname='nickname', gender=enums.GenderType.male, image_uuid=None,
+            role=enums.RoleType.provider, is_verified=True, is_google_login=False,
+        )
+        self.params = view.ViewProviderScheduleParams(stadium_id=1, venue_id=None, start_date=None, days=1, slot_minutes=60)
+        self.courts = [
+            vo.ViewProviderCourt(court_id=1, stadium_name='s1', venue_name='v1', court_number=1, is_published=True),
+            vo.ViewProviderCourt(court_id=2, stadium_name='s1', venue_name='v1', court_number=2, is_published=True),
+        ]
+        self.reservations = [
+            do.Reservation(
+                id=1, stadium_id=1, venue_id=1, court_id=2,
+                start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12),
+                member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=False,
+            ),
+            do.Reservation(
+                id=2, stadium_id=1, venue_id=1, court_id=1,
+                start_time=datetime(2023, 11, 17, 10), end_time=datetime(2023, 11, 17, 12),
+                member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=True,
+            ),
+        ]
+
+    @patch('app.processor.http.view.context', new_callable=MockContext)
+    @patch('app.persistence.database.account.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.view.browse_provider_court', new_callable=AsyncMock)
+    @patch('app.persistence.database.reservation.browse_by_courts', new_callable=AsyncMock)
+    async def test_happy_path(
+        self, mock_browse_reservation: AsyncMock, mock_browse_court: AsyncMock, mock_read: AsyncMock,
+        mock_context: MockContext,
+    ):
+        mock_context._context = self.context
+        mock_read.return_value = self.provider_account
+        mock_browse_court.return_value = self.courts, 2
+        mock_browse_reservation.return_value = self.reservations
+
+        result = await view.view_provider_schedule(params=self.params)
+
+        self.assertEqual(result, Response(data=view.ViewProviderScheduleOutput(
+            start_time=datetime(2023, 11, 17),
+            slot_minutes=60,
+            slot_count=24,
+            courts=[
+                vo.ViewCourtOccupancy(court_id=1, stadium_name='s1', venue_name='v1', court_number=1, occupied=[]),
+                vo.ViewCourtOccupancy(court_id=2, stadium_name='s1', venue_name='v1', court_number=2, occupied=[(10, 2)]),
+            ],
+        )))
+        mock_browse_court.assert_called_once_with(owner_id=1, stadium_id=1, venue_id=None)
+        mock_browse_reservation.assert_called_once_with(
+            court_ids=[1, 2], start_time=datetime(2023, 11, 17), end_time=datetime(2023, 11, 18),
+        )
+        mock_context.reset_context()
+
+    async def test_uneven_slot(self):
+        with self.assertRaises(exc.IllegalInput):
+            await view.view_provider_schedule(params=self.params.model_copy(update={'slot_minutes': 7}))
+
+
+class TestViewProviderStat(AsyncTestCase):
+    def setUp(self) -> None:
+        self.context = {
+            'AUTHED_ACCOUNT': AuthedAccount(id=1, time=datetime(2023, 11, 4), role=enums.RoleType.provider),
+            'REQUEST_TIME': datetime(2023, 11, 30, 15),
+        }
+        self.provider_account = do.Account(
+            id=1, email='email@email.com', nickname='nickname', gender=enums.GenderType.male, image_uuid=None,
+            role=enums.RoleType.provider, is_verified=True, is_google_login=False,
+        )
+        self.stats = [
+            vo.ViewCourtDailyStat(
+                court_id=1, day=date(2023, 11, 17), reservation_count=2, reserved_minutes=180,
+                member_count=5, cancelled_count=1,
+            ),
+        ]
+
+    @patch('app.processor.http.view.context', new_callable=MockContext)
+    @patch('app.persistence.database.account.read', new_callable=AsyncMock)
+    @patch('app.persistence.database.court_daily_stat.browse', new_callable=AsyncMock)
+    async def test_default_range(self, mock_browse: AsyncMock, mock_read: AsyncMock, mock_context: MockContext):
+        mock_context._context = self.context
+        mock_read.return_value = self.provider_account
+        mock_browse.return_value = self.stats
+
+        result = await view.view_provider_stat(params=view.ViewProviderStatParams())
+
+        self.assertEqual(result, Response(data=view.ViewProviderStatOutput(
+            start_date=date(2023, 11, 1), end_date=date(2023, 11, 30), data=self.stats,
+        )))
+        mock_browse.assert_called_once_with(
+            owner_id=1, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30), stadium_id=None, venue_id=None,
+        )
+        mock_context.reset_context()
+
+    @patch('app.processor.http.view.context', new_callable=MockContext)
+    async def test_reversed_range(self, mock_context: MockContext):
+        mock_context._context = self.context
+
+        with self.assertRaises(exc.IllegalInput):
+            await view.view_provider_stat(params=view.ViewProviderStatParams(
+                start_date=date(2023, 11, 30), end_date=date(2023, 11, 1),
+            ))
+        mock_context.reset_context()
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+
+from app.base import do, enums
+from app.config import JobConfig
+from app.processor.job import JobKind, JobRunner
+from tests import AsyncMock, AsyncTestCase, patch
+
+
+def make_job(job_id: int) -> do.Job:
+    return do.Job(
+        id=job_id, job_type='VERIFICATION_EMAIL', payload={'to': 'email@email.com'}, status=enums.JobStatus.running,
+        attempts=1, max_attempts=5, run_after=datetime(2023, 11, 4), locked_at=datetime(2023, 11, 4), last_error=None,
+        created_at=datetime(2023, 11, 4), finished_at=None,
+    )
+
+
+class TestPoll(AsyncTestCase):
+    def setUp(self) -> None:
+        self.runner = JobRunner.__new__(JobRunner)  # not the registered singleton
+        self.runner.__init__()
+        self.runner._job_config = JobConfig()
+
+    @patch('app.persistence.database.job.finish', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.claim', new_callable=AsyncMock)
+    async def test_concurrency(self, mock_claim: AsyncMock, mock_finish: AsyncMock):
+        release = asyncio.Event()
+
+        async def handler(payload):
+            await release.wait()
+
+        kind = JobKind(job_type=enums.JobType.verification_email, handler=handler, concurrency=2)
+        mock_claim.return_value = [make_job(1)]
+
+        self.assertEqual(await self.runner.poll(kind), 1)
+        mock_claim.assert_called_with(job_type=enums.JobType.verification_email, limit=2)
+        mock_claim.return_value = [make_job(2)]
+        self.assertEqual(await self.runner.poll(kind), 1)
+        mock_claim.assert_called_with(job_type=enums.JobType.verification_email, limit=1)
+
+        mock_claim.reset_mock()
+        self.assertEqual(await self.runner.poll(kind), 0)  # full
+        mock_claim.assert_not_called()
+
+        release.set()
+        await asyncio.gather(*kind.running)
+        self.assertEqual(len(kind.running), 0)
+        self.assertEqual(mock_finish.await_count, 2)
+
+
+class TestRun(AsyncTestCase):
+    def setUp(self) -> None:
+        self.runner = JobRunner.__new__(JobRunner)
+        self.runner.__init__()
+        self.runner._job_config = JobConfig()
+        self.runner._job_config.retry_backoff = 30
+
+    @patch('app.persistence.database.job.finish', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_finish: AsyncMock):
+        handler = AsyncMock()
+        kind = JobKind(job_type=enums.JobType.verification_email, handler=handler, concurrency=1)
+
+        await self.runner.run(kind, make_job(1))
+
+        handler.assert_awaited_once_with({'to': 'email@email.com'})
+        mock_finish.assert_awaited_once_with(job_id=1, attempts=1)
+
+    @patch('app.persistence.database.job.finish', new_callable=AsyncMock)
+    @patch('app.persistence.database.job.fail', new_callable=AsyncMock)
+    async def test_failed(self, mock_fail: AsyncMock, mock_finish: AsyncMock):
+        mock_fail.return_value = enums.JobStatus.pending
+        kind = JobKind(
+            job_type=enums.JobType.verification_email, handler=AsyncMock(side_effect=ConnectionError('down')),
+            concurrency=1,
+        )
+
+        await self.runner.run(kind, make_job(1))
+
+        mock_fail.assert_awaited_once_with(job_id=1, attempts=1, error="ConnectionError('down')", backoff_seconds=30)
+        mock_finish.assert_not_called()
+
+    @patch('app.processor.job.jobs_finished.inc')
+    @patch('app.persistence.database.job.finish', new_callable=AsyncMock)
+    async def test_released(self, mock_finish: AsyncMock, mock_inc):
+        mock_finish.return_value = False
+        kind = JobKind(job_type=enums.JobType.verification_email, handler=AsyncMock(), concurrency=1)
+
+        await self.runner.run(kind, make_job(1))
+
+        mock_inc.assert_not_called()
@@ -0,0 +1,79 @@
+from uuid import UUID
+
+import app.exceptions as exc
+from app.base import do, enums
+from app.processor.job import email
+from tests import AsyncMock, AsyncTestCase, patch
+
+
+class TestSendVerificationEmail(AsyncTestCase):
+    def setUp(self) -> None:
+        self.payload = {'account_id': 1, 'to': 'email@email.com'}
+        self.code = UUID('fad08f83-6ad7-429f-baa6-b1c3abf4991c')
+
+    @patch('app.persistence.email.verification.send', new_callable=AsyncMock)
+    @patch('app.persistence.database.email_verification.read', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_read: AsyncMock, mock_send: AsyncMock):
+        mock_read.return_value = self.code
+
+        await email.send_verification_email(self.payload)
+
+        mock_read.assert_called_with(account_id=1, email='email@email.com', include_consumed=False)
+        mock_send.assert_called_with(to='email@email.com', code=str(self.code))
+
+    @patch('app.persistence.email.verification.send', new_callable=AsyncMock)
+    @patch('app.persistence.database.email_verification.read', new_callable=AsyncMock)
+    async def test_consumed(self, mock_read: AsyncMock, mock_send: AsyncMock):
+        mock_read.side_effect = exc.NotFound
+
+        await email.send_verification_email(self.payload)
+
+        mock_send.assert_not_called()
+
+
+class TestSendForgetPasswordEmail(AsyncTestCase):
+    @patch('app.persistence.email.forget_password.send', new_callable=AsyncMock)
+    @patch('app.persistence.database.email_verification.read', new_callable=AsyncMock)
+    async def test_happy_path(self, mock_read: AsyncMock, mock_send: AsyncMock):
+        code = UUID('d0a7fb2d-dca7-4e1e-85a0-f0f5f6f0c651')
+        mock_read.return_value = code
+
+        await email.send_forget_password_email({'account_id': 1, 'to': 'email@email.com'})
+
+        mock_read.assert_called_with(account_id=1, email='email@email.com', include_consumed=False)
+        mock_send.assert_called_with(to='email@email.com', code=str(code))
+
+
+class TestSendInvitationEmails(AsyncTestCase):
+    def setUp(self) -> None:
+        self.payload = {'invitation_code': 'code', 'account_ids': [2, 3]}
+        self.accounts = [
+            do.Account(
+                id=account_id, email=f'{account_id}@email.com', nickname=f'nickname{account_id}',
+                gender=enums.GenderType.male, image_uuid=None, role=enums.RoleType.normal,
+                is_verified=True, is_google_login=False,
+            )
+            for account_id in (2, 3)
+        ]
+
+    @patch('app.persistence.email.invitation.send_many', new_callable=AsyncMock)
+    @patch('app.persistence.database.account.batch_read', new_callable=AsyncMock)
+    async def test_partly_failed(self, mock_batch_read: AsyncMock, mock_send_many: AsyncMock):
+        mock_batch_read.return_value = self.accounts
+        mock_send_many.return_value = [[], ConnectionError()]
+
+        await email.send_invitation_emails(self.payload)
+
+        mock_batch_read.assert_called_with(account_ids=[2, 3])
+        mock_send_many.assert_called_with(
+            meet_code='code', invitees=[('2@email.com', 'nickname2'), ('3@email.com', 'nickname3')],
+        )
+
+    @patch('app.persistence.email.invitation.send_many', new_callable=AsyncMock)
+    @patch('app.persistence.database.account.batch_read', new_callable=AsyncMock)
+    async def test_all_failed(self, mock_batch_read: AsyncMock, mock_send_many: AsyncMock):
+        mock_batch_read.return_value = self.accounts
+        mock_send_many.return_value = [ConnectionError(), ConnectionError()]
+
+        with self.assertRaises(ConnectionError):
+            await email.send_invitation_emails(self.payload)
@@ -0,0 +1,129 @@
+import logging
+import logging.config
+import threading
+from unittest.mock import patch
+
+from app.log import (
+    LoggingHandlerInherited,
+    QueueListenerHandler,
+    SamplingFilter,
+    Truncated,
+)
+from tests import Mock, TestCase
+
+
+def make_record(name: str = 'name', level: int = logging.INFO, msg: str = 'message', args=None):
+    return logging.LogRecord(name, level, 'path', 1, msg, args, None)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+
+class TestLoggingHandlerInherited(TestCase):
+    def setUp(self) -> None:
+        self.record = logging.LogRecord('name', logging.INFO, 'path', 1, 'message', None, None)
+
+    @patch('google.cloud.logging.handlers.CloudLoggingHandler', new_callable=Mock)
+    @patch('google.cloud.logging.Client', new_callable=Mock)
+    def test_create_on_first_emit(self, mock_client: Mock, mock_handler: Mock):
+        mock_handler.return_value = Mock()
+        handler = LoggingHandlerInherited(name='name')
+        mock_client.assert_not_called()
+
+        handler.handle(self.record)
+        handler.handle(self.record)
+
+        mock_client.assert_called_once()
+        mock_handler.assert_called_once_with(client=mock_client.return_value, name='name')
+        self.assertEqual(mock_handler.return_value.emit.call_count, 2)
+
+    @patch('google.cloud.logging.handlers.CloudLoggingHandler', new_callable=Mock)
+    @patch('google.cloud.logging.Client', new_callable=Mock)
+    def test_drop_records_while_creating(self, mock_client: Mock, mock_handler: Mock):
+        mock_handler.return_value = Mock()
+        handler = LoggingHandlerInherited()
+        mock_client.side_effect = lambda: handler.handle(self.record)
+
+        handler.handle(self.record)
+
+        mock_handler.return_value.emit.assert_called_once_with(self.record)
+
+
+class TestQueueListenerHandler(TestCase):
+    def test_handled_by_listener(self):
+        recording = RecordingHandler()
+        handler = QueueListenerHandler(handlers=[recording])
+        args = ['a']
+
+        handler.handle(make_record(msg='message %s', args=(args,)))
+        args.append('b')
+        handler.stop()
+
+        record, = recording.records
+        self.assertEqual(record.msg, "message ['a']")
+        self.assertIsNone(record.args)
+        self.assertIsNot(recording.threads[0], threading.current_thread())
+
+    def test_stop_twice(self):
+        handler = QueueListenerHandler(handlers=[RecordingHandler()])
+        handler.stop()
+        handler.close()
+
+    def test_dict_config(self):
+        logging.config.dictConfig({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'handlers': {
+                'console': {'class': 'logging.NullHandler'},
+                'queue': {'()': QueueListenerHandler, 'handlers': ['cfg://handlers.console']},
+            },
+            'loggers': {'test_dict_config': {'handlers': ['queue'], 'propagate': False}},
+        })
+        handler, = logging.getLogger('test_dict_config').handlers
+        self.assertIsInstance(handler.listener.handlers[0], logging.NullHandler)
+        handler.close()
+
+    def test_not_configured_handler(self):
+        with self.assertRaises(ValueError):
+            QueueListenerHandler(handlers=[{'class': 'logging.NullHandler'}])
+
+
+class TestSamplingFilter(TestCase):
+    def setUp(self) -> None:
+        self.filter = SamplingFilter(rates={'sql': 0, 'app.noisy': 0.5})
+
+    def test_get_rate(self):
+        self.assertEqual(self.filter.get_rate('sql'), 0)
+        self.assertEqual(self.filter.get_rate('sql.child'), 0)
+        self.assertEqual(self.filter.get_rate('app.noisy.child'), 0.5)
+        self.assertEqual(self.filter.get_rate('app'), 1)
+        self.assertEqual(self.filter.get_rate('sqlalchemy'), 1)
+
+    def test_filter(self):
+        self.assertFalse(self.filter.filter(make_record(name='sql')))
+        self.assertTrue(self.filter.filter(make_record(name='sql', level=logging.WARNING)))
+        self.assertTrue(self.filter.filter(make_record(name='app')))
+
+    @patch('random.random', new_callable=Mock)
+    def test_sampled(self, mock_random: Mock):
+        mock_random.return_value = 0.4
+        self.assertTrue(self.filter.filter(make_record(name='app.noisy')))
+        mock_random.return_value = 0.6
+        self.assertFalse(self.filter.filter(make_record(name='app.noisy')))
+
+
+class TestTruncated(TestCase):
+    def test_short(self):
+        self.assertEqual(str(Truncated('SELECT *\n    FROM account', max_length=30)), 'SELECT * FROM account')
+        self.assertEqual(str(Truncated([1, 'a'], max_length=30)), "[1, 'a']")
+
+    def test_long(self):
+        self.assertEqual(str(Truncated('a' * 20, max_length=5)), 'aaaaa...(20 chars)')
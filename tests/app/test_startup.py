@@ -0,0 +1,46 @@
+import asyncio
+
+from app.startup import StartupOrchestrator
+from tests import AsyncMock, AsyncTestCase
+
+
+class TestStartupOrchestrator(AsyncTestCase):
+    def setUp(self) -> None:
+        self.orchestrator = StartupOrchestrator()
+        self.orchestrator.timings = {}
+
+    def tearDown(self) -> None:
+        self.orchestrator.timings = {}
+
+    async def test_concurrent(self):
+        running = []
+
+        async def initialize():
+            running.append(1)
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(running), 2)
+
+        await self.orchestrator.start(required={'a': initialize, 'b': initialize})
+        self.assertCountEqual(self.orchestrator.timings, ['a', 'b'])
+
+    async def test_required_failed(self):
+        with self.assertRaises(RuntimeError):
+            await self.orchestrator.start(required={'a': AsyncMock(side_effect=RuntimeError)})
+
+    async def test_deferred(self):
+        event = asyncio.Event()
+
+        async def initialize():
+            await event.wait()
+
+        await self.orchestrator.start(required={}, deferred={'a': initialize, 'b': AsyncMock(side_effect=RuntimeError)})
+        self.assertNotIn('a', self.orchestrator.timings)
+
+        event.set()
+        await self.orchestrator.join()
+        self.assertCountEqual(self.orchestrator.timings, ['a', 'b'])
+
+    async def test_cancel(self):
+        await self.orchestrator.start(required={}, deferred={'a': asyncio.Event().wait})
+        await self.orchestrator.cancel()
+        await self.orchestrator.join()
@@ -56,3 +56,13 @@ class TestContext(TestCase):
     def test_request_uuid(self):
         self.context.set_request_uuid(self.request_uuid)
         self.assertEqual(self.context.get_request_uuid(), self.request_uuid)
+
+    def test_primary_sticky(self):
+        self.context._context.context.pop(Context.PRIMARY_STICKY_KEY, None)
+        self.assertFalse(self.context.is_primary_sticky())
+        self.context.set_primary_sticky()
+        self.assertTrue(self.context.is_primary_sticky())
+
+    def test_statement_timeout(self):
+        self.context.set_statement_timeout(1.5)
+        self.assertEqual(self.context.get_statement_timeout(), 1.5)
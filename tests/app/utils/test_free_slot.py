@@ -0,0 +1,54 @@
+from datetime import datetime, time, timedelta
+
+import app.utils.free_slot as free_slot
+from app.base import do, vo
+from tests import TestCase
+
+
+def time_range(day: int, start_hour: int, end_hour: int) -> vo.DateTimeRange:
+    return vo.DateTimeRange(start_time=datetime(2023, 11, day, start_hour), end_time=datetime(2023, 11, day, end_hour))
+
+
+def reservation(court_id: int, day: int, start_hour: int, end_hour: int) -> do.Reservation:
+    return do.Reservation(
+        id=1, stadium_id=1, venue_id=1, court_id=court_id,
+        start_time=datetime(2023, 11, day, start_hour), end_time=datetime(2023, 11, day, end_hour),
+        member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=False,
+    )
+
+
+class TestOpenWindows(TestCase):
+    def test_clip_and_merge(self):
+        business_hours = [  # 2023-11-17 is a friday
+            vo.WeekTimeRange(weekday=5, start_time=time(8), end_time=time(12)),
+            vo.WeekTimeRange(weekday=5, start_time=time(11), end_time=time(14)),
+            vo.WeekTimeRange(weekday=6, start_time=time(8), end_time=time(12)),
+        ]
+        result = free_slot.open_windows(business_hours, datetime(2023, 11, 17, 9), datetime(2023, 11, 18, 10))
+        self.assertEqual(result, [time_range(17, 9, 14), time_range(18, 8, 10)])
+
+
+class TestFreeRanges(TestCase):
+    def test_gaps(self):
+        windows = [time_range(17, 8, 12), time_range(18, 8, 12)]
+        busy = [time_range(17, 7, 9), time_range(17, 10, 11), time_range(17, 10, 12)]
+        result = list(free_slot.free_ranges(windows, busy))
+        self.assertEqual(result, [time_range(17, 9, 10), time_range(18, 8, 12)])
+
+
+class TestEarliest(TestCase):
+    def test_across_courts(self):
+        windows = [time_range(17, 8, 12), time_range(18, 8, 12)]
+        reservations = [reservation(1, 17, 8, 12), reservation(2, 17, 8, 9), reservation(2, 17, 10, 12)]
+        result = free_slot.earliest(windows, reservations, court_ids=[1, 2], duration=timedelta(hours=1), limit=3)
+        self.assertEqual(result, [
+            vo.FreeSlot(court_id=2, start_time=datetime(2023, 11, 17, 9), end_time=datetime(2023, 11, 17, 10)),
+            vo.FreeSlot(court_id=1, start_time=datetime(2023, 11, 18, 8), end_time=datetime(2023, 11, 18, 9)),
+            vo.FreeSlot(court_id=2, start_time=datetime(2023, 11, 18, 8), end_time=datetime(2023, 11, 18, 9)),
+        ])
+
+    def test_too_short_gap_skipped(self):
+        windows = [time_range(17, 8, 12)]
+        reservations = [reservation(1, 17, 9, 12)]
+        result = free_slot.earliest(windows, reservations, court_ids=[1], duration=timedelta(hours=2), limit=3)
+        self.assertEqual(result, [])
@@ -0,0 +1,75 @@
+from app.utils import metrics
+from tests import TestCase
+
+
+class TestRegistry(TestCase):
+    def setUp(self) -> None:
+        self.registry = metrics.Registry()
+
+    def test_counter(self):
+        counter = self.registry.counter('cache_requests', 'Lookups.', labelnames=('result',))
+        counter.inc('hit')
+        counter.inc('hit')
+        counter.inc('miss', amount=0.5)
+
+        self.assertEqual(self.registry.expose(), (
+            '# HELP cache_requests Lookups.\n'
+            '# TYPE cache_requests counter\n'
+            'cache_requests_total{result="hit"} 2\n'
+            'cache_requests_total{result="miss"} 0.5\n'
+        ))
+
+    def test_gauge_function(self):
+        self.registry.gauge('pool_size', 'Size.', function=lambda: 3)
+        self.registry.gauge('queue_depth', 'Depth.', labelnames=('queue',), function=lambda: {('log',): 1})
+
+        self.assertEqual(self.registry.expose(), (
+            '# HELP pool_size Size.\n'
+            '# TYPE pool_size gauge\n'
+            'pool_size 3\n'
+            '# HELP queue_depth Depth.\n'
+            '# TYPE queue_depth gauge\n'
+            'queue_depth{queue="log"} 1\n'
+        ))
+
+    def test_gauge_inc_dec(self):
+        gauge = self.registry.gauge('in_progress', 'Requests.')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        self.assertIn('in_progress 1\n', self.registry.expose())
+
+    def test_histogram(self):
+        histogram = self.registry.histogram('latency', 'Latency.', labelnames=('route',), buckets=(0.1, 1))
+        histogram.observe(0.05, '/api/city')
+        histogram.observe(0.1, '/api/city')
+        histogram.observe(3, '/api/city')
+
+        self.assertEqual(self.registry.expose(), (
+            '# HELP latency Latency.\n'
+            '# TYPE latency histogram\n'
+            'latency_bucket{route="/api/city",le="0.1"} 2\n'
+            'latency_bucket{route="/api/city",le="1"} 2\n'
+            'latency_bucket{route="/api/city",le="+Inf"} 3\n'
+            'latency_count{route="/api/city"} 3\n'
+            'latency_sum{route="/api/city"} 3.15\n'
+        ))
+
+    def test_label_escaped(self):
+        counter = self.registry.counter('errors', 'Errors.', labelnames=('message',))
+        counter.inc('say "hi"\n')
+        self.assertIn(r'errors_total{message="say \"hi\"\n"} 1', self.registry.expose())
+
+    def test_duplicated(self):
+        self.registry.counter('errors', 'Errors.')
+        with self.assertRaises(ValueError):
+            self.registry.gauge('errors', 'Errors.')
+
+
+class TestRegisterQueue(TestCase):
+    def tearDown(self) -> None:
+        metrics._queue_depths.pop('test', None)
+
+    def test_happy_path(self):
+        metrics.register_queue('test', lambda: 7)
+        self.assertIn('background_queue_depth{queue="test"} 7\n', metrics.registry.expose())
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from app.base import do
+from app.utils import occupancy
+from tests import TestCase
+
+
+def reservation(court_id: int, start_time: datetime, end_time: datetime) -> do.Reservation:
+    return do.Reservation(
+        id=1, stadium_id=1, venue_id=1, court_id=court_id, start_time=start_time, end_time=end_time,
+        member_count=1, vacancy=0, technical_level=[], remark=None, invitation_code='code', is_cancelled=False,
+    )
+
+
+class TestRasterize(TestCase):
+    def setUp(self) -> None:
+        self.start_time = datetime(2023, 11, 17)
+        self.slot = timedelta(hours=1)
+
+    def test_paint(self):
+        matrix = occupancy.rasterize(
+            court_ids=[5, 3],
+            reservations=[
+                reservation(3, datetime(2023, 11, 17, 1, 30), datetime(2023, 11, 17, 3)),
+                reservation(3, datetime(2023, 11, 17, 2), datetime(2023, 11, 17, 4)),
+                reservation(5, datetime(2023, 11, 16, 22), datetime(2023, 11, 17, 1)),
+                reservation(5, datetime(2023, 11, 17, 5), datetime(2023, 11, 17, 9)),
+                reservation(7, datetime(2023, 11, 17, 0), datetime(2023, 11, 17, 2)),
+            ],
+            start_time=self.start_time, slot=self.slot, slot_count=6,
+        )
+        self.assertEqual(matrix.tolist(), [
+            [True, False, False, False, False, True],
+            [False, True, True, True, False, False],
+        ])
+
+    def test_empty(self):
+        matrix = occupancy.rasterize([1, 2], [], self.start_time, self.slot, 4)
+        self.assertEqual(matrix.shape, (2, 4))
+        self.assertFalse(matrix.any())
+
+
+class TestRunLengths(TestCase):
+    def test_runs(self):
+        matrix = occupancy.rasterize(
+            court_ids=[1, 2, 3],
+            reservations=[
+                reservation(1, datetime(2023, 11, 17, 0), datetime(2023, 11, 17, 2)),
+                reservation(1, datetime(2023, 11, 17, 3), datetime(2023, 11, 17, 6)),
+                reservation(3, datetime(2023, 11, 17, 5), datetime(2023, 11, 17, 6)),
+            ],
+            start_time=datetime(2023, 11, 17), slot=timedelta(hours=1), slot_count=6,
+        )
+        self.assertEqual(occupancy.run_lengths(matrix), [[(0, 2), (3, 3)], [], [(5, 1)]])
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from app.utils import profiler
+from tests import Mock, TestCase
+
+
+class TestRequestProfile(TestCase):
+    def setUp(self) -> None:
+        self.profile = profiler.RequestProfile(n_plus_one_threshold=3)
+
+    def test_server_timing(self):
+        self.profile.add_query('SELECT 1', 0.01)
+        self.profile.add_query('SELECT 2', 0.02)
+        self.profile.add_pool_wait(0.001)
+        self.profile.add_external('gcs', 0.1)
+        self.profile.add_external('gcs', 0.1)
+        self.profile.start, self.profile.end = 1, 1.5
+
+        self.assertEqual(
+            self.profile.server_timing(),
+            'total;dur=500.0, db;dur=30.0;desc="2 queries", pool;dur=1.0, gcs;dur=200.0',
+        )
+        self.assertEqual(self.profile.log_fields(), {
+            'total_ms': 500.0,
+            'db_ms': 30.0,
+            'query_count': 2,
+            'pool_wait_ms': 1.0,
+            'external_ms': {'gcs': 200.0},
+            'n_plus_one': False,
+        })
+
+    def test_repeated_queries(self):
+        for _ in range(3):
+            self.profile.add_query('SELECT * FROM reservation WHERE court_id = $1', 0.01)
+        self.profile.add_query('SELECT 1', 0.01)
+
+        self.assertEqual(self.profile.repeated_queries, {'SELECT * FROM reservation WHERE court_id = $1': 3})
+        self.assertTrue(self.profile.log_fields()['n_plus_one'])
+
+
+class TestTrack(TestCase):
+    def setUp(self) -> None:
+        self.profile = profiler.RequestProfile()
+
+    def test_track_query(self):
+        with patch.object(profiler.context, 'get_request_profile', Mock(return_value=self.profile)):
+            with profiler.track_query('SELECT 1'):
+                pass
+            profiler.add_pool_wait(0.5)
+
+        self.assertEqual(self.profile.query_counts, {'SELECT 1': 1})
+        self.assertEqual(self.profile.pool_wait_time, 0.5)
+
+    def test_track_external_raised(self):
+        with patch.object(profiler.context, 'get_request_profile', Mock(return_value=self.profile)):
+            with self.assertRaises(RuntimeError):
+                with profiler.track_external('maps'):
+                    raise RuntimeError
+
+        self.assertIn('maps', self.profile.external_times)
+
+    def test_no_profile(self):
+        with patch.object(profiler.context, 'get_request_profile', Mock(return_value=None)):
+            with profiler.track_query('SELECT 1'), profiler.track_external('maps'):
+                pass
+            profiler.add_pool_wait(0.5)
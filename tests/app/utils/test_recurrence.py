@@ -0,0 +1,43 @@
+from datetime import date, datetime
+
+import app.utils.recurrence as recurrence
+from app.base import enums, vo
+from tests import TestCase
+
+
+class TestExpand(TestCase):
+    def setUp(self) -> None:
+        self.start_time = datetime(2023, 11, 17, 11)
+        self.end_time = datetime(2023, 11, 17, 13)
+
+    def test_count(self):
+        result = recurrence.expand(
+            self.start_time, self.end_time,
+            vo.Recurrence(frequency=enums.RecurrenceFrequency.weekly, interval=2, count=3), limit=10,
+        )
+        self.assertEqual([time_range.start_time for time_range in result], [
+            datetime(2023, 11, 17, 11), datetime(2023, 12, 1, 11), datetime(2023, 12, 15, 11),
+        ])
+        self.assertEqual(result[-1].end_time, datetime(2023, 12, 15, 13))
+
+    def test_until_inclusive(self):
+        result = recurrence.expand(
+            self.start_time, self.end_time,
+            vo.Recurrence(frequency=enums.RecurrenceFrequency.daily, until=date(2023, 11, 19)), limit=10,
+        )
+        self.assertEqual(len(result), 3)
+
+    def test_over_limit(self):
+        result = recurrence.expand(
+            self.start_time, self.end_time,
+            vo.Recurrence(frequency=enums.RecurrenceFrequency.daily, count=100), limit=10,
+        )
+        self.assertEqual(len(result), 11)
+
+
+class TestToRRule(TestCase):
+    def test_happy_path(self):
+        self.assertEqual(
+            recurrence.to_rrule(vo.Recurrence(frequency=enums.RecurrenceFrequency.weekly, until=date(2024, 1, 1)), 7),
+            'RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=7',
+        )
@@ -0,0 +1,20 @@
+import inspect
+
+from app.exceptions import ack_exception
+from app.utils import response
+from tests import TestCase
+
+
+class TestErrorMessage(TestCase):
+    def test_all_ack_exceptions(self):
+        expect = [name for name, obj in vars(ack_exception).items() if inspect.isclass(obj)]
+        self.assertEqual(list(response.class_enum.__members__), expect)
+        self.assertEqual(response.class_enum.NotFound.value, 'NotFound')
+
+    def test_skip_other_module(self):
+        class OtherException(ack_exception.NotFound):
+            pass
+
+        names = [cls.__name__ for cls in response.walk_exception_classes()]
+        self.assertIn('NotFound', names)
+        self.assertNotIn('OtherException', names)
@@ -1,28 +1,61 @@
 from unittest.mock import patch
 
 from app import main
+from app.startup import startup_orchestrator
 from tests import AsyncMock, AsyncTestCase, Mock
 
 
 class TestStartUp(AsyncTestCase):
+    @patch('app.processor.job.job_runner.start', new_callable=AsyncMock)
+    @patch('app.persistence.cache.response_cache.initialize', new_callable=AsyncMock)
     @patch('app.persistence.database.pg_pool_handler.initialize', new_callable=AsyncMock)
     @patch('app.persistence.email.smtp_handler.initialize', new_callable=AsyncMock)
     @patch('app.client.oauth.oauth_handler.initialize', new_callable=Mock)
     @patch('app.persistence.file_storage.gcs.gcs_handler.initialize', new_callable=Mock)
-    async def test_happy_path(self, mock_gcs: Mock, mock_oauth: Mock, mock_smtp: AsyncMock, mock_pg: AsyncMock):
+    async def test_happy_path(
+            self, mock_gcs: Mock, mock_oauth: Mock, mock_smtp: AsyncMock, mock_pg: AsyncMock, mock_cache: AsyncMock,
+            mock_job: AsyncMock,
+    ):
         await main.app_startup()
-
         mock_pg.assert_called_once()
-        mock_smtp.assert_called_once()
-        mock_oauth.assert_called_once()
+        mock_job.assert_called_once()
+
+        await startup_orchestrator.join()
+        mock_cache.assert_called_once()
         mock_gcs.assert_called_once()
+        mock_smtp.assert_not_called()
+        mock_oauth.assert_not_called()
+        self.assertTrue({'database', 'gcs', 'cache'} <= startup_orchestrator.timings.keys())
+
+    @patch('app.processor.job.job_runner.start', new_callable=AsyncMock)
+    @patch('app.persistence.cache.response_cache.initialize', new_callable=AsyncMock)
+    @patch('app.persistence.database.pg_pool_handler.initialize', new_callable=AsyncMock)
+    @patch('app.persistence.file_storage.gcs.gcs_handler.initialize', new_callable=Mock)
+    async def test_deferred_failed(self, mock_gcs: Mock, mock_pg: AsyncMock, mock_cache: AsyncMock, _: AsyncMock):
+        mock_gcs.side_effect = RuntimeError
+
+        await main.app_startup()
+        await startup_orchestrator.join()
+
+        mock_pg.assert_called_once()
+        mock_cache.assert_called_once()
 
 
 class TestShutDown(AsyncTestCase):
+    @patch('app.processor.job.job_runner.close', new_callable=AsyncMock)
+    @patch('app.persistence.redis.redis_pool_handler.close', new_callable=AsyncMock)
+    @patch('app.persistence.cache.response_cache.close', new_callable=AsyncMock)
     @patch('app.persistence.database.pg_pool_handler.close', new_callable=AsyncMock)
     @patch('app.persistence.email.smtp_handler.close', new_callable=AsyncMock)
-    async def test_happy_path(self, mock_smtp: AsyncMock, mock_pg: AsyncMock):
+    async def test_happy_path(
+            self, mock_smtp: AsyncMock, mock_pg: AsyncMock, mock_cache: AsyncMock, mock_redis: AsyncMock,
+            mock_job: AsyncMock,
+    ):
         await main.app_shutdown()
 
+        mock_job.assert_called_once()
+
+        mock_redis.assert_called_once()
+        mock_cache.assert_called_once()
         mock_pg.assert_called_once()
         mock_smtp.assert_called_once()